@@ -6,6 +6,7 @@ from .tools.tools import add_constant, categorical
 from . import regression
 from .regression.linear_model import OLS, GLS, WLS, GLSAR
 from .regression.recursive_ls import RecursiveLS
+from .regression.rolling import RollingOLS, RollingWLS
 from .regression.quantile_regression import QuantReg
 from .regression.mixed_linear_model import MixedLM
 from .genmod import api as genmod
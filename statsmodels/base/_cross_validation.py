@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+K-fold cross-validation of the penalization weight along a grid of alphas
+
+The folds are independent and can be estimated in parallel with joblib
+through ``statsmodels.tools.parallel``. Within a fold the penalty path is
+traversed from the largest to the smallest penalization weight and each fit
+is warm started at the parameters of the previous, more heavily penalized
+fit.
+
+License: BSD-3
+"""
+
+import numpy as np
+
+from statsmodels.tools.parallel import parallel_func
+
+
+def _mse(endog, fitted):
+    """mean squared prediction error, default cost function
+    """
+    return np.mean((np.asarray(endog) - np.asarray(fitted))**2)
+
+
+def kfold_indices(nobs, k_folds=5, shuffle=False, random_state=None):
+    """list of train and test index arrays for k-fold cross-validation
+
+    Parameters
+    ----------
+    nobs : int
+        number of observations
+    k_folds : int
+        number of folds
+    shuffle : bool
+        If true, then the observations are randomly permuted before they are
+        split into folds.
+    random_state : None, int or RandomState instance
+        used for the permutation if shuffle is true.
+
+    Returns
+    -------
+    folds : list of tuples
+        Each tuple contains the integer index of the training and the test
+        observations of a fold.
+
+    Notes
+    -----
+    This uses ``np.array_split``, the fold sizes differ by at most one
+    observation.
+    """
+    index = np.arange(nobs)
+    if shuffle:
+        if not isinstance(random_state, np.random.RandomState):
+            random_state = np.random.RandomState(random_state)
+        random_state.shuffle(index)
+
+    folds = []
+    for test_index in np.array_split(index, k_folds):
+        mask = np.ones(nobs, dtype=np.bool_)
+        mask[test_index] = False
+        folds.append((np.nonzero(mask)[0], np.sort(test_index)))
+    return folds
+
+
+def _subset_model(model, index, alpha=None):
+    """create a new instance of the model class for a subset of observations
+
+    Arrays in the extra init keywords, e.g. offset, exposure or weights, are
+    subset if their first dimension is nobs. GAM models are split using the
+    smoother of the full model, in this case ``alpha`` is the penalization
+    weight used to create the model.
+    """
+    nobs = model.endog.shape[0]
+    kwds = model._get_init_kwds()
+    for key, value in kwds.items():
+        if (isinstance(value, np.ndarray) and value.ndim > 0 and
+                value.shape[0] == nobs):
+            kwds[key] = value[index]
+
+    endog = model.endog[index]
+    smoother = getattr(model, 'smoother', None)
+    if smoother is not None:
+        # GAM, the penalization is defined in the model
+        from statsmodels.gam.gam_cross_validation.gam_cross_validation import (
+            _split_train_test_smoothers)
+        kwds['smoother'], _ = _split_train_test_smoothers(
+            smoother.x, smoother, index, index)
+        if alpha is not None:
+            kwds['alpha'] = alpha
+        exog = model.exog_linear
+    else:
+        exog = model.exog
+    if exog is not None:
+        exog = exog[index]
+
+    return model.__class__(endog, exog, **kwds)
+
+
+def _fit_fold_path(model, train_index, test_index, alphas, cost, fit_kwds,
+                   warm_start, penalty_in_model):
+    """estimate the penalty path for one fold
+
+    This is a module level function so that it can be pickled by joblib.
+
+    Returns
+    -------
+    errors : ndarray
+        cost for the test sample for each alpha in the original order
+    params : ndarray, 2-D
+        parameter estimates of the training sample, one row for each alpha
+    """
+    n_alphas = len(alphas)
+    # largest penalization first, shrinkage toward zero makes it easiest
+    order = sorted(range(n_alphas), key=lambda i: -np.max(alphas[i]))
+
+    errors = np.empty(n_alphas)
+    params_path = [None] * n_alphas
+
+    if not penalty_in_model:
+        # build the fold models only once and reuse them along the path
+        mod_train = _subset_model(model, train_index)
+        mod_test = _subset_model(model, test_index)
+
+    start_params = fit_kwds.get('start_params', None)
+    for i in order:
+        kwds = dict(fit_kwds)
+        if warm_start and start_params is not None:
+            kwds['start_params'] = start_params
+        if penalty_in_model:
+            mod_train = _subset_model(model, train_index, alpha=alphas[i])
+            mod_test = _subset_model(model, test_index, alpha=alphas[i])
+            res = mod_train.fit(**kwds)
+        else:
+            res = mod_train.fit_regularized(alpha=alphas[i], **kwds)
+
+        params = np.asarray(res.params)
+        fitted = mod_test.predict(params)
+        errors[i] = cost(mod_test.endog, fitted)
+        params_path[i] = params
+        start_params = params
+
+    return errors, np.asarray(params_path)
+
+
+class PenaltyPathCV(object):
+    """k-fold cross-validation for the penalization weight of a model
+
+    Parameters
+    ----------
+    model : model instance
+        The model instance for the full sample. Models for the training and
+        test folds are created from it using the extra init keywords, see
+        ``model._get_init_kwds``.
+    alphas : array_like
+        grid of penalization weights. Each element can be a scalar or an
+        array of penalization weights, e.g. one per parameter or, for GAM,
+        one per smooth term.
+    k_folds : int
+        number of folds. This is ignored if ``folds`` is provided.
+    folds : None or iterable
+        Tuples of (train_index, test_index) as integer or boolean index
+        arrays. If None, then the folds are created with `kfold_indices`.
+    cost : None or callable
+        cost function ``cost(endog_test, predicted_test)`` that returns a
+        scalar. The default is the mean squared prediction error.
+    fit_kwds : dict or None
+        additional keywords for the fit method, e.g. ``L1_wt`` or ``method``
+        for ``fit_regularized``.
+    warm_start : bool
+        If true, then the parameters of the previous fit along the penalty
+        path in a fold are used as start_params for the next fit.
+    shuffle : bool
+        whether to randomly permute observations before creating the folds.
+    random_state : None, int or RandomState instance
+        used for shuffling the observations.
+    n_jobs : int
+        Number of folds that are estimated in parallel using joblib. The
+        default n_jobs=1 estimates the folds sequentially, n_jobs=-1 uses
+        all available cores.
+
+    Notes
+    -----
+    For models that define the penalization in the model instance, e.g.
+    `GLMGam`, a new model is created for each alpha and the ``fit`` method is
+    used. Otherwise ``alpha`` is passed to ``fit_regularized`` of the fold
+    models, which are created only once for each fold.
+
+    Within each fold the penalty path is traversed starting at the largest
+    penalization weight and using warm starts. The models for the training
+    and test sample of a fold are reused along the penalty path, so that
+    attributes that models compute and cache from the data are only computed
+    once per fold.
+
+    Examples
+    --------
+    >>> mod = OLS(endog, exog)
+    >>> cv = PenaltyPathCV(mod, np.logspace(-3, 0, 20), fit_kwds={'L1_wt': 1})
+    >>> res_cv = cv.fit()
+    >>> res_cv.alpha_cv, res_cv.results.params
+    """
+
+    def __init__(self, model, alphas, k_folds=5, folds=None, cost=None,
+                 fit_kwds=None, warm_start=True, shuffle=False,
+                 random_state=None, n_jobs=1):
+        self.model = model
+        self.alphas = list(alphas)
+        self.k_folds = k_folds
+        self.cost = cost if cost is not None else _mse
+        self.fit_kwds = fit_kwds if fit_kwds is not None else {}
+        self.warm_start = warm_start
+        self.n_jobs = n_jobs
+        self.penalty_in_model = getattr(model, 'smoother', None) is not None
+
+        nobs = model.endog.shape[0]
+        if folds is None:
+            folds = kfold_indices(nobs, k_folds=k_folds, shuffle=shuffle,
+                                  random_state=random_state)
+        else:
+            idx = np.arange(nobs)
+            folds = [(idx[np.asarray(tr)], idx[np.asarray(te)])
+                     for tr, te in folds]
+        self.folds = folds
+        self.k_folds = len(folds)
+
+    def fit(self, refit=True):
+        """estimate all folds over the grid of penalization weights
+
+        Parameters
+        ----------
+        refit : bool
+            If true, then the model is estimated on the full sample using the
+            penalization weight with the smallest cross-validation error.
+
+        Returns
+        -------
+        results : PenaltyPathCVResults instance
+        """
+        alphas = self.alphas
+        args = (alphas, self.cost, self.fit_kwds, self.warm_start,
+                self.penalty_in_model)
+
+        if self.n_jobs == 1:
+            fold_results = [_fit_fold_path(self.model, tr, te, *args)
+                            for tr, te in self.folds]
+        else:
+            par, f, n_jobs = parallel_func(_fit_fold_path, self.n_jobs,
+                                           verbose=0)
+            fold_results = par(f(self.model, tr, te, *args)
+                               for tr, te in self.folds)
+
+        # rows correspond to alphas, columns to folds
+        cv_errors = np.column_stack([r[0] for r in fold_results])
+        params_folds = np.array([r[1] for r in fold_results])
+
+        idx_cv = int(np.argmin(cv_errors.mean(1)))
+        results = None
+        if refit:
+            alpha_cv = alphas[idx_cv]
+            kwds = dict(self.fit_kwds)
+            if self.warm_start:
+                kwds['start_params'] = params_folds[:, idx_cv].mean(0)
+            if self.penalty_in_model:
+                nobs = self.model.endog.shape[0]
+                mod = _subset_model(self.model, np.arange(nobs),
+                                    alpha=alpha_cv)
+                results = mod.fit(**kwds)
+            else:
+                results = self.model.fit_regularized(alpha=alpha_cv, **kwds)
+
+        return PenaltyPathCVResults(alphas, cv_errors, params_folds, results)
+
+
+class PenaltyPathCVResults(object):
+    """Results of cross-validation over a penalty path
+
+    **Attributes**
+
+    alphas : list
+        grid of penalization weights
+    cv_errors : ndarray, 2-D
+        cost on the test sample with alphas in rows and folds in columns
+    cv_error : ndarray
+        mean cost across folds for each alpha
+    cv_std : ndarray
+        standard deviation of the cost across folds for each alpha
+    idx_cv : int
+        index of the alpha with the smallest mean cross-validation error
+    alpha_cv : scalar or ndarray
+        penalization weight with the smallest mean cross-validation error
+    params_folds : ndarray, 3-D
+        parameter estimates with shape (k_folds, n_alphas, k_params)
+    results : results instance or None
+        results of the model estimated on the full sample with alpha_cv, if
+        refit is true.
+    """
+
+    def __init__(self, alphas, cv_errors, params_folds, results=None):
+        self.alphas = alphas
+        self.cv_errors = cv_errors
+        self.cv_error = cv_errors.mean(1)
+        self.cv_std = cv_errors.std(1)
+        self.idx_cv = int(np.argmin(self.cv_error))
+        self.alpha_cv = alphas[self.idx_cv]
+        self.params_folds = params_folds
+        self.results = results
+
+    @property
+    def alpha_1se(self):
+        """largest alpha with cv_error within one standard error of the min
+
+        The standard error is ``cv_std / sqrt(k_folds)`` at alpha_cv.
+        """
+        k_folds = self.cv_errors.shape[1]
+        se = self.cv_std[self.idx_cv] / np.sqrt(k_folds)
+        threshold = self.cv_error[self.idx_cv] + se
+        candidates = [i for i in range(len(self.alphas))
+                      if self.cv_error[i] <= threshold]
+        return self.alphas[max(candidates, key=lambda i:
+                               np.max(self.alphas[i]))]
@@ -1,4 +1,6 @@
 from __future__ import print_function
+from timeit import default_timer
+
 from statsmodels.compat.python import lzip, range, reduce
 import numpy as np
 from scipy import stats
@@ -13,7 +15,7 @@ from statsmodels.tools.numdiff import approx_fprime
 from statsmodels.tools.sm_exceptions import ValueWarning, \
     HessianInversionWarning
 from statsmodels.formula import handle_formula_data
-from statsmodels.base.optimizer import Optimizer
+from statsmodels.base.optimizer import Optimizer, OptimizerTrace
 
 
 _model_params_doc = """
@@ -266,6 +268,8 @@ class LikelihoodModel(Model):
             is used, and it can be chosen from among the following strings:
 
             - 'newton' for Newton-Raphson, 'nm' for Nelder-Mead
+            - 'newton_ls' for Newton-Raphson with line search and optional
+              reuse of the Hessian factorization
             - 'bfgs' for Broyden-Fletcher-Goldfarb-Shanno (BFGS)
             - 'lbfgs' for limited-memory BFGS with optional box constraints
             - 'powell' for modified Powell's method
@@ -301,7 +305,8 @@ class LikelihoodModel(Model):
             If False (default), then the negative inverse hessian is calculated
             after the optimization. If True, then the hessian will not be
             calculated. However, it will be available in methods that use the
-            hessian in the optimization (currently only with `"newton"`).
+            hessian in the optimization (currently only with `"newton"` and
+            `"newton_ls"`).
         kwargs : keywords
             All kwargs are passed to the chosen solver with one exception. The
             following keyword controls what happens after the fit::
@@ -309,6 +314,14 @@ class LikelihoodModel(Model):
                 warn_convergence : bool, optional
                     If True, checks the model for the converged flag. If the
                     converged flag is False, a ConvergenceWarning is issued.
+                trace : bool or OptimizerTrace instance, optional
+                    If True or an OptimizerTrace instance, then the calls
+                    to loglike, score and hessian are counted and timed,
+                    the params and gradient norm are recorded in each
+                    iteration, and the trace is attached to the results
+                    as `mle_trace`. The time for computing the covariance
+                    of the parameters and creating the results instance
+                    is recorded under 'results'.
 
         Notes
         -----
@@ -320,6 +333,22 @@ class LikelihoodModel(Model):
             'newton'
                 tol : float
                     Relative error in params acceptable for convergence.
+            'newton_ls'
+                tol : float
+                    Absolute change in params acceptable for convergence.
+                gtol : float
+                    Stop when the largest absolute value of the gradient is
+                    less than gtol.
+                hessian_reuse : int
+                    Number of iterations for which a Hessian factorization
+                    is reused. Default is 1, i.e. full Newton steps with a
+                    new Hessian in every iteration.
+                max_halving : int
+                    Maximum number of step halvings in the line search.
+                ridge_factor : float
+                    Minimum ridge added to the diagonal of the Hessian, if
+                    it is not positive definite, relative to the largest
+                    diagonal element. Default is 1e-3.
             'nm' -- Nelder Mead
                 xtol : float
                     Relative error in params acceptable for convergence
@@ -453,6 +482,12 @@ class LikelihoodModel(Model):
                 return -self.hessian(params, *args) / nobs
 
         warn_convergence = kwargs.pop('warn_convergence', True)
+        trace = kwargs.pop('trace', None)
+        if trace is True:
+            trace = OptimizerTrace()
+        elif trace is False:
+            trace = None
+
         optimizer = Optimizer()
         xopt, retvals, optim_settings = optimizer._fit(f, score, start_params,
                                                        fargs, kwargs,
@@ -462,7 +497,10 @@ class LikelihoodModel(Model):
                                                        maxiter=maxiter,
                                                        callback=callback,
                                                        retall=retall,
-                                                       full_output=full_output)
+                                                       full_output=full_output,
+                                                       trace=trace)
+        if trace is not None:
+            t0 = default_timer()
 
         # NOTE: this is for fit_regularized and should be generalized
         cov_params_func = kwargs.setdefault('cov_params_func', None)
@@ -470,6 +508,9 @@ class LikelihoodModel(Model):
             Hinv = cov_params_func(self, xopt, retvals)
         elif method == 'newton' and full_output:
             Hinv = np.linalg.inv(-retvals['Hessian']) / nobs
+        elif method == 'newton_ls' and full_output:
+            # Hessian of the negative loglike at the optimum
+            Hinv = np.linalg.inv(retvals['Hessian']) / nobs
         elif not skip_hessian:
             H = -1 * self.hessian(xopt)
             invertible = False
@@ -507,6 +548,9 @@ class LikelihoodModel(Model):
                      "Check mle_retvals", ConvergenceWarning)
 
         mlefit.mle_settings = optim_settings
+        if trace is not None:
+            trace.times['results'] += default_timer() - t0
+            mlefit.mle_trace = trace
         return mlefit
 
     def _fit_zeros(self, keep_index=None, start_params=None,
@@ -1086,6 +1130,28 @@ class LikelihoodModelResults(Results):
                 True: converged. False: did not converge.
             allvecs : list
                 List of solutions at each iteration.
+        'newton_ls'
+            fopt : float
+                The value of the (negative) loglikelihood at its
+                minimum.
+            iterations : int
+                Number of iterations performed.
+            score : ndarray
+                The gradient of the negative loglikelihood at the optimum.
+            Hessian : ndarray
+                The Hessian of the negative loglikelihood at the optimum.
+            fcalls : int
+                Number of function calls made.
+            gcalls : int
+                Number of gradient calls made.
+            hcalls : int
+                Number of Hessian calls made.
+            warnflag : int
+                1 if not converged. 0 if successful convergence.
+            converged : bool
+                True: converged. False: did not converge.
+            allvecs : list
+                List of solutions at each iteration.
         'nm'
             fopt : float
                 The value of the (negative) loglikelihood at its
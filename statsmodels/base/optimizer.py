@@ -4,8 +4,12 @@ to untie these from LikelihoodModel so that they may be re-used generally.
 """
 from __future__ import print_function
 
+from collections import defaultdict
+from contextlib import contextmanager
+from timeit import default_timer
+
 import numpy as np
-from scipy import optimize
+from scipy import linalg, optimize
 
 
 def _check_method(method, methods):
@@ -14,10 +18,163 @@ def _check_method(method, methods):
         raise ValueError(message)
 
 
+class OptimizerTrace(object):
+    """Evaluation counts, timings and convergence history of an optimization
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called after each iteration of the optimizer as ``callback(record)``
+        where record is a dict with keys 'iteration', 'time', 'params',
+        'fval' and 'grad_norm'.
+
+    **Attributes**
+
+    ncalls : dict
+        number of calls by function name, e.g. 'loglike', 'score',
+        'hessian'
+    times : dict
+        total time in seconds spent in each function or stage, e.g.
+        'results' for the construction of the results instance
+    history : list of dict
+        one record for each iteration of the optimizer
+    method : str
+        name of the optimizer, set by `Optimizer._fit`
+
+    Notes
+    -----
+    The objective and gradient are the functions seen by the optimizer,
+    i.e. the negative loglikelihood and score divided by nobs for most
+    optimizers. 'fval' and 'grad_norm' in the history refer to the last
+    evaluation at the iteration params, they are nan if the optimizer did
+    not evaluate the function at those params.
+
+    `as_dict` returns a flat summary that can be collected across many fits,
+    e.g. into a DataFrame with one row per fit.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.ncalls = defaultdict(int)
+        self.times = defaultdict(float)
+        self.history = []
+        self.method = None
+        self._last_f = None
+        self._last_grad = None
+        self._start = default_timer()
+
+    def wrap(self, name, func):
+        """wrap a function so that calls are counted and timed under name
+        """
+        if func is None:
+            return None
+
+        def wrapped(params, *args, **kwds):
+            t0 = default_timer()
+            res = func(params, *args, **kwds)
+            self.times[name] += default_timer() - t0
+            self.ncalls[name] += 1
+            if name in ('loglike', 'score', 'loglike_and_score'):
+                params = np.array(params, copy=True)
+                if name == 'loglike':
+                    self._last_f = (params, res)
+                elif name == 'score':
+                    self._last_grad = (params, res)
+                else:
+                    # loglike_and_score has the sign of the loglikelihood
+                    self._last_f = (params, -res[0])
+                    self._last_grad = (params, res[1])
+            return res
+
+        return wrapped
+
+    @contextmanager
+    def timer(self, name):
+        """context manager that adds the elapsed time to ``times[name]``
+        """
+        t0 = default_timer()
+        try:
+            yield
+        finally:
+            self.times[name] += default_timer() - t0
+
+    def _at(self, last, params):
+        # value of the last evaluation if it was at params
+        if last is not None and np.array_equal(last[0], params):
+            return last[1]
+        return None
+
+    def iteration(self, params, *args):
+        """record an iteration, used as callback of the optimizer
+        """
+        params = np.array(params, copy=True)
+        fval = self._at(self._last_f, params)
+        grad = self._at(self._last_grad, params)
+        record = {'iteration': len(self.history) + 1,
+                  'time': default_timer() - self._start,
+                  'params': params,
+                  'fval': np.nan if fval is None else float(fval),
+                  'grad_norm': (np.nan if grad is None else
+                                np.sqrt(np.sum(np.abs(grad)**2)))}
+        self.history.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def chain_callback(self, callback):
+        """callback that records the iteration and then calls callback
+        """
+        def chained(*args):
+            self.iteration(*args)
+            if callback is not None:
+                return callback(*args)
+
+        return chained
+
+    @property
+    def n_iter(self):
+        """number of recorded iterations"""
+        return len(self.history)
+
+    @property
+    def params_trace(self):
+        """parameters at each iteration, 2-D array"""
+        return np.array([rec['params'] for rec in self.history])
+
+    @property
+    def grad_norm_trace(self):
+        """norm of the gradient at each iteration"""
+        return np.array([rec['grad_norm'] for rec in self.history])
+
+    def as_dict(self):
+        """flat summary of counts and timings
+
+        Returns
+        -------
+        summary : dict
+            contains 'method', 'n_iter', 'time_total' and 'ncalls_<name>',
+            'time_<name>' for each counted function and timed stage.
+        """
+        res = {'method': self.method, 'n_iter': self.n_iter,
+               'time_total': default_timer() - self._start}
+        for name in sorted(self.ncalls):
+            res['ncalls_' + name] = self.ncalls[name]
+        for name in sorted(self.times):
+            res['time_' + name] = self.times[name]
+        return res
+
+    def history_frame(self):
+        """iteration history as a DataFrame, params are not included
+        """
+        import pandas as pd
+        columns = ['iteration', 'time', 'fval', 'grad_norm']
+        return pd.DataFrame([[rec[c] for c in columns]
+                             for rec in self.history], columns=columns)
+
+
 class Optimizer(object):
     def _fit(self, objective, gradient, start_params, fargs, kwargs,
              hessian=None, method='newton', maxiter=100, full_output=True,
-             disp=True, callback=None, retall=False):
+             disp=True, callback=None, retall=False, trace=None):
         """
         Fit function for any model with an objective function.
 
@@ -26,9 +183,10 @@ class Optimizer(object):
         start_params : array-like, optional
             Initial guess of the solution for the loglikelihood maximization.
             The default is an array of zeros.
-        method : str {'newton','nm','bfgs','powell','cg','ncg','basinhopping',
-            'minimize'}
-            Method can be 'newton' for Newton-Raphson, 'nm' for Nelder-Mead,
+        method : str {'newton','newton_ls','nm','bfgs','powell','cg','ncg',
+            'basinhopping','minimize'}
+            Method can be 'newton' for Newton-Raphson, 'newton_ls' for
+            Newton-Raphson with line search, 'nm' for Nelder-Mead,
             'bfgs' for Broyden-Fletcher-Goldfarb-Shanno, 'powell' for modified
             Powell's method, 'cg' for conjugate gradient, 'ncg' for Newton-
             conjugate gradient, 'basinhopping' for global basin-hopping
@@ -57,6 +215,9 @@ class Optimizer(object):
         retall : bool
             Set to True to return list of solutions at each iteration.
             Available in Results object's mle_retvals attribute.
+        trace : OptimizerTrace instance, optional
+            If provided, then the calls to the objective, gradient and
+            hessian are counted and timed, and each iteration is recorded.
 
         Returns
         -------
@@ -79,6 +240,22 @@ class Optimizer(object):
             'newton'
                 tol : float
                     Relative error in params acceptable for convergence.
+            'newton_ls'
+                tol : float
+                    Absolute change in params acceptable for convergence.
+                gtol : float
+                    Stop when the largest absolute value of the gradient is
+                    less than gtol.
+                hessian_reuse : int
+                    Number of iterations for which a Hessian factorization
+                    is reused. Default is 1, i.e. full Newton steps with a
+                    new Hessian in every iteration.
+                max_halving : int
+                    Maximum number of step halvings in the line search.
+                ridge_factor : float
+                    Minimum ridge added to the diagonal of the Hessian, if
+                    it is not positive definite, relative to the largest
+                    diagonal element. Default is 1e-3.
             'nm' -- Nelder Mead
                 xtol : float
                     Relative error in params acceptable for convergence
@@ -162,14 +339,15 @@ class Optimizer(object):
         # Extract kwargs specific to fit_regularized calling fit
         extra_fit_funcs = kwargs.setdefault('extra_fit_funcs', dict())
 
-        methods = ['newton', 'nm', 'bfgs', 'lbfgs', 'powell', 'cg', 'ncg',
-                'basinhopping', 'minimize']
+        methods = ['newton', 'newton_ls', 'nm', 'bfgs', 'lbfgs', 'powell',
+                   'cg', 'ncg', 'basinhopping', 'minimize']
         methods += extra_fit_funcs.keys()
         method = method.lower()
         _check_method(method, methods)
 
         fit_funcs = {
             'newton': _fit_newton,
+            'newton_ls': _fit_newton_ls,  # Newton with line search
             'nm': _fit_nm,  # Nelder-Mead
             'bfgs': _fit_bfgs,
             'lbfgs': _fit_lbfgs,
@@ -186,8 +364,19 @@ class Optimizer(object):
             fit_funcs.update(extra_fit_funcs)
 
         func = fit_funcs[method]
+        fit_callback = callback
+        if trace is not None:
+            trace.method = method
+            objective = trace.wrap('loglike', objective)
+            gradient = trace.wrap('score', gradient)
+            hessian = trace.wrap('hessian', hessian)
+            if kwargs.get('loglike_and_score') is not None:
+                kwargs['loglike_and_score'] = trace.wrap(
+                    'loglike_and_score', kwargs['loglike_and_score'])
+            fit_callback = trace.chain_callback(callback)
+
         xopt, retvals = func(objective, gradient, start_params, fargs, kwargs,
-                            disp=disp, maxiter=maxiter, callback=callback,
+                            disp=disp, maxiter=maxiter, callback=fit_callback,
                             retall=retall, full_output=full_output,
                             hess=hessian)
 
@@ -315,6 +504,155 @@ def _fit_newton(f, score, start_params, fargs, kwargs, disp=True,
     return xopt, retvals
 
 
+def _factor_hessian(H, ridge_factor):
+    """Cholesky factor of the Hessian, ridge regularized if not pos. definite
+
+    A multiple of the identity is added if the Hessian is not positive
+    definite, see Algorithm 3.3 in Nocedal and Wright, Numerical
+    Optimization. Returns the factorization and the ridge that was added.
+    """
+    H = np.asarray(H, dtype=np.float64)
+    diag = np.diag(H)
+    beta = ridge_factor * max(np.abs(diag).max(), 1.)
+    ridge = 0. if diag.min() > 0 else beta - diag.min()
+    for _ in range(100):
+        try:
+            return linalg.cho_factor(H + ridge * np.eye(H.shape[0])), ridge
+        except linalg.LinAlgError:
+            ridge = max(2 * ridge, beta)
+    raise np.linalg.LinAlgError('Hessian could not be regularized')
+
+
+def _fit_newton_ls(f, score, start_params, fargs, kwargs, disp=True,
+                   maxiter=100, callback=None, retall=False,
+                   full_output=True, hess=None):
+    """
+    Newton-Raphson with backtracking line search and Hessian reuse
+
+    Parameters
+    ----------
+    f : function
+        Returns negative log likelihood given parameters.
+    score : function
+        Returns gradient of negative log likelihood with respect to params.
+    hess : function
+        Returns Hessian of negative log likelihood with respect to params.
+
+    Notes
+    -----
+    The search direction is the Newton step based on a Cholesky factorization
+    of the Hessian. If the Hessian is not positive definite, then a multiple
+    of the identity matrix is added until it is (modified Newton). The step
+    is halved until the Armijo sufficient decrease condition holds.
+
+    If ``hessian_reuse`` is larger than one, then the factorization is kept
+    for that many iterations, which replaces Hessian evaluations by cheaper
+    score evaluations. The Hessian is recomputed early if the line search
+    has to shorten the step with a stale factorization.
+
+    The number of function, score and Hessian evaluations is reported in
+    the returned ``fcalls``, ``gcalls`` and ``hcalls``.
+    """
+    tol = kwargs.setdefault('tol', 1e-8)
+    gtol = kwargs.setdefault('gtol', 1e-8)
+    hessian_reuse = kwargs.setdefault('hessian_reuse', 1)
+    max_halving = kwargs.setdefault('max_halving', 30)
+    ridge_factor = kwargs.setdefault('ridge_factor', 1e-3)
+    # Armijo constant for sufficient decrease
+    c1 = 1e-4
+
+    counts = {'fcalls': 0, 'gcalls': 0, 'hcalls': 0}
+
+    def func(x):
+        counts['fcalls'] += 1
+        return f(x, *fargs)
+
+    def grad(x):
+        counts['gcalls'] += 1
+        return np.asarray(score(x))
+
+    def hessian(x):
+        counts['hcalls'] += 1
+        return hess(x)
+
+    params = np.asarray(start_params, dtype=np.float64)
+    fval = func(params)
+    g = grad(params)
+    if retall:
+        history = [params]
+
+    factor = None
+    factor_age = 0
+    iterations = 0
+    converged = np.max(np.abs(g)) < gtol
+    while not converged and iterations < maxiter:
+        fresh = factor is None or factor_age >= hessian_reuse
+        if fresh:
+            factor, _ = _factor_hessian(hessian(params), ridge_factor)
+            factor_age = 0
+        direction = -linalg.cho_solve(factor, g)
+        slope = np.dot(g, direction)
+        if not slope < 0:
+            # not a descent direction, use steepest descent
+            direction = -g
+            slope = -np.dot(g, g)
+
+        step = 1.
+        for _ in range(max_halving):
+            new_params = params + step * direction
+            new_fval = func(new_params)
+            if np.isfinite(new_fval) and new_fval <= fval + c1 * step * slope:
+                break
+            step /= 2.
+        else:
+            if not fresh:
+                # retry with a new Hessian before giving up
+                factor = None
+                continue
+            break
+
+        if not fresh and step < 1:
+            # stale curvature information, refresh in the next iteration
+            factor_age = hessian_reuse
+        else:
+            factor_age += 1
+
+        change = new_params - params
+        params, fval = new_params, new_fval
+        g = grad(params)
+        iterations += 1
+        if retall:
+            history.append(params)
+        if callback is not None:
+            callback(params)
+        converged = (np.max(np.abs(change)) < tol or
+                     np.max(np.abs(g)) < gtol)
+
+    warnflag = int(not converged)
+    if disp:
+        if converged:
+            print("Optimization terminated successfully.")
+        else:
+            print("Warning: Optimization did not converge.")
+        print("         Current function value: %f" % fval)
+        print("         Iterations: %d" % iterations)
+        print("         Function evaluations: %d" % counts['fcalls'])
+        print("         Gradient evaluations: %d" % counts['gcalls'])
+        print("         Hessian evaluations: %d" % counts['hcalls'])
+
+    if full_output:
+        retvals = {'fopt': fval, 'iterations': iterations, 'score': g,
+                   'Hessian': hessian(params), 'warnflag': warnflag,
+                   'converged': converged}
+        retvals.update(counts)
+        if retall:
+            retvals.update({'allvecs': history})
+    else:
+        retvals = None
+
+    return params, retvals
+
+
 def _fit_bfgs(f, score, start_params, fargs, kwargs, disp=True,
                     maxiter=100, callback=None, retall=False,
                     full_output=True, hess=None):
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for k-fold cross-validation along a penalty path
+
+License: BSD-3
+"""
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.regression.linear_model import OLS
+from statsmodels.discrete.discrete_model import Logit
+from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.genmod import families
+from statsmodels.gam.api import GLMGam, BSplines
+from statsmodels.base._cross_validation import (
+    PenaltyPathCV, kfold_indices)
+
+
+def _get_data(nobs=200, k_vars=6, seed=987125):
+    np.random.seed(seed)
+    exog = np.random.randn(nobs, k_vars)
+    exog[:, 0] = 1
+    beta = np.zeros(k_vars)
+    beta[:3] = [0.5, 1, -0.5]
+    linpred = exog.dot(beta)
+    return linpred, exog
+
+
+def test_kfold_indices():
+    folds = kfold_indices(23, k_folds=4, shuffle=True, random_state=5)
+    assert_equal(len(folds), 4)
+    test_all = np.sort(np.concatenate([te for _, te in folds]))
+    assert_equal(test_all, np.arange(23))
+    for tr, te in folds:
+        assert_equal(np.intersect1d(tr, te).size, 0)
+        assert_equal(tr.size + te.size, 23)
+
+    folds2 = kfold_indices(23, k_folds=4, shuffle=True, random_state=5)
+    for (tr, te), (tr2, te2) in zip(folds, folds2):
+        assert_equal(te, te2)
+
+
+def test_ols_ridge_path():
+    linpred, exog = _get_data()
+    endog = linpred + np.random.randn(len(linpred))
+    mod = OLS(endog, exog)
+    alphas = [0.001, 0.01, 0.1, 1.]
+    cv = PenaltyPathCV(mod, alphas, k_folds=4, fit_kwds={'L1_wt': 0})
+    res_cv = cv.fit()
+    assert_equal(res_cv.cv_errors.shape, (4, 4))
+    assert_equal(res_cv.params_folds.shape, (4, 4, exog.shape[1]))
+
+    # compare with explicit loop
+    for j, (tr, te) in enumerate(cv.folds):
+        for i, alpha in enumerate(alphas):
+            res = OLS(endog[tr], exog[tr]).fit_regularized(alpha=alpha,
+                                                           L1_wt=0)
+            err = np.mean((endog[te] - exog[te].dot(res.params))**2)
+            assert_allclose(res_cv.cv_errors[i, j], err, rtol=1e-10)
+            assert_allclose(res_cv.params_folds[j, i], res.params,
+                            rtol=1e-10)
+
+    assert_equal(res_cv.alpha_cv, alphas[np.argmin(res_cv.cv_error)])
+    res = mod.fit_regularized(alpha=res_cv.alpha_cv, L1_wt=0)
+    assert_allclose(res_cv.results.params, res.params, rtol=1e-10)
+    assert res_cv.alpha_1se >= res_cv.alpha_cv
+
+
+def test_glm_lasso_warm_start_parallel():
+    linpred, exog = _get_data()
+    endog = np.random.poisson(np.exp(linpred))
+    mod = GLM(endog, exog, family=families.Poisson())
+    alphas = np.logspace(-3, -1, 5)
+    fit_kwds = {'L1_wt': 1, 'cnvrg_tol': 1e-12}
+    res_cv = PenaltyPathCV(mod, alphas, k_folds=3, fit_kwds=fit_kwds,
+                           shuffle=True, random_state=1).fit()
+    res_cold = PenaltyPathCV(mod, alphas, k_folds=3, fit_kwds=fit_kwds,
+                             shuffle=True, random_state=1,
+                             warm_start=False).fit()
+    # coordinate descent stops at slightly different points
+    assert_allclose(res_cv.cv_errors, res_cold.cv_errors, rtol=1e-2)
+
+    res_par = PenaltyPathCV(mod, alphas, k_folds=3, fit_kwds=fit_kwds,
+                            shuffle=True, random_state=1, n_jobs=2).fit()
+    assert_allclose(res_par.cv_errors, res_cv.cv_errors, rtol=1e-12)
+    assert_allclose(res_par.results.params, res_cv.results.params,
+                    rtol=1e-12)
+
+
+def test_logit_l1_offset_folds():
+    linpred, exog = _get_data(nobs=300)
+    endog = (np.random.rand(len(linpred)) < 1 / (1 + np.exp(-linpred)))
+    offset = np.linspace(-0.2, 0.2, len(linpred))
+    mod = Logit(endog.astype(float), exog, offset=offset)
+    alphas = [0.1, 1., 5.]
+    # user provided boolean folds
+    mask = np.arange(len(endog)) % 2 == 0
+    folds = [(mask, ~mask), (~mask, mask)]
+    res_cv = PenaltyPathCV(mod, alphas, folds=folds,
+                           fit_kwds={'disp': 0}).fit()
+
+    tr, te = np.nonzero(mask)[0], np.nonzero(~mask)[0]
+    mod_tr = Logit(endog[tr].astype(float), exog[tr], offset=offset[tr])
+    res = mod_tr.fit_regularized(alpha=alphas[1], disp=0)
+    pred = Logit(endog[te].astype(float), exog[te],
+                 offset=offset[te]).predict(res.params)
+    assert_allclose(res_cv.cv_errors[1, 0], np.mean((endog[te] - pred)**2),
+                    rtol=1e-6)
+
+
+def test_glmgam():
+    np.random.seed(5124)
+    nobs = 200
+    x = np.random.uniform(-2, 2, size=(nobs, 1))
+    endog = np.sin(2 * x[:, 0]) + 0.3 * np.random.randn(nobs)
+    bs = BSplines(x, df=[10], degree=[3])
+    mod = GLMGam(endog, smoother=bs, alpha=0)
+    alphas = [np.array([a]) for a in [0.01, 1., 100.]]
+    res_cv = PenaltyPathCV(mod, alphas, k_folds=3).fit()
+    assert_equal(res_cv.cv_errors.shape, (3, 3))
+    assert_allclose(res_cv.results.model.alpha, res_cv.alpha_cv)
+    mod2 = GLMGam(endog, smoother=bs, alpha=res_cv.alpha_cv)
+    assert_allclose(res_cv.results.params, mod2.fit().params, rtol=1e-6)
@@ -1,12 +1,14 @@
-from numpy.testing import assert_
+import numpy as np
+from numpy.testing import assert_, assert_allclose, assert_equal
 
-from statsmodels.base.optimizer import (_fit_newton, _fit_nm,
+from statsmodels.base.optimizer import (_fit_newton, _fit_newton_ls, _fit_nm,
                                         _fit_bfgs, _fit_cg,
                                         _fit_ncg, _fit_powell,
                                         _fit_lbfgs, _fit_basinhopping)
 
 fit_funcs = {
     'newton': _fit_newton,
+    'newton_ls': _fit_newton_ls,
     'nm': _fit_nm,  # Nelder-Mead
     'bfgs': _fit_bfgs,
     'cg': _fit_cg,
@@ -40,7 +42,7 @@ def test_full_output_false():
     # powell ""
     for method in fit_funcs:
         func = fit_funcs[method]
-        if method == "newton":
+        if method in ("newton", "newton_ls"):
             xopt, retvals = func(dummy_func, dummy_score, [1], (), {},
                     hess=dummy_hess, full_output=False, disp=0)
 
@@ -59,7 +61,7 @@ def test_full_output_false():
 def test_full_output():
     for method in fit_funcs:
         func = fit_funcs[method]
-        if method == "newton":
+        if method in ("newton", "newton_ls"):
             xopt, retvals = func(dummy_func, dummy_score, [1], (), {},
                                  hess=dummy_hess, full_output=True, disp=0)
 
@@ -76,3 +78,96 @@ def test_full_output():
             assert_(xopt.shape == () and xopt.size == 1)
         else:
             assert_(len(xopt) == 1)
+
+
+def test_newton_ls():
+    # pure Newton steps diverge for this function if abs(x) > 1
+    def f(x):
+        return np.sqrt(1 + x**2).sum()
+
+    def score(x):
+        return x / np.sqrt(1 + x**2)
+
+    def hess(x):
+        return np.diag((1 + x**2)**(-1.5))
+
+    start = np.array([2., -3.])
+    xopt, retvals = _fit_newton(f, lambda x: -score(x), start, (), {},
+                                hess=lambda x: -hess(x), maxiter=10, disp=0)
+    assert_(not np.all(np.isfinite(xopt)) or np.any(np.abs(xopt) > 1))
+
+    xopt, retvals = _fit_newton_ls(f, score, start, (), {}, hess=hess,
+                                   disp=0)
+    assert_(retvals['converged'])
+    assert_allclose(xopt, [0, 0], atol=1e-8)
+    assert_equal(retvals['gcalls'], retvals['iterations'] + 1)
+    assert_(retvals['fcalls'] > retvals['iterations'])
+
+    # reusing the Hessian factorization needs fewer Hessian evaluations
+    kwds = {'hessian_reuse': 4}
+    xopt2, retvals2 = _fit_newton_ls(f, score, start, (), kwds, hess=hess,
+                                     disp=0)
+    assert_(retvals2['converged'])
+    assert_allclose(xopt2, [0, 0], atol=1e-8)
+    assert_(retvals2['hcalls'] < retvals2['gcalls'])
+    assert_equal(kwds['hessian_reuse'], 4)
+
+    # indefinite Hessian is regularized
+    xopt3, retvals3 = _fit_newton_ls(lambda x: (x**4 - x**2).sum(),
+                                     lambda x: 4 * x**3 - 2 * x,
+                                     np.array([0.1]), (), {},
+                                     hess=lambda x: np.diag(12 * x**2 - 2),
+                                     disp=0)
+    assert_allclose(np.abs(xopt3), np.sqrt(0.5), rtol=1e-8)
+
+
+def test_newton_ls_model():
+    from statsmodels.discrete.discrete_model import Poisson
+
+    np.random.seed(987125)
+    nobs = 500
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = np.random.poisson(np.exp(exog.dot([0.5, 1., -1.])))
+    mod = Poisson(endog, exog)
+    res1 = mod.fit(method='newton', disp=0)
+    res2 = mod.fit(method='newton_ls', disp=0)
+    res3 = mod.fit(method='newton_ls', hessian_reuse=3, disp=0)
+    assert_allclose(res2.params, res1.params, rtol=1e-8)
+    assert_allclose(res2.bse, res1.bse, rtol=1e-8)
+    assert_allclose(res3.params, res1.params, rtol=1e-7)
+    assert_(res3.mle_retvals['hcalls'] < res2.mle_retvals['hcalls'])
+
+
+def test_optimizer_trace():
+    from statsmodels.base.optimizer import OptimizerTrace
+    from statsmodels.discrete.discrete_model import Poisson
+
+    np.random.seed(987125)
+    nobs = 500
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = np.random.poisson(np.exp(exog.dot([0.5, 1., -1.])))
+    mod = Poisson(endog, exog)
+
+    records = []
+    trace = OptimizerTrace(callback=records.append)
+    res = mod.fit(method='newton_ls', disp=0, trace=trace)
+    assert_(res.mle_trace is trace)
+    counts = res.mle_retvals
+    assert_equal(trace.ncalls['loglike'], counts['fcalls'])
+    assert_equal(trace.ncalls['score'], counts['gcalls'])
+    assert_equal(trace.ncalls['hessian'], counts['hcalls'])
+    assert_equal(trace.n_iter, res.mle_retvals['iterations'])
+    assert_equal(len(records), trace.n_iter)
+    assert_allclose(trace.params_trace[-1], res.params, rtol=1e-10)
+    assert_(trace.grad_norm_trace[-1] < 1e-6)
+    summ = trace.as_dict()
+    assert_equal(summ['method'], 'newton_ls')
+    assert_(summ['time_results'] > 0)
+    assert_equal(trace.history_frame().shape, (trace.n_iter, 4))
+
+    res_bfgs = mod.fit(method='bfgs', disp=0, trace=True)
+    trace = res_bfgs.mle_trace
+    assert_equal(trace.ncalls['loglike'], res_bfgs.mle_retvals['fcalls'])
+    assert_equal(trace.ncalls['score'], res_bfgs.mle_retvals['gcalls'])
+    assert_equal(trace.ncalls['hessian'], 0)
+    assert_(not hasattr(mod.fit(method='bfgs', disp=0), 'mle_trace'))
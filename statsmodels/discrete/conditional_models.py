@@ -14,6 +14,101 @@ import itertools
 
 
 
+# maximum number of strata that are processed jointly in ConditionalLogit
+_BATCH_MAXSIZE = 5000
+
+
+def _log_esp(exog, params, offset, k, order=0):
+    """log elementary symmetric polynomial for a batch of strata
+
+    Computes the log of the conditional logit denominator, i.e. the sum of
+    exp(x_s' params) over all subsets s of size ``k`` of the stratum, and
+    its first and second derivatives with respect to params. All strata in
+    the batch have the same size and the same number of events ``k``.
+
+    Parameters
+    ----------
+    exog : ndarray, 3-D
+        explanatory variables with shape (n_strata, groupsize, k_params)
+    params : ndarray
+        parameter vector
+    offset : None or ndarray, 2-D
+        offset with shape (n_strata, groupsize)
+    k : int
+        number of events in each stratum
+    order : int
+        0 computes only the value, 1 also the gradient and 2 also the
+        hessian.
+
+    Returns
+    -------
+    logd : ndarray
+        log denominator for each stratum
+    grad : ndarray or None
+        gradient with shape (n_strata, k_params) if order >= 1
+    hess : ndarray or None
+        hessian with shape (n_strata, k_params, k_params) if order >= 2
+
+    Notes
+    -----
+    The recursion e_t(j) = e_{t-1}(j) + e_{t-1}(j-1) * exp(x_t' params) is
+    run jointly for all strata, together with its forward mode derivatives.
+    The linear predictor is centered within each stratum and the recursion
+    is rescaled at every step, so that neither exp nor the polynomials
+    overflow. The rescaling factors cancel in the derivatives of the log.
+    """
+    n_strata, groupsize, k_params = exog.shape
+    linpred = np.dot(exog, params)
+    if offset is not None:
+        linpred = linpred + offset
+    shift = linpred.max(1)
+    h = np.exp(linpred - shift[:, None])
+
+    e = np.zeros((n_strata, k + 1))
+    e[:, 0] = 1
+    logscale = k * shift
+    if order >= 1:
+        de = np.zeros((n_strata, k + 1, k_params))
+    if order >= 2:
+        d2e = np.zeros((n_strata, k + 1, k_params, k_params))
+
+    for t in range(groupsize):
+        ht = h[:, t, None]
+        x = exog[:, t, :]
+        # all updates use the values from the previous step
+        e_lag = e[:, :-1]
+        if order >= 2:
+            hx = ht[:, :, None] * x[:, None, :]
+            outer = (de[:, :-1, :, None] * hx[:, :, None, :] +
+                     hx[:, :, :, None] * de[:, :-1, None, :])
+            d2e[:, 1:] += (d2e[:, :-1] * ht[:, :, None, None] + outer +
+                           (e_lag * ht)[:, :, None, None] *
+                           (x[:, :, None] * x[:, None, :])[:, None])
+        if order >= 1:
+            de[:, 1:] += (de[:, :-1] * ht[:, :, None] +
+                          (e_lag * ht)[:, :, None] * x[:, None, :])
+        e[:, 1:] += e_lag * ht
+
+        scale = e.max(1)
+        e /= scale[:, None]
+        logscale += np.log(scale)
+        if order >= 1:
+            de /= scale[:, None, None]
+        if order >= 2:
+            d2e /= scale[:, None, None, None]
+
+    ek = e[:, k]
+    logd = np.log(ek) + logscale
+    grad = hess = None
+    if order >= 1:
+        grad = de[:, k] / ek[:, None]
+    if order >= 2:
+        hess = (d2e[:, k] / ek[:, None, None] -
+                grad[:, :, None] * grad[:, None, :])
+
+    return logd, grad, hess
+
+
 class conditionalModel(base.LikelihoodModel):
 
     def __init__(self, endog, exog, missing='none', **kwargs):
@@ -213,22 +308,69 @@ class ConditionalLogit(conditionalModel):
         super(ConditionalLogit, self).__init__(
             endog, exog, missing=missing, **kwargs)
 
+    def _strata_batches(self):
+        """groups of strata with the same size and number of events
+
+        The batches are created on first use and cached. Each batch is a
+        tuple (exog, offset, n1, xy) where exog has shape
+        (n_strata, groupsize, k_params), offset is None or has shape
+        (n_strata, groupsize), n1 is the number of events and xy is the sum
+        of the sufficient statistics of the strata in the batch.
+        """
+        if hasattr(self, '_batches'):
+            return self._batches
+
+        ix_batch = collections.OrderedDict()
+        for g in range(self._n_groups):
+            key = (self._groupsize[g], int(self._n1[g]))
+            ix_batch.setdefault(key, []).append(g)
+
+        batches = []
+        for (_, n1), ix in ix_batch.items():
+            # large batches are split to bound the memory of the hessian
+            for i in range(0, len(ix), _BATCH_MAXSIZE):
+                ixc = ix[i:i + _BATCH_MAXSIZE]
+                exog = np.array([self._exog_grp[g] for g in ixc],
+                                dtype=np.float64)
+                ofs = None
+                if hasattr(self, 'offset'):
+                    ofs = np.array([self._offset_grp[g] for g in ixc])
+                xy = np.sum([self._xy[g] for g in ixc], axis=0)
+                batches.append((exog, ofs, n1, xy))
+
+        self._batches = batches
+        return batches
+
     def loglike(self, params):
 
-        ll = 0
-        for g in range(len(self._endog_grp)):
-            ll += self.loglike_grp(g, params)
+        ll = 0.
+        for exog, ofs, n1, xy in self._strata_batches():
+            ll += np.dot(xy, params)
+            logd = _log_esp(exog, params, ofs, n1)[0]
+            ll -= logd.sum()
+
+        if hasattr(self, 'offset'):
+            ll += np.sum(self._endofs)
 
         return ll
 
     def score(self, params):
 
-        score = 0
-        for g in range(self._n_groups):
-            score += self.score_grp(g, params)
+        score = 0.
+        for exog, ofs, n1, xy in self._strata_batches():
+            grad = _log_esp(exog, params, ofs, n1, order=1)[1]
+            score += xy - grad.sum(0)
 
         return score
 
+    def hessian(self, params):
+
+        hess = 0.
+        for exog, ofs, n1, _ in self._strata_batches():
+            hess -= _log_esp(exog, params, ofs, n1, order=2)[2].sum(0)
+
+        return hess
+
     def _denom(self, grp, params, ofs=None):
 
         if ofs is None:
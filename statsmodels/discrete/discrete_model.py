@@ -55,6 +55,20 @@ import warnings
 #      this
 FLOAT_EPS = np.finfo(float).eps
 
+# approximate number of elements of the nobs x J arrays that multinomial
+# models hold in memory at the same time, observations are processed in chunks
+_MULTINOMIAL_CHUNK_ELEMENTS = 2**20
+
+
+def _chunk_slices(nobs, n_cols, max_elements=None):
+    """slices over rows so that a chunk has at most max_elements elements
+    """
+    if max_elements is None:
+        max_elements = _MULTINOMIAL_CHUNK_ELEMENTS
+    chunksize = max(1, max_elements // max(1, n_cols))
+    return [slice(i, min(i + chunksize, nobs))
+            for i in range(0, max(nobs, 1), chunksize)]
+
 #TODO: add options for the parameter covariance/variance
 # ie., OIM, EIM, and BHHH see Green 21.4
 
@@ -603,9 +617,19 @@ class MultinomialModel(BinaryModel):
             exog = self.exog
         if exog.ndim == 1:
             exog = exog[None]
-        pred = super(MultinomialModel, self).predict(params, exog, linear)
-        if linear:
-            pred = np.column_stack((np.zeros(len(exog)), pred))
+        # predict in chunks of observations to bound temporary arrays
+        nobs = len(exog)
+        # complex params are used for complex step derivatives
+        pred = np.empty((nobs, self.J),
+                        dtype=np.result_type(params, exog, np.float64))
+        for sl in _chunk_slices(nobs, self.J):
+            pred_chunk = super(MultinomialModel, self).predict(
+                params, exog[sl], linear)
+            if linear:
+                pred[sl, 0] = 0
+                pred[sl, 1:] = pred_chunk
+            else:
+                pred[sl] = pred_chunk
         return pred
 
     def fit(self, start_params=None, method='newton', maxiter=35,
@@ -614,16 +638,31 @@ class MultinomialModel(BinaryModel):
             start_params = np.zeros((self.K * (self.J-1)))
         else:
             start_params = np.asarray(start_params)
+        add_loglike_and_score = (method == 'lbfgs' and
+                                 hasattr(self, 'loglike_and_score') and
+                                 'loglike_and_score' not in kwargs)
+        if add_loglike_and_score:
+            # single pass over the data for function and gradient
+            kwargs['loglike_and_score'] = self._loglike_and_score_nobs
         callback = lambda x : None # placeholder until check_perfect_pred
         # skip calling super to handle results from LikelihoodModel
         mnfit = base.LikelihoodModel.fit(self, start_params = start_params,
                 method=method, maxiter=maxiter, full_output=full_output,
                 disp=disp, callback=callback, **kwargs)
+        if add_loglike_and_score:
+            # internal option, bound methods are not picklable on python 2
+            mnfit.mle_settings.pop('loglike_and_score', None)
         mnfit.params = mnfit.params.reshape(self.K, -1, order='F')
         mnfit = MultinomialResults(self, mnfit)
         return MultinomialResultsWrapper(mnfit)
     fit.__doc__ = DiscreteModel.fit.__doc__
 
+    def _loglike_and_score_nobs(self, params, *args):
+        """loglike_and_score scaled by nobs as the default loglike and score
+        in the optimization"""
+        nobs = self.endog.shape[0]
+        return tuple(x / nobs for x in self.loglike_and_score(params))
+
     def fit_regularized(self, start_params=None, method='l1',
             maxiter='defined_by_method', full_output=1, disp=1, callback=None,
             alpha=0, trim_mode='auto', auto_trim_tol=0.01, size_trim_tol=1e-4,
@@ -1447,7 +1486,7 @@ class GeneralizedPoisson(CountModel):
             In case use_transparams=True and method="newton" or "ncg" transformation
             is ignored.
         """
-        if use_transparams and method not in ['newton', 'ncg']:
+        if use_transparams and method not in ['newton', 'newton_ls', 'ncg']:
             self._transparams = True
         else:
             if use_transparams:
@@ -1479,7 +1518,7 @@ class GeneralizedPoisson(CountModel):
                         **kwargs)
 
 
-        if use_transparams and method not in ["newton", "ncg"]:
+        if use_transparams and method not in ["newton", "newton_ls", "ncg"]:
             self._transparams = False
             mlefit._results.params[-1] = np.exp(mlefit._results.params[-1])
 
@@ -2207,9 +2246,42 @@ class MNLogit(MultinomialModel):
         In the multinomial logit model.
         .. math:: \\frac{\\exp\\left(\\beta_{j}^{\\prime}x_{i}\\right)}{\\sum_{k=0}^{J}\\exp\\left(\\beta_{k}^{\\prime}x_{i}\\right)}
         """
-        eXB = np.column_stack((np.ones(len(X)), np.exp(X)))
+        # shift by the row maximum including the base category to avoid
+        # overflow in exp
+        X = np.asarray(X)
+        xmax = np.maximum(X.real.max(1), 0)[:, None]
+        eXB = np.column_stack((np.exp(-xmax), np.exp(X - xmax)))
         return eXB/eXB.sum(1)[:,None]
 
+    def _loglike_score_chunks(self, params, score=True):
+        """loglike and score accumulated over chunks of observations
+
+        Uses the integer coded endog instead of the dummy matrix ``wendog``
+        and only holds nobs_chunk x J arrays in memory.
+        """
+        params = params.reshape(self.K, -1, order='F')
+        endog = self.endog
+        exog = self.exog
+        llf = 0.
+        # complex params are used for complex step derivatives
+        dtype = np.result_type(params, float)
+        grad = np.zeros((self.J - 1, self.K), dtype=dtype) if score else None
+        for sl in _chunk_slices(exog.shape[0], self.J):
+            xb = np.dot(exog[sl], params)
+            y = endog[sl]
+            prob = self.cdf(xb)
+            rows = np.arange(len(y))
+            # dummy matrix of the chunk, same summation as loglikeobs
+            d = np.zeros(prob.shape)
+            d[rows, y] = 1
+            llf += np.sum(d * np.log(prob))
+            if score:
+                resid = -prob[:, 1:]
+                mask = y > 0
+                resid[rows[mask], y[mask] - 1] += 1
+                grad += np.dot(resid.T, exog[sl])
+        return llf, grad
+
     def loglike(self, params):
         """
         Log-likelihood of the multinomial logit model.
@@ -2232,10 +2304,7 @@ class MNLogit(MultinomialModel):
         where :math:`d_{ij}=1` if individual `i` chose alternative `j` and 0
         if not.
         """
-        params = params.reshape(self.K, -1, order='F')
-        d = self.wendog
-        logprob = np.log(self.cdf(np.dot(self.exog,params)))
-        return np.sum(d * logprob)
+        return self._loglike_score_chunks(params, score=False)[0]
 
     def loglikeobs(self, params):
         """
@@ -2291,11 +2360,7 @@ class MNLogit(MultinomialModel):
         In the multinomial model the score matrix is K x J-1 but is returned
         as a flattened array to work with the solvers.
         """
-        params = params.reshape(self.K, -1, order='F')
-        firstterm = self.wendog[:,1:] - self.cdf(np.dot(self.exog,
-                                                  params))[:,1:]
-        #NOTE: might need to switch terms if params is reshaped
-        return np.dot(firstterm.T, self.exog).flatten()
+        return self._loglike_score_chunks(params)[1].flatten()
 
     def loglike_and_score(self, params):
         """
@@ -2304,13 +2369,12 @@ class MNLogit(MultinomialModel):
         Note that both of these returned quantities will need to be negated
         before being minimized by the maximum likelihood fitting machinery.
 
+        Observations are processed in chunks, so that the memory
+        requirement does not grow with nobs times the number of choices.
+        This is used by default in ``fit`` with ``method='lbfgs'``.
         """
-        params = params.reshape(self.K, -1, order='F')
-        cdf_dot_exog_params = self.cdf(np.dot(self.exog, params))
-        loglike_value = np.sum(self.wendog * np.log(cdf_dot_exog_params))
-        firstterm = self.wendog[:, 1:] - cdf_dot_exog_params[:, 1:]
-        score_array = np.dot(firstterm.T, self.exog).flatten()
-        return loglike_value, score_array
+        llf, grad = self._loglike_score_chunks(params)
+        return llf, grad.flatten()
 
     def score_obs(self, params):
         """
@@ -2369,27 +2433,77 @@ class MNLogit(MultinomialModel):
         The actual Hessian matrix has J**2 * K x K elements. Our Hessian
         is reshaped to be square (J*K, J*K) so that the solvers can use it.
 
-        This implementation does not take advantage of the symmetry of
-        the Hessian and could probably be refactored for speed.
+        The Hessian is computed as ``A'A - blockdiag(X' diag(p_j) X)`` where
+        the rows of A are the Kronecker products of the probabilities and the
+        explanatory variables of each observation. Observations are
+        processed in chunks. For a large number of choices use
+        `hessian_operator` to avoid forming the full matrix.
         """
         params = params.reshape(self.K, -1, order='F')
-        X = self.exog
-        pr = self.cdf(np.dot(X,params))
-        partials = []
-        J = self.J
+        J1 = self.J - 1
         K = self.K
-        for i in range(J-1):
-            for j in range(J-1): # this loop assumes we drop the first col.
-                if i == j:
-                    partials.append(\
-                        -np.dot(((pr[:,i+1]*(1-pr[:,j+1]))[:,None]*X).T,X))
-                else:
-                    partials.append(-np.dot(((pr[:,i+1]*-pr[:,j+1])[:,None]*X).T,X))
-        H = np.array(partials)
-        # the developer's notes on multinomial should clear this math up
-        H = np.transpose(H.reshape(J-1, J-1, K, K), (0, 2, 1, 3)).reshape((J-1)*K, (J-1)*K)
+        X = self.exog
+        # complex params are used for complex step derivatives
+        dtype = np.result_type(params, float)
+        H = np.zeros((J1 * K, J1 * K), dtype=dtype)
+        diag = np.zeros((J1, K, K), dtype=dtype)
+        for sl in _chunk_slices(X.shape[0], J1 * K):
+            Xc = X[sl]
+            pr = self.cdf(np.dot(Xc, params))[:, 1:]
+            # px[i, j, :] = pr[i, j] * X[i, :]
+            px = pr[:, :, None] * Xc[:, None, :]
+            diag += np.tensordot(px, Xc, axes=(0, 0))
+            px = px.reshape(len(Xc), J1 * K)
+            H += np.dot(px.T, px)
+        for j in range(J1):
+            H[j*K:(j+1)*K, j*K:(j+1)*K] -= diag[j]
         return H
 
+    def hessian_operator(self, params):
+        """
+        Hessian of the log-likelihood as a linear operator
+
+        Parameters
+        -----------
+        params : array-like
+            The parameters of the model
+
+        Returns
+        -------
+        hess : scipy.sparse.linalg.LinearOperator
+            Operator of shape ((J-1)*K, (J-1)*K) that computes the product
+            of the Hessian with a vector of the flattened parameter shape
+            without forming the Hessian.
+
+        Notes
+        -----
+        The product is computed in chunks of observations, each product
+        costs about as much as two evaluations of the score. This can be used
+        with iterative solvers, for example to compute a Newton step or the
+        standard errors of a subset of parameters.
+        """
+        from scipy.sparse.linalg import LinearOperator
+
+        params = params.reshape(self.K, -1, order='F')
+        J1 = self.J - 1
+        K = self.K
+        X = self.exog
+        slices = _chunk_slices(X.shape[0], self.J)
+
+        def matvec(v):
+            v = np.asarray(v).reshape(J1, K)
+            out = np.zeros((J1, K), dtype=np.result_type(params, v, float))
+            for sl in slices:
+                Xc = X[sl]
+                pr = self.cdf(np.dot(Xc, params))[:, 1:]
+                u = np.dot(Xc, v.T)
+                w = pr * (u - (pr * u).sum(1)[:, None])
+                out -= np.dot(w.T, Xc)
+            return out.ravel()
+
+        return LinearOperator((J1 * K, J1 * K), matvec=matvec,
+                              rmatvec=matvec, dtype=np.float64)
+
 
 #TODO: Weibull can replaced by a survival analsysis function
 # like stat's streg (The cox model as well)
@@ -2820,10 +2934,11 @@ class NegativeBinomial(CountModel):
         # Note: don't let super handle robust covariance because it has
         # transformed params
         self._transparams = False # always define attribute
-        if self.loglike_method.startswith('nb') and method not in ['newton',
-                                                                   'ncg']:
+        if self.loglike_method.startswith('nb') and method not in [
+                'newton', 'newton_ls', 'ncg']:
             self._transparams = True # in case same Model instance is refit
-        elif self.loglike_method.startswith('nb'): # method is newton/ncg
+        elif self.loglike_method.startswith('nb'):
+            # method is newton/newton_ls/ncg
             self._transparams = False # because we need to step in alpha space
 
         if start_params is None:
@@ -2861,7 +2976,7 @@ class NegativeBinomial(CountModel):
             # mlefit is a wrapped counts results
             self._transparams = False # don't need to transform anymore now
             # change from lnalpha to alpha
-            if method not in ["newton", "ncg"]:
+            if method not in ["newton", "newton_ls", "ncg"]:
                 mlefit._results.params[-1] = np.exp(mlefit._results.params[-1])
 
             nbinfit = NegativeBinomialResults(self, mlefit._results)
@@ -3186,7 +3301,7 @@ class NegativeBinomialP(CountModel):
             In case use_transparams=True and method="newton" or "ncg" transformation
             is ignored.
         """
-        if use_transparams and method not in ['newton', 'ncg']:
+        if use_transparams and method not in ['newton', 'newton_ls', 'ncg']:
             self._transparams = True
         else:
             if use_transparams:
@@ -3218,7 +3333,7 @@ class NegativeBinomialP(CountModel):
                         full_output=full_output, callback=callback,
                         **kwargs)
 
-        if use_transparams and method not in ["newton", "ncg"]:
+        if use_transparams and method not in ["newton", "newton_ls", "ncg"]:
             self._transparams = False
             mlefit._results.params[-1] = np.exp(mlefit._results.params[-1])
 
@@ -72,6 +72,40 @@ def test_logit_2d():
     result.summary()
 
 
+def test_logit_batched():
+
+    np.random.seed(3249)
+    g = np.repeat(np.arange(200), np.random.randint(2, 8, 200))
+    n = len(g)
+    x = np.random.normal(size=(n, 3))
+    y = (np.random.uniform(size=n) < 0.4).astype(np.float64)
+    offset = 0.2 * np.random.normal(size=n)
+
+    for kwds in {}, {"offset": offset}:
+        model = ConditionalLogit(y, x, groups=g, **kwds)
+        params = np.r_[0.3, -0.5, 0.2]
+
+        # Compare to the recursion for each group
+        ll = sum(model.loglike_grp(k, params)
+                 for k in range(model._n_groups))
+        score = sum(model.score_grp(k, params)
+                    for k in range(model._n_groups))
+        assert_allclose(model.loglike(params), ll, rtol=1e-12)
+        assert_allclose(model.score(params), score, rtol=1e-10, atol=1e-12)
+
+        hess = approx_fprime(params, model.score, centered=True)
+        assert_allclose(model.hessian(params), hess, rtol=1e-6)
+
+        result1 = model.fit(method="newton")
+        result2 = model.fit(method="bfgs")
+        assert_allclose(result1.params, result2.params, rtol=1e-3)
+
+    # Large linear predictors do not overflow
+    params = np.r_[40, -30, 20]
+    assert np.isfinite(model.loglike(params))
+    assert np.all(np.isfinite(model.hessian(params)))
+
+
 def test_formula():
 
     for j in 0, 1:
@@ -11,6 +11,7 @@ tests.
 from statsmodels.compat.python import range
 
 import os
+import pickle
 import warnings
 
 import numpy as np
@@ -1583,6 +1584,54 @@ def test_mnlogit_factor():
     assert_allclose(predicted_f, predicted, rtol=1e-10)
 
 
+def test_mnlogit_chunked(monkeypatch):
+    import statsmodels.discrete.discrete_model as dm
+    data = sm.datasets.anes96.load(as_pandas=False)
+    exog = sm.add_constant(data.exog, prepend=False)
+    mod = MNLogit(data.endog, exog)
+    res = mod.fit(method="newton", disp=0)
+    params = res.params.ravel(order="F")
+    llf = mod.loglike(params)
+    score = mod.score(params)
+    hess = mod.hessian(params)
+    predicted = mod.predict(res.params)
+
+    # lbfgs uses loglike_and_score by default
+    res2 = mod.fit(method="lbfgs", disp=0, skip_hessian=True,
+                   pgtol=1e-10, factr=1e2, maxiter=5000)
+    assert_allclose(res2.llf, res.llf, rtol=1e-8)
+    assert_allclose(res2.params, res.params, rtol=5e-3, atol=5e-4)
+    # the internal loglike_and_score does not prevent pickling
+    assert_('loglike_and_score' not in res2.mle_settings)
+    res3 = pickle.loads(pickle.dumps(res2))
+    assert_allclose(res3.params, res2.params, rtol=1e-15)
+
+    # complex step derivatives
+    from statsmodels.tools.numdiff import approx_fprime_cs
+    assert_allclose(approx_fprime_cs(params, mod.loglike), score,
+                    rtol=1e-8, atol=1e-8)
+    assert_allclose(approx_fprime_cs(params, mod.score), hess,
+                    rtol=1e-8, atol=1e-8)
+
+    # many small chunks of observations give the same results
+    monkeypatch.setattr(dm, "_MULTINOMIAL_CHUNK_ELEMENTS", 50)
+    assert_allclose(mod.loglike(params), llf, rtol=1e-13)
+    assert_allclose(mod.score(params), score, rtol=1e-8, atol=1e-10)
+    assert_allclose(mod.hessian(params), hess, rtol=1e-12)
+    assert_allclose(mod.predict(res.params), predicted, rtol=1e-13)
+    assert_allclose(mod.predict(res.params, linear=True)[:, 1:],
+                    exog.dot(res.params), rtol=1e-13)
+
+    # hessian as linear operator
+    hess_op = mod.hessian_operator(params)
+    vec = np.linspace(-1, 1, len(params))
+    assert_allclose(hess_op.matvec(vec), hess.dot(vec), rtol=1e-10)
+
+    # large linear predictor does not overflow
+    prob = mod.cdf(np.array([[800., -800.], [0., 0.]]))
+    assert_allclose(prob, [[0, 1, 0], [1/3., 1/3., 1/3.]], atol=1e-15)
+
+
 def test_formula_missing_exposure():
     # see 2083
     d = {'Foo': [1, 2, 10, 149], 'Bar': [1, 2, 3, np.nan],
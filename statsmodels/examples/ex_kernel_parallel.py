@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the parallel evaluation in the multivariate kernel estimators
+
+Times the efficient bandwidth estimation on subsamples, the evaluation of
+KDEMultivariate.pdf and KernelReg.fit for n_jobs from 1 to the number of
+available cores, see the `n_jobs` and `n_jobs_predict` options of
+EstimatorSettings.
+"""
+
+from __future__ import print_function
+import time
+
+import numpy as np
+import statsmodels.nonparametric.api as nparam
+
+try:
+    import joblib
+    n_cpu = joblib.cpu_count()
+except ImportError:
+    n_cpu = 1
+
+
+def timeit(func, *args):
+    t0 = time.time()
+    res = func(*args)
+    return time.time() - t0, res
+
+
+if __name__ == '__main__':
+
+    np.random.seed(987125)
+    nobs = 4000
+    n_predict = 4000
+    x = np.random.uniform(-2, 2, size=(nobs, 2))
+    y = np.sin(x[:, 0] * 3) + x[:, 1] + 0.5 * np.random.normal(size=nobs)
+    x_predict = np.random.uniform(-2, 2, size=(n_predict, 2))
+    bw = np.array([0.3, 0.3])
+
+    jobs = sorted(set([1, 2, 4, 8, n_cpu]))
+    jobs = [j for j in jobs if j <= n_cpu]
+
+    print('number of cores:', n_cpu)
+    print('%6s %12s %12s %12s' % ('n_jobs', 'efficient_bw', 'kde_pdf',
+                                  'kreg_fit'))
+    res_pdf = None
+    for n_jobs in jobs:
+        settings = nparam.EstimatorSettings(efficient=True, n_sub=200,
+                                            n_res=16, randomize=True,
+                                            n_jobs=n_jobs,
+                                            n_jobs_predict=n_jobs)
+        np.random.seed(12345)
+        t_bw, dens = timeit(nparam.KDEMultivariate, x, 'cc', 'cv_ml',
+                            settings)
+
+        dens = nparam.KDEMultivariate(x, 'cc', bw=bw, defaults=settings)
+        t_pdf, pdf = timeit(dens.pdf, x_predict)
+
+        model = nparam.KernelReg(y, x, 'cc', reg_type='lc', bw=bw,
+                                 defaults=settings)
+        t_fit, (mean, mfx) = timeit(model.fit, x_predict)
+
+        if res_pdf is None:
+            res_pdf, res_mean = pdf, mean
+        else:
+            # results do not depend on the number of jobs
+            assert np.allclose(pdf, res_pdf, rtol=1e-12)
+            assert np.allclose(mean, res_mean, rtol=1e-12)
+
+        print('%6d %12.3f %12.3f %12.3f' % (n_jobs, t_bw, t_pdf, t_fit))
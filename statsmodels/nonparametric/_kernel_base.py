@@ -3,9 +3,10 @@ Module containing the base object for multivariate kernel density and
 regression, plus some utilities.
 """
 from statsmodels.compat.python import range, string_types
-import copy
+from statsmodels.compat.scipy import NumpyVersion
 
 import numpy as np
+import scipy
 from scipy import optimize
 from scipy.stats.mstats import mquantiles
 
@@ -17,6 +18,8 @@ except ImportError:
 
 from . import kernels
 
+# output_type of cKDTree.sparse_distance_matrix is available in scipy 0.19
+_has_ndarray_output = NumpyVersion(scipy.__version__) >= '0.19.0'
 
 kernel_func = dict(wangryzin=kernels.wang_ryzin,
                    aitchisonaitken=kernels.aitchison_aitken,
@@ -52,10 +55,14 @@ def _compute_subset(class_type, data, bw, co, do, n_cvars, ix_ord,
     -----
     Needs to be outside the class in order for joblib to be able to pickle it.
 
+    `bound` is the array of indices of the random subsample if `randomize`
+    is True, and the (start, stop) tuple of the block otherwise. The
+    indices are drawn in the calling process so that the subsamples only
+    depend on the numpy random state and not on the number of jobs.
+    `data` is not modified and can be shared read-only between processes.
     """
     if randomize:
-        np.random.shuffle(data)
-        sub_data = data[:n_sub, :]
+        sub_data = data[bound, :]
     else:
         sub_data = data[bound[0]:bound[1], :]
 
@@ -186,7 +193,7 @@ class GenericKDE (object):
 
         nobs = self.nobs
         n_sub = self.n_sub
-        data = copy.deepcopy(self.data)
+        data = self.data
         n_cvars = self.data_type.count('c')
         co = 4  # 2*order of continuous kernel
         do = 4  # 2*order of discrete kernel
@@ -195,7 +202,8 @@ class GenericKDE (object):
         # Define bounds for slicing the data
         if self.randomize:
             # randomize chooses blocks of size n_sub, independent of nobs
-            bounds = [None] * self.n_res
+            bounds = [np.random.permutation(nobs)[:n_sub]
+                      for _ in range(self.n_res)]
         else:
             bounds = [(i * n_sub, (i+1) * n_sub) for i in range(nobs // n_sub)]
             if nobs % n_sub > 0:
@@ -206,7 +214,7 @@ class GenericKDE (object):
         only_bw = np.empty((n_blocks, self.k_vars))
 
         class_type, class_vars = self._get_class_vars_type()
-        if has_joblib:
+        if has_joblib and self.n_jobs != 1:
             # `res` is a list of tuples (sample_scale_sub, bw_sub)
             res = joblib.Parallel(n_jobs=self.n_jobs)(
                 joblib.delayed(_compute_subset)(
@@ -247,6 +255,9 @@ class GenericKDE (object):
         self.efficient = defaults.efficient
         self.return_only_bw = defaults.return_only_bw
         self.n_jobs = defaults.n_jobs
+        self.binned = defaults.binned
+        self.gridsize = defaults.gridsize
+        self.n_jobs_predict = defaults.n_jobs_predict
 
     def _normal_reference(self):
         """
@@ -354,8 +365,8 @@ class EstimatorSettings(object):
         If False (default), all data is used at the same time.
     randomize: bool, optional
         If True, the bandwidth estimation is to be performed by
-        taking `n_res` random resamples (with replacement) of size `n_sub` from
-        the full sample.  If set to False (default), the estimation is
+        taking `n_res` random resamples (without replacement) of size `n_sub`
+        from the full sample.  If set to False (default), the estimation is
         performed by slicing the full sample in sub-samples of size `n_sub` so
         that all samples are used once.
     n_sub: int, optional
@@ -373,19 +384,46 @@ class EstimatorSettings(object):
         Should be used only for experimenting.
     n_jobs : int, optional
         The number of jobs to use for parallel estimation with
-        ``joblib.Parallel``.  Default is -1, meaning ``n_cores - 1``, with
-        ``n_cores`` the number of available CPU cores.
+        ``joblib.Parallel``.  Default is -1, meaning all available CPU cores.
+        This is only used for the bandwidth estimation on subsamples if
+        `efficient` is True.
         See the `joblib documentation
         <https://pythonhosted.org/joblib/parallel.html>`_ for more details.
+    n_jobs_predict : int, optional
+        The number of jobs used for the evaluation of
+        ``KDEMultivariate.pdf`` and ``KernelReg.fit`` at many points, where
+        the evaluation points are split into one chunk per job.  Default is
+        1, which evaluates in the calling process.  Parallel evaluation has
+        to be requested explicitly, -1 means all available CPU cores.
+        Small evaluation problems are always computed in the calling
+        process.  Large training data arrays are memory mapped by joblib and
+        shared read-only by the worker processes.
+    binned : bool, optional
+        If True, then the leave-one-out cross-validation criteria for the
+        bandwidth selection are approximated by linearly binning the data
+        on a grid and convolving with the kernel using the FFT.  This is
+        only used if all variables are continuous, and is useful for large
+        samples as an alternative to `efficient`.  Default is False, which
+        computes the criteria exactly from blocks of the kernel matrix.
+    gridsize : int, optional
+        Number of grid points in each dimension if `binned` is True.  The
+        default depends on the number of variables.
 
     Examples
     --------
     >>> settings = EstimatorSettings(randomize=True, n_jobs=3)
     >>> k_dens = KDEMultivariate(data, var_type, defaults=settings)
 
+    Evaluate the density at many points in 4 processes
+
+    >>> settings = EstimatorSettings(n_jobs_predict=4)
+    >>> k_dens = KDEMultivariate(data, var_type, defaults=settings)
+    >>> pdf = k_dens.pdf(data_predict)
+
     """
     def __init__(self, efficient=False, randomize=False, n_res=25, n_sub=50,
-                 return_median=True, return_only_bw=False, n_jobs=-1):
+                 return_median=True, return_only_bw=False, n_jobs=-1,
+                 binned=False, gridsize=None, n_jobs_predict=1):
         self.efficient = efficient
         self.randomize = randomize
         self.n_res = n_res
@@ -393,6 +431,9 @@ class EstimatorSettings(object):
         self.return_median = return_median
         self.return_only_bw = return_only_bw  # TODO: remove this?
         self.n_jobs = n_jobs
+        self.binned = binned
+        self.gridsize = gridsize
+        self.n_jobs_predict = n_jobs_predict
 
 
 class LeaveOneOut(object):
@@ -455,6 +496,37 @@ def _adjust_shape(dat, k_vars):
     return dat
 
 
+# minimum number of kernel evaluations, nobs * n_predict, for splitting the
+# evaluation across processes
+_min_parallel_work = 2**22
+
+
+def _parallel_predict(func, data_predict, n_jobs, work, args=()):
+    """
+    Evaluate func on chunks of the prediction points in parallel
+
+    ``func(data_predict_chunk, *args)`` needs to be a module level function
+    that returns an array or a tuple of arrays with the first axis
+    corresponding to the rows of ``data_predict``. The chunks are evaluated
+    with joblib if it is available, ``n_jobs != 1`` and ``work`` is at least
+    ``_min_parallel_work``, otherwise func is called once on all points.
+    """
+    n_predict = data_predict.shape[0]
+    if (not has_joblib or n_jobs == 1 or work < _min_parallel_work or
+            n_predict < 2):
+        return func(data_predict, *args)
+
+    n_cpu = joblib.cpu_count()
+    n_chunks = n_jobs if n_jobs > 0 else max(n_cpu + 1 + n_jobs, 1)
+    n_chunks = min(n_chunks, n_predict)
+    chunks = np.array_split(data_predict, n_chunks)
+    res = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(func)(chunk, *args) for chunk in chunks)
+    if isinstance(res[0], tuple):
+        return tuple(np.concatenate(parts) for parts in zip(*res))
+    return np.concatenate(res)
+
+
 def gpke(bw, data, data_predict, var_type, ckertype='gaussian',
          okertype='wangryzin', ukertype='aitchisonaitken', tosum=True):
     r"""
@@ -518,3 +590,361 @@ def gpke(bw, data, data_predict, var_type, ckertype='gaussian',
         return dens.sum(axis=0)
     else:
         return dens
+
+
+def _unique_rows(x):
+    """unique rows of a 2-D array and the inverse index"""
+    if x.shape[1] == 0:
+        return np.empty((1, 0)), np.zeros(x.shape[0], dtype=np.intp)
+    # lexsort instead of np.unique(x, axis=0) which requires numpy 1.13
+    order = np.lexsort(x.T[::-1])
+    x_sorted = x[order]
+    is_new = np.ones(x.shape[0], dtype=bool)
+    is_new[1:] = np.any(x_sorted[1:] != x_sorted[:-1], axis=1)
+    inverse = np.empty(x.shape[0], dtype=np.intp)
+    inverse[order] = np.cumsum(is_new) - 1
+    return x_sorted[is_new], inverse
+
+
+def _gpke_multi_predict(data_predict, bw, data, var_type, kwds):
+    """gpke_multi with data_predict as first argument for _parallel_predict
+    """
+    return gpke_multi(bw, data, data_predict, var_type, **kwds)
+
+
+def _continuous_kernel_sum(bw, data, data_predict, ckertype='gaussian',
+                           method='exact', cutoff=7., chunksize=None):
+    """sum of the product kernel of the continuous variables
+
+    Parameters
+    ----------
+    bw : 1-D ndarray
+        bandwidths of the continuous variables
+    data : 2-D ndarray, (nobs, k)
+        training data of the continuous variables
+    data_predict : 2-D ndarray, (m, k)
+        evaluation points
+    ckertype : str
+        name of the continuous kernel in ``kernel_func``
+    method : {'exact', 'tree'}
+        If 'exact', then all kernel values are computed in blocks of
+        evaluation points. If 'tree', then a KD-tree is used to find the
+        pairs of points that are closer than `cutoff` bandwidths, which is
+        only available for the gaussian kernel.
+    cutoff : float
+        Truncation of the gaussian kernel in units of the bandwidth for
+        method 'tree'. Kernel values that are smaller than
+        ``exp(-cutoff**2 / 2)`` relative to the maximum are ignored.
+    chunksize : None or int
+        number of evaluation points that are processed together
+
+    Returns
+    -------
+    ksum : 1-D ndarray, (m,)
+        sum over training observations of the product of the kernels, not
+        divided by the product of the bandwidths.
+    """
+    nobs, k_vars = data.shape
+    n_predict = data_predict.shape[0]
+    if k_vars == 0:
+        return np.repeat(float(nobs), n_predict)
+    ksum = np.zeros(n_predict)
+    if nobs == 0:
+        return ksum
+
+    if method == 'tree':
+        if ckertype != 'gaussian':
+            raise ValueError("method 'tree' requires the gaussian kernel")
+        from scipy.spatial import cKDTree
+        tree = cKDTree(data / bw)
+        if chunksize is None:
+            chunksize = 2**14
+        const = (2 * np.pi)**(-k_vars / 2.)
+        for start in range(0, n_predict, chunksize):
+            sl = slice(start, start + chunksize)
+            tree_predict = cKDTree(data_predict[sl] / bw)
+            if _has_ndarray_output:
+                pairs = tree_predict.sparse_distance_matrix(
+                    tree, cutoff, output_type='ndarray')
+                idx, dist = pairs['i'], pairs['v']
+            else:
+                # the dok_matrix output drops pairs with zero distance
+                neighbors = tree_predict.query_ball_tree(tree, cutoff)
+                idx = np.repeat(np.arange(len(neighbors)),
+                                [len(nb) for nb in neighbors])
+                jdx = np.concatenate([np.asarray(nb, dtype=np.intp)
+                                      for nb in neighbors])
+                dist = np.sqrt((((data_predict[sl][idx] - data[jdx]) /
+                                 bw)**2).sum(1))
+            ksum[sl] = np.bincount(idx, weights=np.exp(-0.5 * dist**2),
+                                   minlength=len(ksum[sl])) * const
+        return ksum
+    elif method != 'exact':
+        raise ValueError("method needs to be 'exact' or 'tree'")
+
+    func = kernel_func[ckertype]
+    if chunksize is None:
+        chunksize = max(1, 2**20 // nobs)
+    for start in range(0, n_predict, chunksize):
+        sl = slice(start, start + chunksize)
+        kval = func(bw[0], data[None, :, 0], data_predict[sl, 0, None])
+        for ii in range(1, k_vars):
+            kval *= func(bw[ii], data[None, :, ii], data_predict[sl, ii, None])
+        ksum[sl] = kval.sum(1)
+    return ksum
+
+
+def gpke_multi(bw, data, data_predict, var_type, ckertype='gaussian',
+               okertype='wangryzin', ukertype='aitchisonaitken',
+               method='exact', cutoff=7., chunksize=None):
+    """
+    Returns the non-normalized product kernel sums at many points
+
+    This is the vectorized version of ``gpke`` for a 2-D array of evaluation
+    points, equivalent to ``[gpke(bw, data, x, var_type) for x in
+    data_predict]``.
+
+    Parameters
+    ----------
+    bw: 1-D ndarray
+        The user-specified bandwidth parameters.
+    data: 2-D ndarray, (nobs, k_vars)
+        The training data.
+    data_predict: 2-D ndarray, (m, k_vars)
+        The evaluation points at which the kernel estimation is performed.
+    var_type: str
+        The variable type (continuous, ordered, unordered).
+    ckertype: str, optional
+        The kernel used for the continuous variables.
+    okertype: str, optional
+        The kernel used for the ordered discrete variables.
+    ukertype: str, optional
+        The kernel used for the unordered discrete variables.
+    method: {'exact', 'tree'}
+        If 'exact', then the continuous kernels are evaluated for all pairs
+        of training and evaluation points in chunks. If 'tree', then only
+        the pairs that are closer than ``cutoff`` bandwidths are found with
+        a KD-tree. 'tree' is only available for the gaussian kernel.
+    cutoff: float
+        Truncation in units of the bandwidths if method is 'tree'.
+    chunksize: None or int
+        Number of evaluation points that are processed together.
+
+    Returns
+    -------
+    dens: 1-D ndarray, (m,)
+        The sum over training observations of the product kernel divided by
+        the product of the continuous bandwidths.
+
+    Notes
+    -----
+    The discrete kernels only depend on the categories of the training and
+    evaluation points. The training data is grouped by the distinct
+    combinations of the discrete variables, so that the discrete product
+    kernel is computed once for each pair of distinct combinations in data
+    and data_predict, and the continuous product kernel is summed within
+    each group of training observations.
+    """
+    bw = np.asarray(bw, dtype=float)
+    kertypes = dict(c=ckertype, o=okertype, u=ukertype)
+    ix_cont = np.array([c == 'c' for c in var_type], dtype=bool)
+    ix_disc = ~ix_cont
+
+    uniq, groups = _unique_rows(data[:, ix_disc])
+    uniq_pred, groups_pred = _unique_rows(data_predict[:, ix_disc])
+    types_disc = [vtype for vtype in var_type if vtype != 'c']
+    bw_disc = bw[ix_disc]
+    # discrete product kernel between distinct categories, (n_pred, n_uniq)
+    kdisc = np.ones((len(uniq_pred), len(uniq)))
+    for ii, vtype in enumerate(types_disc):
+        func = kernel_func[kertypes[vtype]]
+        for p in range(len(uniq_pred)):
+            kdisc[p] *= func(bw_disc[ii], uniq[:, ii], uniq_pred[p, ii])
+
+    bw_cont = bw[ix_cont]
+    dens = np.zeros(data_predict.shape[0])
+    for g in range(len(uniq)):
+        kd = kdisc[groups_pred, g]
+        use = kd != 0
+        if not use.any():
+            continue
+        ksum = _continuous_kernel_sum(bw_cont, data[groups == g][:, ix_cont],
+                                      data_predict[use][:, ix_cont],
+                                      ckertype=ckertype, method=method,
+                                      cutoff=cutoff, chunksize=chunksize)
+        dens[use] += kd[use] * ksum
+
+    return dens / np.prod(bw_cont)
+
+
+def _kernel_blocks(bw, data, var_type, ckertype='gaussian',
+                   okertype='wangryzin', ukertype='aitchisonaitken',
+                   chunksize=None, k_extra=1):
+    """
+    Generator of row blocks of the product kernel matrix of the data
+
+    Yields ``(rows, K)`` where ``K[i, j]`` is the product kernel between
+    the evaluation point ``data[rows][i]`` and the training observation
+    ``data[j]`` divided by the product of the continuous bandwidths, i.e.
+    the terms of ``gpke(bw, data, data[i], var_type)``.
+
+    The discrete kernels are computed once on the levels of each discrete
+    variable and indexed by the category codes.
+    """
+    bw = np.asarray(bw, dtype=float)
+    kertypes = dict(c=ckertype, o=okertype, u=ukertype)
+    nobs = data.shape[0]
+    ix_cont = np.array([c == 'c' for c in var_type], dtype=bool)
+    disc = []
+    for ii, vtype in enumerate(var_type):
+        if vtype == 'c':
+            continue
+        levels = np.unique(data[:, ii])
+        codes = np.searchsorted(levels, data[:, ii])
+        func = kernel_func[kertypes[vtype]]
+        # kmat[p, q] is the kernel of training level q at evaluation level p
+        kmat = np.array([func(bw[ii], levels, x) for x in levels])
+        disc.append((kmat, codes))
+
+    cont = [(kernel_func[ckertype], bw[ii], data[:, ii])
+            for ii in np.nonzero(ix_cont)[0]]
+    bw_prod = np.prod(bw[ix_cont])
+    if chunksize is None:
+        chunksize = max(1, 2**20 // (nobs * k_extra))
+    for start in range(0, nobs, chunksize):
+        rows = slice(start, min(start + chunksize, nobs))
+        kval = np.ones((rows.stop - start, nobs))
+        for func, h, x in cont:
+            kval *= func(h, x[None, :], x[rows, None])
+        for kmat, codes in disc:
+            kval *= kmat[codes[rows]][:, codes]
+        yield rows, kval / bw_prod
+
+
+def _binned_kernel_sums(bw, data, ckertype='gaussian', weights=None,
+                        gridsize=None):
+    """
+    Binned approximation of the kernel sums at the observations
+
+    All variables need to be continuous. The data is linearly binned on a
+    grid, the binned counts are convolved with the kernel using the FFT and
+    the result is interpolated at the observations.
+
+    Returns
+    -------
+    ksum : ndarray, (nobs,) or (nobs, p)
+        Approximation of ``sum_j K(data[i], data[j]) * weights[j]``,
+        including the term ``j = i``, divided by the product of the
+        bandwidths.
+    """
+    from scipy import signal
+    from .kdetools import linbin_weights
+    nobs, k_vars = data.shape
+    if gridsize is None:
+        gridsize = min(2**10, max(16, int(2**(14. / k_vars))))
+    gridsize = np.asarray(gridsize, dtype=int) * np.ones(k_vars, dtype=int)
+    grid_min = data.min(0)
+    grid_max = data.max(0)
+    grid_max = np.where(grid_max > grid_min, grid_max, grid_min + 1)
+    delta = (grid_max - grid_min) / (gridsize - 1)
+
+    func = kernel_func[ckertype]
+    kern = np.ones([1] * k_vars)
+    for ii in range(k_vars):
+        # the kernels are negligible beyond 10 bandwidths
+        n_off = int(min(gridsize[ii] - 1, np.ceil(10 * bw[ii] / delta[ii])))
+        offsets = np.arange(-n_off, n_off + 1) * delta[ii]
+        shape = [1] * k_vars
+        shape[ii] = -1
+        kern = kern * func(bw[ii], offsets, 0.).reshape(shape)
+    kern /= np.prod(bw)
+
+    idx, wts = linbin_weights(data, grid_min, grid_max, gridsize)
+    if weights is None:
+        weights = np.ones((nobs, 1))
+        squeeze = True
+    else:
+        weights = np.asarray(weights, dtype=float).reshape(nobs, -1)
+        squeeze = False
+    ksum = np.empty(weights.shape)
+    for jj in range(weights.shape[1]):
+        counts = np.bincount(idx.ravel(),
+                             weights=(wts * weights[:, jj:jj + 1]).ravel(),
+                             minlength=np.prod(gridsize))
+        smooth = signal.fftconvolve(counts.reshape(gridsize), kern,
+                                    mode='same')
+        ksum[:, jj] = (smooth.ravel()[idx] * wts).sum(1)
+    return ksum[:, 0] if squeeze else ksum
+
+
+def _loo_kernel_sums(bw, data, var_type, ckertype='gaussian',
+                     okertype='wangryzin', ukertype='aitchisonaitken',
+                     weights=None, loo=True, binned=False, gridsize=None,
+                     chunksize=None):
+    """
+    Leave-one-out sums of the product kernel at all observations
+
+    Parameters
+    ----------
+    bw : 1-D ndarray
+        The bandwidth parameters.
+    data : 2-D ndarray, (nobs, k_vars)
+        The training data.
+    var_type : str
+        The variable types.
+    ckertype, okertype, ukertype : str
+        The kernels, names in ``kernel_func``.
+    weights : None or ndarray, (nobs,) or (nobs, p)
+        Weights for the training observations, e.g. the response variable
+        in kernel regression.
+    loo : bool
+        If True, then the own observation is excluded from the sums.
+    binned : bool
+        If True and all variables are continuous, then the sums are
+        approximated by linear binning and FFT convolution.
+    gridsize : None or int
+        Number of grid points in each dimension for the binned
+        approximation.
+    chunksize : None or int
+        Number of rows of the kernel matrix that are computed together.
+
+    Returns
+    -------
+    ksum : ndarray, (nobs,) or (nobs, p)
+        ``sum_{j != i} K(data[i], data[j]) * weights[j]``, where K is the
+        product kernel divided by the product of the continuous bandwidths
+        as in ``gpke``.
+    """
+    bw = np.asarray(bw, dtype=float)
+    nobs = data.shape[0]
+    if binned and all(c == 'c' for c in var_type):
+        ksum = _binned_kernel_sums(bw, data, ckertype=ckertype,
+                                   weights=weights, gridsize=gridsize)
+        if loo:
+            k0 = np.prod([kernel_func[ckertype](h, 0., 0.) / h for h in bw])
+            if weights is None:
+                ksum -= k0
+            else:
+                ksum -= k0 * np.asarray(weights).reshape(ksum.shape)
+            # rounding errors of the approximation for small bandwidths
+            if ksum.ndim == 1:
+                ksum = np.maximum(ksum, 0)
+            else:
+                ksum[:, 0] = np.maximum(ksum[:, 0], 0)
+        return ksum
+
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+    ksum = np.empty((nobs,) + (weights.shape[1:] if weights is not None
+                               else ()))
+    for rows, kval in _kernel_blocks(bw, data, var_type, ckertype=ckertype,
+                                     okertype=okertype, ukertype=ukertype,
+                                     chunksize=chunksize):
+        if loo:
+            idx = np.arange(rows.stop - rows.start)
+            kval[idx, idx + rows.start] = 0
+        if weights is None:
+            ksum[rows] = kval.sum(1)
+        else:
+            ksum[rows] = kval.dot(weights)
+    return ksum
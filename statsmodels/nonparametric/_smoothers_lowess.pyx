@@ -18,9 +18,10 @@ cimport numpy as np
 import numpy as np
 from cpython cimport bool
 cimport cython
+from libc.math cimport fabs, NAN
 
 # there's no fmax in math.h with windows SDK apparently
-cdef inline double fmax(double x, double y): return x if x >= y else y
+cdef inline double fmax(double x, double y) nogil: return x if x >= y else y
 
 DTYPE = np.double
 ctypedef np.double_t DTYPE_t
@@ -613,3 +614,260 @@ def bisquare(np.ndarray[DTYPE_t, ndim = 1] x):
     '''
 
     return (1.0 - x**2)**2
+
+
+# Batched lowess
+# --------------
+# The functions below implement the same algorithm as `lowess` on typed
+# memoryviews without python objects, so that many series can be smoothed
+# in one call with the GIL released.
+
+cdef inline double _tricube(double d) nogil:
+    d = d * (d * d)
+    d = 1.0 - d
+    return d * (d * d)
+
+
+cdef bint _local_fit(double[::1] x, double[::1] y, Py_ssize_t left_end,
+                     Py_ssize_t right_end, double xi, double radius,
+                     double[::1] weights, double[::1] resid_weights,
+                     bint use_resid_weights, double *y_fit) nogil:
+    """
+    Weighted local linear fit at xi, returns False if no regression is
+    possible, i.e. if less than two weights are positive.
+    """
+    cdef:
+        Py_ssize_t j, n_pos = 0
+        double sum_weights = 0, sum_weighted_x = 0, weighted_sqdev_x = 0
+        double w, fit = 0
+
+    for j in range(left_end, right_end):
+        w = _tricube(fabs(x[j] - xi) / radius)
+        if use_resid_weights:
+            w = w * resid_weights[j]
+        weights[j] = w
+        sum_weights += w
+        if w != 0:
+            n_pos += 1
+
+    if sum_weights <= 0.0 or n_pos == 1:
+        return False
+
+    for j in range(left_end, right_end):
+        weights[j] = weights[j] / sum_weights
+        sum_weighted_x += weights[j] * x[j]
+    for j in range(left_end, right_end):
+        weighted_sqdev_x += weights[j] * (x[j] - sum_weighted_x) ** 2
+    if weighted_sqdev_x > 0:
+        for j in range(left_end, right_end):
+            fit += weights[j] * (1.0 + (xi - sum_weighted_x) *
+                                 (x[j] - sum_weighted_x) /
+                                 weighted_sqdev_x) * y[j]
+    else:
+        # all weight on tied x values, use the weighted mean
+        for j in range(left_end, right_end):
+            fit += weights[j] * y[j]
+    y_fit[0] = fit
+    return True
+
+
+cdef inline void _neighborhood(double[::1] x, double xi, Py_ssize_t n,
+                               Py_ssize_t *left_end,
+                               Py_ssize_t *right_end) nogil:
+    # same as update_neighborhood
+    while right_end[0] < n:
+        if xi > (x[left_end[0]] + x[right_end[0]]) / 2.0:
+            left_end[0] += 1
+            right_end[0] += 1
+        else:
+            break
+
+
+cdef void _lowess_fit_inputs(double[::1] x, double[::1] y, Py_ssize_t n,
+                             Py_ssize_t k, double delta, double[::1] y_fit,
+                             double[::1] weights, double[::1] resid_weights,
+                             bint use_resid_weights) nogil:
+    """One lowess iteration at the input points, see `lowess`"""
+    cdef:
+        Py_ssize_t i = 0, j, last_fit_i = -1, left_end = 0, right_end = k
+        double radius, a, cutpoint, fit
+
+    while True:
+        _neighborhood(x, x[i], n, &left_end, &right_end)
+        radius = fmax(x[i] - x[left_end], x[right_end - 1] - x[i])
+        if _local_fit(x, y, left_end, right_end, x[i], radius, weights,
+                      resid_weights, use_resid_weights, &fit):
+            y_fit[i] = fit
+        else:
+            y_fit[i] = y[i]
+
+        # linear interpolation of points skipped because of delta
+        for j in range(last_fit_i + 1, i):
+            a = (x[j] - x[last_fit_i]) / (x[i] - x[last_fit_i])
+            y_fit[j] = a * y_fit[i] + (1.0 - a) * y_fit[last_fit_i]
+
+        # same as update_indices
+        last_fit_i = i
+        cutpoint = x[last_fit_i] + delta
+        j = last_fit_i
+        for j in range(last_fit_i + 1, n):
+            if x[j] > cutpoint:
+                break
+            if x[j] == x[last_fit_i]:
+                y_fit[j] = y_fit[last_fit_i]
+                last_fit_i = j
+        i = j - 1 if j - 1 > last_fit_i + 1 else last_fit_i + 1
+
+        if last_fit_i >= n - 1:
+            break
+
+
+cdef double _select(double[::1] a, Py_ssize_t n, Py_ssize_t kth) nogil:
+    """kth smallest element of a[:n] by quickselect, reorders a"""
+    cdef:
+        Py_ssize_t left = 0, right = n - 1, i, j
+        double pivot, tmp
+
+    while left < right:
+        pivot = a[(left + right) // 2]
+        i = left
+        j = right
+        while i <= j:
+            while a[i] < pivot:
+                i += 1
+            while a[j] > pivot:
+                j -= 1
+            if i <= j:
+                tmp = a[i]
+                a[i] = a[j]
+                a[j] = tmp
+                i += 1
+                j -= 1
+        if kth <= j:
+            right = j
+        elif kth >= i:
+            left = i
+        else:
+            break
+    return a[kth]
+
+
+cdef void _residual_weights(double[::1] y, double[::1] y_fit, Py_ssize_t n,
+                            double[::1] resid_weights,
+                            double[::1] work) nogil:
+    """same as calculate_residual_weights"""
+    cdef:
+        Py_ssize_t j
+        double median, r, lower
+
+    for j in range(n):
+        work[j] = fabs(y[j] - y_fit[j])
+    median = _select(work, n, n // 2)
+    if n % 2 == 0:
+        # largest element of the lower half after the selection
+        lower = work[0]
+        for j in range(1, n // 2):
+            if work[j] > lower:
+                lower = work[j]
+        median = (median + lower) / 2.0
+
+    for j in range(n):
+        r = fabs(y[j] - y_fit[j])
+        if median == 0:
+            r = 1.0 if r > 0 else 0.0
+        else:
+            r = r / (6.0 * median)
+        if r >= 1.0:
+            r = 1.0
+        resid_weights[j] = (1.0 - r * r) ** 2
+
+
+cdef void _lowess_xvals(double[::1] x, double[::1] y, Py_ssize_t n,
+                        Py_ssize_t k, double[::1] xvals,
+                        double[::1] out, double[::1] weights,
+                        double[::1] resid_weights,
+                        bint use_resid_weights) nogil:
+    """Local linear fits at the sorted xvals"""
+    cdef:
+        Py_ssize_t i, j, left_end = 0, right_end = k
+        double xi, radius, fit
+
+    for i in range(xvals.shape[0]):
+        xi = xvals[i]
+        if not (xi >= x[0] and xi <= x[n - 1]):
+            out[i] = NAN
+            continue
+        _neighborhood(x, xi, n, &left_end, &right_end)
+        radius = fmax(xi - x[left_end], x[right_end - 1] - xi)
+        if radius == 0:
+            # xi is tied with all points in the neighborhood
+            fit = 0
+            for j in range(left_end, right_end):
+                fit += y[j]
+            out[i] = fit / (right_end - left_end)
+        elif _local_fit(x, y, left_end, right_end, xi, radius, weights,
+                        resid_weights, use_resid_weights, &fit):
+            out[i] = fit
+        else:
+            out[i] = NAN
+
+
+def lowess_batch(double[:, ::1] endog, double[:, ::1] exog,
+                 Py_ssize_t[::1] nobs, double frac, Py_ssize_t it,
+                 double delta, double[:, ::1] xvals, double[:, ::1] out):
+    '''
+    Lowess for the rows of endog and exog, the GIL is released.
+
+    Parameters
+    ----------
+    endog, exog : 2-D arrays
+        Each row is one series, exog has to be increasing in the first
+        nobs[i] elements of row i. Elements after nobs[i] are ignored.
+    nobs : 1-D array of integers
+        Number of valid observations of each series.
+    frac, it, delta : see `lowess`
+    xvals : 2-D array or None
+        Increasing evaluation points for each series. If None, then the
+        fitted values at exog are computed.
+    out : 2-D array
+        The fitted values are written to out, which has the shape of endog
+        or of xvals. Elements of skipped observations and points outside of
+        the range of exog are nan.
+    '''
+    cdef:
+        Py_ssize_t n_series = endog.shape[0], n_max = endog.shape[1]
+        Py_ssize_t row, n, k, robiter, j
+        bint at_xvals = xvals is not None
+        double[::1] weights = np.zeros(n_max)
+        double[::1] resid_weights = np.ones(n_max)
+        double[::1] work = np.zeros(n_max)
+        double[::1] y_fit = np.zeros(n_max)
+
+    with nogil:
+        for row in range(n_series):
+            n = nobs[row]
+            out[row, :] = NAN
+            if n < 2:
+                continue
+            k = <Py_ssize_t>(frac * n + 1e-10)
+            if k < 2:
+                k = 2
+            if k > n:
+                k = n
+
+            for robiter in range(it + 1):
+                if at_xvals and robiter == it:
+                    _lowess_xvals(exog[row], endog[row], n, k, xvals[row],
+                                  out[row], weights, resid_weights,
+                                  robiter > 0)
+                    break
+                _lowess_fit_inputs(exog[row], endog[row], n, k, delta,
+                                   y_fit, weights, resid_weights,
+                                   robiter > 0)
+                if robiter < it:
+                    _residual_weights(endog[row], y_fit, n, resid_weights,
+                                      work)
+
+            if not at_xvals:
+                for j in range(n):
+                    out[row, j] = y_fit[j]
@@ -1,7 +1,7 @@
-from .kde import KDEUnivariate
-from .smoothers_lowess import lowess
+from .kde import KDEUnivariate, KDEGrid, KDEBinned
+from .smoothers_lowess import lowess, lowess_batch
 from . import bandwidths
 
 from .kernel_density import \
     KDEMultivariate, KDEMultivariateConditional, EstimatorSettings
-from .kernel_regression import KernelReg, KernelCensoredReg
+from .kernel_regression import KernelReg, KernelCensoredReg, LocalPolynomialReg
@@ -12,14 +12,14 @@ http://en.wikipedia.org/wiki/Kernel_%28statistics%29
 Silverman, B.W.  Density Estimation for Statistics and Data Analysis.
 """
 from __future__ import absolute_import, print_function, division
-from statsmodels.compat.python import range
+from statsmodels.compat.python import range, string_types
 import numpy as np
-from scipy import integrate, stats
+from scipy import integrate, interpolate, signal, stats
 from statsmodels.sandbox.nonparametric import kernels
 from statsmodels.tools.decorators import (cache_readonly, resettable_cache)
 from . import bandwidths
-from .kdetools import (forrt, revrt, silverman_transform)
-from .linbin import fast_linbin
+from .kdetools import (forrt, revrt, silverman_transform, linbin_weights)
+from .linbin import fast_linbin, fast_linbin_weighted
 
 #### Kernels Switch for estimators ####
 
@@ -258,6 +258,460 @@ class KDEUnivariate(object):
         return self.kernel.density(self.endog, point)
 
 
+class KDEGrid(object):
+    """
+    Multivariate Kernel Density Estimator on a regular grid.
+
+    Parameters
+    ----------
+    endog : array-like, (nobs, k_vars)
+        The continuous variables for which the density estimate is desired,
+        observations in rows.
+
+    Notes
+    -----
+    The data is linearly binned on a regular grid and the binned counts are
+    convolved with a product kernel, see Wand and Jones (1995) Appendix D.
+    The cost of the binning is linear in `nobs` and the convolution depends
+    only on the grid size, which makes `KDEGrid` suitable for bivariate and
+    trivariate densities of very large samples, e.g. for heatmaps. The
+    number of grid points increases exponentially with the number of
+    variables.
+
+    The density estimate is only available on the grid and by multilinear
+    interpolation between grid points.
+
+    See Also
+    --------
+    KDEUnivariate, KDEMultivariate
+
+    Examples
+    --------
+    >>> x = np.random.normal(size=(100000, 2))
+    >>> dens = sm.nonparametric.KDEGrid(x)
+    >>> dens.fit(kernel='epa', gridsize=128)
+    >>> xx, yy = np.meshgrid(*dens.support, indexing='ij')
+    >>> plt.contour(xx, yy, dens.density)
+    >>> dens.evaluate([[0, 0], [1, 1]])
+    """
+
+    def __init__(self, endog):
+        endog = np.asarray(endog, dtype=float)
+        if endog.ndim == 1:
+            endog = endog[:, None]
+        self.endog = endog
+        self.nobs, self.k_vars = endog.shape
+
+    def fit(self, kernel="gau", bw="normal_reference", weights=None,
+            gridsize=None, adjust=1, cut=3, bounds=None, chunksize=None):
+        """
+        Attach the density estimate on the grid to the KDEGrid class.
+
+        Parameters
+        ----------
+        kernel : str
+            The product kernel to be used. Choices are:
+
+            - "epa" for Epanechnikov
+            - "gau" for Gaussian.
+
+        bw : str, float or array_like
+            The bandwidth to use, a scalar or one value for each variable.
+            If "normal_reference", then the bandwidth of each variable is
+            ``C * A * nobs ** (-1 / (k_vars + 4))`` with ``A`` and the kernel
+            constant ``C`` as in `bandwidths.bw_normal_reference`. If weights
+            are given, then ``A`` is the weighted standard deviation and
+            ``nobs`` the effective number of observations
+            ``sum(weights)**2 / sum(weights**2)``.
+        weights : array_like, (nobs,), optional
+            Nonnegative weights of the observations, e.g. frequencies.
+        gridsize : int or array_like, optional
+            Number of grid points in each dimension. The default is 4096 for
+            univariate, 256 for bivariate and 64 for trivariate data, and 16
+            for more variables.
+        adjust : float
+            An adjustment factor for the bw. Bandwidth becomes bw * adjust.
+        cut : float
+            Defines the length of the grid past the lowest and highest values
+            of each variable, the grid ranges from ``min - cut * bw`` to
+            ``max + cut * bw``. Not used if `bounds` is given.
+        bounds : sequence of tuples, optional
+            Lower and upper bound of the grid for each variable. Observations
+            outside of the bounds are not binned but are included in the
+            total weight, so that the density integrates to the fraction of
+            the observations inside of the bounds.
+        chunksize : int, optional
+            Number of observations that are binned at once, which limits the
+            size of the temporary arrays.
+        """
+        if kernel not in ("gau", "epa"):
+            raise ValueError("kernel needs to be 'gau' or 'epa'")
+        endog = self.endog
+        nobs, k_vars = endog.shape
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape != (nobs,):
+                raise ValueError("The length of weights must be nobs")
+
+        if isinstance(bw, string_types):
+            if bw != "normal_reference":
+                raise ValueError("bw needs to be 'normal_reference' or "
+                                 "numeric")
+            self.bw_method = bw
+            bw = self._normal_reference(kernel, weights)
+        else:
+            self.bw_method = "user-given"
+        bw = np.asarray(bw, dtype=float) * np.ones(k_vars) * adjust
+
+        if gridsize is None:
+            gridsize = {1: 2**12, 2: 2**8, 3: 2**6}.get(k_vars, 16)
+        gridsize = np.asarray(gridsize, dtype=int) * np.ones(k_vars, int)
+        if np.any(gridsize < 2):
+            raise ValueError("gridsize needs to be at least 2")
+        if bounds is None:
+            grid_min = endog.min(0) - cut * bw
+            grid_max = endog.max(0) + cut * bw
+        else:
+            grid_min, grid_max = np.asarray(bounds, dtype=float).T
+        delta = (grid_max - grid_min) / (gridsize - 1)
+
+        if chunksize is None:
+            chunksize = max(1, 2**20 // 2**k_vars)
+        n_grid = np.prod(gridsize)
+        counts = np.zeros(n_grid)
+        for start in range(0, nobs, chunksize):
+            sl = slice(start, start + chunksize)
+            x = endog[sl]
+            w = None if weights is None else weights[sl]
+            if bounds is not None:
+                mask = np.all((x >= grid_min) & (x <= grid_max), axis=1)
+                x = x[mask]
+                w = None if w is None else w[mask]
+            idx, lw = linbin_weights(x, grid_min, grid_max, gridsize)
+            if w is not None:
+                lw *= w[:, None]
+            counts += np.bincount(idx.ravel(), lw.ravel(), minlength=n_grid)
+        counts = counts.reshape(gridsize)
+
+        # separable convolution with the discretized product kernel, the
+        # kernel is normalized to sum to one on the grid
+        tau = 5. if kernel == "gau" else 1.
+        density = counts
+        for ii in range(k_vars):
+            m = int(min(gridsize[ii] - 1, np.ceil(tau * bw[ii] / delta[ii])))
+            u = np.arange(-m, m + 1) * delta[ii] / bw[ii]
+            if kernel == "gau":
+                kern = np.exp(-0.5 * u**2)
+            else:
+                kern = np.maximum(1 - u**2, 0)
+            if kern.sum() == 0:
+                kern[m] = 1
+            kern /= kern.sum()
+            density = np.moveaxis(density, ii, -1)
+            density = signal.fftconvolve(density, kern.reshape(
+                (1,) * (k_vars - 1) + (-1,)), mode="same")
+            density = np.moveaxis(density, -1, ii)
+
+        total = nobs if weights is None else weights.sum()
+        # fft introduces small negative values where the density is zero
+        density = np.maximum(density, 0) / (total * np.prod(delta))
+
+        self.density = density
+        self.support = [np.linspace(grid_min[ii], grid_max[ii], gridsize[ii])
+                        for ii in range(k_vars)]
+        self.bw = bw
+        self.kernel = kernel
+        self.interpolator = interpolate.RegularGridInterpolator(
+            self.support, density, method="linear", bounds_error=False,
+            fill_value=0.)
+
+    def _normal_reference(self, kernel, weights):
+        """Normal reference bandwidth with the multivariate rate"""
+        endog = self.endog
+        C = kernel_switch[kernel]().normal_reference_constant
+        if weights is None:
+            nobs = self.nobs
+            # same as bandwidths._select_sigma, np.percentile partitions
+            # instead of sorting the data
+            q75, q25 = np.percentile(endog, [75, 25], axis=0)
+            A = np.minimum(endog.std(0, ddof=1), (q75 - q25) / 1.349)
+        else:
+            w = weights / weights.sum()
+            nobs = 1. / (w**2).sum()
+            mean = w.dot(endog)
+            A = np.sqrt(w.dot((endog - mean)**2) * nobs / (nobs - 1))
+        return C * A * nobs ** (-1. / (self.k_vars + 4))
+
+    def evaluate(self, points):
+        """
+        Evaluate the density at points by interpolation on the grid.
+
+        Parameters
+        ----------
+        points : array_like, (n, k_vars)
+            Points at which to evaluate the density. Points outside of the
+            grid have density zero.
+
+        Returns
+        -------
+        density : ndarray, (n,)
+            Multilinear interpolation of the density on the grid.
+        """
+        _checkisfit(self)
+        points = np.asarray(points, dtype=float)
+        if points.ndim == 1:
+            points = points.reshape(-1, self.k_vars)
+        return self.interpolator(points)
+
+
+class KDEBinned(object):
+    """
+    Mergeable binned summary for univariate kernel density estimation.
+
+    Parameters
+    ----------
+    grid_min, grid_max : float
+        Lower and upper bound of the grid. The grid should include the range
+        of the data plus a margin for the kernel.
+    gridsize : int
+        Number of grid points.
+
+    Attributes
+    ----------
+    support : ndarray
+        The grid.
+    counts : ndarray
+        Linearly binned weights of the observations on the grid.
+    weight_below, weight_above : float
+        Total weight of the observations below and above the grid.
+    nobs : int
+        Number of observations.
+
+    Notes
+    -----
+    The summary is accumulated with `update` on chunks of data, and
+    summaries of different chunks or shards of the data on the same grid can
+    be combined with `merge`. The memory requirement only depends on the
+    grid size. `fit` computes the kernel density estimate and its cdf on the
+    grid by convolving the binned counts with the kernel, which is the same
+    approximation as in `KDEUnivariate.fit` with ``fft=True``, but for all
+    kernels and weights.
+
+    Observations outside of the grid are not smoothed. They are included in
+    the total weight and in the cdf, but not in the density.
+
+    See Also
+    --------
+    KDEUnivariate
+
+    Examples
+    --------
+    >>> summary = KDEBinned(-10, 10, gridsize=2048)
+    >>> for chunk in chunks:
+    ...     summary.update(chunk)
+    >>> summary.merge(summary_other_shard)
+    >>> summary.fit(kernel="epa")
+    >>> summary.evaluate([0, 1])
+    >>> summary.quantile([0.05, 0.5, 0.95])
+    """
+
+    def __init__(self, grid_min, grid_max, gridsize=2**12):
+        gridsize = int(gridsize)
+        if gridsize < 2:
+            raise ValueError("gridsize needs to be at least 2")
+        if not grid_min < grid_max:
+            raise ValueError("grid_min needs to be smaller than grid_max")
+        self.grid_min = float(grid_min)
+        self.grid_max = float(grid_max)
+        self.support = np.linspace(self.grid_min, self.grid_max, gridsize)
+        self.counts = np.zeros(gridsize)
+        self.weight_below = 0.
+        self.weight_above = 0.
+        self.nobs = 0
+        # weighted moments of all observations, shifted to the grid center
+        self._center = (self.grid_min + self.grid_max) / 2
+        self._moments = np.zeros(4)  # sum w, w**2, w*x, w*x**2
+
+    @property
+    def weight_total(self):
+        """Total weight of all observations"""
+        return self._moments[0]
+
+    def update(self, endog, weights=None):
+        """
+        Add observations to the summary.
+
+        Parameters
+        ----------
+        endog : array_like
+            Observations, nan values are ignored.
+        weights : array_like, optional
+            Nonnegative weights of the observations.
+
+        Returns
+        -------
+        self : KDEBinned
+        """
+        endog = np.asarray(endog, dtype=float).ravel()
+        if weights is None:
+            weights = np.ones(len(endog))
+        else:
+            weights = np.asarray(weights, dtype=float).ravel()
+            if len(weights) != len(endog):
+                raise ValueError("The length of weights must be the same "
+                                 "as the length of endog")
+        mask = ~np.isnan(endog)
+        endog, weights = endog[mask], weights[mask]
+
+        counts, below, above = fast_linbin_weighted(
+            endog, weights, self.grid_min, self.grid_max, len(self.support))
+        self.counts += counts
+        self.weight_below += below
+        self.weight_above += above
+        self.nobs += len(endog)
+        x = endog - self._center
+        wx = weights * x
+        self._moments += [weights.sum(), weights.dot(weights), wx.sum(),
+                          wx.dot(x)]
+        return self
+
+    def merge(self, other):
+        """
+        Add the observations of another summary on the same grid.
+
+        Parameters
+        ----------
+        other : KDEBinned
+            Summary with the same grid.
+
+        Returns
+        -------
+        self : KDEBinned
+        """
+        if (not isinstance(other, KDEBinned) or
+                not np.array_equal(self.support, other.support)):
+            raise ValueError("other needs to be a KDEBinned instance with "
+                             "the same grid")
+        self.counts += other.counts
+        self.weight_below += other.weight_below
+        self.weight_above += other.weight_above
+        self.nobs += other.nobs
+        self._moments += other._moments
+        return self
+
+    def _select_bandwidth(self, bw, kern):
+        """Rule of thumb bandwidths based on the summary"""
+        sum_w, sum_w2, sum_wx, sum_wx2 = self._moments
+        nobs = sum_w**2 / sum_w2
+        var = (sum_wx2 - sum_wx**2 / sum_w) / sum_w * nobs / (nobs - 1)
+        q75, q25 = self._binned_quantile([0.75, 0.25])
+        A = np.minimum(np.sqrt(var), (q75 - q25) / 1.349)
+        C = {"scott": 1.059, "silverman": .9,
+             "normal_reference": kern.normal_reference_constant}[bw]
+        return C * A * nobs ** (-0.2)
+
+    def _binned_quantile(self, q):
+        """Quantiles of the binned observations without smoothing"""
+        cum = np.r_[self.weight_below, self.weight_below +
+                    np.cumsum(self.counts)] / self.weight_total
+        return np.interp(q, cum, np.r_[self.support[0], self.support])
+
+    def fit(self, kernel="gau", bw="normal_reference", adjust=1):
+        """
+        Compute the kernel density estimate on the grid.
+
+        Parameters
+        ----------
+        kernel : str
+            The Kernel to be used, see `KDEUnivariate.fit` for the choices.
+        bw : str, float
+            The bandwidth to use. Choices are "scott", "silverman" and
+            "normal_reference" as in `KDEUnivariate.fit`, where the standard
+            deviation is computed from all observations and the
+            interquartile range from the binned observations. If a float is
+            given, it is the bandwidth.
+        adjust : float
+            An adjustment factor for the bw. Bandwidth becomes bw * adjust.
+
+        Notes
+        -----
+        The results are attached as attributes `density`, `cdf` and `bw`.
+        They are not updated by `update` or `merge`, `fit` needs to be
+        called again.
+        """
+        if self.weight_total <= 0:
+            raise ValueError("The summary does not contain observations")
+        kern = kernel_switch[kernel]()
+        if isinstance(bw, string_types):
+            self.bw_method = bw
+            bw = self._select_bandwidth(bw.lower(), kern)
+        else:
+            self.bw_method = "user-given"
+        bw = float(bw) * adjust
+
+        # discretized kernel on the grid, truncated at its domain or for
+        # the gaussian kernel at 5 bandwidths
+        gridsize = len(self.support)
+        delta = self.support[1] - self.support[0]
+        domain = kern.domain if kern.domain is not None else [-5., 5.]
+        m = int(min(gridsize - 1, np.ceil(max(np.abs(domain)) * bw / delta)))
+        u = np.arange(-m, m + 1) * delta / bw
+        kern_grid = np.where((u >= domain[0]) & (u <= domain[1]), kern(u), 0)
+        if kern_grid.sum() <= 0:
+            kern_grid[m] = 1
+        kern_grid = kern_grid / kern_grid.sum()
+
+        density = signal.fftconvolve(self.counts, kern_grid, mode="same")
+        # fft introduces small negative values where the density is zero
+        density = np.maximum(density, 0) / (self.weight_total * delta)
+        cdf = np.r_[0, np.cumsum((density[1:] + density[:-1]) / 2 * delta)]
+        cdf += self.weight_below / self.weight_total
+
+        self.kernel = kernel
+        self.bw = bw
+        self.density = density
+        self.cdf = cdf
+
+    def evaluate(self, point):
+        """
+        Evaluate the density by linear interpolation on the grid.
+
+        Parameters
+        ----------
+        point : array_like
+            Points at which to evaluate the density, the density is zero
+            outside of the grid.
+        """
+        _checkisfit(self)
+        return np.interp(point, self.support, self.density, left=0, right=0)
+
+    def evaluate_cdf(self, point):
+        """
+        Evaluate the cdf by linear interpolation on the grid.
+
+        Parameters
+        ----------
+        point : array_like
+            Points at which to evaluate the cdf.
+        """
+        _checkisfit(self)
+        return np.interp(point, self.support, self.cdf, left=0, right=1)
+
+    def quantile(self, q):
+        """
+        Quantiles of the density estimate.
+
+        Parameters
+        ----------
+        q : array_like
+            Probabilities at which the inverse of the cdf is evaluated.
+            Probabilities outside of the range of the cdf on the grid
+            return the grid boundaries.
+        """
+        _checkisfit(self)
+        return np.interp(q, self.cdf, self.support)
+
+
 #### Kernel Density Estimator Functions ####
 
 def kdensity(X, kernel="gau", bw="normal_reference", weights=None, gridsize=None,
@@ -55,3 +55,54 @@ def counts(x, v):
 
 def kdesum(x, axis=0):
     return np.asarray([np.sum(x[i] - x, axis) for i in range(len(x))])
+
+def linbin_weights(data, grid_min, grid_max, gridsize):
+    """
+    Linear binning weights of multivariate data on a regular grid.
+
+    Parameters
+    ----------
+    data : ndarray, (nobs, k)
+        Observations, values outside of the grid are assigned to the
+        boundary bins.
+    grid_min, grid_max : array_like, (k,)
+        Lower and upper bounds of the grid in each dimension.
+    gridsize : array_like of int, (k,)
+        Number of grid points in each dimension.
+
+    Returns
+    -------
+    idx : ndarray of int, (nobs, 2**k)
+        Flat (C-order) index of the grid points at the corners of the grid
+        cell that contains each observation.
+    weights : ndarray, (nobs, 2**k)
+        Linear binning weights of the corners, the rows sum to one.
+
+    Notes
+    -----
+    The binned counts are ``np.bincount(idx.ravel(), weights.ravel(),
+    minlength=np.prod(gridsize))`` and multilinear interpolation of values
+    on the grid at the observations is
+    ``(grid.ravel()[idx] * weights).sum(1)``.
+    See Wand and Jones (1995), Kernel Smoothing, Appendix D, for binning
+    in kernel estimation.
+    """
+    data = np.asarray(data, dtype=float)
+    nobs, k_vars = data.shape
+    gridsize = np.asarray(gridsize, dtype=int) * np.ones(k_vars, dtype=int)
+    grid_min = np.asarray(grid_min, dtype=float)
+    delta = (np.asarray(grid_max, dtype=float) - grid_min) / (gridsize - 1)
+    pos = (data - grid_min) / delta
+    pos = np.clip(pos, 0, gridsize - 1)
+    lower = np.minimum(np.floor(pos).astype(int), np.maximum(gridsize - 2, 0))
+    frac = pos - lower
+    strides = np.cumprod(np.r_[1, gridsize[1:][::-1]])[::-1]
+
+    idx = np.zeros((nobs, 2**k_vars), dtype=int)
+    weights = np.ones((nobs, 2**k_vars))
+    for corner in range(2**k_vars):
+        for ii in range(k_vars):
+            upper = (corner >> (k_vars - 1 - ii)) & 1
+            idx[:, corner] += (lower[:, ii] + upper) * strides[ii]
+            weights[:, corner] *= frac[:, ii] if upper else 1 - frac[:, ii]
+    return idx, weights
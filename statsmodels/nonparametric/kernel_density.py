@@ -33,9 +33,9 @@ from __future__ import division
 from statsmodels.compat.python import range, next
 import numpy as np
 
-from . import kernels
 from ._kernel_base import GenericKDE, EstimatorSettings, gpke, \
-    LeaveOneOut, _adjust_shape
+    gpke_multi, LeaveOneOut, _adjust_shape, _loo_kernel_sums, \
+    _parallel_predict, _gpke_multi_predict
 
 
 __all__ = ['KDEMultivariate', 'KDEMultivariateConditional', 'EstimatorSettings']
@@ -152,17 +152,19 @@ class KDEMultivariate(GenericKDE):
 
         .. math:: K_{h}(X_{i},X_{j}) =
             \prod_{s=1}^{q}h_{s}^{-1}k\left(\frac{X_{is}-X_{js}}{h_{s}}\right)
+
+        The leave-one-out sums are computed from row blocks of the kernel
+        matrix with the diagonal removed, or approximated by binning if
+        ``binned`` is set in the `EstimatorSettings`. `func` is applied to
+        the array of leave-one-out densities.
         """
-        LOO = LeaveOneOut(self.data)
-        L = 0
-        for i, X_not_i in enumerate(LOO):
-            f_i = gpke(bw, data=-X_not_i, data_predict=-self.data[i, :],
-                       var_type=self.var_type)
-            L += func(f_i)
+        f_i = _loo_kernel_sums(bw, self.data, self.var_type,
+                               binned=self.binned, gridsize=self.gridsize)
+        L = np.sum(func(f_i))
 
         return -L
 
-    def pdf(self, data_predict=None):
+    def pdf(self, data_predict=None, method='exact', cutoff=7.):
         r"""
         Evaluate the probability density function.
 
@@ -170,6 +172,17 @@ class KDEMultivariate(GenericKDE):
         ----------
         data_predict: array_like, optional
             Points to evaluate at.  If unspecified, the training data is used.
+        method: {'exact', 'tree'}, optional
+            If 'exact' (default), then the kernel is evaluated at all pairs
+            of training and evaluation points, vectorized over chunks of
+            evaluation points. If 'tree', then the Gaussian kernel of the
+            continuous variables is truncated at `cutoff` bandwidths and
+            only pairs within the cutoff are found using a KD-tree, which
+            is faster for large samples with small bandwidths.
+        cutoff: float, optional
+            Truncation of the continuous kernel in units of the bandwidth
+            for method 'tree'. The relative truncation error of the kernel
+            is bounded by ``exp(-cutoff**2 / 2)``.
 
         Returns
         -------
@@ -183,17 +196,26 @@ class KDEMultivariate(GenericKDE):
 
         .. math:: K_{h}(X_{i},X_{j}) =
             \prod_{s=1}^{q}h_{s}^{-1}k\left(\frac{X_{is}-X_{js}}{h_{s}}\right)
+
+        The discrete kernels are computed once for each combination of
+        categories, see `gpke_multi`.
+
+        For a large number of evaluation points, the points can be split
+        across `n_jobs_predict` processes as set in `EstimatorSettings`. The
+        evaluation is serial by default.
         """
         if data_predict is None:
             data_predict = self.data
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
-        pdf_est = []
-        for i in range(np.shape(data_predict)[0]):
-            pdf_est.append(gpke(self.bw, data=self.data,
-                                data_predict=data_predict[i, :],
-                                var_type=self.var_type) / self.nobs)
+        kwds = dict(method=method, cutoff=cutoff)
+        pdf_est = _parallel_predict(_gpke_multi_predict, data_predict,
+                                    self.n_jobs_predict,
+                                    self.nobs * data_predict.shape[0],
+                                    args=(self.bw, self.data, self.var_type,
+                                          kwds))
+        pdf_est = pdf_est / self.nobs
 
         pdf_est = np.squeeze(pdf_est)
         return pdf_est
@@ -234,14 +256,12 @@ class KDEMultivariate(GenericKDE):
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
-        cdf_est = []
-        for i in range(np.shape(data_predict)[0]):
-            cdf_est.append(gpke(self.bw, data=self.data,
-                                data_predict=data_predict[i, :],
-                                var_type=self.var_type,
-                                ckertype="gaussian_cdf",
-                                ukertype="aitchisonaitken_cdf",
-                                okertype='wangryzin_cdf') / self.nobs)
+        cdf_est = gpke_multi(self.bw, data=self.data,
+                             data_predict=data_predict,
+                             var_type=self.var_type,
+                             ckertype="gaussian_cdf",
+                             ukertype="aitchisonaitken_cdf",
+                             okertype='wangryzin_cdf') / self.nobs
 
         cdf_est = np.squeeze(cdf_est)
         return cdf_est
@@ -294,42 +314,18 @@ class KDEMultivariate(GenericKDE):
         #return (F / self.nobs**2 + self.loo_likelihood(bw) * \
         #        2 / ((self.nobs) * (self.nobs - 1)))
 
-        # The code below is equivalent to the commented-out code above.  It's
-        # about 20% faster due to some code being moved outside the for-loops
-        # and shared by gpke() and loo_likelihood().
-        F = 0
-        kertypes = dict(c=kernels.gaussian_convolution,
-                        o=kernels.wang_ryzin_convolution,
-                        u=kernels.aitchison_aitken_convolution)
+        # The code below is equivalent to the commented-out code above, the
+        # kernel sums are computed from blocks of the kernel matrix, or
+        # approximated by binning if ``binned`` is set in the settings.
         nobs = self.nobs
-        data = -self.data
-        var_type = self.var_type
-        ix_cont = np.array([c == 'c' for c in var_type])
-        _bw_cont_product = bw[ix_cont].prod()
-        Kval = np.empty(data.shape)
-        for i in range(nobs):
-            for ii, vtype in enumerate(var_type):
-                Kval[:, ii] = kertypes[vtype](bw[ii],
-                                              data[:, ii],
-                                              data[i, ii])
-
-            dens = Kval.prod(axis=1) / _bw_cont_product
-            k_bar_sum = dens.sum(axis=0)
-            F += k_bar_sum  # sum of prod kernel over nobs
-
-        kertypes = dict(c=kernels.gaussian,
-                        o=kernels.wang_ryzin,
-                        u=kernels.aitchison_aitken)
-        LOO = LeaveOneOut(self.data)
-        L = 0   # leave-one-out likelihood
-        Kval = np.empty((data.shape[0]-1, data.shape[1]))
-        for i, X_not_i in enumerate(LOO):
-            for ii, vtype in enumerate(var_type):
-                Kval[:, ii] = kertypes[vtype](bw[ii],
-                                              -X_not_i[:, ii],
-                                              data[i, ii])
-            dens = Kval.prod(axis=1) / _bw_cont_product
-            L += dens.sum(axis=0)
+        F = _loo_kernel_sums(bw, self.data, self.var_type,
+                             ckertype='gauss_convolution',
+                             okertype='wangryzin_convolution',
+                             ukertype='aitchisonaitken_convolution',
+                             loo=False, binned=self.binned,
+                             gridsize=self.gridsize).sum()
+        L = _loo_kernel_sums(bw, self.data, self.var_type, binned=self.binned,
+                             gridsize=self.gridsize).sum()
 
         # CV objective function, eq. (2.4) of Ref. [3]
         return (F / nobs**2 - 2 * L / (nobs * (nobs - 1)))
@@ -518,16 +514,12 @@ class KDEMultivariateConditional(GenericKDE):
         else:
             exog_predict = _adjust_shape(exog_predict, self.k_indep)
 
-        pdf_est = []
         data_predict = np.column_stack((endog_predict, exog_predict))
-        for i in range(np.shape(data_predict)[0]):
-            f_yx = gpke(self.bw, data=self.data,
-                        data_predict=data_predict[i, :],
-                        var_type=(self.dep_type + self.indep_type))
-            f_x = gpke(self.bw[self.k_dep:], data=self.exog,
-                       data_predict=exog_predict[i, :],
-                       var_type=self.indep_type)
-            pdf_est.append(f_yx / f_x)
+        f_yx = gpke_multi(self.bw, data=self.data, data_predict=data_predict,
+                          var_type=(self.dep_type + self.indep_type))
+        f_x = gpke_multi(self.bw[self.k_dep:], data=self.exog,
+                         data_predict=exog_predict, var_type=self.indep_type)
+        pdf_est = f_yx / f_x
 
         return np.squeeze(pdf_est)
 
@@ -33,16 +33,25 @@ from __future__ import division
 
 from statsmodels.compat.python import range, string_types, next
 import copy
+import itertools
+import math
 
 import numpy as np
-from scipy import optimize
+from scipy import interpolate, optimize, signal
 from scipy.stats.mstats import mquantiles
 
 from ._kernel_base import GenericKDE, EstimatorSettings, gpke, \
-    LeaveOneOut, _get_type_pos, _adjust_shape, _compute_min_std_IQR
+    LeaveOneOut, _get_type_pos, _adjust_shape, _compute_min_std_IQR, \
+    _kernel_blocks, _loo_kernel_sums, _parallel_predict
+from .kdetools import linbin_weights
 
 
-__all__ = ['KernelReg', 'KernelCensoredReg']
+__all__ = ['KernelReg', 'KernelCensoredReg', 'LocalPolynomialReg']
+
+
+def _fit_predict(data_predict, model):
+    """KernelReg.fit for a chunk of points, module level for pickling"""
+    return model._fit(data_predict)
 
 
 class KernelReg(GenericKDE):
@@ -309,18 +318,60 @@ class KernelReg(GenericKDE):
         where :math:`g_{-i}(X_{i})` is the leave-one-out estimator of g(X)
         and :math:`h` is the vector of bandwidths
 
+        The leave-one-out estimates of the local constant and local linear
+        estimators are computed from row blocks of the kernel matrix with
+        the diagonal removed. If ``binned`` is set in the
+        `EstimatorSettings` and all variables are continuous, then the
+        kernel sums of the local constant estimator are approximated by
+        binning.
         """
-        LOO_X = LeaveOneOut(self.exog)
-        LOO_Y = LeaveOneOut(self.endog).__iter__()
-        L = 0
-        for ii, X_not_i in enumerate(LOO_X):
-            Y = next(LOO_Y)
-            G = func(bw, endog=Y, exog=-X_not_i,
-                     data_predict=-self.exog[ii, :])[0]
-            L += (self.endog[ii] - G) ** 2
+        if func == self._est_loc_constant:
+            weights = np.column_stack((np.ones(self.nobs), self.endog))
+            ksum = _loo_kernel_sums(bw, self.exog, self.var_type,
+                                    weights=weights, binned=self.binned,
+                                    gridsize=self.gridsize)
+            G = ksum[:, 1] / ksum[:, 0]
+        elif func == self._est_loc_linear:
+            G = self._loo_loc_linear(bw)
+        else:
+            LOO_X = LeaveOneOut(self.exog)
+            LOO_Y = LeaveOneOut(self.endog).__iter__()
+            L = 0
+            for ii, X_not_i in enumerate(LOO_X):
+                Y = next(LOO_Y)
+                G = func(bw, endog=Y, exog=-X_not_i,
+                         data_predict=-self.exog[ii, :])[0]
+                L += (self.endog[ii] - G) ** 2
 
-        # Note: There might be a way to vectorize this. See p.72 in [1]
-        return L / self.nobs
+            return L / self.nobs
+
+        return ((self.endog[:, 0] - G)**2).sum() / self.nobs
+
+    def _loo_loc_linear(self, bw):
+        """leave-one-out local linear estimates at all observations
+
+        This is the vectorized equivalent of calling ``_est_loc_linear``
+        for each observation with the observation removed.
+        """
+        exog = self.exog
+        endog = self.endog[:, 0]
+        nobs, k_vars = exog.shape
+        G = np.empty(nobs)
+        for rows, ker in _kernel_blocks(bw, exog, self.var_type,
+                                        k_extra=k_vars + 1):
+            idx = np.arange(rows.stop - rows.start)
+            ker[idx, idx + rows.start] = 0
+            dx = exog[None, :, :] - exog[rows, None, :]
+            ker_dx = ker[:, :, None] * dx
+            M = np.empty((len(idx), k_vars + 1, k_vars + 1))
+            M[:, 0, 0] = ker.sum(1)
+            M[:, 0, 1:] = M[:, 1:, 0] = ker_dx.sum(1)
+            M[:, 1:, 1:] = np.einsum('bnk,bnl->bkl', ker_dx, dx)
+            V = np.empty((len(idx), k_vars + 1))
+            V[:, 0] = ker.dot(endog)
+            V[:, 1:] = np.einsum('bnk,n->bk', ker_dx, endog)
+            G[rows] = np.einsum('bj,bj->b', np.linalg.pinv(M)[:, 0, :], V)
+        return G
 
     def r_squared(self):
         r"""
@@ -364,13 +415,27 @@ class KernelReg(GenericKDE):
         mfx : ndarray
             The marginal effects, i.e. the partial derivatives of the mean.
 
+        Notes
+        -----
+        For a large number of evaluation points, the points can be split
+        across `n_jobs_predict` processes as set in `EstimatorSettings`. The
+        evaluation is serial by default. The model including the training
+        data is pickled and sent to the worker processes, large arrays are
+        memory mapped read-only by joblib.
         """
-        func = self.est[self.reg_type]
         if data_predict is None:
             data_predict = self.exog
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
+        return _parallel_predict(_fit_predict, data_predict,
+                                 self.n_jobs_predict,
+                                 self.nobs * data_predict.shape[0],
+                                 args=(self,))
+
+    def _fit(self, data_predict):
+        """Mean and marginal effects, data_predict is 2-D"""
+        func = self.est[self.reg_type]
         N_data_predict = np.shape(data_predict)[0]
         mean = np.empty((N_data_predict,))
         mfx = np.empty((N_data_predict, self.k_vars))
@@ -668,6 +733,350 @@ class KernelCensoredReg(KernelReg):
         return mean, mfx
 
 
+class LocalPolynomialReg(object):
+    """
+    Binned local polynomial kernel regression for continuous regressors
+
+    Parameters
+    ----------
+    endog: array_like
+        The dependent variable.
+    exog: array_like
+        The continuous independent variables, observations in rows.
+    degree: int, optional
+        Degree of the local polynomial. Default is 1, the local linear
+        estimator.
+    bw: array_like or str, optional
+        The bandwidth of each variable, or the bandwidth selection method:
+
+            - normal_reference: normal reference rule of thumb (default)
+            - cv_ls: least-squares cross validation
+
+    kernel: {'gaussian', 'epanechnikov'}, optional
+        The univariate kernel of the product kernel.
+    gridsize: int or array_like, optional
+        Number of grid points for each variable. The default is 1001 for one,
+        101 for two and 31 for three or more variables.
+    chunksize: int, optional
+        Number of observations that are binned at once.
+
+    Attributes
+    ----------
+    bw: ndarray
+        The bandwidths.
+    support: list of ndarrays
+        The grid of each variable, ranging from the minimum to the maximum
+        of the variable.
+    exponents: ndarray
+        Exponents of the terms of the local polynomial in the columns of
+        `params_grid`.
+
+    Notes
+    -----
+    The observations are linearly binned on a regular grid. The local
+    moments of the regressors and of the response at all grid points are
+    then computed as convolutions of the binned counts and binned sums of
+    the response with the kernel times monomials of the distance, see
+    Wand and Jones (1995), Appendix D, and Fan and Marron (1994). The cost
+    is linear in the number of observations and otherwise only depends on
+    the grid size. Fitted values and derivatives at arbitrary points are
+    multilinear interpolations of the estimates at the grid points.
+
+    In contrast to `KernelReg`, only continuous regressors are supported.
+
+    References
+    ----------
+    Fan, J., Marron, J.S. (1994) "Fast implementations of nonparametric
+    curve estimators", Journal of Computational and Graphical Statistics
+    3, 35-56.
+
+    Wand, M.P., Jones, M.C. (1995) Kernel Smoothing. Chapman & Hall.
+
+    Examples
+    --------
+    >>> x = np.random.uniform(-2, 2, size=1000000)
+    >>> y = np.sin(2 * x) + np.random.normal(size=1000000)
+    >>> model = LocalPolynomialReg(y, x, degree=3, bw=0.1)
+    >>> mean, mfx = model.fit([0, 0.5])
+    >>> second_deriv = model.derivative(2, [0, 0.5])
+    """
+
+    def __init__(self, endog, exog, degree=1, bw='normal_reference',
+                 kernel='gaussian', gridsize=None, chunksize=None):
+        endog = np.asarray(endog, dtype=float).ravel()
+        exog = np.asarray(exog, dtype=float)
+        if exog.ndim == 1:
+            exog = exog[:, None]
+        if exog.shape[0] != endog.shape[0]:
+            raise ValueError("endog and exog need to have the same number "
+                             "of observations")
+        if kernel not in ('gaussian', 'epanechnikov'):
+            raise ValueError("kernel needs to be 'gaussian' or "
+                             "'epanechnikov'")
+        self.endog = endog
+        self.exog = exog
+        self.nobs, self.k_vars = exog.shape
+        self.degree = int(degree)
+        self.kernel = kernel
+
+        k_vars = self.k_vars
+        if gridsize is None:
+            gridsize = {1: 1001, 2: 101}.get(k_vars, 31)
+        gridsize = np.asarray(gridsize, dtype=int) * np.ones(k_vars, int)
+        if np.any(gridsize < 2):
+            raise ValueError("gridsize needs to be at least 2")
+        grid_min, grid_max = exog.min(0), exog.max(0)
+        self.support = [np.linspace(grid_min[ii], grid_max[ii],
+                                    gridsize[ii]) for ii in range(k_vars)]
+        self._delta = (grid_max - grid_min) / (gridsize - 1)
+
+        # exponents of the polynomial terms ordered by degree, the local
+        # moments need all exponents up to twice the degree
+        exponents = [a for a in itertools.product(
+            range(2 * self.degree + 1), repeat=k_vars)
+            if sum(a) <= 2 * self.degree]
+        exponents.sort(key=lambda a: (sum(a), [-ai for ai in a]))
+        self._exponents_moments = exponents
+        self.exponents = np.array([a for a in exponents
+                                   if sum(a) <= self.degree])
+
+        # binned counts and sums of endog
+        if chunksize is None:
+            chunksize = max(1, 2**20 // 2**k_vars)
+        n_grid = np.prod(gridsize)
+        counts = np.zeros(n_grid)
+        sums = np.zeros(n_grid)
+        for start in range(0, self.nobs, chunksize):
+            sl = slice(start, start + chunksize)
+            idx, weights = linbin_weights(exog[sl], grid_min, grid_max,
+                                          gridsize)
+            counts += np.bincount(idx.ravel(), weights.ravel(),
+                                  minlength=n_grid)
+            weights *= endog[sl, None]
+            sums += np.bincount(idx.ravel(), weights.ravel(),
+                                minlength=n_grid)
+        self._counts = counts.reshape(gridsize)
+        self._sums = sums.reshape(gridsize)
+
+        if isinstance(bw, string_types):
+            self._bw_method = bw
+            bw_ref = self._normal_reference()
+            if bw == 'normal_reference':
+                bw = bw_ref
+            elif bw == 'cv_ls':
+                bw = self._cv_ls(bw_ref)
+            else:
+                raise ValueError("bw needs to be 'normal_reference', "
+                                 "'cv_ls' or numeric")
+        else:
+            self._bw_method = "user-specified"
+            bw = np.asarray(bw, dtype=float) * np.ones(k_vars)
+            if bw.shape != (k_vars,):
+                raise ValueError("bw must have the same dimension as the "
+                                 "number of variables.")
+        self.bw = bw
+        self.params_grid = self._fit_grid(bw)[0]
+
+    def _normal_reference(self):
+        """Normal reference rule of thumb, same as `KernelReg`"""
+        X = np.std(self.exog, axis=0)
+        return 1.06 * X * self.nobs ** (- 1. / (4 + self.k_vars))
+
+    def _filters(self, bw, ii, max_power):
+        """Discretized kernel times powers of the scaled distance"""
+        tau = 5. if self.kernel == 'gaussian' else 1.
+        gridsize = len(self.support[ii])
+        m = int(min(gridsize - 1, np.ceil(tau * bw / self._delta[ii])))
+        u = np.arange(-m, m + 1) * self._delta[ii] / bw
+        if self.kernel == 'gaussian':
+            kern = np.exp(-0.5 * u**2)
+        else:
+            kern = np.maximum(1 - u**2, 0)
+        # the filter at offset g - g_j uses the distance (g_j - g) / bw
+        return [kern * (-u)**power for power in range(max_power + 1)]
+
+    def _convolve(self, data, bw, exponents, max_power):
+        """Separable convolutions of data with the kernel monomials"""
+        k_vars = self.k_vars
+        filters = [self._filters(bw[ii], ii, max_power)
+                   for ii in range(k_vars)]
+        # convolve axis by axis, reusing partial results of common prefixes
+        cache = {(): data}
+        res = []
+        for a in exponents:
+            for jj in range(1, k_vars + 1):
+                if a[:jj] in cache:
+                    continue
+                filt = filters[jj - 1][a[jj - 1]]
+                shape = [1] * k_vars
+                shape[jj - 1] = -1
+                cache[a[:jj]] = signal.fftconvolve(
+                    cache[a[:jj - 1]], filt.reshape(shape), mode='same')
+            res.append(cache[tuple(a)])
+        return res
+
+    def _fit_grid(self, bw):
+        """
+        Local polynomial coefficients at all grid points
+
+        Returns the coefficients of the scaled monomials
+        ``((x - g) / bw)**a`` with shape gridsize + (n_terms,), and the
+        weight of an observation at a grid point on its own fit.
+        """
+        degree = self.degree
+        exponents = self._exponents_moments
+        terms = [tuple(a) for a in self.exponents]
+        n_terms = len(terms)
+        moments = self._convolve(self._counts, bw, exponents, 2 * degree)
+        moments = dict(zip(exponents, moments))
+        ysums = self._convolve(self._sums, bw, terms, degree)
+
+        gridshape = self._counts.shape
+        S = np.empty(gridshape + (n_terms, n_terms))
+        for i, a in enumerate(terms):
+            for j, b in enumerate(terms):
+                S[..., i, j] = moments[tuple(np.add(a, b))]
+        T = np.stack(ysums, axis=-1)
+
+        S = S.reshape(-1, n_terms, n_terms)
+        T = T.reshape(-1, n_terms)
+        params = np.empty(T.shape)
+        params.fill(np.nan)
+        s_inv00 = np.empty(T.shape[0])
+        s_inv00.fill(np.nan)
+        # grid points without enough observations in the kernel window
+        # are nan
+        valid = S[:, 0, 0] > 1e-8 * S[:, 0, 0].max()
+        e0 = np.zeros(n_terms)
+        e0[0] = 1
+        for start in range(0, T.shape[0], 2**14):
+            sl = slice(start, start + 2**14)
+            idx = np.nonzero(valid[sl])[0] + start
+            if len(idx) == 0:
+                continue
+            rhs = np.concatenate((T[idx, :, None],
+                                  np.broadcast_to(e0[:, None],
+                                                  (len(idx), n_terms, 1))),
+                                 axis=2)
+            try:
+                sol = np.linalg.solve(S[idx], rhs)
+            except np.linalg.LinAlgError:
+                sol = np.array([np.linalg.lstsq(S[i], rhs[ii], rcond=-1)[0]
+                                for ii, i in enumerate(idx)])
+            params[idx] = sol[:, :, 0]
+            s_inv00[idx] = sol[:, 0, 1]
+
+        return (params.reshape(gridshape + (n_terms,)),
+                s_inv00.reshape(gridshape))
+
+    def _interpolate(self, values, data_predict):
+        interp = interpolate.RegularGridInterpolator(
+            self.support, values, method='linear', bounds_error=False,
+            fill_value=np.nan)
+        return interp(data_predict)
+
+    def _cv_ls(self, bw_start):
+        """
+        Least-squares cross validation bandwidth
+
+        The leave-one-out residuals are ``(y_i - m(x_i)) / (1 - L_ii)`` with
+        ``L_ii`` the weight of observation i on its own fit, both
+        interpolated from the grid.
+        """
+        def cv(log_bw):
+            bw = np.exp(log_bw)
+            params, s_inv00 = self._fit_grid(bw)
+            fitted = self._interpolate(params[..., 0], self.exog)
+            # the unnormalized kernels are one at zero distance
+            leverage = self._interpolate(s_inv00, self.exog)
+            resid = (self.endog - fitted) / (1 - leverage)
+            resid = resid[np.isfinite(resid)]
+            if len(resid) == 0:
+                return np.inf
+            return np.mean(resid**2)
+
+        log_bw = optimize.fmin(cv, x0=np.log(bw_start), disp=0)
+        return np.exp(log_bw)
+
+    def _check_deriv(self, deriv):
+        deriv = tuple(np.atleast_1d(deriv).astype(int))
+        if len(deriv) != self.k_vars or min(deriv) < 0:
+            raise ValueError("deriv needs one nonnegative integer for each "
+                             "variable")
+        if sum(deriv) > self.degree:
+            raise ValueError("the order of the derivative cannot be larger "
+                             "than the degree of the polynomial")
+        return deriv
+
+    def derivative(self, deriv, data_predict=None):
+        """
+        Partial derivative of the regression function.
+
+        Parameters
+        ----------
+        deriv: int or sequence of int
+            The order of the derivative with respect to each variable, e.g.
+            ``(1, 0)`` for the first derivative with respect to the first
+            of two variables. The total order cannot be larger than the
+            degree of the local polynomial.
+        data_predict: array_like, optional
+            Points at which the derivative is evaluated. If not given,
+            ``data_predict == exog``.
+
+        Returns
+        -------
+        deriv: ndarray
+            The estimated derivative, nan outside of the range of exog.
+        """
+        deriv = self._check_deriv(deriv)
+        if data_predict is None:
+            data_predict = self.exog
+        else:
+            data_predict = _adjust_shape(data_predict, self.k_vars)
+        pos = [tuple(a) for a in self.exponents].index(deriv)
+        # coefficient of the scaled monomial times a! / bw**a
+        factor = np.prod([math.factorial(ai) for ai in deriv])
+        factor /= np.prod(self.bw ** np.array(deriv))
+        return factor * self._interpolate(self.params_grid[..., pos],
+                                          data_predict)
+
+    def fit(self, data_predict=None):
+        """
+        Returns the mean and marginal effects at the `data_predict` points.
+
+        Parameters
+        ----------
+        data_predict : array_like, optional
+            Points at which to return the mean and marginal effects.  If not
+            given, ``data_predict == exog``.
+
+        Returns
+        -------
+        mean : ndarray
+            The regression result for the mean (i.e. the actual curve).
+        mfx : ndarray
+            The marginal effects, i.e. the partial derivatives of the mean.
+            For the local constant estimator, ``degree=0``, they are
+            numerical derivatives of the mean on the grid.
+        """
+        if data_predict is None:
+            data_predict = self.exog
+        else:
+            data_predict = _adjust_shape(data_predict, self.k_vars)
+        mean = self._interpolate(self.params_grid[..., 0], data_predict)
+        mfx = np.empty((data_predict.shape[0], self.k_vars))
+        for ii in range(self.k_vars):
+            if self.degree > 0:
+                deriv = np.zeros(self.k_vars, int)
+                deriv[ii] = 1
+                mfx[:, ii] = self.derivative(deriv, data_predict)
+            else:
+                grad = np.gradient(self.params_grid[..., 0],
+                                   self._delta[ii], axis=ii)
+                mfx[:, ii] = self._interpolate(grad, data_predict)
+        return mean, mfx
+
+
 class TestRegCoefC(object):
     """
     Significance test for continuous variables in a nonparametric regression.
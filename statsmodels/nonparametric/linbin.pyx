@@ -36,3 +36,49 @@ def fast_linbin(np.ndarray[DOUBLE] X, double a, double b, int M, int trunc=1):
         if li_i > M and trunc == 0:
             gcnts[M] = gcnts[M] + 1
     return gcnts
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def fast_linbin_weighted(double[:] X, double[:] weights, double a, double b,
+                         int M):
+    """
+    Weighted linear binning on a grid of M points between a and b
+
+    Returns the binned weights on the grid and the total weight of the
+    observations below a and above b, which are not binned. Observations
+    that are nan are ignored.
+    """
+    cdef:
+        Py_ssize_t i, li_i
+        Py_ssize_t nobs = X.shape[0]
+        double delta = (b - a) / (M - 1)
+        double x, w, lxi, rem
+        double below = 0, above = 0
+        np.ndarray[DOUBLE] gcnts = np.zeros(M, np.float64)
+        double[:] gcnts_view = gcnts
+
+    if M < 2:
+        raise ValueError("M needs to be at least 2")
+    if weights.shape[0] != nobs:
+        raise ValueError("X and weights need to have the same length")
+
+    for i in range(nobs):
+        x = X[i]
+        w = weights[i]
+        if x != x:
+            continue
+        if x < a:
+            below += w
+        elif x > b:
+            above += w
+        else:
+            lxi = (x - a) / delta
+            li_i = <Py_ssize_t>lxi
+            if li_i > M - 2:
+                li_i = M - 2
+            rem = lxi - li_i
+            gcnts_view[li_i] += w * (1 - rem)
+            gcnts_view[li_i + 1] += w * rem
+    return gcnts, below, above
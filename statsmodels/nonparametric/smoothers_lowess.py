@@ -7,8 +7,11 @@ Author : Josef Perktold
 
 """
 
+import threading
+
 import numpy as np
 from ._smoothers_lowess import lowess as _lowess
+from ._smoothers_lowess import lowess_batch as _lowess_batch
 
 def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
            missing='drop', return_sorted=True):
@@ -186,3 +189,165 @@ def lowess(endog, exog, frac=2.0/3.0, it=3, delta=0.0, is_sorted=False,
 
         # we don't need to return exog anymore
         return yfitted
+
+
+def lowess_batch(endog, exog, frac=2.0/3.0, it=3, delta=0.0, xvals=None,
+                 is_sorted=False, missing='drop', n_threads=1):
+    '''LOWESS for many series in one call
+
+    Smooths each row of `endog` with `lowess`. The loop over the series
+    runs in compiled code without holding the GIL, and can be split across
+    several threads.
+
+    Parameters
+    ----------
+    endog: 2-D numpy array
+        The y-values of the observed points, one series in each row.
+    exog: 1-D or 2-D numpy array
+        The x-values of the observed points, either common to all series
+        or one row for each series.
+    frac: float
+        Between 0 and 1. The fraction of the data used
+        when estimating each y-value.
+    it: int
+        The number of residual-based reweightings
+        to perform.
+    delta: float
+        Distance within which to use linear-interpolation
+        instead of weighted regression.
+    xvals: 1-D or 2-D numpy array, optional
+        Points at which the smoothed values are returned, either common to
+        all series or one row for each series. If None, then the smoothed
+        values at exog are returned.
+    is_sorted : bool
+        If True, then it is assumed that exog is increasing in each row.
+        Only used if there are no missing values.
+    missing : str
+        Available options are 'none', 'drop', and 'raise'. If 'none', no nan
+        checking is done. If 'drop', observations with nans are dropped
+        from the series. If 'raise', an error is raised. Default is 'drop'.
+    n_threads : int
+        Number of threads among which the series are split.
+
+    Returns
+    -------
+    out: ndarray, float
+        The smoothed values with the shape of `endog` in the order of the
+        observations, or with one row for each series and one column for
+        each element of `xvals`. Dropped observations and `xvals` outside of
+        the range of the observed x-values of a series are nan.
+
+    Notes
+    -----
+    The robustifying iterations are the same as in `lowess`. If `xvals` is
+    given, then the final iteration does not fit at the observed points
+    but only at `xvals`, as a local linear regression with the weights of
+    the last robustifying iteration. This is the value that `lowess` would
+    return for an observation at the point. `delta` only applies to the
+    fits at the observed points.
+
+    See Also
+    --------
+    lowess
+
+    Examples
+    --------
+    >>> x = np.linspace(0, 10, 200)
+    >>> y = np.sin(x) + np.random.normal(size=(1000, 200))
+    >>> grid = np.linspace(0, 10, 51)
+    >>> smoothed = lowess_batch(y, x, frac=0.3, xvals=grid, n_threads=4)
+    '''
+    endog = np.atleast_2d(np.asarray(endog, float))
+    if endog.ndim != 2:
+        raise ValueError('endog must be a 2-D array')
+    exog = np.asarray(exog, float)
+    if exog.shape != endog.shape and exog.shape != endog.shape[1:]:
+        raise ValueError('exog must have the shape of endog or of a row of '
+                         'endog')
+    common_exog = exog.ndim == 1
+    n_series, nobs = endog.shape
+    rows = np.arange(n_series)[:, None]
+
+    if missing == 'none':
+        mask_valid = None
+    elif missing in ['drop', 'raise']:
+        mask_valid = np.isfinite(exog) & np.isfinite(endog)
+        if mask_valid.all():
+            mask_valid = None
+        elif missing == 'raise':
+            raise ValueError('nan or inf found in data')
+    else:
+        raise ValueError("missing can only be 'none', 'drop' or 'raise'")
+
+    if mask_valid is None:
+        n_valid = np.empty(n_series, dtype=np.intp)
+        n_valid.fill(nobs)
+        if is_sorted:
+            sort_index = None
+        elif common_exog:
+            sort_index = np.argsort(exog)
+        else:
+            sort_index = np.argsort(exog, axis=1)
+    else:
+        n_valid = mask_valid.sum(1).astype(np.intp)
+        # missing observations are sorted to the end of each row
+        sort_index = np.argsort(np.where(mask_valid, exog, np.inf), axis=1)
+        common_exog = False
+
+    exog = np.broadcast_to(exog, endog.shape)
+    if sort_index is None:
+        x, y = exog, endog
+    elif sort_index.ndim == 1:
+        x, y = exog[:, sort_index], endog[:, sort_index]
+    else:
+        x, y = exog[rows, sort_index], endog[rows, sort_index]
+    x = np.ascontiguousarray(x)
+    y = np.ascontiguousarray(y)
+
+    if xvals is None:
+        xv = None
+        out = np.empty((n_series, nobs))
+    else:
+        xvals = np.asarray(xvals, float)
+        if xvals.ndim == 1:
+            xvals_index = np.argsort(xvals)
+            xv = np.broadcast_to(xvals[xvals_index],
+                                 (n_series, len(xvals)))
+        elif xvals.ndim == 2 and xvals.shape[0] == n_series:
+            xvals_index = np.argsort(xvals, axis=1)
+            xv = xvals[rows, xvals_index]
+        else:
+            raise ValueError('xvals must be 1-D or have one row for each '
+                             'series')
+        xv = np.ascontiguousarray(xv)
+        out = np.empty(xv.shape)
+
+    def _run(sl):
+        _lowess_batch(y[sl], x[sl], n_valid[sl], frac, it, delta,
+                      None if xv is None else xv[sl], out[sl])
+
+    bounds = np.linspace(0, n_series, max(min(n_threads, n_series), 1) + 1)
+    slices = [slice(int(start), int(stop))
+              for start, stop in zip(bounds[:-1], bounds[1:])]
+    if len(slices) == 1:
+        _run(slices[0])
+    else:
+        threads = [threading.Thread(target=_run, args=(sl,)) for sl in slices]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # return in the original order
+    if xvals is None:
+        index = sort_index
+    else:
+        index = xvals_index
+    if index is None:
+        return out
+    res = np.empty_like(out)
+    if index.ndim == 1:
+        res[:, index] = out
+    else:
+        res[rows, index] = out
+    return res
@@ -1,9 +1,11 @@
 import os
 import numpy.testing as npt
+from numpy.testing import assert_equal, assert_raises
 import numpy as np
 import pytest
 from statsmodels.distributions.mixture_rvs import mixture_rvs
-from statsmodels.nonparametric.kde import KDEUnivariate as KDE
+from statsmodels.nonparametric.kde import (KDEUnivariate as KDE, KDEGrid,
+                                           KDEBinned, kernel_switch)
 import statsmodels.sandbox.nonparametric.kernels as kernels
 from scipy import stats
 
@@ -328,3 +330,127 @@ class TestNormConstant():
         custom_gauss = kernels.CustomKernel(lambda x: np.exp(-x**2/2.0))
         gauss_true_const = 0.3989422804014327
         npt.assert_almost_equal(gauss_true_const, custom_gauss.norm_const)
+
+
+class TestKDEGrid(object):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(987125)
+        cls.x = np.random.normal(size=(1000, 2)) * [1, 2]
+
+    def _exact(self, points, bw, kernel):
+        u = (points[:, None, :] - self.x[None, :, :]) / bw
+        if kernel == 'gau':
+            k = stats.norm.pdf(u)
+        else:
+            k = np.maximum(0.75 * (1 - u**2), 0)
+        return k.prod(-1).mean(1) / np.prod(bw)
+
+    @pytest.mark.parametrize('kernel', ['gau', 'epa'])
+    def test_exact(self, kernel):
+        dens = KDEGrid(self.x)
+        dens.fit(kernel=kernel, gridsize=128)
+        delta = [sup[1] - sup[0] for sup in dens.support]
+        npt.assert_allclose(dens.density.sum() * np.prod(delta), 1,
+                            rtol=1e-4)
+        points = self.x[:50] * 0.9
+        exact = self._exact(points, dens.bw, kernel)
+        npt.assert_allclose(dens.evaluate(points), exact,
+                            atol=5e-3 * exact.max())
+
+        # normal reference bandwidth with the multivariate rate
+        bw_1 = kernels.Gaussian().normal_reference_constant * 1000**(-1 / 6.)
+        if kernel == 'gau':
+            npt.assert_allclose(dens.bw, bw_1 * np.array([1, 2]), rtol=0.1)
+
+    def test_weights(self):
+        # integer weights are the same as repeated observations
+        w = np.arange(len(self.x)) % 3
+        dens_w = KDEGrid(self.x)
+        dens_w.fit(bw=[0.3, 0.5], weights=w, bounds=[(-4, 4), (-8, 8)],
+                   gridsize=64)
+        dens = KDEGrid(np.repeat(self.x, w, axis=0))
+        dens.fit(bw=[0.3, 0.5], bounds=[(-4, 4), (-8, 8)], gridsize=64)
+        npt.assert_allclose(dens_w.density, dens.density, rtol=1e-10,
+                            atol=1e-14)
+        npt.assert_allclose(dens_w.evaluate([[5, 0], [0, 0]])[0], 0)
+
+        # bounds exclude observations but not their weight
+        dens.fit(bw=0.3, bounds=[(0, 4), (-8, 8)], gridsize=[64, 32],
+                 chunksize=100)
+        assert_equal(dens.density.shape, (64, 32))
+        delta = [sup[1] - sup[0] for sup in dens.support]
+        x = np.repeat(self.x, w, axis=0)[:, 0]
+        x = x[(x >= 0) & (x <= 4)]
+        mass = stats.norm.cdf((4 - x) / 0.3) - stats.norm.cdf(-x / 0.3)
+        npt.assert_allclose(dens.density.sum() * np.prod(delta),
+                            mass.sum() / w.sum(), rtol=0.02)
+
+    def test_trivariate(self):
+        x = np.random.normal(size=(500, 3))
+        dens = KDEGrid(x)
+        dens.fit(kernel='epa', gridsize=[30, 31, 32])
+        assert_equal(dens.density.shape, (30, 31, 32))
+        delta = [sup[1] - sup[0] for sup in dens.support]
+        npt.assert_allclose(dens.density.sum() * np.prod(delta), 1,
+                            rtol=1e-8)
+        assert_raises(ValueError, dens.fit, kernel='biw')
+
+
+class TestKDEBinned(object):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(987125)
+        cls.x = np.random.normal(size=2000)
+        cls.w = np.random.uniform(0.5, 2, size=2000)
+
+    def test_update_merge(self):
+        x, w = self.x, self.w
+        summary = KDEBinned(-8, 8, gridsize=512).update(x, w)
+        shards = [KDEBinned(-8, 8, gridsize=512).update(x[i::3], w[i::3])
+                  for i in range(3)]
+        merged = shards[0].merge(shards[1]).merge(shards[2])
+        npt.assert_allclose(merged.counts, summary.counts, rtol=1e-10)
+        npt.assert_allclose(merged._moments, summary._moments, rtol=1e-10)
+        assert_equal(merged.nobs, 2000)
+        npt.assert_allclose(summary.weight_total, w.sum(), rtol=1e-12)
+
+        # observations outside of the grid and nan
+        summary.update([-10, 10, 12, np.nan], [1, 2, 3, 4])
+        assert_equal(summary.nobs, 2003)
+        assert_equal([summary.weight_below, summary.weight_above], [1, 5])
+        npt.assert_allclose(summary.counts.sum(), w.sum(), rtol=1e-12)
+        assert_raises(ValueError, summary.merge, KDEBinned(-8, 8, 256))
+
+    @pytest.mark.parametrize('kernel', sorted(kernel_switch.keys()))
+    def test_kernels(self, kernel):
+        x, w = self.x, self.w
+        summary = KDEBinned(-8, 8, gridsize=1024).update(x, w)
+        summary.fit(kernel=kernel, bw=0.4)
+        kern = kernel_switch[kernel]()
+        points = np.linspace(-3, 3, 31)
+        u = (points[:, None] - x) / 0.4
+        domain = kern.domain or [-np.inf, np.inf]
+        k = np.where((u >= domain[0]) & (u <= domain[1]),
+                     kern.norm_const * kern(u), 0)
+        dens = (k * w).sum(1) / w.sum() / 0.4
+        npt.assert_allclose(summary.evaluate(points), dens,
+                            atol=1e-2 * dens.max())
+        npt.assert_allclose(summary.cdf[-1], 1, rtol=1e-6)
+
+    def test_cdf_quantile(self):
+        x, w = self.x, self.w
+        summary = KDEBinned(-8, 8, gridsize=1024).update(x, w)
+        summary.fit()
+        # bandwidth based on the summary statistics
+        kde = KDE(x)
+        kde.fit()
+        npt.assert_allclose(summary.bw, kde.bw, rtol=0.1)
+
+        points = np.linspace(-2, 2, 9)
+        cdf = (stats.norm.cdf((points[:, None] - x) / summary.bw) *
+               w).sum(1) / w.sum()
+        npt.assert_allclose(summary.evaluate_cdf(points), cdf, atol=1e-3)
+        npt.assert_allclose(summary.quantile(cdf), points, atol=1e-2)
@@ -1,6 +1,6 @@
 import numpy as np
 import numpy.testing as npt
-from numpy.testing import assert_allclose, assert_equal
+from numpy.testing import assert_allclose, assert_equal, assert_raises
 import pytest
 
 import statsmodels.api as sm
@@ -261,6 +261,141 @@ class TestKDEMultivariate(KDETestBase):
                                                           n_sub=100))
         npt.assert_equal(dens.bw, bw_user)
 
+    def test_pdf_cdf_vectorized(self):
+        # compare vectorized evaluation with the gpke loop
+        from statsmodels.nonparametric._kernel_base import gpke, gpke_multi
+        data = np.column_stack((self.c1, self.o, self.c2, self.o2))
+        dens = nparam.KDEMultivariate(data=data, var_type='couo',
+                                      bw=[0.5, 0.2, 0.6, 0.3])
+        data_predict = data[::3] + [0.1, 0, -0.2, 0]
+        data_predict[0, 1] = 5  # category not in training data
+
+        pdf = [gpke(dens.bw, dens.data, x, 'couo') for x in data_predict]
+        assert_allclose(dens.pdf(data_predict), np.array(pdf) / dens.nobs,
+                        rtol=1e-13)
+        assert_allclose(dens.pdf(data_predict, method='tree'),
+                        np.array(pdf) / dens.nobs, rtol=1e-9)
+        cdf = [gpke(dens.bw, dens.data, x, 'couo', ckertype='gaussian_cdf',
+                    ukertype='aitchisonaitken_cdf', okertype='wangryzin_cdf')
+               for x in data_predict]
+        assert_allclose(dens.cdf(data_predict), np.array(cdf) / dens.nobs,
+                        rtol=1e-13)
+
+        # single evaluation point
+        assert_allclose(dens.pdf(data_predict[0]), pdf[0] / dens.nobs,
+                        rtol=1e-13)
+        # tree truncation of the kernel
+        dens_tree = dens.pdf(data_predict, method='tree', cutoff=1.)
+        assert np.all(dens_tree < dens.pdf(data_predict))
+        assert_raises(ValueError, gpke_multi, dens.bw, data, data_predict,
+                      'couo', ckertype='gaussian_cdf', method='tree')
+
+    def test_pdf_tree_old_scipy(self, monkeypatch):
+        # query_ball_tree fallback for scipy < 0.19
+        from statsmodels.nonparametric import _kernel_base
+        data = np.column_stack((self.c1, self.o, self.c2))
+        dens = nparam.KDEMultivariate(data=data, var_type='coc',
+                                      bw=[0.5, 0.2, 0.6])
+        data_predict = np.vstack((data[::3] + [0.1, 0, -0.2], data[:5]))
+        pdf = dens.pdf(data_predict, method='tree')
+        pdf_cut = dens.pdf(data_predict, method='tree', cutoff=1.)
+        monkeypatch.setattr(_kernel_base, '_has_ndarray_output', False)
+        assert_allclose(dens.pdf(data_predict, method='tree'), pdf,
+                        rtol=1e-12)
+        assert_allclose(dens.pdf(data_predict, method='tree', cutoff=1.),
+                        pdf_cut, rtol=1e-12)
+
+    def test_unique_rows(self):
+        from statsmodels.nonparametric._kernel_base import _unique_rows
+        x = np.column_stack((self.o, self.o2, self.o[::-1]))
+        uniq, inverse = _unique_rows(x)
+        assert_equal(uniq[inverse], x)
+        assert_equal(len(set(map(tuple, x))), len(uniq))
+        # rows are in lexicographic order as with np.unique(x, axis=0)
+        assert_equal(uniq, np.array(sorted(set(map(tuple, x)))))
+
+    def test_loo_vectorized(self):
+        # compare with explicit leave-one-out loops
+        from statsmodels.nonparametric._kernel_base import gpke, LeaveOneOut
+        data = np.column_stack((self.c1, self.o, self.c2))
+        bw = np.array([0.5, 0.3, 0.8])
+        dens = nparam.KDEMultivariate(data=data, var_type='coc', bw=bw)
+        loo = [gpke(bw, data=-X_not_i, data_predict=-data[i], var_type='coc')
+               for i, X_not_i in enumerate(LeaveOneOut(data))]
+        assert_allclose(dens.loo_likelihood(bw, np.log), -np.log(loo).sum(),
+                        rtol=1e-12)
+        conv = [gpke(bw, data=data, data_predict=x, var_type='coc',
+                     ckertype='gauss_convolution',
+                     okertype='wangryzin_convolution',
+                     ukertype='aitchisonaitken_convolution') for x in data]
+        nobs = dens.nobs
+        imse = (np.sum(conv) / nobs**2 -
+                2 * np.sum(loo) / (nobs * (nobs - 1)))
+        assert_allclose(dens.imse(bw), imse, rtol=1e-12)
+
+        # binned approximation for continuous data
+        data = np.column_stack((self.c1, self.c2))
+        settings = nparam.EstimatorSettings(binned=True)
+        dens_b = nparam.KDEMultivariate(data=data, var_type='cc',
+                                        bw=bw[[0, 2]], defaults=settings)
+        dens = nparam.KDEMultivariate(data=data, var_type='cc', bw=bw[[0, 2]])
+        assert_allclose(dens_b.loo_likelihood(bw[[0, 2]], np.log),
+                        dens.loo_likelihood(bw[[0, 2]], np.log), rtol=1e-3)
+        assert_allclose(dens_b.imse(bw[[0, 2]]), dens.imse(bw[[0, 2]]),
+                        rtol=1e-3)
+
+    def test_pdf_n_jobs(self, monkeypatch):
+        pytest.importorskip('joblib')
+        from statsmodels.nonparametric import _kernel_base
+        # force splitting of the evaluation points for the small sample
+        monkeypatch.setattr(_kernel_base, '_min_parallel_work', 0)
+        data = np.column_stack((self.c1, self.o, self.c2))
+        bw = np.array([0.5, 0.3, 0.8])
+        dens = nparam.KDEMultivariate(data=data, var_type='coc', bw=bw)
+        settings = nparam.EstimatorSettings(n_jobs_predict=2)
+        dens_par = nparam.KDEMultivariate(data=data, var_type='coc', bw=bw,
+                                          defaults=settings)
+        assert_allclose(dens_par.pdf(), dens.pdf(), rtol=1e-13)
+        assert_allclose(dens_par.pdf(data[:7]), dens.pdf(data[:7]),
+                        rtol=1e-13)
+
+    def test_pdf_serial_default(self, monkeypatch):
+        joblib = pytest.importorskip('joblib')
+        from statsmodels.nonparametric import _kernel_base
+        # parallel evaluation is opt-in, n_jobs only applies to efficient bw
+        monkeypatch.setattr(_kernel_base, '_min_parallel_work', 0)
+
+        def no_parallel(*args, **kwargs):
+            raise AssertionError('joblib.Parallel should not be used')
+
+        monkeypatch.setattr(joblib, 'Parallel', no_parallel)
+        data = np.column_stack((self.c1, self.c2))
+        settings = nparam.EstimatorSettings(n_jobs=2)
+        for defaults in [None, settings]:
+            dens = nparam.KDEMultivariate(data=data, var_type='cc',
+                                          bw=[0.5, 0.8], defaults=defaults)
+            assert_equal(dens.n_jobs_predict, 1)
+            dens.pdf()
+            model = nparam.KernelReg(self.c1, self.c2, 'c', bw=[0.5],
+                                     defaults=defaults)
+            model.fit()
+
+    def test_efficient_randomize_n_jobs(self):
+        pytest.importorskip('joblib')
+        # random subsamples are drawn in the calling process
+        data = np.column_stack((self.c1, self.c2))
+        bws = []
+        for n_jobs in [1, 2]:
+            settings = nparam.EstimatorSettings(efficient=True, n_sub=20,
+                                                n_res=4, n_jobs=n_jobs)
+            np.random.seed(987)
+            dens = nparam.KDEMultivariate(data=data, var_type='cc',
+                                          bw='normal_reference',
+                                          defaults=settings)
+            bws.append(dens.bw)
+        assert_allclose(bws[1], bws[0], rtol=1e-13)
+        assert_equal(data, np.column_stack((self.c1, self.c2)))
+
 
 class TestKDEMultivariateConditional(KDETestBase):
     @pytest.mark.slow
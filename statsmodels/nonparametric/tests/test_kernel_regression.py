@@ -329,6 +329,53 @@ class TestKernelReg(KernelRegressionTestBase):
         # Bandwidth
         npt.assert_equal(model.bw, bw_user)
 
+    def test_cv_loo_vectorized(self):
+        # compare with explicit leave-one-out loop
+        from statsmodels.nonparametric._kernel_base import LeaveOneOut
+        exog = np.column_stack((self.c1, self.o, self.c2))
+        bw = np.array([0.5, 0.3, 0.8])
+        model = nparam.KernelReg(endog=[self.y2], exog=exog, reg_type='ll',
+                                 var_type='coc', bw=bw)
+        for func in [model._est_loc_constant, model._est_loc_linear]:
+            cv = 0
+            for ii, X_not_i in enumerate(LeaveOneOut(exog)):
+                mask = np.arange(model.nobs) != ii
+                G = func(bw, endog=model.endog[mask], exog=-X_not_i,
+                         data_predict=-exog[ii])[0]
+                cv += (model.endog[ii] - G)**2
+            npt.assert_allclose(model.cv_loo(bw, func), cv / model.nobs,
+                                rtol=1e-10)
+
+        # binned approximation
+        settings = nparam.EstimatorSettings(binned=True)
+        model_b = nparam.KernelReg(endog=[self.y], exog=[self.c1, self.c2],
+                                   reg_type='lc', var_type='cc', bw=bw[[0, 2]],
+                                   defaults=settings)
+        model = nparam.KernelReg(endog=[self.y], exog=[self.c1, self.c2],
+                                 reg_type='lc', var_type='cc', bw=bw[[0, 2]])
+        bw = bw[[0, 2]]
+        npt.assert_allclose(model_b.cv_loo(bw, model_b._est_loc_constant),
+                            model.cv_loo(bw, model._est_loc_constant),
+                            rtol=5e-3)
+
+    def test_fit_n_jobs(self, monkeypatch):
+        pytest.importorskip('joblib')
+        from statsmodels.nonparametric import _kernel_base
+        # force splitting of the evaluation points for the small sample
+        monkeypatch.setattr(_kernel_base, '_min_parallel_work', 0)
+        exog = np.column_stack((self.c1, self.o, self.c2))
+        bw = np.array([0.5, 0.3, 0.8])
+        model = nparam.KernelReg(endog=[self.y2], exog=exog, reg_type='ll',
+                                 var_type='coc', bw=bw)
+        settings = nparam.EstimatorSettings(n_jobs_predict=2)
+        model_par = nparam.KernelReg(endog=[self.y2], exog=exog,
+                                     reg_type='ll', var_type='coc', bw=bw,
+                                     defaults=settings)
+        mean, mfx = model.fit()
+        mean_par, mfx_par = model_par.fit()
+        npt.assert_allclose(mean_par, mean, rtol=1e-13)
+        npt.assert_allclose(mfx_par, mfx, rtol=1e-13)
+
 
 def test_invalid_bw():
     # GH4873
@@ -336,3 +383,69 @@ def test_invalid_bw():
     y = x ** 2
     with pytest.raises(ValueError):
         nparam.KernelReg(x, y, 'c', bw=[12.5, 1.])
+
+
+class TestLocalPolynomialReg(object):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(987125)
+        nobs = 300
+        cls.x = np.random.uniform(-2, 2, size=nobs)
+        cls.y = np.sin(2 * cls.x) + 0.3 * np.random.normal(size=nobs)
+        cls.points = np.array([-1.5, -0.3, 0.4, 1.7])
+
+    def _local_poly(self, x0, degree, bw):
+        # weighted least squares with gaussian kernel weights
+        u = (self.x - x0) / bw
+        w = np.exp(-0.5 * u**2)
+        V = np.vander(self.x - x0, degree + 1, increasing=True)
+        return np.linalg.solve(V.T.dot(w[:, None] * V), V.T.dot(w * self.y))
+
+    @pytest.mark.parametrize('degree', [0, 1, 2, 3])
+    def test_exact(self, degree):
+        model = nparam.LocalPolynomialReg(self.y, self.x, degree=degree,
+                                          bw=0.3)
+        mean, mfx = model.fit(self.points)
+        params = np.array([self._local_poly(p, degree, 0.3)
+                           for p in self.points])
+        npt.assert_allclose(mean, params[:, 0], atol=1e-4)
+        for order in range(1, degree + 1):
+            deriv = model.derivative(order, self.points)
+            npt.assert_allclose(deriv, params[:, order] *
+                                np.prod(np.arange(1, order + 1)),
+                                atol=0.02 * 10**(order - 1))
+        if degree > 0:
+            npt.assert_allclose(mfx[:, 0], params[:, 1], atol=1e-3)
+        with pytest.raises(ValueError):
+            model.derivative(degree + 1)
+        assert np.isnan(model.fit([-3])[0]).all()
+
+    def test_kernelreg(self):
+        kreg = nparam.KernelReg(self.y, self.x, 'c', reg_type='ll',
+                                bw=[0.3])
+        model = nparam.LocalPolynomialReg(self.y, self.x, bw=0.3)
+        res1 = kreg.fit(self.points)
+        res2 = model.fit(self.points)
+        npt.assert_allclose(res2[0], res1[0], atol=1e-4)
+        npt.assert_allclose(res2[1], res1[1], atol=1e-3)
+
+        # bivariate
+        exog = np.column_stack((self.x, np.cos(3 * self.x) +
+                                np.random.normal(size=len(self.x))))
+        endog = np.sin(exog[:, 0]) * exog[:, 1] + 0.1 * self.y
+        kreg = nparam.KernelReg(endog, exog, 'cc', reg_type='ll',
+                                bw=[0.4, 0.5])
+        model = nparam.LocalPolynomialReg(endog, exog, bw=[0.4, 0.5],
+                                          gridsize=201)
+        points = np.array([[0.1, 0.2], [-1, 0.5], [1.2, -0.5]])
+        res1 = kreg.fit(points)
+        res2 = model.fit(points)
+        npt.assert_allclose(res2[0], res1[0], rtol=1e-3, atol=1e-3)
+        npt.assert_allclose(res2[1], res1[1], rtol=1e-2, atol=1e-3)
+
+    def test_cv_ls(self):
+        model = nparam.LocalPolynomialReg(self.y, self.x, bw='cv_ls')
+        kreg = nparam.KernelReg(self.y, self.x, 'c', reg_type='ll',
+                                bw='cv_ls')
+        npt.assert_allclose(model.bw, kreg.bw, rtol=0.02)
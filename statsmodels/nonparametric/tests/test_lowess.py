@@ -15,7 +15,7 @@ import numpy as np
 from numpy.testing import (assert_almost_equal, assert_, assert_raises,
                            assert_equal)
 
-from statsmodels.nonparametric.smoothers_lowess import lowess
+from statsmodels.nonparametric.smoothers_lowess import lowess, lowess_batch
 
 # Number of decimals to test equality with.
 # The default is 7.
@@ -154,3 +154,37 @@ def test_returns_inputs():
     x = np.arange(20)
     result = lowess(y, x, frac=.4)
     assert_almost_equal(result, np.column_stack((x, y)))
+
+
+def test_lowess_batch():
+    np.random.seed(987125)
+    x = np.random.uniform(0, 10, size=(20, 100))
+    y = np.sin(x) + 0.3 * np.random.standard_cauchy(size=x.shape)
+    y[3, 5] = np.nan
+    x[7, 9] = np.inf
+    for kwds in [{}, {'it': 0}, {'frac': 0.2, 'delta': 0.3}]:
+        res = lowess_batch(y, x, **kwds)
+        res_loop = [lowess(y[i], x[i], return_sorted=False, **kwds)
+                    for i in range(20)]
+        assert_almost_equal(res, res_loop, decimal=10)
+    assert_raises(ValueError, lowess_batch, y, x, missing='raise')
+
+    # common exog, evaluation at xvals and threads
+    x = np.linspace(0, 10, 100)
+    y = np.sin(x) + 0.3 * np.random.standard_cauchy(size=(20, 100))
+    res_loop = np.array([lowess(y[i], x, return_sorted=False)
+                         for i in range(20)])
+    assert_almost_equal(lowess_batch(y, x, n_threads=3), res_loop,
+                        decimal=12)
+    xvals = x[::-7]
+    res = lowess_batch(y, x, xvals=xvals, n_threads=2)
+    assert_almost_equal(res, res_loop[:, ::-7], decimal=12)
+    res = lowess_batch(y, x, xvals=[-1, 5.03, 11], it=0)
+    assert_(np.isnan(res[:, [0, 2]]).all())
+    # local linear fit with tricube weights of the nearest neighbors
+    dist = np.abs(x - 5.03)
+    idx = np.argsort(dist)[:66]
+    w = (1 - (dist[idx] / dist[idx].max())**3)**3
+    for i in range(20):
+        params = np.polyfit(x[idx], y[i, idx], 1, w=np.sqrt(w))
+        assert_almost_equal(res[i, 1], np.polyval(params, 5.03), decimal=12)
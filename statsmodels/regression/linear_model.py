@@ -1018,11 +1018,18 @@ class OLS(WLS):
         -----
         Equivalent to fit_regularized with L1_wt = 0 (but implemented
         more efficiently).
+
+        The singular value decomposition of exog does not depend on alpha
+        and is cached, so that repeated calls along a grid of penalization
+        weights only solve the diagonal system.
         """
 
-        u, s, vt = np.linalg.svd(self.exog, 0)
+        if not hasattr(self, '_ridge_svd'):
+            u, s, vt = np.linalg.svd(self.exog, 0)
+            q = np.dot(u.T, self.endog) * s
+            self._ridge_svd = (vt, s, q)
+        vt, s, q = self._ridge_svd
         v = vt.T
-        q = np.dot(u.T, self.endog) * s
         s2 = s * s
         if np.isscalar(alpha):
             sd = s2 + alpha * self.nobs
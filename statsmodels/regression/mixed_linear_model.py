@@ -1998,7 +1998,7 @@ class MixedLM(base.LikelihoodModel):
             method = [method]
 
         for meth in method:
-            if meth.lower() in ["newton", "ncg"]:
+            if meth.lower() in ["newton", "newton_ls", "ncg"]:
                 raise ValueError(
                     "method %s not available for MixedLM" % meth)
 
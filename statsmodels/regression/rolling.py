@@ -0,0 +1,538 @@
+"""
+Rolling and expanding window least squares
+
+The window moments are updated incrementally, rows entering a window are
+added to and rows leaving a window are subtracted from the cross-products,
+so that the cost does not depend on the window length.
+
+License: BSD-3
+"""
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from statsmodels.tools.data import _is_using_pandas
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.sm_exceptions import MissingDataError
+
+__all__ = ['RollingWLS', 'RollingOLS', 'RollingRegressionResults']
+
+
+class RollingWLS(object):
+    """
+    Rolling or expanding window weighted least squares
+
+    Parameters
+    ----------
+    endog : array_like
+        1-d endogenous response variable.
+    exog : array_like
+        A nobs x k array of regressors. An intercept is not included by
+        default and should be added by the user.
+    window : {int, None}
+        Length of the rolling window. If None, then an expanding window over
+        the full sample is used.
+    weights : array_like, optional
+        1-d array of weights, the regression in each window is estimated by
+        WLS with these weights.
+    min_nobs : {int, None}
+        Minimum number of valid observations required to estimate a window.
+        Default is k + 1.
+    missing : {'drop', 'skip', 'raise'}
+        Handling of observations with missing values in endog, exog or
+        weights.
+
+        * 'drop' : the observation is excluded and the window is estimated
+          if it has at least min_nobs valid observations.
+        * 'skip' : windows that contain a missing observation are set to nan.
+        * 'raise' : raise MissingDataError.
+
+    expanding : bool
+        If True, then the windows before the first full window are estimated
+        on the expanding sample starting at the first observation as soon as
+        they contain min_nobs observations. If False, then windows with less
+        than `window` observations are set to nan.
+
+    See Also
+    --------
+    statsmodels.regression.recursive_ls.RecursiveLS
+        Expanding window OLS based on the Kalman filter.
+
+    Notes
+    -----
+    The estimates for the window that ends at observation t are stored at
+    position t of the result arrays.
+
+    The window sums of the cross-products are computed incrementally in
+    chunks of windows: for each chunk the rows that enter and the rows that
+    leave the windows are accumulated with a cumulative sum and added to,
+    respectively subtracted from, the sums of the last window of the previous
+    chunk. The sums are recomputed from scratch every `reset` chunks to
+    prevent the accumulation of rounding errors. The parameters of all
+    windows in a chunk are then obtained with a single stacked solve.
+    """
+
+    def __init__(self, endog, exog, window=None, weights=None, min_nobs=None,
+                 missing='drop', expanding=False):
+        self._use_pandas = _is_using_pandas(endog, exog)
+        if self._use_pandas:
+            self._index = getattr(endog, 'index', getattr(exog, 'index', None))
+            self._exog_names = (list(exog.columns) if hasattr(exog, 'columns')
+                                else None)
+        else:
+            self._index = self._exog_names = None
+        endog = np.asarray(endog, dtype=float)
+        exog = np.asarray(exog, dtype=float)
+        if endog.ndim != 1:
+            endog = np.squeeze(endog)
+            if endog.ndim != 1:
+                raise ValueError('endog must be 1-d')
+        if exog.ndim == 1:
+            exog = exog[:, None]
+        nobs, k = exog.shape
+        if endog.shape[0] != nobs:
+            raise ValueError('endog and exog must have the same length')
+        if weights is None:
+            weights = np.ones(nobs)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape != (nobs,):
+                raise ValueError('weights must be 1-d with length nobs')
+
+        if window is None:
+            window = nobs
+            expanding = True
+        window = int(window)
+        if min_nobs is None:
+            min_nobs = k + 1
+        min_nobs = int(min_nobs)
+        if min_nobs < k or window < min_nobs:
+            raise ValueError('min_nobs must be at least k and at most window')
+        missing = missing.lower()
+        if missing not in ('drop', 'skip', 'raise'):
+            raise ValueError("missing option %s not understood" % missing)
+
+        valid = ~(np.isnan(endog) | np.isnan(exog).any(1) | np.isnan(weights))
+        if missing == 'raise' and not valid.all():
+            raise MissingDataError('NaNs were encountered in the data')
+        if self._exog_names is None:
+            self._exog_names = ['x%d' % i for i in range(k)]
+
+        self.endog = endog
+        self.exog = exog
+        self.weights = weights
+        self.window = window
+        self.min_nobs = min_nobs
+        self.missing = missing
+        self.expanding = expanding
+        self.nobs = nobs
+        self.k_exog = k
+        self._valid = valid
+        xv = exog[valid]
+        const = (np.ptp(xv, axis=0) == 0) & (xv.any(0)) if xv.shape[0] else []
+        self.k_constant = int(np.any(const))
+
+    def _window_start(self, ends):
+        """first row of the windows that end at rows `ends`"""
+        return np.maximum(0, ends + 1 - self.window)
+
+    def _rows(self, start, stop):
+        """weighted exog and endog of rows start to stop - 1, 0 if missing"""
+        valid = self._valid[start:stop]
+        w = np.where(valid, self.weights[start:stop], 0.)
+        sw = np.sqrt(w)
+        x = np.where(valid[:, None], self.exog[start:stop], 0.) * sw[:, None]
+        y = np.where(valid, self.endog[start:stop], 0.) * sw
+        return x, y, w, sw, valid
+
+    def _scores(self, start, stop):
+        """
+        u_r = z_r kron x_r with z_r = [x_r, y_r] for rows start to stop - 1
+
+        The score of row r is u_r reshaped to (k + 1, k) and contracted with
+        [-params, 1]. Rows outside of the sample are zero.
+        """
+        lo, hi = max(start, 0), min(stop, self.nobs)
+        u = np.zeros((stop - start, (self.k_exog + 1) * self.k_exog))
+        if hi > lo:
+            x, y = self._rows(lo, hi)[:2]
+            z = np.column_stack((x, y))
+            u[lo - start:hi - start] = (z[:, :, None] * x[:, None, :]
+                                        ).reshape(hi - lo, -1)
+        return u
+
+    def _features(self, start, stop, kernel=None, leaving=False):
+        """
+        Row contributions to the window sums for rows start to stop - 1
+
+        Returns a list with the array of the moment contributions of each row
+        and, if kernel is not None, of the kernel weighted score products.
+        A pair of rows (r, q), q = r - l, is added to the window sums when
+        the later row r enters and removed when the earlier row q leaves a
+        window, so that the row contribution is u_r kron sum_l w_l u_{r-l}
+        for entering rows and sum_l w_l u_{q+l} kron u_q for leaving rows.
+        """
+        k = self.k_exog
+        x, y, w, sw, valid = self._rows(start, stop)
+        nrows = stop - start
+        base = np.empty((nrows, k * k + k + 5))
+        base[:, :k * k] = (x[:, :, None] * x[:, None, :]).reshape(nrows, -1)
+        base[:, k * k:k * k + k] = x * y[:, None]
+        base[:, -5] = y ** 2
+        base[:, -4] = w
+        base[:, -3] = sw * y
+        base[:, -2] = valid
+        base[:, -1] = ~valid
+        if kernel is None:
+            return [base]
+        nlags = len(kernel) - 1
+        if leaving:
+            u_all = self._scores(start, stop + nlags)
+            u = u_all[:nrows]
+            v = sum(kernel[l] * u_all[l:l + nrows] for l in range(nlags + 1))
+            pair = v[:, :, None] * u[:, None, :]
+        else:
+            u_all = self._scores(start - nlags, stop)
+            u = u_all[nlags:]
+            v = sum(kernel[l] * u_all[nlags - l:nlags - l + nrows]
+                    for l in range(nlags + 1))
+            pair = u[:, :, None] * v[:, None, :]
+        return [base, pair.reshape(nrows, -1)]
+
+    def _direct_sums(self, end, kernel=None):
+        """window sums for the window ending at row end, from scratch"""
+        start = self._window_start(np.array([end]))[0]
+        feats = self._features(start, end + 1)
+        sums = [feats[0].sum(0)]
+        if kernel is not None:
+            u = self._scores(start, end + 1)
+            v = np.zeros_like(u)
+            for lag, weight in enumerate(kernel):
+                v[lag:] += weight * u[:u.shape[0] - lag]
+            sums.append(u.T.dot(v).ravel())
+        return sums
+
+    def fit(self, cov_type='nonrobust', cov_kwds=None, params_only=False,
+            use_t=None, chunksize=None, reset=100):
+        """
+        Estimate the regressions of all windows
+
+        Parameters
+        ----------
+        cov_type : {'nonrobust', 'HC0', 'HAC'}
+            Covariance estimator of the parameters. 'HC0' and 'HAC' are the
+            White and the Newey-West estimators of `OLS.fit` without small
+            sample correction.
+        cov_kwds : dict, optional
+            For 'HAC', `maxlags` is the number of lags of the Bartlett
+            kernel.
+        params_only : bool
+            If True, then only the parameters are computed.
+        use_t : {bool, None}
+            Whether to use the t distribution for the p-values. Default is
+            True for 'nonrobust' and False otherwise.
+        chunksize : {int, None}
+            Number of windows that are estimated together.
+        reset : int
+            Number of chunks after which the window sums are recomputed from
+            scratch.
+
+        Returns
+        -------
+        RollingRegressionResults
+
+        Notes
+        -----
+        The robust covariances are computed from window sums of the kernel
+        weighted products of the fourth order moments of [exog, endog] and
+        exog. The cost per observation is of order k**4 + maxlags * k**2.
+        This is exact but only attractive for a moderate number of
+        regressors.
+
+        With missing='drop' the HAC lags refer to the original time index,
+        missing observations contribute zero scores.
+        """
+        cov_type = cov_type.lower()
+        cov_kwds = {} if cov_kwds is None else cov_kwds
+        if cov_type == 'nonrobust':
+            kernel = None
+        elif cov_type == 'hc0':
+            kernel = np.array([0.5])
+        elif cov_type == 'hac':
+            maxlags = int(cov_kwds['maxlags'])
+            if maxlags >= self.window:
+                raise ValueError('maxlags must be smaller than window')
+            # Bartlett weights, lag 0 is halved because the pair sums are
+            # symmetrized below
+            kernel = 1 - np.arange(maxlags + 1) / (maxlags + 1.)
+            kernel[0] = 0.5
+        else:
+            raise ValueError('cov_type %s not understood' % cov_type)
+        if params_only:
+            kernel = None
+        if use_t is None:
+            use_t = cov_type == 'nonrobust'
+
+        nobs, k = self.nobs, self.k_exog
+        m = k * k + k + 5
+        mu = (k + 1) * k
+        if chunksize is None:
+            chunksize = max(1, 2 ** 22 // (m + (kernel is not None) * mu * mu))
+        params = np.full((nobs, k), np.nan)
+        cov = None if params_only else np.full((nobs, k, k), np.nan)
+        ssr = np.full(nobs, np.nan)
+        centered_tss = np.full(nobs, np.nan)
+        uncentered_tss = np.full(nobs, np.nan)
+        nobs_win = np.zeros(nobs)
+
+        first = self.min_nobs - 1 if self.expanding else self.window - 1
+        sums = None
+        for ichunk, s in enumerate(range(first, nobs, chunksize)):
+            e = min(s + chunksize, nobs)
+            ends = np.arange(s, e)
+            lo = self._window_start(ends)
+            if s == 0:
+                sums = [np.zeros(m), np.zeros(mu * mu)]
+            elif ichunk % reset == 0:
+                sums = self._direct_sums(s - 1, kernel)
+            lo_prev = self._window_start(np.array([max(s - 1, 0)]))[0]
+            # rows entering the windows and rows leaving the windows
+            add = self._features(s, e, kernel)
+            rem = (self._features(lo_prev, lo[-1], kernel, leaving=True)
+                   if lo[-1] > lo_prev else None)
+            win = []
+            for j, f in enumerate(add):
+                total = sums[j] + np.cumsum(f, 0)
+                if rem is not None:
+                    fr = rem[j]
+                    csr = np.vstack((np.zeros((1, fr.shape[1])),
+                                     np.cumsum(fr, 0)))
+                    total -= csr[lo - lo_prev]
+                win.append(total)
+            sums = [w[-1] for w in win]
+
+            base = win[0]
+            xx = base[:, :k * k].reshape(-1, k, k)
+            xy = base[:, k * k:k * k + k]
+            yy, sw, swy, count, nmiss = base[:, -5:].T
+            count = np.round(count)
+            ok = count >= self.min_nobs
+            if self.missing == 'skip':
+                ok &= np.round(nmiss) == 0
+            if not ok.any():
+                continue
+            idx = ends[ok]
+            xx, xy = xx[ok], xy[ok]
+            try:
+                xxi = np.linalg.inv(xx)
+            except np.linalg.LinAlgError:
+                xxi = np.array([np.linalg.pinv(a) for a in xx])
+            beta = np.einsum('tij,tj->ti', xxi, xy)
+            params[idx] = beta
+            nobs_win[idx] = count[ok]
+            ssr[idx] = yy[ok] - np.einsum('ti,ti->t', beta, xy)
+            uncentered_tss[idx] = yy[ok]
+            centered_tss[idx] = yy[ok] - swy[ok] ** 2 / sw[ok]
+            if params_only:
+                continue
+            if kernel is None:
+                sigma2 = ssr[idx] / (count[ok] - k)
+                cov[idx] = xxi * sigma2[:, None, None]
+            else:
+                nwin = len(idx)
+                c = np.column_stack((-beta, np.ones(nwin)))
+                # contract the pair sums with c on both score factors
+                mom = win[1][ok].reshape(nwin, k + 1, -1)
+                half = np.matmul(c[:, None, :], mom).reshape(nwin, k, k + 1,
+                                                             k)
+                half = np.matmul(half.transpose(0, 1, 3, 2),
+                                 c[:, None, :, None])[..., 0]
+                meat = half + half.transpose(0, 2, 1)
+                cov[idx] = np.matmul(np.matmul(xxi, meat), xxi)
+
+        return RollingRegressionResults(self, params, cov, ssr, centered_tss,
+                                        uncentered_tss, nobs_win, cov_type,
+                                        use_t)
+
+
+class RollingOLS(RollingWLS):
+    """
+    Rolling or expanding window ordinary least squares
+
+    Parameters
+    ----------
+    endog : array_like
+        1-d endogenous response variable.
+    exog : array_like
+        A nobs x k array of regressors. An intercept is not included by
+        default and should be added by the user.
+    window : {int, None}
+        Length of the rolling window. If None, then an expanding window over
+        the full sample is used.
+    min_nobs : {int, None}
+        Minimum number of valid observations required to estimate a window.
+        Default is k + 1.
+    missing : {'drop', 'skip', 'raise'}
+        Handling of observations with missing values, see RollingWLS.
+    expanding : bool
+        If True, then the windows before the first full window are estimated
+        on the expanding sample, see RollingWLS.
+
+    See Also
+    --------
+    RollingWLS
+    """
+
+    def __init__(self, endog, exog, window=None, min_nobs=None,
+                 missing='drop', expanding=False):
+        super(RollingOLS, self).__init__(endog, exog, window=window,
+                                         weights=None, min_nobs=min_nobs,
+                                         missing=missing, expanding=expanding)
+
+
+class RollingRegressionResults(object):
+    """
+    Results of rolling or expanding window least squares
+
+    The estimates of the window ending at observation t are in row t, rows
+    of windows that could not be estimated are nan. If the data of the
+    model are pandas objects, then the attributes are pandas objects with
+    the index of the data.
+
+    **Attributes**
+
+    params : ndarray or DataFrame
+        parameter estimates, nobs x k
+    bse : ndarray or DataFrame
+        standard errors of the parameter estimates
+    tvalues : ndarray or DataFrame
+        t- or z-statistics of the parameter estimates
+    pvalues : ndarray or DataFrame
+        two-sided p-values of the parameter estimates
+    rsquared, rsquared_adj : ndarray or Series
+        R-squared and adjusted R-squared, centered if the model has a
+        constant
+    ssr : ndarray or Series
+        sum of squared (weighted) residuals
+    mse_resid : ndarray or Series
+        ssr / df_resid
+    nobs : ndarray or Series
+        number of observations used in each window
+    df_resid : ndarray or Series
+        residual degrees of freedom
+    cov_type : str
+        type of the parameter covariance
+    """
+
+    def __init__(self, model, params, cov, ssr, centered_tss, uncentered_tss,
+                 nobs, cov_type, use_t):
+        self.model = model
+        self._params = params
+        self._cov = cov
+        self._ssr = ssr
+        self._centered_tss = centered_tss
+        self._uncentered_tss = uncentered_tss
+        self._nobs = nobs
+        self.cov_type = cov_type
+        self.use_t = use_t
+        self.k_constant = model.k_constant
+
+    def _wrap(self, value):
+        if not self.model._use_pandas:
+            return value
+        index = self.model._index
+        if value.ndim == 1:
+            return pd.Series(value, index=index)
+        return pd.DataFrame(value, index=index,
+                            columns=self.model._exog_names)
+
+    def cov_params(self):
+        """
+        Covariances of the parameter estimates of all windows
+
+        Returns
+        -------
+        cov : ndarray
+            nobs x k x k array, or a DataFrame with a MultiIndex of the
+            observation index and the exog names if the data are pandas.
+        """
+        if self._cov is None:
+            raise ValueError('cov_params is not available if params_only '
+                             'is True')
+        if not self.model._use_pandas:
+            return self._cov
+        k = self.model.k_exog
+        names = self.model._exog_names
+        index = pd.MultiIndex.from_product([self.model._index, names])
+        return pd.DataFrame(self._cov.reshape(-1, k), index=index,
+                            columns=names)
+
+    @cache_readonly
+    def _df_resid(self):
+        df = self._nobs - self.model.k_exog
+        return np.where(np.isnan(self._ssr), np.nan, df)
+
+    @property
+    def params(self):
+        return self._wrap(self._params)
+
+    @property
+    def nobs(self):
+        return self._wrap(np.where(np.isnan(self._ssr), np.nan, self._nobs))
+
+    @property
+    def df_resid(self):
+        return self._wrap(self._df_resid)
+
+    @property
+    def ssr(self):
+        return self._wrap(self._ssr)
+
+    @property
+    def mse_resid(self):
+        return self._wrap(self._ssr / self._df_resid)
+
+    @cache_readonly
+    def _rsquared(self):
+        if self.k_constant:
+            return 1 - self._ssr / self._centered_tss
+        return 1 - self._ssr / self._uncentered_tss
+
+    @property
+    def rsquared(self):
+        return self._wrap(self._rsquared)
+
+    @property
+    def rsquared_adj(self):
+        nobs = self._nobs
+        adj = 1 - (nobs - self.k_constant) / self._df_resid * (
+            1 - self._rsquared)
+        return self._wrap(adj)
+
+    @cache_readonly
+    def _bse(self):
+        if self._cov is None:
+            raise ValueError('bse is not available if params_only is True')
+        return np.sqrt(np.diagonal(self._cov, axis1=1, axis2=2))
+
+    @property
+    def bse(self):
+        return self._wrap(self._bse)
+
+    @property
+    def tvalues(self):
+        return self._wrap(self._params / self._bse)
+
+    @property
+    def pvalues(self):
+        tvalues = np.abs(self._params / self._bse)
+        pvalues = np.full(tvalues.shape, np.nan)
+        finite = np.isfinite(tvalues)
+        if self.use_t:
+            df = np.broadcast_to(self._df_resid[:, None], tvalues.shape)
+            pvalues[finite] = 2 * stats.t.sf(tvalues[finite], df[finite])
+        else:
+            pvalues[finite] = 2 * stats.norm.sf(tvalues[finite])
+        return self._wrap(pvalues)
@@ -0,0 +1,105 @@
+"""
+Tests for rolling and expanding window least squares
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.rolling import RollingOLS, RollingWLS
+from statsmodels.tools.sm_exceptions import MissingDataError
+
+
+def _get_data(nobs=150, seed=12345):
+    rs = np.random.RandomState(seed)
+    exog = np.column_stack((np.ones(nobs), rs.standard_normal((nobs, 2))))
+    endog = exog.dot([1., 0.5, -0.5]) + rs.standard_normal(nobs)
+    weights = rs.uniform(0.5, 2., nobs)
+    return endog, exog, weights
+
+
+@pytest.mark.parametrize('expanding', [True, False])
+@pytest.mark.parametrize('cov_type, cov_kwds', [('nonrobust', {}),
+                                                ('HC0', {}),
+                                                ('HAC', {'maxlags': 3})])
+def test_rolling_wls(expanding, cov_type, cov_kwds):
+    endog, exog, weights = _get_data()
+    window = 30
+    mod = RollingWLS(endog, exog, window=window, weights=weights,
+                     expanding=expanding)
+    # small chunks and frequent resets exercise the incremental updates
+    res = mod.fit(cov_type=cov_type, cov_kwds=cov_kwds, chunksize=7,
+                  reset=4)
+    fit_kwds = {}
+    if cov_type != 'nonrobust':
+        fit_kwds = {'cov_type': cov_type, 'cov_kwds': cov_kwds}
+    first = 3 if expanding else window - 1
+    assert np.isnan(res.params[:first]).all()
+    for t in range(first, endog.shape[0]):
+        sl = slice(max(0, t + 1 - window), t + 1)
+        res1 = WLS(endog[sl], exog[sl], weights=weights[sl]).fit(**fit_kwds)
+        assert_allclose(res.params[t], res1.params, rtol=1e-10)
+        assert_allclose(res.bse[t], res1.bse, rtol=1e-8)
+        assert_allclose(res.rsquared[t], res1.rsquared, rtol=1e-8)
+        assert_allclose(res.rsquared_adj[t], res1.rsquared_adj, rtol=1e-8)
+        assert_allclose(res.ssr[t], res1.ssr, rtol=1e-8)
+        assert_allclose(res.pvalues[t], res1.pvalues, rtol=1e-6,
+                        atol=1e-14)
+        assert_equal(res.nobs[t], res1.nobs)
+    assert_equal(res.cov_params().shape, (endog.shape[0], 3, 3))
+
+
+def test_rolling_ols_missing():
+    endog, exog, _ = _get_data()
+    endog[[40, 41, 90]] = np.nan
+    window = 20
+    res = RollingOLS(endog, exog, window=window, min_nobs=19).fit()
+    res_skip = RollingOLS(endog, exog, window=window,
+                          missing='skip').fit(params_only=True)
+    for t in range(window - 1, endog.shape[0]):
+        sl = slice(t + 1 - window, t + 1)
+        valid = ~np.isnan(endog[sl])
+        if valid.all():
+            assert_allclose(res_skip.params[t], res.params[t], rtol=1e-10)
+        else:
+            assert np.isnan(res_skip.params[t]).all()
+        if valid.sum() < 19:
+            assert np.isnan(res.params[t]).all()
+            continue
+        res1 = OLS(endog[sl][valid], exog[sl][valid]).fit()
+        assert_allclose(res.params[t], res1.params, rtol=1e-10)
+        assert_allclose(res.bse[t], res1.bse, rtol=1e-8)
+        assert_equal(res.nobs[t], valid.sum())
+
+    assert_raises(MissingDataError, RollingOLS, endog, exog, window,
+                  missing='raise')
+    assert_raises(ValueError, res_skip.cov_params)
+
+
+def test_rolling_ols_expanding_pandas():
+    endog, exog, _ = _get_data(nobs=60)
+    index = pd.date_range('2000-01-01', periods=60, freq='D')
+    endog = pd.Series(endog, index=index, name='y')
+    exog = pd.DataFrame(exog, index=index, columns=['const', 'a', 'b'])
+    res = RollingOLS(endog, exog).fit()
+    assert isinstance(res.params, pd.DataFrame)
+    assert_equal(list(res.params.columns), ['const', 'a', 'b'])
+    assert res.rsquared.index.equals(index)
+    res1 = OLS(endog, exog).fit()
+    assert_allclose(res.params.iloc[-1], res1.params, rtol=1e-10)
+    assert_allclose(res.tvalues.iloc[-1], res1.tvalues, rtol=1e-8)
+    res1 = OLS(endog[:10], exog[:10]).fit()
+    assert_allclose(res.params.iloc[9], res1.params, rtol=1e-10)
+    assert_equal(res.cov_params().shape, (60 * 3, 3))
+
+
+def test_rolling_errors():
+    endog, exog, _ = _get_data(nobs=30)
+    assert_raises(ValueError, RollingOLS, endog, exog, window=3)
+    assert_raises(ValueError, RollingOLS, endog, exog, window=10,
+                  missing='none')
+    mod = RollingOLS(endog, exog, window=10)
+    assert_raises(ValueError, mod.fit, cov_type='HAC',
+                  cov_kwds={'maxlags': 10})
+    assert_raises(ValueError, mod.fit, cov_type='HC3')
@@ -168,7 +168,7 @@ def variance_inflation_factor(exog, exog_idx):
 
     See Also
     --------
-    xxx : class for regression diagnostics  TODO: doesn't exist yet
+    variance_inflation_factors : VIF for all variables at once
 
     References
     ----------
@@ -184,6 +184,232 @@ def variance_inflation_factor(exog, exog_idx):
     return vif
 
 
+def _inv_corr(corr, tol):
+    """inverse of a correlation matrix and indicator of singular directions
+
+    Returns the inverse based on the Cholesky factor if corr is numerically
+    positive definite, and otherwise the pseudo-inverse based on the
+    eigenvalue decomposition together with an (k, m) array that spans the
+    null space of corr.
+    """
+    from scipy import linalg
+    k_vars = corr.shape[0]
+    try:
+        chol = linalg.cholesky(corr, lower=True)
+        if np.min(np.diag(chol))**2 > tol:
+            chol_inv = linalg.solve_triangular(chol, np.eye(k_vars),
+                                               lower=True)
+            return chol_inv.T.dot(chol_inv), np.zeros((k_vars, 0))
+    except linalg.LinAlgError:
+        pass
+    evals, evecs = np.linalg.eigh(corr)
+    null = evals <= tol * max(evals.max(), 1)
+    evecs_pos = evecs[:, ~null]
+    return (evecs_pos / evals[~null]).dot(evecs_pos.T), evecs[:, null]
+
+
+def variance_inflation_factors(exog, hasconst=None, chunksize=None, tol=None):
+    """variance inflation factors, VIF, for all exogenous variables
+
+    This computes the same values as `variance_inflation_factor` for all
+    columns of exog, but derives all of them from one factorization of the
+    correlation matrix of the design instead of running one auxiliary
+    regression for each column.
+
+    Parameters
+    ----------
+    exog : array_like or iterable of array_like
+        Design matrix with all explanatory variables, nobs x k. Tall data
+        can also be provided as an iterable, e.g. a generator, of 2-D
+        chunks of rows which are processed one at a time.
+    hasconst : None or bool
+        If None, then columns with a constant nonzero value are detected and
+        R-squared of the auxiliary regression of each variable is centered if
+        a constant is among the other variables and uncentered otherwise, as
+        in `variance_inflation_factor`. If True, then R-squared is centered
+        for all non-constant variables, e.g. if the design has an implicit
+        constant. If False, then uncentered R-squared is used for all
+        variables.
+    chunksize : None or int
+        Number of rows that are processed together if exog is an array.
+    tol : None or float
+        Tolerance for near-singular designs. If the smallest eigenvalue of
+        the correlation matrix relative to the largest is below tol, then
+        the pseudo-inverse is used, and variables that are exactly collinear
+        with other variables have an infinite VIF. The default is
+        ``k * eps``.
+
+    Returns
+    -------
+    vif : ndarray or pandas Series
+        Variance inflation factors of all columns of exog. A Series with the
+        column names as index is returned if exog is a DataFrame.
+
+    Notes
+    -----
+    The variance inflation factor of variable j is
+    ``VIF_j = 1 / (1 - R^2_j) = tss_j / ssr_j`` where ssr_j is the residual
+    sum of squares of the regression of the variable on the other variables.
+    The ssr_j are the inverses of the diagonal elements of the inverse of
+    the cross-product matrix. The computation uses the equivalent diagonal
+    of the inverse of the (centered or uncentered) correlation matrix which
+    is better conditioned. The cross-products are accumulated over chunks of
+    rows of data that are shifted by the first observation, so that the
+    memory requirement does not depend on the number of observations.
+
+    See Also
+    --------
+    variance_inflation_factor
+
+    References
+    ----------
+    http://en.wikipedia.org/wiki/Variance_inflation_factor
+    """
+    columns = getattr(exog, 'columns', None)
+    if hasattr(exog, 'shape'):
+        exog = np.asarray(exog, dtype=float)
+        if exog.ndim != 2:
+            raise ValueError('exog needs to be 2-dimensional')
+        if chunksize is None:
+            chunksize = max(1, 2**22 // exog.shape[1])
+        chunks = (exog[start:start + chunksize]
+                  for start in range(0, exog.shape[0], chunksize))
+    else:
+        chunks = exog
+
+    nobs = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=float)
+        if nobs == 0:
+            shift = chunk[0].copy()
+            sums = np.zeros(chunk.shape[1])
+            cross = np.zeros((chunk.shape[1], chunk.shape[1]))
+            x_min = chunk[0].copy()
+            x_max = chunk[0].copy()
+        chunk = chunk - shift
+        nobs += chunk.shape[0]
+        sums += chunk.sum(0)
+        cross += chunk.T.dot(chunk)
+        x_min = np.minimum(x_min, chunk.min(0) + shift)
+        x_max = np.maximum(x_max, chunk.max(0) + shift)
+    if nobs == 0:
+        raise ValueError('exog has no observations')
+
+    k_vars = len(sums)
+    if tol is None:
+        tol = k_vars * np.finfo(float).eps
+    is_const = (x_min == x_max) & (x_max != 0)
+    vif = np.empty(k_vars)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if hasconst is False or (hasconst is None and not is_const.any()):
+            # uncentered moments around zero
+            sums_shift = np.outer(sums, shift)
+            moments = (cross + sums_shift + sums_shift.T +
+                       nobs * np.outer(shift, shift))
+            std = np.sqrt(np.diag(moments))
+            corr_inv, null = _inv_corr(moments / np.outer(std, std), tol)
+            vif[:] = np.diag(corr_inv)
+            vif[(null**2).sum(1) > np.sqrt(tol)] = np.inf
+        else:
+            # centered moments of the non-constant variables
+            mask = ~is_const
+            mean = sums / nobs
+            moments = cross - nobs * np.outer(mean, mean)
+            moments = moments[mask][:, mask]
+            std = np.sqrt(np.diag(moments))
+            corr_inv, null = _inv_corr(moments / np.outer(std, std), tol)
+            vif_ = np.diag(corr_inv).copy()
+            vif_[(null**2).sum(1) > np.sqrt(tol)] = np.inf
+            vif[mask] = vif_
+            if is_const.sum() == 1 and hasconst is None:
+                # the regression of the constant on the other variables
+                # has no constant and uses uncentered R-squared,
+                # VIF = 1 + nobs * m' corr^{-1} m, m = mean / std
+                m = (mean + shift)[mask] / std
+                vif_const = 1 + nobs * m.dot(corr_inv).dot(m)
+                if (null.T.dot(m)**2).sum() > np.sqrt(tol) * m.dot(m):
+                    vif_const = np.inf
+                vif[is_const] = vif_const
+            else:
+                # constant is a linear combination of other constants,
+                # or R-squared is centered for all variables
+                vif[is_const] = np.inf
+
+    if columns is not None:
+        from pandas import Series
+        vif = Series(vif, index=columns)
+    return vif
+
+
+def _qr_r_chunked(exog, chunksize=None):
+    """triangular factor R of a thin QR decomposition computed in row chunks
+
+    Each chunk of rows is stacked below the current R and reduced by a QR
+    decomposition, so that the memory requirement is of order
+    chunksize * k and the full Q is never formed.
+    """
+    nobs, k_vars = exog.shape
+    if chunksize is None:
+        chunksize = max(k_vars, 2**22 // k_vars)
+    r = np.zeros((0, k_vars))
+    for start in range(0, nobs, chunksize):
+        r = np.linalg.qr(np.vstack((r, exog[start:start + chunksize])),
+                         mode='r')
+    return r
+
+
+def _hat_matrix_diag_chunked(exog, wexog=None, chunksize=None):
+    """diagonal of the hat matrix computed in row chunks
+
+    Parameters
+    ----------
+    exog : ndarray
+        design matrix, nobs x k
+    wexog : None or ndarray
+        whitened design matrix used in the estimation. If None, then
+        ``exog`` is used.
+    chunksize : int or None
+        number of rows that are processed together
+
+    Returns
+    -------
+    hii : ndarray
+        ``(exog (wexog' wexog)^{-1} * wexog).sum(1)`` computed from the
+        triangular factor of wexog, without forming the pseudo-inverse of
+        the design matrix. Singular designs are handled through the
+        pseudo-inverse of the triangular factor.
+    """
+    nobs, k_vars = exog.shape
+    if chunksize is None:
+        chunksize = max(1, 2**22 // k_vars)
+    r_pinv = np.linalg.pinv(_qr_r_chunked(wexog if wexog is not None
+                                          else exog, chunksize=chunksize))
+    hii = np.empty(nobs)
+    for start in range(0, nobs, chunksize):
+        sl = slice(start, start + chunksize)
+        xr = exog[sl].dot(r_pinv)
+        if wexog is None or wexog is exog:
+            hii[sl] = (xr * xr).sum(1)
+        else:
+            hii[sl] = (xr * wexog[sl].dot(r_pinv)).sum(1)
+    return hii
+
+
+def _top_update(idx_top, values_top, idx, values, top):
+    """merge new candidates into the indices of the `top` largest values
+    """
+    idx = np.concatenate((idx_top, idx))
+    values = np.concatenate((values_top, values))
+    if len(values) > top:
+        keep = np.argpartition(-values, top - 1)[:top]
+        idx, values = idx[keep], values[keep]
+    return idx, values
+
+
+_influence_criteria = ['cooks_d', 'hat_diag', 'standard_resid',
+                       'student_resid', 'dffits_internal', 'dffits']
+
+
 class _BaseInfluenceMixin(object):
     """common methods between OLSInfluence and MLE/GLMInfluence
     """
@@ -386,10 +612,16 @@ class MLEInfluence(_BaseInfluenceMixin):
         if hasattr(self, '_hat_matrix_diag'):
             return self._hat_matrix_diag
 
+        from scipy import linalg
         dmu_dp = self.results.model._deriv_mean_dparams(self.results.params)
         dsdy = self.results.model._deriv_score_obs_dendog(self.results.params)
         #dmu_dp = 1 / self.results.model.family.link.deriv(self.results.fittedvalues)
-        h = (dmu_dp * np.linalg.solve(-self.hessian, dsdy.T).T).sum(1)
+        lu_piv = linalg.lu_factor(-self.hessian)
+        h = np.empty(self.nobs)
+        chunksize = max(1, 2**22 // self.k_vars)
+        for start in range(0, self.nobs, chunksize):
+            sl = slice(start, start + chunksize)
+            h[sl] = (dmu_dp[sl] * linalg.lu_solve(lu_piv, dsdy[sl].T).T).sum(1)
         return h
 
     @cache_readonly
@@ -490,10 +722,22 @@ class MLEInfluence(_BaseInfluenceMixin):
         # this will be relevant for WLS comparing fitted endog versus wendog
         return self.d_fittedvalues / self._get_prediction.se_mean
 
-    def summary_frame(self):
+    def summary_frame(self, top=None, criterion='cooks_d'):
         """
         Creates a DataFrame with influence results.
 
+        Parameters
+        ----------
+        top : None or int
+            If top is an integer, then only the rows of the `top` most
+            influential observations according to `criterion` are returned,
+            sorted in decreasing order. If None, then all observations are
+            included in the original order.
+        criterion : str
+            Name of the column that is used to rank observations if `top` is
+            not None, one of 'cooks_d', 'hat_diag', 'standard_resid' or
+            'dffits_internal'. Signed measures are ranked by absolute value.
+
         Returns
         -------
         frame : pandas DataFrame
@@ -531,8 +775,78 @@ class MLEInfluence(_BaseInfluenceMixin):
         #NOTE: if we don't give columns, order of above will be arbitrary
         dfbeta = DataFrame(self.dfbetas, columns=beta_labels,
                             index=row_labels)
+        frame = dfbeta.join(summary_data)
 
-        return dfbeta.join(summary_data)
+        if top is not None:
+            if criterion not in summary_data.columns:
+                raise ValueError('criterion %s is not available' % criterion)
+            values = np.abs(summary_data[criterion].values)
+            idx, values = _top_update(np.zeros(0, int), np.zeros(0),
+                                      np.arange(self.nobs), values, top)
+            frame = frame.iloc[idx[np.argsort(-values, kind='mergesort')]]
+
+        return frame
+
+
+def _looo_closed_form(exog, resid, params, normalized_cov_params, df_resid,
+                      chunksize=None):
+    """leave-one-observation-out least squares results in closed form
+
+    Parameters
+    ----------
+    exog : ndarray
+        (whitened) design matrix, nobs x k
+    resid : ndarray
+        (whitened) residuals of the full sample regression
+    params : ndarray
+        parameter estimates of the full sample regression
+    normalized_cov_params : ndarray
+        inverse of exog.T exog
+    df_resid : float
+        residual degrees of freedom of the full sample regression
+    chunksize : int or None
+        number of observations that are processed together, the memory
+        requirement is of order chunksize * k.
+
+    Returns
+    -------
+    res : dict
+        dictionary with the arrays 'params', 'mse_resid', 'det_cov_params'
+        and 'hat_matrix_diag', where row i refers to the regression that
+        drops observation i.
+
+    Notes
+    -----
+    This uses the rank one downdating formulas, see Belsley, Kuh and Welsch
+    (1980), ::
+
+        params_i = params - (X'X)^{-1} x_i resid_i / (1 - h_i)
+        ssr_i = ssr - resid_i**2 / (1 - h_i)
+        det((X'X - x_i x_i')^{-1}) = det((X'X)^{-1}) / (1 - h_i)
+
+    with h_i = x_i' (X'X)^{-1} x_i. The computational cost is O(nobs k**2)
+    compared to O(nobs**2 k**2) for explicitly estimating nobs regressions.
+    """
+    nobs, k_vars = exog.shape
+    if chunksize is None:
+        chunksize = max(1, 2**20 // k_vars)
+    params_noti = np.empty((nobs, k_vars))
+    hii = np.empty(nobs)
+    for start in range(0, nobs, chunksize):
+        sl = slice(start, start + chunksize)
+        # rows are (X'X)^{-1} x_i
+        xxi_x = exog[sl].dot(normalized_cov_params)
+        h = (xxi_x * exog[sl]).sum(1)
+        params_noti[sl] = params - xxi_x * (resid[sl] / (1 - h))[:, None]
+        hii[sl] = h
+
+    ssr = np.dot(resid, resid)
+    mse_resid = (ssr - resid**2 / (1 - hii)) / (df_resid - 1)
+    logdet = np.linalg.slogdet(normalized_cov_params)[1]
+    det_cov_params = np.exp(k_vars * np.log(mse_resid) + logdet -
+                            np.log(1 - hii))
+    return dict(params=params_noti, mse_resid=mse_resid,
+                det_cov_params=det_cov_params, hat_matrix_diag=hii)
 
 
 class OLSInfluence(_BaseInfluenceMixin):
@@ -549,13 +863,9 @@ class OLSInfluence(_BaseInfluenceMixin):
     (some of which have the `_internal` postfix in the name. Other statistics
     require leave-one-observation-out (LOOO) auxiliary regression, and will be
     slower (mainly results with `_external` postfix in the name).
-    The auxiliary LOOO regression only the required results are stored.
-
-    Using the LOO measures is currently only recommended if the data set
-    is not too large. One possible approach for LOOO measures would be to
-    identify possible problem observations with the _internal measures, and
-    then run the leave-one-observation-out only with observations that are
-    possible outliers. (However, this is not yet available in an automized way.)
+    The LOOO results are computed in closed form with rank one downdating
+    formulas, which requires O(nobs k**2) operations and no auxiliary
+    regressions.
 
     This should be extended to general least squares.
 
@@ -586,8 +896,11 @@ class OLSInfluence(_BaseInfluenceMixin):
         Notes
         -----
         temporarily calculated here, this should go to model class
+
+        This is computed in chunks of rows from the triangular factor of a
+        QR decomposition of the design matrix.
         '''
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        return _hat_matrix_diag_chunked(self.exog, self.results.model.wexog)
 
     @cache_readonly
     def resid_press(self):
@@ -921,39 +1234,122 @@ class OLSInfluence(_BaseInfluenceMixin):
 
     @cache_readonly
     def _res_looo(self):
-        '''collect required results from the LOOO loop
+        '''collect required results for leave-one-observation-out
 
-        all results will be attached.
         currently only 'params', 'mse_resid', 'det_cov_params' are stored
 
-        regresses endog on exog dropping one observation at a time
-
-        this uses a nobs loop, only attributes of the OLS instance are stored.
+        The results of regressing endog on exog dropping one observation at a
+        time are computed in closed form from the residuals and the diagonal
+        of the hat matrix without a nobs loop, see `_looo_closed_form`.
+        Weighted least squares results use the whitened data.
         '''
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-        get_det_cov_params = lambda res: np.linalg.det(res.cov_params())
+        results = self.results
+        model = results.model
+        return _looo_closed_form(model.wexog, results.wresid,
+                                 np.asarray(results.params),
+                                 results.normalized_cov_params,
+                                 results.df_resid)
 
-        endog = self.results.model.endog
-        exog = self.results.model.exog
+    def _summary_rows(self, rows, r_pinv, dfbetas=True):
+        """influence measures for a subset of rows
 
-        params = np.zeros(exog.shape, dtype=np.float)
-        mse_resid = np.zeros(endog.shape, dtype=np.float)
-        det_cov_params = np.zeros(endog.shape, dtype=np.float)
+        Parameters
+        ----------
+        rows : slice or ndarray
+            index of the observations
+        r_pinv : ndarray
+            pseudo-inverse of the triangular factor of the QR decomposition
+            of the whitened design matrix
+        dfbetas : bool
+            If True, then dfbetas for the rows are included.
 
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            res_i = self.model_class(endog[inidx], exog[inidx]).fit()
-            params[outidx] = res_i.params
-            mse_resid[outidx] = res_i.mse_resid
-            det_cov_params[outidx] = get_det_cov_params(res_i)
+        Returns
+        -------
+        res : dict
+            dictionary with the summary_frame columns for the rows
+        """
+        results = self.results
+        model = results.model
+        wexog = model.wexog[rows]
+        wxr = wexog.dot(r_pinv)
+        if model.wexog is self.exog:
+            xr = wxr
+        else:
+            xr = self.exog[rows].dot(r_pinv)
+        hii = (xr * wxr).sum(1)
+        wresid = results.wresid[rows]
+        resid = self.resid[rows]
+        sigma2_noti = ((results.ssr - wresid**2 / (1 - hii)) /
+                       (results.df_resid - 1))
+        factor = np.sqrt(hii / (1 - hii))
+        res = dict(hat_diag=hii)
+        res['standard_resid'] = resid / np.sqrt(self.scale * (1 - hii))
+        res['student_resid'] = resid / np.sqrt(sigma2_noti * (1 - hii))
+        res['cooks_d'] = res['standard_resid']**2 / self.k_vars * factor**2
+        res['dffits_internal'] = res['standard_resid'] * factor
+        res['dffits'] = res['student_resid'] * factor
+        if dfbetas:
+            d_params = wxr.dot(r_pinv.T) * (wresid / (1 - hii))[:, None]
+            d_params /= np.sqrt(sigma2_noti)[:, None]
+            d_params /= np.sqrt(np.diag(results.normalized_cov_params))
+            res['dfbetas'] = d_params
+        return res
 
-        return dict(params=params, mse_resid=mse_resid,
-                       det_cov_params=det_cov_params)
+    def _summary_top(self, top, criterion='cooks_d', chunksize=None):
+        """influence measures of the top most influential observations
+
+        The measures are computed in chunks of rows and only the candidates
+        for the `top` rows are kept, so that the memory requirement does
+        not grow with nobs beyond the data of the model.
 
-    def summary_frame(self):
+        Returns
+        -------
+        idx : ndarray
+            row index of the top observations in decreasing order of the
+            absolute value of criterion
+        res : dict
+            dictionary with the summary_frame columns for the top rows
+        """
+        if criterion not in _influence_criteria:
+            raise ValueError('criterion %s is not available' % criterion)
+        wexog = self.results.model.wexog
+        if chunksize is None:
+            chunksize = max(1, 2**22 // self.k_vars)
+        r_pinv = np.linalg.pinv(_qr_r_chunked(wexog, chunksize=chunksize))
+
+        idx_top, values_top = np.zeros(0, int), np.zeros(0)
+        for start in range(0, self.nobs, chunksize):
+            sl = slice(start, start + chunksize)
+            values = np.abs(self._summary_rows(sl, r_pinv,
+                                               dfbetas=False)[criterion])
+            idx_top, values_top = _top_update(
+                idx_top, values_top, np.arange(start, start + len(values)),
+                values, top)
+
+        idx = idx_top[np.lexsort((idx_top, -values_top))]
+        return idx, self._summary_rows(idx, r_pinv)
+
+    def summary_frame(self, top=None, criterion='cooks_d', chunksize=None):
         """
         Creates a DataFrame with all available influence results.
 
+        Parameters
+        ----------
+        top : None or int
+            If top is an integer, then only the rows of the `top` most
+            influential observations according to `criterion` are returned,
+            sorted in decreasing order. The measures are then computed in
+            chunks of rows without storing them for all observations, which
+            bounds the memory for very large samples. If None, then all
+            observations are included in the original order.
+        criterion : str
+            Name of the column that is used to rank observations if `top` is
+            not None, one of 'cooks_d', 'hat_diag', 'standard_resid',
+            'student_resid', 'dffits_internal' or 'dffits'. Signed measures
+            are ranked by absolute value.
+        chunksize : None or int
+            Number of rows that are processed together if `top` is not None.
+
         Returns
         -------
         frame : DataFrame
@@ -983,6 +1379,19 @@ class OLSInfluence(_BaseInfluenceMixin):
         row_labels = data.row_labels
         beta_labels = ['dfb_' + i for i in data.xnames]
 
+        if top is not None:
+            idx, res = self._summary_top(top, criterion=criterion,
+                                         chunksize=chunksize)
+            index = row_labels[idx] if row_labels is not None else idx
+            columns = ['cooks_d', 'standard_resid', 'hat_diag',
+                       'dffits_internal', 'student_resid', 'dffits']
+            summary_data = DataFrame(dict((name, res[name])
+                                          for name in columns),
+                                     index=index, columns=columns)
+            dfbeta = DataFrame(res['dfbetas'], columns=beta_labels,
+                               index=index)
+            return dfbeta.join(summary_data)
+
         # grab the results
         summary_data = DataFrame(dict(
                             cooks_d = self.cooks_distance[0],
@@ -1182,8 +1591,10 @@ class GLMInfluence(MLEInfluence):
 
     Some GLM specific measures like d_deviance are still missing.
 
-    Computing an explicit leave-one-observation-out (LOOO) loop is included
-    but no influence measures are currently computed from it.
+    The leave-one-observation-out (LOOO) measures ``params_not_obsi``,
+    ``scale_not_obsi``, ``det_cov_params_not_obsi`` and ``cov_ratio`` are
+    one-step approximations that do not require reestimating the model.
+    The explicit LOOO loop in ``_res_looo`` is kept for verification.
     """
 
     @cache_readonly
@@ -1208,9 +1619,86 @@ class GLMInfluence(MLEInfluence):
         one observation.
         """
 
-        beta_i = np.linalg.pinv(self.exog) * self.resid_studentized
-        beta_i /= np.sqrt(1 - self.hat_matrix_diag)
-        return beta_i.T
+        exog = self.exog
+        xtx_pinv = np.linalg.pinv(exog.T.dot(exog))
+        w = self.resid_studentized / np.sqrt(1 - self.hat_matrix_diag)
+        beta_i = np.empty(exog.shape)
+        chunksize = max(1, 2**20 // self.k_vars)
+        # rows of exog (X'X)^+ are the columns of pinv(exog)
+        for start in range(0, self.nobs, chunksize):
+            sl = slice(start, start + chunksize)
+            beta_i[sl] = exog[sl].dot(xtx_pinv) * w[sl, None]
+        return beta_i
+
+    @cache_readonly
+    def params_not_obsi(self):
+        """(cached attribute) parameter estimates for all LOO regressions
+
+        This is the one-step approximation ``params_one`` and does not
+        reestimate the model, see `_res_looo` for the exact but slow
+        computation.
+        """
+        return self.params_one
+
+    @cache_readonly
+    def scale_not_obsi(self):
+        """(cached attribute) one-step scale estimate dropping observation i
+
+        If the scale is fixed, either by default for Binomial, Poisson and
+        NegativeBinomial or by a float scaletype in the fit, then this is
+        the full sample scale. Otherwise the contribution of observation i
+        to the Pearson chi-square, or to the deviance if scaletype is
+        'dev', is removed using the leave-one-out residual
+        ``resid_i / sqrt(1 - hii)`` and the degrees of freedom are reduced
+        by the frequency weight of the observation.
+        """
+        from statsmodels.genmod import families
+        results = self.results
+        model = results.model
+        scaletype = model.scaletype
+        fixed = (isinstance(scaletype, float) or
+                 (not scaletype and isinstance(
+                     model.family, (families.Binomial, families.Poisson,
+                                    families.NegativeBinomial))))
+        if fixed:
+            return np.repeat(np.asarray(results.scale, dtype=float),
+                             self.nobs)
+
+        if isinstance(scaletype, str) and scaletype.lower() == 'dev':
+            resid = results.resid_deviance
+            total = results.deviance
+        else:
+            resid = results.resid_pearson
+            total = results.pearson_chi2
+        freq_weights = model.freq_weights
+        resid2_i = freq_weights * resid**2 / (1 - self.hat_matrix_diag)
+        return (total - resid2_i) / (results.df_resid - freq_weights)
+
+    @cache_readonly
+    def det_cov_params_not_obsi(self):
+        """(cached attribute) determinant of cov_params dropping observation i
+
+        This uses the one-step scale ``scale_not_obsi`` and the rank one
+        downdate of the normalized covariance,
+        ``det(cov_i) = det(cov) (scale_i / scale)**k / (1 - hii)``
+        """
+        logdet = np.linalg.slogdet(self.results.normalized_cov_params)[1]
+        return np.exp(self.k_vars * np.log(self.scale_not_obsi) + logdet -
+                      np.log(1 - self.hat_matrix_diag))
+
+    @cache_readonly
+    def cov_ratio(self):
+        """(cached attribute) covariance ratio between LOOO and original
+
+        This uses determinant of the estimate of the parameter covariance
+        from the one-step leave-one-out estimates, see
+        ``det_cov_params_not_obsi``, relative to the full sample
+        nonrobust covariance ``scale * normalized_cov_params``.
+        """
+        results = self.results
+        logdet = self.k_vars * np.log(results.scale) + np.linalg.slogdet(
+            results.normalized_cov_params)[1]
+        return self.det_cov_params_not_obsi / np.exp(logdet)
 
     # same computation as OLS
     @cache_readonly
@@ -8,16 +8,18 @@ from statsmodels.compat.pandas import testing as pdt
 
 import os.path
 import numpy as np
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_equal
 import pandas as pd
 
 import pytest
 
-from statsmodels.regression.linear_model import OLS
+from statsmodels.regression.linear_model import OLS, WLS
 from statsmodels.genmod.generalized_linear_model import GLM
 from statsmodels.genmod import families
 
-from statsmodels.stats.outliers_influence import MLEInfluence
+from statsmodels.stats.outliers_influence import (
+    MLEInfluence, OLSInfluence, _looo_closed_form, _hat_matrix_diag_chunked,
+    variance_inflation_factor, variance_inflation_factors)
 
 cur_dir = os.path.abspath(os.path.dirname(__file__))
 
@@ -51,6 +53,137 @@ def test_influence_glm_bernoulli():
     assert_allclose(c_bar, results_sas[:, 9], atol=6e-5)
 
 
+@pytest.mark.parametrize('weighted', [False, True])
+def test_ols_looo_closed_form(weighted):
+    # compare closed form leave-one-out results with explicit refits
+    np.random.seed(987125)
+    nobs = 50
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 3)))
+    endog = exog.sum(1) + np.random.randn(nobs)
+    endog[5] += 5
+    weights = np.random.uniform(0.5, 2, size=nobs) if weighted else 1.
+    res = WLS(endog, exog, weights=weights).fit()
+    infl = OLSInfluence(res)
+
+    params = np.empty((nobs, exog.shape[1]))
+    mse_resid = np.empty(nobs)
+    det_cov = np.empty(nobs)
+    for i in range(nobs):
+        mask = np.arange(nobs) != i
+        w = weights[mask] if weighted else 1.
+        res_i = WLS(endog[mask], exog[mask], weights=w).fit()
+        params[i] = res_i.params
+        mse_resid[i] = res_i.mse_resid
+        det_cov[i] = np.linalg.det(res_i.cov_params())
+
+    assert_allclose(infl.params_not_obsi, params, rtol=1e-10)
+    assert_allclose(infl.sigma2_not_obsi, mse_resid, rtol=1e-10)
+    assert_allclose(infl.det_cov_params_not_obsi, det_cov, rtol=1e-10)
+    assert_allclose(infl.cov_ratio,
+                    det_cov / np.linalg.det(res.cov_params()), rtol=1e-10)
+    dfbetas = (res.params - params) / np.sqrt(mse_resid)[:, None]
+    dfbetas /= np.sqrt(np.diag(res.normalized_cov_params))
+    assert_allclose(infl.dfbetas, dfbetas, rtol=1e-10)
+
+    # chunked computation
+    res_chunk = _looo_closed_form(res.model.wexog, res.wresid, res.params,
+                                  res.normalized_cov_params, res.df_resid,
+                                  chunksize=7)
+    for key in ['params', 'mse_resid', 'det_cov_params']:
+        assert_allclose(res_chunk[key], infl._res_looo[key], rtol=1e-13)
+    wexog = res.model.wexog
+    hii = (wexog * np.linalg.pinv(wexog).T).sum(1)
+    assert_allclose(res_chunk['hat_matrix_diag'], hii, rtol=1e-12)
+
+
+def test_hat_matrix_diag_chunked():
+    np.random.seed(987125)
+    nobs = 103
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 3)))
+    # singular design
+    exog = np.column_stack((exog, exog[:, 1] + exog[:, 2]))
+    hii = (exog * np.linalg.pinv(exog).T).sum(1)
+    for chunksize in [5, 10, 1000]:
+        assert_allclose(_hat_matrix_diag_chunked(exog, chunksize=chunksize),
+                        hii, rtol=1e-10)
+    assert_allclose(hii.sum(), 4, rtol=1e-10)
+
+    weights = np.random.uniform(0.5, 2, size=nobs)
+    wexog = np.sqrt(weights)[:, None] * exog
+    hii = (exog * np.linalg.pinv(wexog).T).sum(1)
+    assert_allclose(_hat_matrix_diag_chunked(exog, wexog, chunksize=7),
+                    hii, rtol=1e-10)
+
+
+@pytest.mark.parametrize('criterion', ['cooks_d', 'hat_diag', 'dffits',
+                                       'student_resid'])
+def test_summary_frame_top(criterion):
+    from .test_diagnostic import get_duncan_data
+    endog, exog, labels = get_duncan_data()
+    data = pd.DataFrame(np.column_stack((endog, exog)),
+                        columns='y const var1 var2'.split(),
+                        index=labels)
+    res = OLS.from_formula('y ~ const + var1 + var2 - 1', data).fit()
+    infl = res.get_influence()
+    frame = infl.summary_frame()
+    order = np.argsort(-np.abs(frame[criterion].values), kind='mergesort')
+    expected = frame.iloc[order[:5]]
+
+    frame_top = infl.summary_frame(top=5, criterion=criterion, chunksize=4)
+    pdt.assert_index_equal(frame_top.index, expected.index)
+    pdt.assert_index_equal(frame_top.columns, expected.columns)
+    assert_allclose(frame_top.values, expected.values, rtol=1e-10)
+
+    res = GLM.from_formula('y ~ const + var1 + var2 - 1', data).fit()
+    infl = res.get_influence()
+    if criterion in infl.summary_frame().columns:
+        frame = infl.summary_frame()
+        order = np.argsort(-np.abs(frame[criterion].values), kind='mergesort')
+        frame_top = infl.summary_frame(top=5, criterion=criterion)
+        pdt.assert_frame_equal(frame_top, frame.iloc[order[:5]])
+    else:
+        with pytest.raises(ValueError):
+            infl.summary_frame(top=5, criterion=criterion)
+
+
+def test_variance_inflation_factors():
+    np.random.seed(987125)
+    nobs = 200
+    x = np.random.randn(nobs, 4)
+    x[:, 1] += 0.8 * x[:, 0] + 3
+    x[:, 2] = 2 + 0.5 * x[:, 2]
+    exog_const = np.column_stack((np.ones(nobs), x))
+    for exog in [x, exog_const]:
+        vif_loop = [variance_inflation_factor(exog, i)
+                    for i in range(exog.shape[1])]
+        vif = variance_inflation_factors(exog)
+        assert_allclose(vif, vif_loop, rtol=1e-10)
+        assert_allclose(variance_inflation_factors(exog, chunksize=7), vif,
+                        rtol=1e-12)
+        chunks = (exog[i:i + 30] for i in range(0, nobs, 30))
+        assert_allclose(variance_inflation_factors(chunks), vif, rtol=1e-12)
+
+    # centered R-squared for all variables with hasconst
+    vif = variance_inflation_factors(x, hasconst=True)
+    corr = np.corrcoef(x, rowvar=False)
+    assert_allclose(vif, np.diag(np.linalg.inv(corr)), rtol=1e-10)
+
+    # pandas
+    df = pd.DataFrame(exog_const, columns=['const', 'a', 'b', 'c', 'd'])
+    vif = variance_inflation_factors(df)
+    pdt.assert_index_equal(vif.index, df.columns)
+    assert_allclose(vif.values, variance_inflation_factors(exog_const),
+                    rtol=1e-13)
+
+    # exactly collinear design
+    exog = np.column_stack((exog_const, x[:, 0] + x[:, 3]))
+    vif = variance_inflation_factors(exog)
+    assert_equal(np.isinf(vif), [False, True, False, False, True, True])
+    assert_allclose(vif[[0, 2, 3]],
+                    [variance_inflation_factor(exog, i) for i in [0, 2, 3]],
+                    rtol=1e-8)
+
+
 class InfluenceCompareExact(object):
     # Mixin to compare and test two Influence instances
 
@@ -116,6 +249,12 @@ def _check_looo(self):
     diff_params = results.params - res_looo['params']
     assert_allclose(infl.d_params[mask_low], diff_params[mask_low], atol=0.05)
     assert_allclose(infl.params_one[mask_low], res_looo['params'][mask_low], rtol=0.01)
+    # one-step approximation to scale and determinant of cov_params,
+    # the latter ignores the change in the weights in small samples
+    assert_allclose(infl.scale_not_obsi[mask_low], res_looo['scale'][mask_low],
+                    rtol=0.01)
+    assert_allclose(infl.det_cov_params_not_obsi[mask_low],
+                    res_looo['det_cov_params'][mask_low], rtol=0.25)
 
 
 class TestInfluenceLogitGLMMLE(InfluenceCompareExact):
@@ -236,6 +375,18 @@ class TestInfluenceGaussianGLMOLS(InfluenceCompareExact):
         assert_allclose(infl0.d_linpred_scaled,
                         infl0.d_fittedvalues_scaled, rtol=1e-12)
 
+    def test_looo_one(self):
+        # one-step LOOO is exact in the linear Gaussian case
+        infl1 = self.infl1
+        infl0 = self.infl0
+        assert_allclose(infl0.params_not_obsi, infl1.params_not_obsi,
+                        rtol=1e-10)
+        assert_allclose(infl0.scale_not_obsi, infl1.sigma2_not_obsi,
+                        rtol=1e-10)
+        assert_allclose(infl0.det_cov_params_not_obsi,
+                        infl1.det_cov_params_not_obsi, rtol=1e-10)
+        assert_allclose(infl0.cov_ratio, infl1.cov_ratio, rtol=1e-10)
+
     def test_summary(self):
         infl1 = self.infl1
         infl0 = self.infl0
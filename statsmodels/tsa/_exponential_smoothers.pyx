@@ -3,6 +3,7 @@
 
 import numpy as np
 cimport numpy as np
+from libc.math cimport log
 
 np.import_array()
 
@@ -341,3 +342,188 @@ def _holt_win_mul_add_dam(double[::1] x, np.uint8_t[::1] xi, double[::1] p, doub
         err = y[i] - ((l[i] * phi * b[i]) + s[i])
         sse += err * err
     return sse
+
+
+
+def _holt_win_sse_grad(object x, np.uint8_t[::1] xi, double[::1] p, double[::1] y,
+                       Py_ssize_t m, Py_ssize_t n, int trend, int seasonal,
+                       double max_seen):
+    """
+    Sum of squared errors and its gradient for all Holt Winters models
+
+    Parameters
+    ----------
+    x : ndarray
+        Values of the free parameters.
+    xi : ndarray
+        Indicator of the free parameters in p.
+    p : ndarray
+        All parameters, alpha, beta, gamma, l0, b0, phi, s0, ..., s_(m-1).
+    y : ndarray
+        Data.
+    m : int
+        Number of seasons, 0 if the model is not seasonal.
+    n : int
+        Number of observations.
+    trend, seasonal : int
+        Type of the component, 0 for none, 1 for additive and 2 for
+        multiplicative.
+    max_seen : float
+        Value returned if the parameters are outside of the admissible region.
+
+    Returns
+    -------
+    sse : float
+        Sum of squared errors
+    grad : ndarray
+        Gradient of sse with respect to the free parameters
+
+    Notes
+    -----
+    The derivatives of the states with respect to all parameters are
+    propagated through the smoothing recursions in the same pass
+    (forward-mode differentiation), so that the gradient costs a single
+    pass over the data instead of one pass per parameter.
+    """
+    cdef double alpha, beta, gamma, phi, alphac, betac, gammac
+    cdef double l, b, lb, bphi, si, ln, f, err, sse, yi, c1, c2
+    cdef double[::1] x_arr, s, dl, db, dlb, dbphi, df, dln, dsse
+    cdef double[:, ::1] ds
+    cdef double[::1] grad
+    cdef Py_ssize_t i, j, k, idx = 0
+
+    x_arr = ensure_1d(x)
+    k = p.shape[0]
+    for j in range(k):
+        if xi[j]:
+            p[j] = x_arr[idx]
+            idx += 1
+    grad = np.zeros(idx)
+    alpha = p[0]
+    beta = p[1]
+    gamma = p[2]
+    phi = p[5]
+    # same admissible region as the SSE functions of the individual models
+    if (trend or seasonal) and alpha == 0.0:
+        return max_seen, np.asarray(grad)
+    if trend and seasonal and beta == 0.0:
+        return max_seen, np.asarray(grad)
+    if trend and beta > alpha:
+        return max_seen, np.asarray(grad)
+    if seasonal and gamma > 1 - alpha:
+        return max_seen, np.asarray(grad)
+    alphac = 1 - alpha
+    betac = 1 - beta
+    gammac = 1 - gamma
+
+    dl = np.zeros(k)
+    db = np.zeros(k)
+    dlb = np.zeros(k)
+    dbphi = np.zeros(k)
+    df = np.zeros(k)
+    dln = np.zeros(k)
+    dsse = np.zeros(k)
+    s = np.zeros(n + m)
+    ds = np.zeros((n + m, k))
+
+    l = p[3]
+    dl[3] = 1.0
+    b = 0.0
+    if trend:
+        b = p[4]
+        db[4] = 1.0
+    for j in range(m):
+        s[j] = p[6 + j]
+        ds[j, 6 + j] = 1.0
+
+    sse = 0.0
+    for i in range(n):
+        yi = y[i]
+        # trend component of the one-step prediction
+        if trend == 1:
+            bphi = phi * b
+            for j in range(k):
+                dbphi[j] = phi * db[j]
+            dbphi[5] += b
+            lb = l + bphi
+            for j in range(k):
+                dlb[j] = dl[j] + dbphi[j]
+        elif trend == 2:
+            if b <= 0.0:
+                # the damped multiplicative slope is not defined
+                return max_seen, np.asarray(grad)
+            bphi = b ** phi
+            c1 = phi * bphi / b
+            for j in range(k):
+                dbphi[j] = c1 * db[j]
+            dbphi[5] += bphi * log(b)
+            lb = l * bphi
+            for j in range(k):
+                dlb[j] = dl[j] * bphi + l * dbphi[j]
+        else:
+            bphi = 0.0
+            lb = l
+            for j in range(k):
+                dlb[j] = dl[j]
+
+        # prediction and updates of level and season
+        if seasonal == 1:
+            si = s[i]
+            f = lb + si
+            ln = alpha * (yi - si) + alphac * lb
+            s[i + m] = gamma * (yi - lb) + gammac * si
+            for j in range(k):
+                df[j] = dlb[j] + ds[i, j]
+                dln[j] = alphac * dlb[j] - alpha * ds[i, j]
+                ds[i + m, j] = gammac * ds[i, j] - gamma * dlb[j]
+            dln[0] += yi - si - lb
+            ds[i + m, 2] += yi - lb - si
+        elif seasonal == 2:
+            si = s[i]
+            f = lb * si
+            ln = alpha * yi / si + alphac * lb
+            s[i + m] = gamma * yi / lb + gammac * si
+            c1 = alpha * yi / (si * si)
+            c2 = gamma * yi / (lb * lb)
+            for j in range(k):
+                df[j] = dlb[j] * si + lb * ds[i, j]
+                dln[j] = alphac * dlb[j] - c1 * ds[i, j]
+                ds[i + m, j] = gammac * ds[i, j] - c2 * dlb[j]
+            dln[0] += yi / si - lb
+            ds[i + m, 2] += yi / lb - si
+        else:
+            f = lb
+            ln = alpha * yi + alphac * lb
+            for j in range(k):
+                df[j] = dlb[j]
+                dln[j] = alphac * dlb[j]
+            dln[0] += yi - lb
+
+        err = yi - f
+        sse += err * err
+        for j in range(k):
+            dsse[j] -= 2 * err * df[j]
+
+        # slope update
+        if trend == 1:
+            c1 = ln - l
+            for j in range(k):
+                db[j] = beta * (dln[j] - dl[j]) + betac * dbphi[j]
+            db[1] += c1 - bphi
+            b = beta * c1 + betac * bphi
+        elif trend == 2:
+            c1 = ln / l
+            for j in range(k):
+                db[j] = beta * (dln[j] - c1 * dl[j]) / l + betac * dbphi[j]
+            db[1] += c1 - bphi
+            b = beta * c1 + betac * bphi
+        l = ln
+        for j in range(k):
+            dl[j] = dln[j]
+
+    idx = 0
+    for j in range(k):
+        if xi[j]:
+            grad[idx] = dsse[j]
+            idx += 1
+    return sse, np.asarray(grad)
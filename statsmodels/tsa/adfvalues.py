@@ -1,5 +1,5 @@
 from scipy.stats import norm
-from numpy import array, polyval, inf, asarray
+from numpy import array, polyval, inf, asarray, where, isnan, full, nan
 
 __all__ = ['mackinnonp','mackinnoncrit']
 
@@ -385,3 +385,46 @@ def mackinnoncrit(N=1, regression ="c", nobs=inf):
         return eval("tau_"+reg+"_2010["+str(N-1)+",:,0]")
     else:
         return polyval(eval("tau_"+reg+"_2010["+str(N-1)+",:,::-1].T"),1./nobs)
+
+
+def _mackinnonp_array(teststat, regression="c", N=1):
+    """
+    Vectorized version of mackinnonp for an array of tau statistics.
+
+    Parameters
+    ----------
+    teststat : array_like
+        "T-values" from (Augmented) Dickey-Fuller regressions.
+    regression : str {"c", "nc", "ct", "ctt"}
+        This is the method of regression that was used.
+    N : int
+        The number of series believed to be I(1).
+
+    Returns
+    -------
+    pvalue : ndarray
+        MacKinnon's approximate p-values with the shape of `teststat`.
+        The p-value is nan where `teststat` is nan.
+
+    See Also
+    --------
+    mackinnonp
+    """
+    tables = globals()
+    teststat = asarray(teststat, dtype=float)
+    maxstat = tables["tau_max_" + regression][N - 1]
+    minstat = tables["tau_min_" + regression][N - 1]
+    starstat = tables["tau_star_" + regression][N - 1]
+    small = tables["tau_" + regression + "_smallp"][N - 1]
+    large = tables["tau_" + regression + "_largep"][N - 1]
+    pvalue = full(teststat.shape, nan)
+    valid = ~isnan(teststat)
+    stat = teststat[valid]
+    # values outside of [minstat, maxstat] are replaced below
+    clipped = stat.clip(minstat, maxstat)
+    pval = where(stat <= starstat,
+                 norm.cdf(polyval(small[::-1], clipped)),
+                 norm.cdf(polyval(large[::-1], clipped)))
+    pval = where(stat > maxstat, 1., pval)
+    pvalue[valid] = where(stat < minstat, 0., pval)
+    return pvalue
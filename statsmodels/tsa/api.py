@@ -19,10 +19,12 @@ from .x13 import x13_arima_select_order
 from .x13 import x13_arima_analysis
 from .statespace import api as statespace
 from .statespace.sarimax import SARIMAX
+from .statespace.order_selection import sarimax_order_select
 from .statespace.structural import UnobservedComponents
 from .statespace.varmax import VARMAX
 from .statespace.dynamic_factor import DynamicFactor
 from .regime_switching.markov_regression import MarkovRegression
 from .regime_switching.markov_autoregression import MarkovAutoregression
-from .holtwinters import ExponentialSmoothing, SimpleExpSmoothing, Holt
+from .holtwinters import (ExponentialSmoothing, SimpleExpSmoothing, Holt,
+                          BatchExponentialSmoothing)
 from .innovations import api as innovations
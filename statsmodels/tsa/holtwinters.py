@@ -13,6 +13,8 @@ Modified: Kevin Sheppard
 """
 from statsmodels.compat.python import string_types
 
+import itertools
+
 import numpy as np
 import pandas as pd
 from scipy.optimize import basinhopping, brute, minimize
@@ -246,6 +248,201 @@ PY_SMOOTHERS = {('mul', 'add'): _holt_win_add_mul_dam,
                 (None, None): _holt__}
 
 
+def _batch_holt_win(p, y, trend, seasonal, m):
+    """
+    Exponential smoothing recursions for many series at once
+
+    Parameters
+    ----------
+    p : ndarray
+        Parameters with one row per series in the order alpha, beta, gamma,
+        l0, b0, phi, s0, ..., s_(m-1).
+    y : ndarray
+        Data with one column per series.
+    trend : {'add', 'mul', None}
+    seasonal : {'add', 'mul', None}
+    m : int
+        The number of seasons, 0 if the model is not seasonal.
+
+    Returns
+    -------
+    fitted : ndarray
+        One-step ahead predictions, same shape as y.
+    l : ndarray
+        Levels with nobs + 1 rows, the first row is the initial level.
+    b : ndarray
+        Slopes with nobs + 1 rows, the first row is the initial slope.
+    s : ndarray
+        Seasonal components with nobs + m rows, the first m rows are the
+        initial seasons.
+
+    Notes
+    -----
+    The loop is over time periods, all operations inside the loop are
+    vectorized over the series so that the Python overhead does not depend
+    on the number of series.
+    """
+    nobs, n = y.shape
+    alpha, beta, gamma, _, _, phi = p[:, :6].T
+    alphac = 1 - alpha
+    betac = 1 - beta
+    gammac = 1 - gamma
+    fitted = np.empty((nobs, n))
+    l = np.empty((nobs + 1, n))
+    b = np.zeros((nobs + 1, n))
+    s = np.zeros((nobs + m, n))
+    l[0] = p[:, 3]
+    if trend is not None:
+        b[0] = p[:, 4]
+    if seasonal is not None:
+        s[:m] = p[:, 6:6 + m].T
+    for i in range(nobs):
+        if trend == 'mul':
+            b_phi = b[i] ** phi
+            lb = l[i] * b_phi
+        elif trend == 'add':
+            b_phi = phi * b[i]
+            lb = l[i] + b_phi
+        else:
+            lb = l[i]
+        if seasonal == 'mul':
+            fitted[i] = lb * s[i]
+            l[i + 1] = alpha * y[i] / s[i] + alphac * lb
+            s[i + m] = gamma * y[i] / lb + gammac * s[i]
+        elif seasonal == 'add':
+            fitted[i] = lb + s[i]
+            l[i + 1] = alpha * (y[i] - s[i]) + alphac * lb
+            s[i + m] = gamma * (y[i] - lb) + gammac * s[i]
+        else:
+            fitted[i] = lb
+            l[i + 1] = alpha * y[i] + alphac * lb
+        if trend == 'mul':
+            b[i + 1] = beta * (l[i + 1] / l[i]) + betac * b_phi
+        elif trend == 'add':
+            b[i + 1] = beta * (l[i + 1] - l[i]) + betac * b_phi
+    return fitted, l, b, s
+
+
+def _batch_fd_jacobian(resid, x, r, idx, upper):
+    """forward difference Jacobian of the residuals, shape (nobs, n, k)"""
+    k = x.shape[1]
+    jac = np.empty(r.shape + (k,))
+    for j in range(k):
+        h = 1.49e-8 * np.maximum(np.abs(x[:, j]), 1.)
+        # step backwards at the upper bound
+        h = np.where(x[:, j] + h > upper[j], -h, h)
+        xh = x.copy()
+        xh[:, j] += h
+        jac[:, :, j] = (resid(xh, idx) - r) / h
+    return jac
+
+
+def _batch_least_squares(resid, x, lower, upper, project, jacobian=None,
+                         maxiter=100, tol=1e-8):
+    """
+    Bounded Levenberg-Marquardt for many independent least squares problems
+
+    Parameters
+    ----------
+    resid : callable
+        ``resid(x, idx)`` returns the residuals with shape (nobs, len(idx))
+        of the problems with integer index idx for their parameters x with
+        shape (len(idx), k).
+    x : ndarray
+        Starting values, shape (n, k).
+    lower, upper : ndarray
+        Bounds for the columns of x, shape (k,).
+    project : callable
+        ``project(x, idx)`` returns the parameters x of the problems idx
+        mapped into the feasible set.
+    jacobian : callable, optional
+        ``jacobian(x, r, idx)`` returns the Jacobian of the residuals with
+        shape (nobs, len(idx), k). Forward differences are used by default.
+    maxiter : int
+        The maximum number of iterations.
+    tol : float
+        Convergence tolerance for the relative decrease of the sum of
+        squares and for the change in the parameters.
+
+    Returns
+    -------
+    x : ndarray
+        Parameter estimates.
+    sse : ndarray
+        Sum of squared residuals for each problem.
+    converged : ndarray
+        Boolean convergence flags.
+    iterations : ndarray
+        Number of iterations for each problem.
+
+    Notes
+    -----
+    Parameters at a bound with the gradient pointing outside are held fixed
+    in a step, other steps that leave the feasible set are projected back.
+    Steps that do not decrease the sum of squares are rejected and the
+    damping is increased.
+    Each problem has its own damping and convergence status, and only the
+    problems that have not yet converged are evaluated.
+    """
+    if jacobian is None:
+        def jacobian(x, r, idx):
+            return _batch_fd_jacobian(resid, x, r, idx, upper)
+
+    n, k = x.shape
+    x = project(np.array(x, dtype=np.double), np.arange(n))
+    r = resid(x, np.arange(n))
+    sse = (r ** 2).sum(0)
+    lam = np.full(n, 1e-3)
+    converged = ~np.isfinite(sse)
+    iterations = np.zeros(n, dtype=np.int_)
+    stale = np.ones(n, dtype=np.bool_)
+    hess = np.empty((n, k, k))
+    grad = np.empty((n, k))
+    eye = np.eye(k)
+    for _ in range(maxiter):
+        idx = np.nonzero(~converged)[0]
+        if idx.size == 0:
+            break
+        upd = idx[stale[idx]]
+        if upd.size:
+            jac = jacobian(x[upd], r[:, upd], upd)
+            hess[upd] = np.einsum('tnk,tnl->nkl', jac, jac)
+            grad[upd] = np.einsum('tnk,tn->nk', jac, r[:, upd])
+            stale[upd] = False
+
+        g = grad[idx]
+        xk = x[idx]
+        free = ~(((xk <= lower) & (g > 0)) | ((xk >= upper) & (g < 0)))
+        h = hess[idx] * free[:, :, None] * free[:, None, :]
+        diag = np.diagonal(h, axis1=1, axis2=2)
+        ridge = 1e-12 * (1 + diag.max(1))
+        h = h + (lam[idx, None] * diag + ridge[:, None] + ~free)[:, :, None] * eye
+        step = np.linalg.solve(h, -(g * free)[:, :, None])[:, :, 0]
+        x_new = project(xk + step, idx)
+        r_new = resid(x_new, idx)
+        sse_new = (r_new ** 2).sum(0)
+        iterations[idx] += 1
+
+        better = np.isfinite(sse_new) & (sse_new < sse[idx])
+        acc = idx[better]
+        decrease = sse[acc] - sse_new[better]
+        change = np.abs(x_new[better] - x[acc]).max(1)
+        converged[acc] = ((decrease <= tol * sse[acc]) |
+                          (change <= tol * (1 + np.abs(x[acc]).max(1))))
+        x[acc] = x_new[better]
+        r[:, acc] = r_new[:, better]
+        sse[acc] = sse_new[better]
+        lam[acc] *= 0.3
+        stale[acc] = True
+
+        # no decrease even for tiny steps, we are at a (bounded) minimum
+        rej = idx[~better]
+        lam[rej] *= 10
+        converged[rej] = lam[rej] > 1e10
+
+    return x, sse, converged, iterations
+
+
 class HoltWintersResults(Results):
     """
     Holt Winter's Exponential Smoothing Results
@@ -691,19 +888,31 @@ class ExponentialSmoothing(TimeSeriesModel):
                 # s0 = p[6:]
                 # bounds = np.array([(0.0,1.0),(0.0,1.0),(0.0,1.0),(0.0,None),
                 # (0.0,None),(0.8,1.0)] + [(None,None),]*m)
-                args = (xi.astype(np.uint8), p, y, l, b, s, m, self.nobs, max_seen)
+                if start_params is None:
+                    # Grid points can lie on the boundary of the admissible
+                    # region, move inside so that the gradient is usable
+                    if txi[1]:
+                        p[1] = min(p[1], 0.99 * p[0])
+                    if txi[2]:
+                        p[2] = min(p[2], 0.99 * (1 - p[0]))
+                # The SSE and its analytic gradient are computed in one pass
+                codes = {None: 0, 'add': 1, 'mul': 2}
+                args = (xi.astype(np.uint8), p, y, m, self.nobs, codes[trend],
+                        codes[seasonal], max_seen)
+                func = smoothers._holt_win_sse_grad
                 if use_basinhopping:
                     # Take a deeper look in the local minimum we are in to find the best
                     # solution to parameters, maybe hop around to try escape the local
                     # minimum we may be in.
                     res = basinhopping(func, p[xi],
-                                       minimizer_kwargs={'args': args, 'bounds': bounds[xi]},
+                                       minimizer_kwargs={'args': args, 'bounds': bounds[xi],
+                                                         'jac': True},
                                        stepsize=0.01)
                     success = res.lowest_optimization_result.success
                 else:
                     # Take a deeper look in the local minimum we are in to find the best
                     # solution to parameters
-                    res = minimize(func, p[xi], args=args, bounds=bounds[xi])
+                    res = minimize(func, p[xi], args=args, bounds=bounds[xi], jac=True)
                     success = res.success
 
                 if not success:
@@ -1138,3 +1347,405 @@ class Holt(ExponentialSmoothing):
                                      smoothing_slope=smoothing_slope, damping_slope=damping_slope,
                                      optimized=optimized, start_params=start_params,
                                      initial_level=None, initial_slope=None, use_brute=use_brute)
+
+
+class BatchExponentialSmoothing(object):
+    """
+    Holt Winter's Exponential Smoothing for many series
+
+    Parameters
+    ----------
+    endog : array-like
+        Time series in columns, 2-D with shape (nobs, n_series). All series
+        have the same length and the same model specification.
+    trend : {"add", "mul", "additive", "multiplicative", None}, optional
+        Type of trend component.
+    damped : bool, optional
+        Should the trend component be damped.
+    seasonal : {"add", "mul", "additive", "multiplicative", None}, optional
+        Type of seasonal component.
+    seasonal_periods : int, optional
+        The number of seasons to consider for the holt winters. Required if
+        the model is seasonal.
+
+    Notes
+    -----
+    The model uses the same recursions, initial values and parameter bounds
+    as `ExponentialSmoothing`. The smoothing recursions are evaluated for
+    all series in one pass over the time periods, and the parameters of all
+    series are estimated jointly by a vectorized bounded Levenberg-Marquardt
+    least squares optimizer in which each series has its own step size and
+    convergence status. Box-Cox transformations are not supported.
+
+    See Also
+    --------
+    ExponentialSmoothing
+
+    Examples
+    --------
+    >>> mod = BatchExponentialSmoothing(y, trend='add', seasonal='add',
+    ...                                 seasonal_periods=52)
+    >>> res = mod.fit()
+    >>> res.params.head()
+    >>> res.forecast(8)
+    """
+
+    def __init__(self, endog, trend=None, damped=False, seasonal=None,
+                 seasonal_periods=None):
+        self.series_names = None
+        if isinstance(endog, pd.DataFrame):
+            self.series_names = list(endog.columns)
+        endog = np.asarray(endog, dtype=np.double)
+        if endog.ndim == 1:
+            endog = endog[:, None]
+        if endog.ndim != 2:
+            raise ValueError('endog must be 2-dimensional')
+        if not np.all(np.isfinite(endog)):
+            raise ValueError('endog must not contain missing values')
+        self.endog = endog
+        self.nobs, self.n_series = endog.shape
+
+        if trend in ['additive', 'multiplicative']:
+            trend = {'additive': 'add', 'multiplicative': 'mul'}[trend]
+        self.trend = trend
+        self.damped = damped
+        if seasonal in ['additive', 'multiplicative']:
+            seasonal = {'additive': 'add', 'multiplicative': 'mul'}[seasonal]
+        self.seasonal = seasonal
+        self.trending = trend in ['mul', 'add']
+        self.seasoning = seasonal in ['mul', 'add']
+        if (self.trend == 'mul' or self.seasonal == 'mul') and np.any(endog <= 0.0):
+            raise ValueError('endog must be strictly positive when using multiplicative '
+                             'trend or seasonal components.')
+        if self.damped and not self.trending:
+            raise ValueError('Can only dampen the trend component')
+        if self.seasoning:
+            if seasonal_periods is None or seasonal_periods <= 1:
+                raise ValueError('seasonal_periods must be larger than 1.')
+            self.seasonal_periods = int(seasonal_periods)
+        else:
+            self.seasonal_periods = 0
+
+    def initial_values(self):
+        """
+        Compute initial values used in the exponential smoothing recursions
+
+        Returns
+        -------
+        initial_level : ndarray
+            The initial level of each series.
+        initial_slope : {ndarray, None}
+            The initial slope of each series.
+        initial_seasons : ndarray
+            The initial seasonal components with shape (m, n_series).
+
+        See Also
+        --------
+        ExponentialSmoothing.initial_values
+        """
+        y = self.endog
+        m = self.seasonal_periods
+        b0 = None
+        if self.seasoning:
+            l0 = y[np.arange(self.nobs) % m == 0].mean(0)
+            if self.trending:
+                lead, lag = y[m:m + m], y[:m]
+                if self.trend == 'mul':
+                    b0 = np.exp((np.log(lead.mean(0)) - np.log(lag.mean(0))) / m)
+                else:
+                    b0 = ((lead - lag) / m).mean(0)
+            s0 = y[:m] / l0 if self.seasonal == 'mul' else y[:m] - l0
+        else:
+            l0 = y[0].copy()
+            if self.trending:
+                b0 = y[1] / y[0] if self.trend == 'mul' else y[1] - y[0]
+            s0 = np.zeros((0, self.n_series))
+        return l0, b0, s0
+
+    def fit(self, smoothing_level=None, smoothing_slope=None, smoothing_seasonal=None,
+            damping_slope=None, optimized=True, start_params=None, use_brute=True,
+            maxiter=100, tol=1e-8, chunksize=10000):
+        """
+        Fit the model to all series
+
+        Parameters
+        ----------
+        smoothing_level : {float, array}, optional
+            The alpha value of the simple exponential smoothing, if the value
+            is set then this value will be used as the value. An array
+            provides one value for each series.
+        smoothing_slope : {float, array}, optional
+            The beta value of the Holt's trend method, if the value is
+            set then this value will be used as the value.
+        smoothing_seasonal : {float, array}, optional
+            The gamma value of the holt winters seasonal method, if the value
+            is set then this value will be used as the value.
+        damping_slope : {float, array}, optional
+            The phi value of the damped method, if the value is
+            set then this value will be used as the value.
+        optimized : bool, optional
+            Estimate model parameters by minimizing the sum of squared errors.
+            If False, then the initial states are set by `initial_values` and
+            smoothing parameters that are not provided are set to the naive
+            starting values.
+        start_params : array, optional
+            Starting values with one row for each series and one column for
+            each estimated parameter, in the order alpha, beta, gamma,
+            l0, b0, phi, s0, ..., s_(m-1).
+        use_brute : bool, optional
+            Search for good starting values for the smoothing parameters on
+            a coarse grid. If False, a naive set of starting values is used.
+        maxiter : int, optional
+            The maximum number of iterations of the optimizer.
+        tol : float, optional
+            Convergence tolerance of the optimizer.
+        chunksize : int, optional
+            The number of series that are estimated at the same time. This
+            limits the memory used by the Jacobian of the residuals.
+
+        Returns
+        -------
+        results : BatchHoltWintersResults
+        """
+        alpha = smoothing_level
+        beta = smoothing_slope
+        gamma = smoothing_seasonal
+        phi = damping_slope
+        trending = self.trending
+        seasoning = self.seasoning
+        damped = self.damped
+        m = self.seasonal_periods
+        n = self.n_series
+        phi = phi if damped else 1.0
+
+        l0, b0, s0 = self.initial_values()
+        init_alpha = alpha if alpha is not None else 0.5 / max(m, 1)
+        init_beta = beta if beta is not None else 0.1 * init_alpha if trending else 0.0
+        init_gamma = 0.0
+        if seasoning:
+            init_gamma = gamma if gamma is not None else 0.05 * (1 - init_alpha)
+        init_phi = phi if phi is not None else 0.99
+
+        p = np.zeros((n, 6 + m))
+        p[:, 0] = init_alpha
+        p[:, 1] = init_beta
+        p[:, 2] = init_gamma
+        p[:, 3] = l0
+        if trending:
+            p[:, 4] = b0
+        p[:, 5] = init_phi
+        p[:, 6:] = s0.T
+
+        xi = np.zeros(6 + m, dtype=np.bool)
+        if optimized:
+            xi = np.array([alpha is None, trending and beta is None,
+                           seasoning and gamma is None, True, trending,
+                           phi is None and damped] + [True] * m)
+        converged = np.ones(n, dtype=np.bool)
+        iterations = np.zeros(n, dtype=np.int_)
+        if start_params is not None:
+            start_params = np.asarray(start_params, dtype=np.double)
+            if start_params.ndim == 1:
+                start_params = np.tile(start_params, (n, 1))
+            if start_params.shape != (n, xi.sum()):
+                raise ValueError('start_params must have shape {0} but has '
+                                 'shape {1}'.format((n, xi.sum()),
+                                                    start_params.shape))
+            p[:, xi] = start_params
+
+        if np.any(xi):
+            for start in range(0, n, chunksize):
+                sl = slice(start, min(start + chunksize, n))
+                y = self.endog[:, sl]
+                if start_params is None and use_brute:
+                    p[sl] = self._brute(p[sl], xi, y)
+                p[sl], converged[sl], iterations[sl] = self._fit_chunk(
+                    p[sl], xi, y, maxiter, tol)
+            if not np.all(converged):
+                from warnings import warn
+                from statsmodels.tools.sm_exceptions import ConvergenceWarning
+                warn("Optimization failed to converge for {0} series. Check "
+                     "converged.".format(n - converged.sum()), ConvergenceWarning)
+
+        return BatchHoltWintersResults(self, p, optimized=xi, converged=converged,
+                                       iterations=iterations)
+
+    def _sse(self, p, y):
+        fitted = _batch_holt_win(p, y, self.trend, self.seasonal,
+                                 self.seasonal_periods)[0]
+        sse = ((y - fitted) ** 2).sum(0)
+        return np.where(np.isfinite(sse), sse, np.inf)
+
+    def _brute(self, p, xi, y, ns=6):
+        """grid search for the smoothing parameters, all series at once"""
+        grid = np.linspace(0, 1, ns)
+        grids = [grid[1:] if xi[0] else [None],
+                 grid if xi[1] else [None],
+                 grid if xi[2] else [None],
+                 [0.8, 0.9, 0.98] if xi[5] else [None]]
+        best = p.copy()
+        best_sse = self._sse(p, y)
+        trial = p.copy()
+        for alpha, beta, gamma, phi in itertools.product(*grids):
+            trial[:] = p
+            for col, value in zip((0, 1, 2, 5), (alpha, beta, gamma, phi)):
+                if value is not None:
+                    trial[:, col] = value
+            # same restrictions as the objective of ExponentialSmoothing
+            if np.any(trial[:, 1] > trial[:, 0]) and xi[1]:
+                continue
+            if np.any(trial[:, 2] > 1 - trial[:, 0]) and xi[2]:
+                continue
+            sse = self._sse(trial, y)
+            better = sse < best_sse
+            best[better] = trial[better]
+            best_sse[better] = sse[better]
+        return best
+
+    def _fit_chunk(self, p, xi, y, maxiter, tol):
+        """estimate the free parameters of a group of series"""
+        trend, seasonal, m = self.trend, self.seasonal, self.seasonal_periods
+        p = p.copy()
+        upper = np.array([1., 1., 1., np.inf, np.inf, 1.] + [np.inf] * m)[xi]
+        lower = np.array([0., 0., 0., 0., 0., 0.] + [-np.inf] * m)[xi]
+        pos = np.cumsum(xi) - 1
+
+        def project(x, idx):
+            x = np.clip(x, lower, upper)
+            # same restrictions as the objective of ExponentialSmoothing
+            alpha = x[:, pos[0]] if xi[0] else p[idx, 0]
+            if xi[1]:
+                x[:, pos[1]] = np.minimum(x[:, pos[1]], alpha)
+            if xi[2]:
+                x[:, pos[2]] = np.minimum(x[:, pos[2]], 1 - alpha)
+            return x
+
+        def resid(x, idx):
+            pp = p[idx]
+            pp[:, xi] = x
+            fitted = _batch_holt_win(pp, y[:, idx], trend, seasonal, m)[0]
+            return fitted - y[:, idx]
+
+        x, _, converged, iterations = _batch_least_squares(
+            resid, p[:, xi], lower, upper, project, maxiter=maxiter, tol=tol)
+        p[:, xi] = x
+        return p, converged, iterations
+
+
+class BatchHoltWintersResults(Results):
+    """
+    Results of Holt Winter's Exponential Smoothing for many series
+
+    Parameters
+    ----------
+    model : BatchExponentialSmoothing instance
+        The fitted model instance
+    params : ndarray
+        The parameters with one row per series in the order alpha, beta,
+        gamma, l0, b0, phi, s0, ..., s_(m-1).
+
+    Attributes
+    ----------
+    params : pd.DataFrame
+        The parameters of each series in rows. Parameters that are not
+        included in the model are nan.
+    fittedvalues : ndarray
+        The one-step ahead predictions, shape (nobs, n_series).
+    resid : ndarray
+        The residuals, shape (nobs, n_series).
+    sse : ndarray
+        The sum of squared errors of each series.
+    level : ndarray
+        The levels, shape (nobs, n_series).
+    slope : ndarray
+        The slopes, shape (nobs, n_series).
+    season : ndarray
+        The seasonal components, shape (nobs, n_series).
+    aic : ndarray
+        The Akaike information criterion of each series.
+    bic : ndarray
+        The Bayesian information criterion of each series.
+    aicc : ndarray
+        AIC with a correction for finite sample sizes.
+    k : int
+        the k parameter used to remove the bias in AIC, BIC etc.
+    optimized : ndarray
+        Boolean flags indicating which parameters were estimated.
+    converged : ndarray
+        Convergence flag of the optimizer for each series.
+    iterations : ndarray
+        The number of iterations of the optimizer for each series.
+    """
+
+    def __init__(self, model, params, **kwargs):
+        super(BatchHoltWintersResults, self).__init__(model, params, **kwargs)
+        m = model.seasonal_periods
+        nobs = model.nobs
+        y = model.endog
+        fitted, l, b, s = _batch_holt_win(params, y, model.trend,
+                                          model.seasonal, m)
+        self._params = params
+        self.fittedvalues = fitted
+        self.resid = y - fitted
+        self.sse = (self.resid ** 2).sum(0)
+        self.level = l[1:]
+        self.slope = b[1:]
+        self.season = s[m:]
+
+        k = m * model.seasoning + 2 * model.trending + 2 + 1 * model.damped
+        self.k = k
+        self.aic = nobs * np.log(self.sse / nobs) + k * 2
+        if nobs - k - 3 > 0:
+            aicc_penalty = (2 * (k + 2) * (k + 3)) / (nobs - k - 3)
+        else:
+            aicc_penalty = np.inf
+        self.aicc = self.aic + aicc_penalty
+        self.bic = nobs * np.log(self.sse / nobs) + k * np.log(nobs)
+
+        idx = ['smoothing_level', 'smoothing_slope', 'smoothing_seasonal',
+               'initial_level', 'initial_slope', 'damping_slope']
+        idx += ['initial_seasons.{0}'.format(i) for i in range(m)]
+        included = np.array([True, model.trending, model.seasoning, True,
+                             model.trending, model.damped] + [True] * m)
+        formatted = np.where(included, params, np.nan)
+        self.params = pd.DataFrame(formatted, columns=idx,
+                                   index=model.series_names)
+
+    def forecast(self, steps=1):
+        """
+        Out-of-sample forecasts
+
+        Parameters
+        ----------
+        steps : int
+            The number of out of sample forecasts from the end of the
+            sample.
+
+        Returns
+        -------
+        forecast : ndarray
+            The forecasts with shape (steps, n_series).
+        """
+        model = self.model
+        m = model.seasonal_periods
+        phi = self._params[:, 5]
+        h = np.arange(1, steps + 1)[:, None]
+        if model.damped:
+            phi_h = np.cumsum(phi ** h, axis=0)
+        else:
+            phi_h = h * np.ones_like(phi)
+        level = self.level[-1]
+        slope = self.slope[-1]
+        if model.trend == 'mul':
+            fcast = level * slope ** phi_h
+        elif model.trend == 'add':
+            fcast = level + phi_h * slope
+        else:
+            fcast = np.tile(level, (steps, 1))
+        if model.seasoning:
+            season = self.season[-m:][(h[:, 0] - 1) % m]
+            if model.seasonal == 'mul':
+                fcast = fcast * season
+            else:
+                fcast = fcast + season
+        return fcast
@@ -1,2 +1,3 @@
 from .arma_innovations import (  # noqa: F401
-    arma_loglike, arma_loglikeobs, arma_score, arma_scoreobs)
+    arma_innovations, arma_loglike, arma_loglikeobs, arma_score,
+    arma_scoreobs)
@@ -1,11 +1,81 @@
 import numpy as np
 
+from statsmodels.tsa import arima_process
 from statsmodels.tsa.statespace.tools import prefix_dtype_map
 from statsmodels.tools.numdiff import _get_epsilon, approx_fprime_cs
 from scipy.linalg.blas import find_best_blas_type
 from . import _arma_innovations
 
 
+def arma_innovations(endog, ar_params=None, ma_params=None, sigma2=1,
+                     normalize=False, prefix=None):
+    """
+    Compute innovations using a given ARMA process
+
+    Parameters
+    ----------
+    endog : ndarray
+        The observed time-series process.
+    ar_params : ndarray, optional
+        Autoregressive parameters.
+    ma_params : ndarray, optional
+        Moving average parameters.
+    sigma2 : ndarray, optional
+        The ARMA innovation variance. Default is 1.
+    normalize : boolean, optional
+        Whether or not to normalize the returned innovations. Default is False.
+    prefix : str, optional
+        The BLAS prefix associated with the datatype. Default is to find the
+        best datatype based on given input. This argument is typically only
+        used internally.
+
+    Returns
+    -------
+    innovations : ndarray
+        Innovations (one-step-ahead prediction errors) for the given `endog`
+        series with predictions based on the given ARMA process. If
+        `normalize=True`, then the returned innovations have been "whitened"
+        by dividing through by the square root of the mean square error.
+    innovations_mse : ndarray
+        Mean square error for the innovations.
+
+    """
+    endog = np.array(endog)
+    ar_params = np.atleast_1d([] if ar_params is None else ar_params)
+    ma_params = np.atleast_1d([] if ma_params is None else ma_params)
+
+    if prefix is None:
+        prefix, dtype, _ = find_best_blas_type(
+            [endog, ar_params, ma_params, np.array(sigma2)])
+    dtype = prefix_dtype_map[prefix]
+
+    endog = np.ascontiguousarray(endog, dtype=dtype)
+    ar_params = np.asfortranarray(ar_params, dtype=dtype)
+    ma_params = np.asfortranarray(ma_params, dtype=dtype)
+    sigma2 = dtype(sigma2).item()
+    nobs = len(endog)
+
+    ar = np.r_[1, -ar_params].astype(dtype)
+    ma = np.r_[1, ma_params].astype(dtype)
+    arma_acovf = arima_process.arma_acovf(ar, ma, nobs, sigma2,
+                                          dtype=dtype) / sigma2
+    acovf, acovf2 = getattr(_arma_innovations,
+                            prefix + 'arma_transformed_acovf_fast')(
+        ar, ma, arma_acovf)
+    theta, v = getattr(_arma_innovations,
+                       prefix + 'arma_innovations_algo_fast')(
+        nobs, ar_params, ma_params, acovf, acovf2)
+    u = getattr(_arma_innovations, prefix + 'arma_innovations_filter')(
+        endog, ar_params, ma_params, theta)
+
+    innovations = np.array(u)
+    innovations_mse = np.array(v) * sigma2
+    if normalize:
+        innovations /= innovations_mse**0.5
+
+    return innovations, innovations_mse
+
+
 def arma_loglike(endog, ar_params=None, ma_params=None, sigma2=1, prefix=None):
     """
     Compute loglikelihood of the given data assuming an ARMA process
@@ -42,3 +42,13 @@ def test_innovations_algo_filter_kalman_filter(ar_params, ma_params, sigma2):
     # Note: the tolerance on the two gets worse as more nobs are added
     assert_allclose(score, mod.score(params), atol=1e-5)
     assert_allclose(score_obs, mod.score_obs(params), atol=1e-5)
+
+    # Innovations and their mean square error
+    u, v = arma_innovations.arma_innovations(endog, ar_params, ma_params,
+                                             sigma2)
+    res = mod.filter(params)
+    assert_allclose(u, res.forecasts_error[0])
+    assert_allclose(v, res.forecasts_error_cov[0, 0])
+    u_std, _ = arma_innovations.arma_innovations(endog, ar_params, ma_params,
+                                                 sigma2, normalize=True)
+    assert_allclose(u_std, u / v**0.5)
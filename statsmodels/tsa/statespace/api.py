@@ -1,5 +1,7 @@
-__all__ = ["SARIMAX", "MLEModel", "MLEResults", "tools", "Initialization"]
+__all__ = ["SARIMAX", "MLEModel", "MLEResults", "tools", "Initialization",
+           "sarimax_order_select"]
 from .sarimax import SARIMAX
+from .order_selection import sarimax_order_select
 from .mlemodel import MLEModel, MLEResults
 from .initialization import Initialization
 from . import tools
@@ -7,6 +7,7 @@ License: Simplified-BSD
 """
 from __future__ import division, absolute_import, print_function
 import warnings
+from timeit import default_timer
 
 import numpy as np
 import pandas as pd
@@ -427,7 +428,13 @@ class MLEModel(tsbase.TimeSeriesModel):
             approximation. This keyword is only relevant if the
             optimization method uses the Hessian matrix.
         **kwargs
-            Additional keyword arguments to pass to the optimizer.
+            Additional keyword arguments to pass to the optimizer. If
+            `trace` is True or an OptimizerTrace instance, then the
+            optimization is instrumented, see
+            `statsmodels.base.model.LikelihoodModel.fit`, and the trace is
+            available as `mle_trace` of the results. The time for smoothing
+            at the final parameters and creating the results is included
+            under 'results'.
 
         Returns
         -------
@@ -483,9 +490,16 @@ class MLEModel(tsbase.TimeSeriesModel):
             return self.transform_params(mlefit.params)
         # Otherwise construct the results class if desired
         else:
+            t0 = default_timer()
             res = self.smooth(mlefit.params, transformed=False,
                               cov_type=cov_type, cov_kwds=cov_kwds)
 
+            trace = getattr(mlefit, 'mle_trace', None)
+            if trace is not None:
+                # smoothing and _wrap_results at the final params
+                trace.times['results'] += default_timer() - t0
+                res.mle_trace = trace
+
             res.mlefit = mlefit
             res.mle_retvals = mlefit.mle_retvals
             res.mle_settings = mlefit.mle_settings
@@ -0,0 +1,438 @@
+"""
+Automatic order selection for SARIMAX models
+
+The differencing orders are selected first, the ARMA orders are then
+selected by a stepwise search over the neighborhood of the best model found
+so far, similar to Hyndman and Khandakar (2008), or by a search over the
+full grid of orders.
+
+All candidate models are estimated on the same differenced data, which is
+computed only once, and each candidate is started at the parameters of the
+best already estimated model that differs by one lag. Candidates that are
+independent of each other can be estimated in parallel with joblib.
+
+References
+----------
+Hyndman, Rob J., and Yeasmin Khandakar. 2008. "Automatic Time Series
+Forecasting: The forecast Package for R." Journal of Statistical Software
+27 (3).
+
+Wang, Xiaozhe, Kate Smith-Miles, and Rob J. Hyndman. 2006.
+"Characteristic-Based Clustering for Time Series Data." Data Mining and
+Knowledge Discovery 13 (3): 335-364.
+
+License: BSD-3
+"""
+from __future__ import division
+
+import warnings
+from timeit import default_timer
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.tools.parallel import parallel_func
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.statespace.tools import diff
+
+
+def ndiffs(x, test='kpss', alpha=0.05, max_d=2):
+    """number of differences required for a stationary series
+
+    Parameters
+    ----------
+    x : array_like, 1-D
+        time series
+    test : {'kpss', 'adf'}
+        The series is differenced as long as the KPSS test rejects the null
+        hypothesis of level stationarity, or as long as the augmented
+        Dickey-Fuller test does not reject the null hypothesis of a unit
+        root, at level `alpha`. The KPSS test uses ``int(3 * sqrt(nobs) /
+        13)`` lags as in Hyndman and Khandakar (2008).
+    alpha : float
+        significance level of the tests
+    max_d : int
+        maximum number of differences
+
+    Returns
+    -------
+    d : int
+        number of differences
+    """
+    from statsmodels.tsa.stattools import adfuller, kpss
+    if test not in ('kpss', 'adf'):
+        raise ValueError('test must be "kpss" or "adf"')
+
+    x = np.asarray(x, dtype=float)
+    d = 0
+    while d < max_d:
+        if np.ptp(x) == 0:
+            break
+        with warnings.catch_warnings():
+            # p-values outside of the kpss table
+            warnings.simplefilter('ignore')
+            if test == 'kpss':
+                lags = int(3 * np.sqrt(len(x)) / 13)
+                nonstationary = kpss(x, regression='c', lags=lags)[1] < alpha
+            else:
+                nonstationary = adfuller(x, regression='c')[1] > alpha
+        if not nonstationary:
+            break
+        x = np.diff(x)
+        d += 1
+    return d
+
+
+def nsdiffs(x, seasonal_periods, max_D=1, threshold=0.64):
+    """number of seasonal differences based on the seasonal strength
+
+    Parameters
+    ----------
+    x : array_like, 1-D
+        time series
+    seasonal_periods : int
+        number of periods in a season
+    max_D : int
+        maximum number of seasonal differences
+    threshold : float
+        The series is seasonally differenced as long as the strength of the
+        seasonal component is larger than the threshold.
+
+    Returns
+    -------
+    D : int
+        number of seasonal differences
+
+    Notes
+    -----
+    The seasonal strength is ``max(0, 1 - var(resid) / var(seasonal +
+    resid))`` of an additive decomposition with `seasonal_decompose`,
+    see Wang, Smith-Miles and Hyndman (2006).
+    """
+    from statsmodels.tsa.seasonal import seasonal_decompose
+    x = np.asarray(x, dtype=float)
+    D = 0
+    while D < max_D and len(x) >= 2 * seasonal_periods + 1:
+        dec = seasonal_decompose(x, freq=seasonal_periods)
+        mask = np.isfinite(dec.resid)
+        resid = dec.resid[mask]
+        strength = 1 - resid.var() / (dec.seasonal[mask] + resid).var()
+        if strength <= threshold:
+            break
+        x = x[seasonal_periods:] - x[:-seasonal_periods]
+        D += 1
+    return D
+
+
+def _fit_candidate(endog, exog, spec, start_params, model_kw, fit_kw, ic):
+    """estimate one candidate model
+
+    This is a module level function so that it can be pickled by joblib.
+
+    Returns
+    -------
+    info : dict
+        parameters, loglikelihood, information criterion, convergence
+        and estimation time of the candidate
+    """
+    order, seasonal_order, trend = spec
+    t0 = default_timer()
+    info = {'params': None, 'param_names': None, 'llf': np.nan,
+            'ic': np.inf, 'converged': False}
+    mod = SARIMAX(endog, exog=exog, order=order,
+                  seasonal_order=seasonal_order, trend=trend, **model_kw)
+    starts = [None]
+    if start_params is not None:
+        # fall back to the default start parameters if the neighbor's
+        # parameters are not admissible for this model
+        starts.insert(0, _map_params(start_params, mod.param_names))
+    for sp in starts:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                res = mod.fit(start_params=sp, **fit_kw)
+            value = getattr(res, ic)
+        except (np.linalg.LinAlgError, ValueError):
+            continue
+        if np.isfinite(value):
+            info.update(params=np.asarray(res.params),
+                        param_names=mod.param_names, llf=res.llf, ic=value,
+                        converged=res.mle_retvals.get('converged', True))
+            break
+    info['time'] = default_timer() - t0
+    return info
+
+
+def _map_params(params, param_names):
+    """start parameters for param_names from a dict of named parameters
+
+    Parameters that are not in `params`, i.e. additional lags, start at zero.
+    """
+    return np.array([params.get(name, 0.) for name in param_names])
+
+
+class SARIMAXOrderSelectResults(object):
+    """Results of the automatic order selection of SARIMAX models
+
+    **Attributes**
+
+    order : tuple
+        (p, d, q) of the selected model
+    seasonal_order : tuple
+        (P, D, Q, s) of the selected model
+    trend : str
+        trend of the selected model
+    ic : str
+        information criterion used for the selection
+    results : SARIMAXResults or None
+        The selected model estimated on the original data, if refit is true.
+    trace : DataFrame
+        one row for each estimated candidate, in the order of estimation,
+        with the orders, the loglikelihood and information criterion of the
+        candidate on the differenced data, convergence, the estimation time
+        and the search step in which it was estimated.
+    time_differencing : float
+        time used for selecting the differencing orders
+    """
+
+    def __init__(self, order, seasonal_order, trend, ic, results, trace,
+                 time_differencing):
+        self.order = order
+        self.seasonal_order = seasonal_order
+        self.trend = trend
+        self.ic = ic
+        self.results = results
+        self.trace = trace
+        self.time_differencing = time_differencing
+
+
+def sarimax_order_select(endog, exog=None, seasonal_periods=None, d=None,
+                         D=None, max_p=5, max_q=5, max_P=2, max_Q=2,
+                         max_d=2, max_D=1, max_order=5, trend=None,
+                         ic='aic', stepwise=True, max_models=94,
+                         test='kpss', alpha=0.05, n_jobs=1, model_kw=None,
+                         fit_kw=None, refit=True):
+    """
+    Automatic selection of the orders of a SARIMAX model
+
+    Parameters
+    ----------
+    endog : array_like, 1-D
+        The observed time-series process.
+    exog : array_like, optional
+        exogenous regressors, differenced in the same way as endog
+    seasonal_periods : None or int
+        Number of periods in a season. Seasonal orders are only searched
+        if it is larger than one.
+    d, D : None or int
+        Number of differences and seasonal differences. If None, then they
+        are selected with `ndiffs` and `nsdiffs`. `D` is selected first,
+        `d` is selected using the seasonally differenced data.
+    max_p, max_q, max_P, max_Q : int
+        maximum AR, MA, seasonal AR and seasonal MA orders
+    max_d, max_D : int
+        maximum number of differences and seasonal differences
+    max_order : None or int
+        maximum of ``p + q + P + Q``
+    trend : None or str
+        Trend of all candidates, see `SARIMAX`. If None, then a constant is
+        included if ``d + D`` is at most one, which corresponds to a drift
+        if the data is differenced once.
+    ic : {'aic', 'bic', 'hqic'}
+        information criterion for the selection
+    stepwise : bool
+        If true, then the neighborhood of the best model is searched as
+        long as the information criterion improves. Otherwise all
+        combinations of orders are estimated.
+    max_models : int
+        maximum number of candidates in the stepwise search
+    test : {'kpss', 'adf'}
+        unit root or stationarity test used in `ndiffs`
+    alpha : float
+        significance level for the test in `ndiffs`
+    n_jobs : int
+        Number of candidates that are estimated in parallel using joblib.
+        n_jobs=-1 uses all available cores.
+    model_kw : dict
+        additional keywords for `SARIMAX`, e.g. enforce_stationarity
+    fit_kw : dict
+        additional keywords for `SARIMAX.fit`
+    refit : bool
+        If true, then the selected model is estimated on the original data.
+
+    Returns
+    -------
+    res : SARIMAXOrderSelectResults
+
+    Notes
+    -----
+    All candidates are estimated as ARMA models on the differenced endog
+    and exog, which are computed only once, so that their information
+    criteria are comparable. If `refit` is true, then the selected model is
+    re-estimated with the differencing in the model, starting at the
+    selected parameters, so that forecasts are in levels.
+
+    The stepwise search starts with the null model (0, 0)(0, 0), followed
+    by the candidates (1, 0)(1, 0), (0, 1)(0, 1) and (2, 2)(1, 1) that
+    satisfy the maximum orders. With the default ``max_order=5`` the
+    seasonal (2, 2)(1, 1) is not estimated. Then all models that
+    change one of p, q, P or Q, or both p and q, or both P and Q, by one
+    from the current best model are estimated. All candidates of a step are
+    independent and estimated in parallel if n_jobs is not 1. Each
+    candidate starts at the parameters of the best estimated model that
+    differs from it by one lag in one of the orders, with zeros for the
+    additional parameters.
+
+    Examples
+    --------
+    >>> res = sarimax_order_select(y, seasonal_periods=12)
+    >>> res.order, res.seasonal_order
+    >>> res.trace
+    >>> res.results.forecast(12)
+    """
+    if ic not in ('aic', 'bic', 'hqic'):
+        raise ValueError('ic must be "aic", "bic" or "hqic"')
+    model_kw = {} if model_kw is None else dict(model_kw)
+    fit_kw = {} if fit_kw is None else dict(fit_kw)
+    fit_kw.setdefault('disp', False)
+
+    endog_orig, exog_orig = endog, exog
+    endog = np.asarray(endog, dtype=float)
+    if exog is not None:
+        exog = np.asarray(exog, dtype=float)
+        if exog.ndim == 1:
+            exog = exog[:, None]
+    seasonal = seasonal_periods is not None and seasonal_periods > 1
+    s = seasonal_periods if seasonal else 0
+    if not seasonal:
+        D = 0
+        max_P = max_Q = 0
+
+    # differencing, computed once for all candidates
+    t0 = default_timer()
+    if D is None:
+        D = nsdiffs(endog, s, max_D=max_D)
+    if d is None:
+        x = diff(endog, 0, D, max(s, 1))
+        d = ndiffs(x, test=test, alpha=alpha, max_d=max_d)
+    endog_diff = diff(endog, d, D, max(s, 1))
+    exog_diff = None if exog is None else diff(exog, d, D, max(s, 1))
+    time_differencing = default_timer() - t0
+
+    if trend is None:
+        trend = 'c' if d + D <= 1 else 'n'
+
+    def valid(orders):
+        p, q, P, Q = orders
+        if min(orders) < 0 or p > max_p or q > max_q:
+            return False
+        if P > max_P or Q > max_Q:
+            return False
+        return max_order is None or sum(orders) <= max_order
+
+    def spec(orders):
+        p, q, P, Q = orders
+        return ((p, 0, q), (P, 0, Q, s), trend)
+
+    evaluated = {}
+    trace = []
+    if n_jobs != 1:
+        par, func, n_jobs = parallel_func(_fit_candidate, n_jobs, verbose=0)
+
+    def start_params(orders):
+        # best estimated model that differs by one lag in one order
+        best = None
+        for i in range(4):
+            for step in (-1, 1):
+                nb = list(orders)
+                nb[i] += step
+                info = evaluated.get(tuple(nb))
+                if info is None or info['params'] is None:
+                    continue
+                if best is None or info['ic'] < best['ic']:
+                    best = info
+        if best is None:
+            return None
+        return dict(zip(best['param_names'], best['params']))
+
+    def evaluate(candidates, step):
+        candidates = [c for c in candidates if c not in evaluated]
+        starts = [start_params(c) for c in candidates]
+        args = (model_kw, fit_kw, ic)
+        if n_jobs == 1:
+            infos = [_fit_candidate(endog_diff, exog_diff, spec(c), sp,
+                                    *args)
+                     for c, sp in zip(candidates, starts)]
+        else:
+            infos = par(func(endog_diff, exog_diff, spec(c), sp, *args)
+                        for c, sp in zip(candidates, starts))
+        for c, info in zip(candidates, infos):
+            evaluated[c] = info
+            trace.append({'p': c[0], 'd': d, 'q': c[1], 'P': c[2], 'D': D,
+                          'Q': c[3], 's': s, 'trend': trend,
+                          'llf': info['llf'], ic: info['ic'],
+                          'converged': info['converged'],
+                          'time': info['time'], 'step': step})
+        return candidates
+
+    def best_model():
+        return min(evaluated, key=lambda c: evaluated[c]['ic'])
+
+    if stepwise:
+        if seasonal:
+            initial = [(1, 0, 1, 0), (0, 1, 0, 1), (2, 2, 1, 1)]
+        else:
+            initial = [(1, 0, 0, 0), (0, 1, 0, 0), (2, 2, 0, 0)]
+        null = (0, 0, 0, 0)
+        # estimate the null model first, it provides start values
+        evaluate([null], 0)
+        evaluate([c for c in initial if c != null and valid(c)], 0)
+
+        step = 1
+        moves = [(1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1),
+                 (1, 1, 0, 0), (0, 0, 1, 1)]
+        while len(evaluated) < max_models:
+            current = best_model()
+            neighbors = []
+            for move in moves:
+                for sign in (-1, 1):
+                    nb = tuple(c + sign * m for c, m in zip(current, move))
+                    if valid(nb) and nb not in evaluated:
+                        neighbors.append(nb)
+            neighbors = neighbors[:max_models - len(evaluated)]
+            if not neighbors:
+                break
+            evaluate(neighbors, step)
+            if best_model() == current:
+                break
+            step += 1
+    else:
+        grid = [(p, q, P, Q) for p in range(max_p + 1)
+                for q in range(max_q + 1) for P in range(max_P + 1)
+                for Q in range(max_Q + 1)]
+        grid = [c for c in grid if valid(c)]
+        # levels of increasing total order, for warm starts
+        for level in range(max(sum(c) for c in grid) + 1):
+            evaluate([c for c in grid if sum(c) == level], level)
+
+    best = best_model()
+    if not np.isfinite(evaluated[best]['ic']):
+        raise ValueError('estimation of all candidate models failed')
+    (p, _, q), (P, _, Q, _), _ = spec(best)
+    order = (p, d, q)
+    seasonal_order = (P, D, Q, s)
+
+    results = None
+    if refit:
+        mod = SARIMAX(endog_orig, exog=exog_orig, order=order,
+                      seasonal_order=seasonal_order, trend=trend, **model_kw)
+        info = evaluated[best]
+        sp = _map_params(dict(zip(info['param_names'], info['params'])),
+                         mod.param_names)
+        results = mod.fit(start_params=sp, **fit_kw)
+
+    columns = ['p', 'd', 'q', 'P', 'D', 'Q', 's', 'trend', 'llf', ic,
+               'converged', 'time', 'step']
+    trace = pd.DataFrame(trace, columns=columns)
+    return SARIMAXOrderSelectResults(order, seasonal_order, trend, ic,
+                                     results, trace, time_differencing)
@@ -16,7 +16,7 @@ from statsmodels.tsa.statespace import (sarimax, varmax, kalman_filter,
                                         kalman_smoother)
 from statsmodels.tsa.statespace.mlemodel import MLEModel, MLEResultsWrapper
 from statsmodels.datasets import nile
-from numpy.testing import assert_almost_equal, assert_equal, assert_allclose, assert_raises
+from numpy.testing import assert_, assert_almost_equal, assert_equal, assert_allclose, assert_raises
 from statsmodels.tsa.statespace.tests.results import results_sarimax, results_var_misc
 
 current_path = os.path.dirname(os.path.abspath(__file__))
@@ -181,6 +181,20 @@ def test_fit_misc():
     assert_almost_equal(res_params, [0, 0], 5)
 
 
+def test_fit_trace():
+    true = results_sarimax.wpi1_stationary
+    endog = np.diff(true['data'])[1:]
+
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 1), trend='c')
+    res = mod.fit(disp=0, trace=True)
+    trace = res.mle_trace
+    assert_equal(trace.method, 'lbfgs')
+    assert_equal(trace.n_iter, res.mle_retvals['iterations'])
+    assert_equal(trace.ncalls['loglike'], res.mle_retvals['fcalls'])
+    assert_(trace.times['results'] > 0)
+    assert_allclose(mod.transform_params(trace.params_trace[-1]), res.params)
+
+
 def test_score_misc():
     mod, res = get_dummy_mod()
 
@@ -0,0 +1,108 @@
+"""
+Tests for automatic SARIMAX order selection
+
+License: BSD-3
+"""
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_equal, assert_allclose, assert_raises
+
+from statsmodels.tsa.arima_process import arma_generate_sample
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.statespace.order_selection import (
+    ndiffs, nsdiffs, sarimax_order_select)
+
+
+def _arma_data(nobs=250, seed=1234):
+    np.random.seed(seed)
+    return arma_generate_sample([1, -0.6], [1, 0.4], nobs)
+
+
+def test_ndiffs_nsdiffs():
+    y = _arma_data()
+    for test in ['kpss', 'adf']:
+        assert_equal(ndiffs(y, test=test), 0)
+        assert_equal(ndiffs(y.cumsum(), test=test), 1)
+        assert_equal(ndiffs(y.cumsum(), test=test, max_d=0), 0)
+
+    season = np.tile(5 * np.sin(np.arange(12) * np.pi / 6), 20)
+    assert_equal(nsdiffs(y[:240] + season, 12), 1)
+    assert_equal(nsdiffs(y[:240], 12), 0)
+
+
+def test_stepwise():
+    y = _arma_data().cumsum() + 5
+    res = sarimax_order_select(y, max_p=3, max_q=3)
+    assert_equal(res.order, (1, 1, 1))
+    assert_equal(res.seasonal_order, (0, 0, 0, 0))
+    assert_equal(res.trend, 'c')
+
+    trace = res.trace
+    assert_equal(list(trace.columns), ['p', 'd', 'q', 'P', 'D', 'Q', 's',
+                                       'trend', 'llf', 'aic', 'converged',
+                                       'time', 'step'])
+    # each candidate is estimated only once
+    assert_equal(len(trace.drop_duplicates(['p', 'q'])), len(trace))
+    assert_equal(trace['step'].iloc[:4].values, 0)
+    assert (trace['time'] > 0).all()
+    best = trace.loc[trace['aic'].idxmin()]
+    assert_equal((best['p'], best['q']), (1, 1))
+
+    # candidates are estimated on the differenced data
+    mod = SARIMAX(np.diff(y), order=(1, 0, 1), trend='c')
+    res1 = mod.fit(disp=False)
+    assert_allclose(best['llf'], res1.llf, rtol=1e-5)
+    # final model is estimated in levels
+    assert_equal(res.results.model.order, (1, 1, 1))
+    assert_allclose(res.results.params, res1.params, rtol=0.05)
+
+
+def test_grid_parallel():
+    y = pd.Series(_arma_data(nobs=200),
+                  index=pd.date_range('2000-1-1', periods=200, freq='M'))
+    res = sarimax_order_select(y, max_p=2, max_q=2, stepwise=False,
+                               ic='bic', refit=False)
+    assert_equal(len(res.trace), 9)
+    assert_equal(res.trace['step'].values, [0, 1, 1, 2, 2, 2, 3, 3, 4])
+    assert res.results is None
+    best = res.trace.loc[res.trace['bic'].idxmin()]
+    assert_equal(res.order, (best['p'], 0, best['q']))
+
+    res_par = sarimax_order_select(y, max_p=2, max_q=2, stepwise=False,
+                                   ic='bic', refit=False, n_jobs=2)
+    assert_allclose(res_par.trace['bic'], res.trace['bic'], rtol=1e-8)
+
+    res_step = sarimax_order_select(y, max_p=2, max_q=2, ic='bic')
+    assert_equal(res_step.order, res.order)
+    assert_equal(res_step.results.model.order, res.order)
+
+
+def test_seasonal_exog():
+    np.random.seed(987)
+    nobs = 144
+    season = np.tile(3 * np.sin(np.arange(12) * np.pi / 6), nobs // 12)
+    exog = np.random.randn(nobs)
+    y = _arma_data(nobs) + season + 0.5 * exog
+    res = sarimax_order_select(y, exog=exog, seasonal_periods=12, d=0,
+                               max_p=2, max_q=1, max_P=1, max_Q=1)
+    assert_equal(res.seasonal_order[1], 1)
+    assert_equal(res.seasonal_order[3], 12)
+    assert_equal(res.order[1], 0)
+    assert_equal(res.trend, 'c')
+    assert_allclose(res.results.params[1], 0.5, atol=0.1)
+    assert (res.trace[['P', 'Q']].values <= 1).all()
+    assert (res.trace[['p', 'q', 'P', 'Q']].sum(1) <= 5).all()
+
+    assert_raises(ValueError, sarimax_order_select, y, ic='fpe')
+
+
+def test_stepwise_initial_seasonal():
+    y = _arma_data(nobs=120)
+    res = sarimax_order_select(y, seasonal_periods=4, d=0, D=0,
+                               max_models=3, refit=False)
+    # the null model is estimated first, (2, 2)(1, 1) exceeds max_order
+    orders = [tuple(row) for row in res.trace[['p', 'q', 'P', 'Q']].values]
+    assert_equal(orders, [(0, 0, 0, 0), (1, 0, 1, 0), (0, 1, 0, 1)])
+    assert_equal(res.trace['step'].values, 0)
@@ -16,13 +16,17 @@ from statsmodels.tools.sm_exceptions import (InterpolationWarning,
                                              CollinearityWarning)
 from statsmodels.tools.tools import add_constant, Bunch
 from statsmodels.tsa._bds import bds
-from statsmodels.tsa.adfvalues import mackinnonp, mackinnoncrit
+from statsmodels.tsa.adfvalues import (mackinnonp, mackinnoncrit,
+                                       _mackinnonp_array)
 from statsmodels.tsa.arima_model import ARMA
 from statsmodels.tsa.tsatools import lagmat, lagmat2ds, add_trend
 
 __all__ = ['acovf', 'acf', 'pacf', 'pacf_yw', 'pacf_ols', 'ccovf', 'ccf',
-           'periodogram', 'q_stat', 'coint', 'arma_order_select_ic',
-           'adfuller', 'kpss', 'bds', 'pacf_burg', 'innovations_algo',
+           'ccovf_multi', 'ccf_multi',
+           'periodogram', 'q_stat', 'OnlineACF', 'coint',
+           'arma_order_select_ic',
+           'adfuller', 'adfuller_batch', 'kpss', 'kpss_batch', 'coint_batch',
+           'bds', 'pacf_burg', 'innovations_algo',
            'innovations_filter', 'levinson_durbin_pacf', 'levinson_durbin']
 
 SQRTEPS = np.sqrt(np.finfo(np.double).eps)
@@ -298,6 +302,264 @@ def adfuller(x, maxlag=None, regression="c", autolag='AIC',
             return adfstat, pvalue, usedlag, nobs, critvalues, icbest
 
 
+def _stacked_cholesky(a):
+    """
+    Cholesky factors of a stack of symmetric matrices.
+
+    Matrices that are not positive definite get a factor filled with nan
+    instead of failing the whole stack.
+    """
+    try:
+        return np.linalg.cholesky(a)
+    except LinAlgError:
+        out = np.empty_like(a)
+        for i in range(a.shape[0]):
+            try:
+                out[i] = np.linalg.cholesky(a[i])
+            except LinAlgError:
+                out[i] = np.nan
+        return out
+
+
+def _stacked_ols_chol(trend, regs, endog):
+    """
+    Cholesky factor of the scaled cross-products of a stack of regressions
+
+    Parameters
+    ----------
+    trend : ndarray
+        nobs by k_trend array of deterministic terms shared by all series.
+    regs : ndarray
+        nseries by nobs by k_regs array of series specific regressors.
+    endog : ndarray
+        nseries by nobs array of dependent variables.
+
+    Returns
+    -------
+    r_y : ndarray
+        nseries by k array, the last column of the upper triangular factor
+        R of [X, y]'[X, y] restricted to the regressors.
+    ssr : ndarray
+        nseries by (k + 1) array, the sum of squared residuals of the nested
+        regressions on the first j columns, j = 0, ..., k, of the scaled
+        regressors. The scaling is common to all j.
+
+    Notes
+    -----
+    The columns are ordered as trend, regs. Because R is the triangular
+    factor of a QR decomposition of the design, the residual sum of squares
+    of every leading subset of columns follows from a single factorization,
+    and the t-value of the last included column j - 1 is
+    ``r_y[:, j - 1] / sqrt(ssr[:, j] / (nobs - j))``.
+    """
+    nseries, nobs = endog.shape
+    k_trend = trend.shape[1]
+    k = k_trend + regs.shape[2]
+    # shared deterministic blocks are computed once for the whole panel
+    xx = np.empty((nseries, k + 1, k + 1))
+    xx[:, :k_trend, :k_trend] = trend.T.dot(trend)
+    tr = np.einsum('ti,stj->sij', trend, regs)
+    ty = endog.dot(trend)
+    xx[:, :k_trend, k_trend:k] = tr
+    xx[:, k_trend:k, :k_trend] = tr.transpose(0, 2, 1)
+    xx[:, :k_trend, k] = ty
+    xx[:, k, :k_trend] = ty
+    xx[:, k_trend:k, k_trend:k] = np.matmul(regs.transpose(0, 2, 1), regs)
+    ry = np.einsum('stj,st->sj', regs, endog)
+    xx[:, k_trend:k, k] = ry
+    xx[:, k, k_trend:k] = ry
+    xx[:, k, k] = (endog ** 2).sum(1)
+
+    scale = np.sqrt(np.diagonal(xx, axis1=1, axis2=2))
+    scale[scale == 0] = 1.
+    xx /= scale[:, :, None]
+    xx /= scale[:, None, :]
+    chol = _stacked_cholesky(xx)
+    r_y = chol[:, k, :k]
+    ssr = chol[:, k, k:k + 1] ** 2 + np.cumsum((r_y ** 2)[:, ::-1], 1)[:, ::-1]
+    ssr = np.column_stack((ssr, chol[:, k, k] ** 2))
+    ssr *= scale[:, k:k + 1] ** 2
+    r_y = r_y * scale[:, k:k + 1]
+    return r_y, ssr
+
+
+def _adf_design(x, xdiff, lags, nobs):
+    """
+    Lagged level and lagged differences for the last nobs observations.
+
+    Returns an nseries by nobs by (1 + lags) array with the lagged level in
+    the first column followed by lags 1 to lags of the differences.
+    """
+    nobs_x = x.shape[0]
+    cols = [x[nobs_x - nobs - 1:nobs_x - 1]]
+    ndiff = xdiff.shape[0]
+    for i in range(1, lags + 1):
+        cols.append(xdiff[ndiff - nobs - i:ndiff - i])
+    return np.stack(cols, axis=-1).transpose(1, 0, 2)
+
+
+def _adf_trend(regression, nobs):
+    """Deterministic terms of the ADF regression, constant first"""
+    k_trend = {'nc': 0, 'c': 1, 'ct': 2, 'ctt': 3}[regression]
+    trend = np.arange(1, nobs + 1, dtype=float)[:, None]
+    return trend ** np.arange(k_trend)
+
+
+def adfuller_batch(x, maxlag=None, regression="c", autolag='AIC',
+                   chunksize=None):
+    """
+    Augmented Dickey-Fuller unit root test for many series at once
+
+    Parameters
+    ----------
+    x : array_like, 2d
+        nobs by nseries array, each column is tested separately. A 1d array
+        is treated as a single series.
+    maxlag : int
+        Maximum lag which is included in test, default 12*(nobs/100)^{1/4}
+    regression : {'c','ct','ctt','nc'}
+        Constant and trend order to include in regression
+
+        * 'c' : constant only (default)
+        * 'ct' : constant and trend
+        * 'ctt' : constant, and linear and quadratic trend
+        * 'nc' : no constant, no trend
+    autolag : {'AIC', 'BIC', 't-stat', None}
+        Lag length selection, see `adfuller`.
+    chunksize : int, optional
+        Number of series that are processed together. The default limits
+        the size of the stacked design arrays to about 2**24 elements.
+
+    Returns
+    -------
+    adf : ndarray
+        Test statistics
+    pvalue : ndarray
+        MacKinnon's approximate p-values based on MacKinnon (1994, 2010)
+    usedlag : ndarray
+        Number of lags used for each series
+    nobs : ndarray
+        Number of observations used for the ADF regression and calculation of
+        the critical values
+    critical values : dict
+        Arrays of critical values for the test statistic at the 1 %, 5 %,
+        and 10 % levels. Based on MacKinnon (2010)
+    icbest : ndarray
+        The maximized information criterion if autolag is not None.
+
+    See Also
+    --------
+    adfuller
+
+    Notes
+    -----
+    The results agree with calling `adfuller` on each column, but the
+    regressions are not estimated one at a time. For each chunk of series
+    the cross-products of the design with all maxlag lags are computed
+    once, with the deterministic blocks shared across series, and a single
+    Cholesky factorization of the cross-product matrix per series gives the
+    residual sum of squares and the t-value on the last lag of every nested
+    lag length. The final regression is then run jointly for all series
+    that selected the same lag length.
+
+    Series for which the design is singular, for example constant series,
+    return nan.
+    """
+    trenddict = {None: 'nc', 0: 'c', 1: 'ct', 2: 'ctt'}
+    if regression is None or isinstance(regression, (int, long)):
+        regression = trenddict[regression]
+    regression = regression.lower()
+    if regression not in ['c', 'nc', 'ct', 'ctt']:
+        raise ValueError("regression option %s not understood" % regression)
+    if autolag is not None:
+        autolag = autolag.lower()
+        if autolag not in ['aic', 'bic', 't-stat']:
+            raise ValueError("autolag option %s not understood" % autolag)
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    if x.ndim != 2:
+        raise ValueError("x must be 1 or 2-dimensional")
+    nobs_x, nseries = x.shape
+
+    if maxlag is None:
+        maxlag = int(np.ceil(12. * np.power(nobs_x / 100., 1 / 4.)))
+    k_trend = {'nc': 0, 'c': 1, 'ct': 2, 'ctt': 3}[regression]
+    nobs_max = nobs_x - 1 - maxlag
+    if nobs_max <= k_trend + maxlag + 1:
+        raise ValueError("maxlag is too large for the number of "
+                         "observations")
+    if chunksize is None:
+        chunksize = 2 ** 24 // (nobs_x * (maxlag + 2)) + 1
+
+    usedlag = np.empty(nseries, dtype=int)
+    icbest = np.full(nseries, np.nan)
+    adfstat = np.full(nseries, np.nan)
+    trend_max = _adf_trend(regression, nobs_max)
+    startlag = k_trend + 1
+    # if no lag is significant, t-stat selection falls back to lag 0
+    stop = 1.6448536269514722
+
+    xdiff_all = np.diff(x, axis=0)
+    for start in range(0, nseries, chunksize):
+        sl = slice(start, min(start + chunksize, nseries))
+        xs = x[:, sl]
+        xdiff = xdiff_all[:, sl]
+        if autolag is not None:
+            regs = _adf_design(xs, xdiff, maxlag, nobs_max)
+            r_y, ssr = _stacked_ols_chol(trend_max, regs,
+                                         xdiff[-nobs_max:].T)
+            ncols = np.arange(startlag, startlag + maxlag + 1)
+            ssr = ssr[:, ncols]
+            if autolag == 't-stat':
+                tvals = np.abs(r_y[:, ncols - 1] /
+                               np.sqrt(ssr / (nobs_max - ncols)))
+                sig = tvals >= stop
+                best = maxlag - np.argmax(sig[:, ::-1], 1)
+                best[~sig.any(1)] = 0
+                icbest[sl] = tvals[np.arange(tvals.shape[0]), best]
+            else:
+                penalty = 2. if autolag == 'aic' else np.log(nobs_max)
+                llf = -nobs_max / 2. * (np.log(2 * np.pi) +
+                                        np.log(ssr / nobs_max) + 1)
+                ic = -2 * llf + penalty * ncols
+                ic_masked = np.where(np.isnan(ic), np.inf, ic)
+                best = np.argmin(ic_masked, 1)
+                icbest[sl] = ic[np.arange(ic.shape[0]), best]
+            usedlag[sl] = best
+        else:
+            usedlag[sl] = maxlag
+
+        # rerun the regression with the selected lag on all available
+        # observations, jointly for all series with the same lag
+        lags_chunk = usedlag[sl]
+        stat_chunk = np.full(lags_chunk.shape[0], np.nan)
+        for lag in np.unique(lags_chunk):
+            idx = np.nonzero(lags_chunk == lag)[0]
+            nobs_lag = nobs_x - 1 - lag
+            regs = _adf_design(xs[:, idx], xdiff[:, idx], lag, nobs_lag)
+            # put the lagged level last to get its t-value
+            regs = np.roll(regs, -1, axis=2)
+            r_y, ssr = _stacked_ols_chol(_adf_trend(regression, nobs_lag),
+                                         regs, xdiff[-nobs_lag:, idx].T)
+            k = ssr.shape[1] - 1
+            stat_chunk[idx] = r_y[:, -1] / np.sqrt(ssr[:, -1] /
+                                                   (nobs_lag - k))
+        adfstat[sl] = stat_chunk
+
+    nobs = nobs_x - 1 - usedlag
+    pvalue = _mackinnonp_array(adfstat, regression=regression, N=1)
+    pvalue[np.isnan(adfstat)] = np.nan
+    crit = np.empty((nseries, 3))
+    for n in np.unique(nobs):
+        crit[nobs == n] = mackinnoncrit(N=1, regression=regression, nobs=n)
+    critvalues = {"1%": crit[:, 0], "5%": crit[:, 1], "10%": crit[:, 2]}
+    if autolag is None:
+        return adfstat, pvalue, usedlag, nobs, critvalues
+    else:
+        return adfstat, pvalue, usedlag, nobs, critvalues, icbest
+
+
 def acovf(x, unbiased=False, demean=True, fft=None, missing='none', nlag=None):
     """
     Autocovariance for 1D
@@ -742,7 +1004,73 @@ def pacf(x, nlags=40, method='ywunbiased', alpha=None):
         return ret
 
 
-def ccovf(x, y, unbiased=True, demean=True):
+def _ccovf_blocks(x, y, nlags, blocksize, demean=True):
+    """
+    Sums of lagged cross-products by blockwise FFT (overlap-add)
+
+    Parameters
+    ----------
+    x : ndarray
+        nobs by kx array.
+    y : {ndarray, None}
+        nobs by ky array. If None, then the cross-products of all pairs of
+        columns of x are computed.
+    nlags : int
+        Largest lag.
+    blocksize : int
+        Number of observations per block.
+    demean : bool
+        If True, then the column means are subtracted block by block.
+
+    Returns
+    -------
+    cross : ndarray
+        kx by ky by (nlags + 1) array with
+        cross[i, j, k] = sum_t x[t + k, i] * y[t, j].
+
+    Notes
+    -----
+    For each block of y and the corresponding block of x extended by nlags
+    observations, the circular cross-correlation of the zero-padded blocks
+    is exact for lags 0 to nlags. Because all blocks use the same FFT
+    length, the cross-spectra of the blocks are added up and a single
+    inverse transform is needed at the end. Memory is bounded by the block
+    size and not by nobs.
+    """
+    nobs = x.shape[0]
+    mean_x = x.mean(0) if demean else 0.
+    if y is not None:
+        mean_y = y.mean(0) if demean else 0.
+    blocksize = max(1, min(blocksize, nobs))
+    nfft = _next_regular(blocksize + nlags)
+    kx = x.shape[1]
+    ky = kx if y is None else y.shape[1]
+    spec = np.zeros((nfft // 2 + 1, kx, ky), dtype=complex)
+    starts = np.arange(0, nobs, blocksize)
+    # several blocks are transformed together and their cross-spectra
+    # summed with one stacked matrix product per frequency
+    ngroup = max(1, 2 ** 22 // (nfft * (kx + ky)))
+    for g in range(0, len(starts), ngroup):
+        group = starts[g:g + ngroup]
+        xa = np.zeros((len(group), nfft, kx))
+        yb = np.zeros((len(group), nfft, ky))
+        for i, start in enumerate(group):
+            xblock = x[start:start + blocksize + nlags] - mean_x
+            xa[i, :xblock.shape[0]] = xblock
+            if y is None:
+                yblock = xblock[:blocksize]
+            else:
+                yblock = y[start:start + blocksize] - mean_y
+            yb[i, :yblock.shape[0]] = yblock
+        fx = np.fft.rfft(xa, axis=1).transpose(1, 2, 0)
+        fy = np.fft.rfft(yb, axis=1).transpose(1, 0, 2)
+        spec += np.matmul(fx, np.conj(fy))
+    cross = np.fft.irfft(spec, n=nfft, axis=0)[:nlags + 1]
+    return cross.transpose(1, 2, 0)
+
+
+def ccovf(x, y, unbiased=True, demean=True, fft=True, nlags=None,
+          blocksize=None):
     ''' crosscovariance for 1D
 
     Parameters
@@ -751,33 +1079,60 @@ def ccovf(x, y, unbiased=True, demean=True):
        time series data
     unbiased : boolean
        if True, then denominators is n-k, otherwise n
+    demean : boolean
+       if True, then subtract the mean from x and y
+    fft : boolean
+       if True, use blockwise FFT convolution, otherwise direct correlation.
+    nlags : {int, None}
+       Limit the number of cross-covariances returned. Size of returned
+       array is nlags + 1. Default is all lags, n - 1.
+    blocksize : {int, None}
+       Number of observations per block if fft is True, see ccovf_multi.
 
     Returns
     -------
     ccovf : array
-        autocovariance function
+        crosscovariance function, element k is the covariance of x[t + k]
+        and y[t].
 
     Notes
     -----
-    This uses np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
+    With fft=True the cost is O(n log(blocksize + nlags)) instead of the
+    O(n nlags) of direct correlation. See ccovf_multi for all pairs of
+    several series.
     '''
+    x = np.asarray(x)
+    y = np.asarray(y)
     n = len(x)
+    if nlags is None:
+        nlags = n - 1
+    elif nlags > n - 1:
+        raise ValueError('nlags must be smaller than nobs - 1')
+    if unbiased:
+        d = n - np.arange(nlags + 1)
+    else:
+        d = n
+    if fft:
+        if blocksize is None:
+            blocksize = max(2 * (nlags + 1), 4096)
+        cross = _ccovf_blocks(x[:, None], y[:, None], nlags, blocksize,
+                              demean=demean)
+        return cross[0, 0] / d
     if demean:
         xo = x - x.mean()
         yo = y - y.mean()
     else:
         xo = x
         yo = y
-    if unbiased:
-        xi = np.ones(n)
-        d = np.correlate(xi, xi, 'full')
-    else:
-        d = n
-    return (np.correlate(xo, yo, 'full') / d)[n - 1:]
+    if nlags == n - 1:
+        return np.correlate(xo, yo, 'full')[n - 1:] / d
+    cross = np.empty(nlags + 1)
+    for k in range(nlags + 1):
+        cross[k] = xo[k:].dot(yo[:n - k])
+    return cross / d
 
 
-def ccf(x, y, unbiased=True):
+def ccf(x, y, unbiased=True, fft=True, nlags=None):
     '''cross-correlation function for 1d
 
     Parameters
@@ -786,6 +1141,11 @@ def ccf(x, y, unbiased=True):
        time series data
     unbiased : boolean
        if True, then denominators for autocovariance is n-k, otherwise n
+    fft : boolean
+       if True, use FFT convolution, otherwise direct correlation.
+    nlags : {int, None}
+       Limit the number of cross-correlations returned. Size of returned
+       array is nlags + 1. Default is all lags, n - 1.
 
     Returns
     -------
@@ -794,17 +1154,104 @@ def ccf(x, y, unbiased=True):
 
     Notes
     -----
-    This is based np.correlate which does full convolution. For very long time
-    series it is recommended to use fft convolution instead.
-
     If unbiased is true, the denominator for the autocovariance is adjusted
     but the autocorrelation is not an unbiased estimtor.
 
     '''
-    cvf = ccovf(x, y, unbiased=unbiased, demean=True)
+    cvf = ccovf(x, y, unbiased=unbiased, demean=True, fft=fft, nlags=nlags)
     return cvf / (np.std(x) * np.std(y))
 
 
+def ccovf_multi(x, nlags, unbiased=True, demean=True, blocksize=None):
+    '''crosscovariances of all pairs of series in a multichannel array
+
+    Parameters
+    ----------
+    x : array_like
+       nobs by k array of time series data
+    nlags : int
+       Largest lag.
+    unbiased : boolean
+       if True, then denominators is n-k, otherwise n
+    demean : boolean
+       if True, then subtract the mean of each series
+    blocksize : {int, None}
+       Number of observations that are transformed together. The memory
+       used is of order (blocksize + nlags) * k**2 independent of nobs.
+       Default is max(2 * (nlags + 1), 4096).
+
+    Returns
+    -------
+    ccovf : ndarray
+        k by k by (nlags + 1) array, element [i, j, lag] is the
+        crosscovariance of x[t + lag, i] and x[t, j], so that [i, j] is
+        equal to ccovf(x[:, i], x[:, j]).
+
+    See Also
+    --------
+    ccovf, ccf_multi
+
+    Notes
+    -----
+    The series are processed in blocks of blocksize observations. For each
+    block the FFTs of all k series are computed once and the cross-spectra
+    of all pairs are accumulated, so that a single inverse FFT per pair is
+    needed at the end (overlap-add). The cost is O(n k log(blocksize +
+    nlags) + n k**2) compared to O(n nlags) for each pair with direct
+    correlation.
+    '''
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    if x.ndim != 2:
+        raise ValueError('x must be 1 or 2-dimensional')
+    n = x.shape[0]
+    if nlags > n - 1:
+        raise ValueError('nlags must be smaller than nobs - 1')
+    if blocksize is None:
+        blocksize = max(2 * (nlags + 1), 4096)
+    cross = _ccovf_blocks(x, None, nlags, blocksize, demean=demean)
+    if unbiased:
+        cross /= n - np.arange(nlags + 1)
+    else:
+        cross /= n
+    return cross
+
+
+def ccf_multi(x, nlags, unbiased=True, blocksize=None):
+    '''cross-correlations of all pairs of series in a multichannel array
+
+    Parameters
+    ----------
+    x : array_like
+       nobs by k array of time series data
+    nlags : int
+       Largest lag.
+    unbiased : boolean
+       if True, then denominators for autocovariance is n-k, otherwise n
+    blocksize : {int, None}
+       Number of observations that are transformed together, see
+       ccovf_multi.
+
+    Returns
+    -------
+    ccf : ndarray
+        k by k by (nlags + 1) array, element [i, j] is equal to
+        ccf(x[:, i], x[:, j]).
+
+    See Also
+    --------
+    ccf, ccovf_multi
+    '''
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    cvf = ccovf_multi(x, nlags, unbiased=unbiased, demean=True,
+                      blocksize=blocksize)
+    std = x.std(0)
+    return cvf / np.outer(std, std)[:, :, None]
+
+
 def periodogram(X):
     """
     Returns the periodogram for the natural frequency of X
@@ -833,6 +1280,282 @@ def periodogram(X):
     return pergr
 
 
+class OnlineACF(object):
+    """
+    Online estimator of the autocovariance, autocorrelation and PACF
+
+    Parameters
+    ----------
+    nlags : int
+        Largest lag for which the autocovariance is tracked.
+    window : int, optional
+        If given, the statistics are computed for the last `window`
+        observations only. Cannot be combined with `discount`.
+    discount : float, optional
+        Exponential forgetting factor in (0, 1]. A pair of observations
+        (x_t, x_{t-k}) enters the sums with weight discount**(n - t) where n
+        is the index of the last observation. Cannot be combined with
+        `window`.
+
+    Attributes
+    ----------
+    nobs : float
+        Number of observations in the current estimate. With exponential
+        forgetting this is the sum of the weights.
+    mean : float
+        (Weighted) mean of the observations in the current estimate.
+
+    See Also
+    --------
+    acovf, acf, pacf_yw, q_stat
+
+    Notes
+    -----
+    For every lag k the estimator keeps the weighted sums of x_t x_{t-k},
+    x_t, x_{t-k} and of the weights over all pairs in the sample, together
+    with the last `nlags` observations (or the last `window` observations)
+    that are needed to form the pairs that cross the boundary of the next
+    chunk. An update with m observations costs O(m nlags), and the
+    autocovariance, demeaned with the mean of the current sample, is
+    available at any time in O(nlags) and the PACF in O(nlags**2).
+
+    Without window and discount the results are identical to `acovf` and
+    `acf` on the full series. With a fixed window observations leaving the
+    window are subtracted from the sums, so that rounding error can
+    accumulate over very long streams.
+
+    Examples
+    --------
+    >>> mod = OnlineACF(nlags=10, window=500)
+    >>> for chunk in stream:
+    ...     mod.update(chunk)
+    ...     qstat, pvalue = mod.q_stat()
+    """
+
+    def __init__(self, nlags, window=None, discount=None):
+        nlags = int(nlags)
+        if nlags < 0:
+            raise ValueError('nlags must be non-negative')
+        if window is not None and discount is not None:
+            raise ValueError('window and discount cannot both be used')
+        if window is not None and window <= nlags:
+            raise ValueError('window must be larger than nlags')
+        if discount is not None and not 0 < discount <= 1:
+            raise ValueError('discount must be in (0, 1]')
+        self.nlags = nlags
+        self.window = window
+        self.discount = discount
+        # sums over pairs for lags 0, ..., nlags of x_t x_{t-k}, x_t,
+        # x_{t-k} and of the weights
+        self._sums = np.zeros((4, nlags + 1))
+        self._buffer = np.empty(0)
+
+    @property
+    def nobs(self):
+        return self._sums[3, 0]
+
+    @property
+    def mean(self):
+        if self.nobs == 0:
+            return np.nan
+        return self._sums[1, 0] / self.nobs
+
+    def _add_pairs(self, x, first, lower, weights):
+        """
+        Add the pairs (x[j], x[j - k]) with j >= first and j - k >= lower
+        for all lags, weights are for x[first:].
+        """
+        sums = self._sums
+        nx = x.shape[0]
+        for k in range(self.nlags + 1):
+            start = max(first, lower + k)
+            if start >= nx:
+                continue
+            later = x[start:]
+            earlier = x[start - k:nx - k]
+            if weights is None:
+                sums[0, k] += later.dot(earlier)
+                sums[1, k] += later.sum()
+                sums[2, k] += earlier.sum()
+                sums[3, k] += later.shape[0]
+            else:
+                w = weights[start - first:]
+                sums[0, k] += (w * later).dot(earlier)
+                sums[1, k] += w.dot(later)
+                sums[2, k] += w.dot(earlier)
+                sums[3, k] += w.sum()
+
+    def update(self, chunk):
+        """
+        Add new observations
+
+        Parameters
+        ----------
+        chunk : array_like
+            Scalar or 1d array with the new observations in time order.
+
+        Returns
+        -------
+        self : OnlineACF
+        """
+        chunk = np.atleast_1d(np.squeeze(np.asarray(chunk, dtype=float)))
+        if chunk.ndim != 1:
+            raise ValueError('chunk must be 1d')
+        nchunk = chunk.shape[0]
+        if nchunk == 0:
+            return self
+        x = np.concatenate((self._buffer, chunk))
+        first = self._buffer.shape[0]
+        weights = None
+        if self.discount is not None and self.discount != 1:
+            self._sums *= self.discount ** nchunk
+            weights = self.discount ** np.arange(nchunk - 1, -1, -1.)
+
+        if self.window is not None:
+            lower = max(0, x.shape[0] - self.window)
+            # remove the pairs whose earlier element leaves the window
+            sums = self._sums
+            for k in range(self.nlags + 1):
+                stop = min(lower, first - k)
+                if stop <= 0:
+                    continue
+                earlier = x[:stop]
+                later = x[k:stop + k]
+                sums[0, k] -= later.dot(earlier)
+                sums[1, k] -= later.sum()
+                sums[2, k] -= earlier.sum()
+                sums[3, k] -= stop
+            self._add_pairs(x, first, lower, weights)
+            self._buffer = x[lower:].copy()
+        else:
+            self._add_pairs(x, first, 0, weights)
+            self._buffer = x[max(0, x.shape[0] - self.nlags):].copy()
+        return self
+
+    def acovf(self, unbiased=False, demean=True):
+        """
+        Autocovariances of the current sample
+
+        Parameters
+        ----------
+        unbiased : bool
+            If True, then denominators is the number (or weight) of pairs
+            at each lag, otherwise nobs.
+        demean : bool
+            If True, then subtract the mean of the current sample.
+
+        Returns
+        -------
+        acovf : ndarray
+            Autocovariances for lags 0, ..., nlags.
+        """
+        if self.nobs <= self.nlags:
+            raise ValueError('nobs must be larger than nlags')
+        cross, sum_later, sum_earlier, weight = self._sums
+        if demean:
+            mean = self.mean
+            acov = (cross - mean * (sum_later + sum_earlier) +
+                    mean ** 2 * weight)
+        else:
+            acov = cross.copy()
+        if unbiased:
+            acov /= weight
+        else:
+            acov /= self.nobs
+        return acov
+
+    def acf(self, unbiased=False):
+        """
+        Autocorrelations of the current sample
+
+        Parameters
+        ----------
+        unbiased : bool
+            If True, then denominators for autocovariance are the number (or
+            weight) of pairs at each lag, otherwise nobs.
+
+        Returns
+        -------
+        acf : ndarray
+            Autocorrelations for lags 0, ..., nlags.
+        """
+        acov = self.acovf(unbiased=unbiased)
+        return acov / acov[0]
+
+    def q_stat(self):
+        """
+        Ljung-Box Q statistics of the current sample
+
+        Returns
+        -------
+        q-stat : ndarray
+            Ljung-Box Q-statistic for lags 1, ..., nlags.
+        p-value : ndarray
+            P-values of the Q statistics.
+
+        Notes
+        -----
+        With exponential forgetting nobs, the sum of the weights, is used as
+        the effective number of observations.
+        """
+        return q_stat(self.acf()[1:], nobs=self.nobs)
+
+    def pacf(self, method='ywunbiased'):
+        """
+        Partial autocorrelations of the current sample
+
+        Parameters
+        ----------
+        method : {'ywunbiased', 'ywmle'}
+            Yule-Walker with the unbiased or the biased (mle) autocovariance,
+            computed by the Levinson-Durbin recursion. See `pacf_yw`.
+
+        Returns
+        -------
+        pacf : ndarray
+            Partial autocorrelations for lags 0, ..., nlags.
+        """
+        if method in ('ywunbiased', 'yw', 'unbiased'):
+            unbiased = True
+        elif method in ('ywmle', 'mle'):
+            unbiased = False
+        else:
+            raise ValueError('method not available')
+        acov = self.acovf(unbiased=unbiased)
+        if self.nlags == 0:
+            return np.ones(1)
+        return levinson_durbin(acov, nlags=self.nlags, isacov=True)[2]
+
+    def periodogram(self, nfreq=None):
+        """
+        Lag window estimate of the spectral density of the current sample
+
+        Parameters
+        ----------
+        nfreq : int, optional
+            Number of equally spaced frequencies in [0, pi]. Default is
+            nlags + 1.
+
+        Returns
+        -------
+        freq : ndarray
+            Frequencies in radians.
+        density : ndarray
+            Bartlett lag window estimate of the periodogram,
+            sum_k w_k acov_k exp(-i freq k) for |k| <= nlags with
+            w_k = 1 - |k| / (nlags + 1).
+        """
+        if nfreq is None:
+            nfreq = self.nlags + 1
+        acov = self.acovf()
+        freq = np.linspace(0, np.pi, nfreq)
+        lags = np.arange(1, self.nlags + 1)
+        weights = 1. - lags / (self.nlags + 1.)
+        density = acov[0] + 2 * np.cos(np.outer(freq, lags)).dot(
+            weights * acov[1:])
+        return freq, density
+
+
 #copied from nitime and statsmodels\sandbox\tsa\examples\try_ld_nitime.py
 #TODO: check what to return, for testing and trying out returns everything
 def levinson_durbin(s, nlags=10, isacov=False):
@@ -1364,6 +2087,111 @@ def coint(y0, y1, trend='c', method='aeg', maxlag=None, autolag='aic',
     return res_adf[0], pval_asy, crit
 
 
+def coint_batch(y0, y1, trend='c', maxlag=None, autolag='aic',
+                chunksize=None):
+    """
+    Augmented Engle-Granger cointegration test for many equations at once
+
+    Parameters
+    ----------
+    y0 : array_like, 2d
+        nobs by nseries array, first element in the cointegrating vector of
+        each equation.
+    y1 : array_like
+        nobs by nseries array or nobs by nseries by m array of the remaining
+        elements of the cointegrating vectors.
+    trend : str {'c', 'ct'}
+        trend term included in regression for cointegrating equation
+
+        * 'c' : constant
+        * 'ct' : constant and linear trend
+        * also available quadratic trend 'ctt', and no constant 'nc'
+
+    maxlag : None or int
+        keyword for `adfuller`, largest or given number of lags
+    autolag : string
+        keyword for `adfuller`, lag selection criterion.
+    chunksize : int, optional
+        keyword for `adfuller_batch`, number of series processed together.
+
+    Returns
+    -------
+    coint_t : ndarray
+        t-statistics of unit-root test on the residuals
+    pvalue : ndarray
+        MacKinnon's approximate, asymptotic p-values based on MacKinnon (1994)
+    crit_value : ndarray
+        Critical values for the test statistic at the 1 %, 5 %, and 10 %
+        levels based on regression curve. This depends on the number of
+        observations and is the same for all equations.
+
+    See Also
+    --------
+    coint, adfuller_batch
+
+    Notes
+    -----
+    The results agree with calling `coint` on each equation. The
+    cointegrating regressions are solved jointly from stacked
+    cross-products and the residuals are tested with `adfuller_batch`.
+    As in `coint`, the statistic is set to -inf for equations in which
+    y0 and y1 are (almost) perfectly collinear.
+    """
+    trend = trend.lower()
+    if trend not in ['c', 'nc', 'ct', 'ctt']:
+        raise ValueError("trend option %s not understood" % trend)
+    y0 = np.asarray(y0, dtype=float)
+    y1 = np.asarray(y1, dtype=float)
+    if y0.ndim == 1:
+        y0 = y0[:, None]
+    if y1.ndim == 1:
+        y1 = y1[:, None]
+    if y1.ndim == 2:
+        y1 = y1[:, :, None]
+    nobs, nseries, k_vars = y1.shape
+    if y0.shape != (nobs, nseries):
+        raise ValueError("y0 and y1 do not have compatible shapes")
+    k_vars += 1   # add 1 for y0
+
+    det = _adf_trend(trend, nobs)
+    k_trend = det.shape[1]
+    xx = np.empty((nseries, nobs, k_vars - 1 + k_trend))
+    xx[:, :, :k_vars - 1] = y1.transpose(1, 0, 2)
+    xx[:, :, k_vars - 1:] = det
+    xtx = np.matmul(xx.transpose(0, 2, 1), xx)
+    xty = np.einsum('stj,ts->sj', xx, y0)
+    params = np.linalg.solve(xtx, xty[:, :, None])[:, :, 0]
+    resid = y0 - np.einsum('stj,sj->ts', xx, params)
+    ssr = (resid ** 2).sum(0)
+    if trend == 'nc':
+        tss = (y0 ** 2).sum(0)
+    else:
+        tss = ((y0 - y0.mean(0)) ** 2).sum(0)
+    rsquared = 1 - ssr / tss
+
+    coint_t = np.full(nseries, -np.inf)
+    valid = rsquared < 1 - 100 * SQRTEPS
+    if not valid.all():
+        import warnings
+        warnings.warn("y0 and y1 are (almost) perfectly colinear for some "
+                      "equations. Cointegration test is not reliable in "
+                      "this case.", CollinearityWarning)
+    if valid.any():
+        res_adf = adfuller_batch(resid[:, valid], maxlag=maxlag,
+                                 autolag=autolag, regression='nc',
+                                 chunksize=chunksize)
+        coint_t[valid] = res_adf[0]
+
+    # no constant or trend, see egranger in Stata and MacKinnon
+    if trend == 'nc':
+        crit = np.array([np.nan] * 3)  # 2010 critical values not available
+    else:
+        crit = mackinnoncrit(N=k_vars, regression=trend, nobs=nobs - 1)
+
+    pval_asy = _mackinnonp_array(coint_t, regression=trend, N=k_vars)
+    return coint_t, pval_asy, crit
+
+
 def _safe_arma_fit(y, order, model_kw, trend, fit_kw, start_params=None):
     try:
         return ARMA(y, order=order, **model_kw).fit(disp=0, trend=trend,
@@ -1390,8 +2218,175 @@ def _safe_arma_fit(y, order, model_kw, trend, fit_kw, start_params=None):
         return
 
 
+def _arma_innovations_constrain(x, k_trend, k_ar, k_ma):
+    """map unconstrained parameters to mean, stationary ar and invertible ma
+    """
+    from statsmodels.tsa.statespace.tools import (
+        constrain_stationary_univariate)
+    mean = x[0] if k_trend else 0.
+    ar = x[k_trend:k_trend + k_ar]
+    ma = x[k_trend + k_ar:]
+    if k_ar > 0:
+        ar = constrain_stationary_univariate(ar)
+    if k_ma > 0:
+        ma = -constrain_stationary_univariate(ma)
+    return mean, ar, ma
+
+
+def _arma_innovations_unconstrain(params, k_trend, k_ar, k_ma):
+    from statsmodels.tsa.statespace.tools import (
+        unconstrain_stationary_univariate)
+    x = np.array(params, dtype=float)
+    if k_ar > 0:
+        x[k_trend:k_trend + k_ar] = unconstrain_stationary_univariate(
+            x[k_trend:k_trend + k_ar])
+    if k_ma > 0:
+        x[k_trend + k_ar:] = unconstrain_stationary_univariate(
+            -x[k_trend + k_ar:])
+    return x
+
+
+def _arma_innovations_loglike(x, y, k_trend, k_ar, k_ma):
+    """exact loglikelihood with the innovation variance concentrated out
+
+    Returns the loglikelihood and the estimate of sigma2.
+    """
+    from statsmodels.tsa.innovations.arma_innovations import (
+        arma_innovations)
+    mean, ar, ma = _arma_innovations_constrain(x, k_trend, k_ar, k_ma)
+    u, v = arma_innovations(y - mean, ar, ma)
+    nobs = len(y)
+    sigma2 = np.sum(u**2 / v) / nobs
+    llf = -0.5 * (nobs * (np.log(2 * np.pi * sigma2) + 1) +
+                  np.sum(np.log(v)))
+    return llf, sigma2
+
+
+def _arma_innovations_fit(y, order, k_trend, start_params, fit_kw):
+    """exact MLE of an ARMA model based on the innovations algorithm
+
+    This is a module level function so that it can be pickled by joblib.
+
+    Returns
+    -------
+    params : ndarray or None
+        mean (if k_trend), ar and ma parameters, None if estimation failed
+    llf : float
+    """
+    from scipy.optimize import minimize
+    k_ar, k_ma = order
+    nobs = len(y)
+    x0 = _arma_innovations_unconstrain(start_params, k_trend, k_ar, k_ma)
+
+    def nloglike(x):
+        return -_arma_innovations_loglike(x, y, k_trend, k_ar, k_ma)[0] / nobs
+
+    try:
+        if len(x0) > 0:
+            x = minimize(nloglike, x0, **fit_kw).x
+        else:
+            x = x0
+        llf = _arma_innovations_loglike(x, y, k_trend, k_ar, k_ma)[0]
+    except (LinAlgError, ValueError):
+        return None, np.nan
+    if not np.isfinite(llf):
+        return None, np.nan
+    mean, ar, ma = _arma_innovations_constrain(x, k_trend, k_ar, k_ma)
+    return np.r_[[mean][:k_trend], ar, ma], llf
+
+
+def _arma_order_select_innovations(y, max_ar, max_ma, ic, trend, fit_kw,
+                                   n_jobs, prune):
+    """information criteria of all ARMA orders, innovations algorithm MLE
+
+    Models are estimated in levels of increasing k_ar + k_ma. Models within
+    a level are independent and can be estimated in parallel, each starts at
+    the better of the estimates of its two neighbors of the previous level.
+    """
+    from statsmodels.tools.parallel import parallel_func
+    k_trend = int(trend == 'c')
+    nobs = len(y)
+    fit_kw = dict(fit_kw)
+    fit_kw.setdefault('method', 'BFGS')
+
+    penalty_weight = {'aic': 2., 'bic': np.log(nobs),
+                      'hqic': 2 * np.log(np.log(nobs))}
+    for criteria in ic:
+        if criteria not in penalty_weight:
+            raise ValueError('ic %s not available with method '
+                             '"innovations"' % criteria)
+
+    if prune:
+        # approximate lower bound of -2 llf from a long autoregression
+        maxlag = min(max(max_ar + max_ma, int(10 * np.log10(nobs))),
+                     nobs // 4)
+        xlag, ycurrent = lagmat(y - y.mean() * k_trend, maxlag, trim='both',
+                                original='sep')
+        ssr = OLS(ycurrent[:, 0], xlag).fit().ssr
+        llf_bound = -0.5 * nobs * (np.log(2 * np.pi * ssr / nobs) + 1)
+
+    if n_jobs != 1:
+        par, func, n_jobs = parallel_func(_arma_innovations_fit, n_jobs,
+                                          verbose=0)
+
+    results = np.empty((len(ic), max_ar + 1, max_ma + 1))
+    results.fill(np.nan)
+    params = {}
+    llfs = {}
+    best = np.inf
+    for level in range(max_ar + max_ma + 1):
+        k_params = level + k_trend + 1
+        if prune and (-2 * llf_bound + penalty_weight[ic[0]] * k_params >
+                      best):
+            # the penalty increases with the level, all remaining models
+            # are pruned
+            break
+
+        orders = [(ar, level - ar) for ar in range(max(0, level - max_ma),
+                                                   min(level, max_ar) + 1)]
+        if level == 0 and k_trend == 0:
+            orders = []
+        starts = []
+        for ar, ma in orders:
+            start = None
+            for prev, pad in [((ar - 1, ma), 'ar'), ((ar, ma - 1), 'ma')]:
+                if prev not in params or params[prev] is None:
+                    continue
+                if start is None or llfs[prev] > llfs[start[0]]:
+                    start = (prev, pad)
+            if start is None:
+                sp = np.zeros(k_trend + ar + ma)
+                if k_trend:
+                    sp[0] = y.mean()
+            elif start[1] == 'ar':
+                prev = params[start[0]]
+                sp = np.r_[prev[:k_trend + ar - 1], 0, prev[k_trend + ar - 1:]]
+            else:
+                sp = np.r_[params[start[0]], 0]
+            starts.append(sp)
+
+        if n_jobs == 1:
+            fits = [_arma_innovations_fit(y, order, k_trend, sp, fit_kw)
+                    for order, sp in zip(orders, starts)]
+        else:
+            fits = par(func(y, order, k_trend, sp, fit_kw)
+                       for order, sp in zip(orders, starts))
+
+        for (ar, ma), (p, llf) in zip(orders, fits):
+            params[(ar, ma)] = p
+            llfs[(ar, ma)] = llf
+            for i, criteria in enumerate(ic):
+                results[i, ar, ma] = (-2 * llf +
+                                      penalty_weight[criteria] * k_params)
+            if np.isfinite(results[0, ar, ma]):
+                best = min(best, results[0, ar, ma])
+
+    return results
+
+
 def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
-                         model_kw=None, fit_kw=None):
+                         model_kw=None, fit_kw=None, method='mle', n_jobs=1,
+                         prune=False):
     """
     Returns information criteria for many ARMA models
 
@@ -1411,7 +2406,22 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     model_kw : dict
         Keyword arguments to be passed to the ``ARMA`` model
     fit_kw : dict
-        Keyword arguments to be passed to ``ARMA.fit``.
+        Keyword arguments to be passed to ``ARMA.fit``. If method is
+        "innovations", then they are passed to ``scipy.optimize.minimize``.
+    method : {"mle", "innovations"}
+        If "mle", then each model is estimated with ``ARMA.fit``. If
+        "innovations", then the exact loglikelihood is computed with the
+        innovations algorithm, see ``tsa.innovations.arma_innovations``.
+        This is much faster, but only "aic", "bic" and "hqic" are available
+        and ``model_kw`` cannot be used.
+    n_jobs : int
+        Number of models that are estimated in parallel using joblib if
+        method is "innovations". n_jobs=-1 uses all available cores.
+    prune : bool
+        If true and method is "innovations", then larger models are not
+        estimated once the penalty of the first information criterion in
+        ``ic`` is so large that they cannot improve on the best model found
+        so far. Pruned models are nan in the results.
 
     Returns
     -------
@@ -1443,9 +2453,18 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     This method can be used to tentatively identify the order of an ARMA
     process, provided that the time series is stationary and invertible. This
     function computes the full exact MLE estimate of each model and can be,
-    therefore a little slow. An implementation using approximate estimates
-    will be provided in the future. In the meantime, consider passing
-    {method : 'css'} to fit_kw.
+    therefore a little slow. Consider using method="innovations" or
+    passing {method : 'css'} to fit_kw.
+
+    With method="innovations" the models are estimated in order of
+    increasing ``k_ar + k_ma``. Each model is warm started at the estimate of
+    the smaller model with one less AR or MA lag that has the larger
+    loglikelihood, and all models of the same size are estimated in
+    parallel if ``n_jobs`` is not 1. The mean is estimated jointly with the
+    ARMA parameters if trend is "c", and the innovation variance is
+    concentrated out of the likelihood. For pruning, the loglikelihood of
+    all models is bounded using the residual variance of a long
+    autoregression estimated by OLS. This is an approximate bound.
     """
     from pandas import DataFrame
 
@@ -1456,23 +2475,37 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     elif not isinstance(ic, (list, tuple)):
         raise ValueError("Need a list or a tuple for ic if not a string.")
 
-    results = np.zeros((len(ic), max_ar + 1, max_ma + 1))
+    if method not in ('mle', 'innovations'):
+        raise ValueError('method must be "mle" or "innovations"')
+
     model_kw = {} if model_kw is None else model_kw
     fit_kw = {} if fit_kw is None else fit_kw
     y_arr = np.asarray(y)
-    for ar in ar_range:
-        for ma in ma_range:
-            if ar == 0 and ma == 0 and trend == 'nc':
-                results[:, ar, ma] = np.nan
-                continue
-
-            mod = _safe_arma_fit(y_arr, (ar, ma), model_kw, trend, fit_kw)
-            if mod is None:
-                results[:, ar, ma] = np.nan
-                continue
-
-            for i, criteria in enumerate(ic):
-                results[i, ar, ma] = getattr(mod, criteria)
+    if method == 'innovations':
+        if model_kw:
+            raise ValueError('model_kw cannot be used with method '
+                             '"innovations"')
+        if trend not in ('c', 'nc'):
+            raise ValueError('trend must be "c" or "nc"')
+        results = _arma_order_select_innovations(
+            y_arr.astype(float), max_ar, max_ma, ic, trend, fit_kw, n_jobs,
+            prune)
+    else:
+        results = np.zeros((len(ic), max_ar + 1, max_ma + 1))
+        for ar in ar_range:
+            for ma in ma_range:
+                if ar == 0 and ma == 0 and trend == 'nc':
+                    results[:, ar, ma] = np.nan
+                    continue
+
+                mod = _safe_arma_fit(y_arr, (ar, ma), model_kw, trend,
+                                     fit_kw)
+                if mod is None:
+                    results[:, ar, ma] = np.nan
+                    continue
+
+                for i, criteria in enumerate(ic):
+                    results[i, ar, ma] = getattr(mod, criteria)
 
     dfs = [DataFrame(res, columns=ma_range, index=ar_range) for res in results]
 
@@ -1620,3 +2653,93 @@ def _sigma_est_kpss(resids, nobs, lags):
         resids_prod = np.dot(resids[i:], resids[:nobs - i])
         s_hat += 2 * resids_prod * (1. - (i / (lags + 1.)))
     return s_hat / nobs
+
+
+def kpss_batch(x, regression='c', lags=None):
+    """
+    Kwiatkowski-Phillips-Schmidt-Shin test for many series at once
+
+    Parameters
+    ----------
+    x : array_like, 2d
+        nobs by nseries array, each column is tested separately. A 1d array
+        is treated as a single series.
+    regression : str{'c', 'ct'}
+        Indicates the null hypothesis for the KPSS test
+        * 'c' : The data is stationary around a constant (default)
+        * 'ct' : The data is stationary around a trend
+    lags : int
+        Indicates the number of lags to be used. If None (default),
+        lags is set to int(12 * (n / 100)**(1 / 4)), as outlined in
+        Schwert (1989).
+
+    Returns
+    -------
+    kpss_stat : ndarray
+        The KPSS test statistics
+    p_value : ndarray
+        The p-values of the tests, interpolated from Table 1 in
+        Kwiatkowski et al. (1992) and truncated to the interval (0.01, 0.1).
+    lags : int
+        The truncation lag parameter
+    crit : dict
+        The critical values at 10%, 5%, 2.5% and 1%. Based on
+        Kwiatkowski et al. (1992).
+
+    See Also
+    --------
+    kpss
+
+    Notes
+    -----
+    The results agree with calling `kpss` on each column. The detrending
+    projection is shared by all series and the Newey-West long-run variance
+    is computed with one pass over the panel per lag. A single
+    InterpolationWarning is issued if any p-value is at the boundary of the
+    table.
+    """
+    from warnings import warn
+
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    if x.ndim != 2:
+        raise ValueError("x must be 1 or 2-dimensional")
+    nobs = x.shape[0]
+    hypo = regression.lower()
+
+    if hypo == 'ct':
+        trend = add_constant(np.arange(1, nobs + 1))
+        resids = x - trend.dot(np.linalg.lstsq(trend, x, rcond=None)[0])
+        crit = [0.119, 0.146, 0.176, 0.216]
+    elif hypo == 'c':
+        resids = x - x.mean(0)
+        crit = [0.347, 0.463, 0.574, 0.739]
+    else:
+        raise ValueError("hypothesis '{0}' not understood".format(hypo))
+
+    if lags is None:
+        # from Kwiatkowski et al. referencing Schwert (1989)
+        lags = int(np.ceil(12. * np.power(nobs / 100., 1 / 4.)))
+
+    pvals = [0.10, 0.05, 0.025, 0.01]
+
+    eta = (resids.cumsum(0) ** 2).sum(0) / (nobs ** 2)  # eq. 11, p. 165
+    s_hat = (resids ** 2).sum(0)
+    for i in range(1, lags + 1):
+        resids_prod = np.einsum('ij,ij->j', resids[i:], resids[:nobs - i])
+        s_hat += 2 * resids_prod * (1. - (i / (lags + 1.)))
+    s_hat /= nobs
+
+    kpss_stat = eta / s_hat
+    p_value = np.interp(kpss_stat, crit, pvals)
+
+    if np.any(p_value == pvals[-1]):
+        warn("p-value is smaller than the indicated p-value for some "
+             "series", InterpolationWarning)
+    if np.any(p_value == pvals[0]):
+        warn("p-value is greater than the indicated p-value for some "
+             "series", InterpolationWarning)
+
+    crit_dict = {'10%': crit[0], '5%': crit[1], '2.5%': crit[2], '1%': crit[3]}
+    return kpss_stat, p_value, lags, crit_dict
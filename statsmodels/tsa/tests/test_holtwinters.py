@@ -12,7 +12,8 @@ from numpy.testing import assert_almost_equal, assert_allclose
 
 from statsmodels.tools.sm_exceptions import EstimationWarning
 from statsmodels.tsa.holtwinters import (ExponentialSmoothing,
-                                         SimpleExpSmoothing, Holt, SMOOTHERS, PY_SMOOTHERS)
+                                         SimpleExpSmoothing, Holt, SMOOTHERS, PY_SMOOTHERS,
+                                         BatchExponentialSmoothing)
 
 base, _ = os.path.split(os.path.abspath(__file__))
 housing_data = pd.read_csv(os.path.join(base, 'results', 'housing-data.csv'))
@@ -382,6 +383,48 @@ def test_equivalence_cython_python(trend, seasonal):
     assert_allclose(sse_py, sse_cy)
 
 
+@pytest.mark.parametrize('trend', TRENDS)
+@pytest.mark.parametrize('seasonal', SEASONALS)
+def test_sse_analytic_gradient(trend, seasonal):
+    from statsmodels.tools.numdiff import approx_fprime
+    from statsmodels.tsa._exponential_smoothers import _holt_win_sse_grad
+
+    y = np.squeeze(np.asarray(housing_data))[:120].copy()
+    nobs = y.shape[0]
+    m = 12 if seasonal else 0
+    p = np.zeros(6 + m)
+    p[:6] = [0.3, 0.05, 0.1, y[:12].mean(), 0.3, 0.95]
+    if trend == 'mul':
+        p[4] = 1.01
+    if seasonal == 'mul':
+        p[6:] = y[:12] / y[:12].mean()
+    elif seasonal == 'add':
+        p[6:] = y[:12] - y[:12].mean()
+    trending = trend is not None
+    xi = np.array([True, trending, seasonal is not None, True, trending,
+                   trending] + [True] * m)
+    codes = {None: 0, 'add': 1, 'mul': 2}
+    args = (xi.astype(np.uint8), p.copy(), y, m, nobs, codes[trend],
+            codes[seasonal], np.finfo(np.double).max)
+    x = p[xi]
+    sse, grad = _holt_win_sse_grad(x, *args)
+
+    def f(x):
+        return _holt_win_sse_grad(x, *args)[0]
+
+    assert_allclose(grad, approx_fprime(x, f, centered=True), rtol=1e-5)
+
+    # same objective as the SSE functions of the individual models
+    if not (trend == 'mul' and seasonal == 'add'):
+        l = np.zeros(nobs)
+        b = np.zeros(nobs)
+        s = np.zeros(nobs + m - 1)
+        xi_all = np.ones_like(p).astype(np.uint8)
+        sse_cy = SMOOTHERS[(seasonal, trend)](p.copy(), xi_all, p.copy(), y, l,
+                                              b, s, m, nobs, args[-1])
+        assert_allclose(sse, sse_cy)
+
+
 def test_direct_holt_add():
     mod = SimpleExpSmoothing(housing_data)
     res = mod.fit()
@@ -410,3 +453,79 @@ def test_direct_holt_add():
     assert_allclose(b, res.slope)
     assert_allclose(f, res.level.iloc[-1] + res.slope.iloc[-1] * np.array([1, 2, 3, 4, 5]))
     assert_allclose(f, res.forecast(5))
+
+
+def _batch_data(n_series=3, nobs=120):
+    rs = np.random.RandomState(1234)
+    y = np.squeeze(np.asarray(housing_data))[:nobs]
+    scale = rs.uniform(0.5, 2, size=n_series)
+    return y[:, None] * scale + rs.standard_normal((nobs, n_series))
+
+
+@pytest.mark.parametrize('trend', TRENDS)
+@pytest.mark.parametrize('seasonal', SEASONALS)
+def test_batch_fixed_params(trend, seasonal):
+    y = _batch_data()
+    damped = trend is not None
+    kwargs = dict(smoothing_level=0.3, smoothing_seasonal=0.1)
+    if trend is not None:
+        kwargs.update(smoothing_slope=0.05, damping_slope=0.95)
+    mod = BatchExponentialSmoothing(y, trend=trend, seasonal=seasonal,
+                                    damped=damped, seasonal_periods=12)
+    res = mod.fit(optimized=False, **kwargs)
+    assert_allclose(res.params['smoothing_level'], 0.3)
+    fcast = res.forecast(10)
+    assert fcast.shape == (10, y.shape[1])
+    for j in range(y.shape[1]):
+        mod_j = ExponentialSmoothing(y[:, j].copy(), trend=trend,
+                                     seasonal=seasonal, damped=damped,
+                                     seasonal_periods=12)
+        res_j = mod_j.fit(optimized=False, **kwargs)
+        assert_allclose(res.fittedvalues[:, j], res_j.fittedvalues)
+        assert_allclose(res.level[:, j], res_j.level)
+        assert_allclose(res.sse[j], res_j.sse)
+        assert_allclose(res.aic[j], res_j.aic)
+        if seasonal is not None:
+            assert_allclose(res.season[:, j], res_j.season)
+        if trend is not None:
+            assert_allclose(res.slope[:, j], res_j.slope)
+        assert_allclose(fcast[0, j], res_j.fcastvalues[0])
+        if damped and seasonal:
+            # ExponentialSmoothing forecasts by rerunning the recursions from
+            # res_j.params, but stores the damped initial slope, phi * b0 or
+            # b0**phi, as initial_slope.  The effect dies out in level and
+            # slope, but not in the slowly updated seasons.  Undo the
+            # damping of b0 to compare the forecasts.
+            params_j = dict(res_j.params)
+            b0 = res.params['initial_slope'].iloc[j]
+            b0_damped = b0 ** 0.95 if trend == 'mul' else 0.95 * b0
+            assert_allclose(params_j['initial_slope'], b0_damped)
+            params_j['initial_slope'] = b0
+            fcast_j = mod_j._predict(h=10, **params_j).fcastvalues[:10]
+        else:
+            fcast_j = res_j.forecast(10)
+        # less than one season, ExponentialSmoothing repeats the seasons of
+        # the previous cycle at horizon seasonal_periods
+        assert_allclose(fcast[:, j], fcast_j)
+
+
+@pytest.mark.parametrize('trend_seasonal', ((None, None), ('add', None),
+                                            ('add', 'add'), (None, 'mul')))
+def test_batch_fit(trend_seasonal):
+    trend, seasonal = trend_seasonal
+    y = _batch_data()
+    mod = BatchExponentialSmoothing(y, trend=trend, seasonal=seasonal,
+                                    seasonal_periods=12)
+    res = mod.fit()
+    assert res.converged.all()
+    for j in range(y.shape[1]):
+        mod_j = ExponentialSmoothing(y[:, j].copy(), trend=trend,
+                                     seasonal=seasonal, seasonal_periods=12)
+        res_j = mod_j.fit()
+        # local optimizers from different starting values
+        assert_allclose(res.sse[j], res_j.sse, rtol=5e-3)
+
+    res2 = mod.fit(chunksize=2)
+    assert_allclose(res2.sse, res.sse, rtol=1e-8)
+    res3 = mod.fit(start_params=res.params.values[:, res.optimized])
+    assert np.all(res3.sse <= res.sse * (1 + 1e-10))
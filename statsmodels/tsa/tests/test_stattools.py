@@ -19,7 +19,10 @@ from statsmodels.tsa.stattools import (adfuller, acf, pacf_yw,
                                        coint, acovf, kpss,
                                        arma_order_select_ic, levinson_durbin,
                                        levinson_durbin_pacf, pacf_burg,
-                                       innovations_algo, innovations_filter)
+                                       innovations_algo, innovations_filter,
+                                       adfuller_batch, kpss_batch,
+                                       coint_batch, OnlineACF,
+                                       ccovf, ccf, ccovf_multi, ccf_multi)
 from statsmodels.tsa.arima_process import arma_acovf
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 
@@ -575,6 +578,58 @@ def test_arma_order_select_ic():
     assert_equal(res.aic_min_order, (1, 2))
 
 
+def test_arma_order_select_ic_innovations():
+    from statsmodels.tsa.arima_process import arma_generate_sample
+
+    arparams = np.r_[1, -np.array([.75, -.25])]
+    maparams = np.array([.65, .35])
+    np.random.seed(2014)
+    y = arma_generate_sample(arparams, maparams, 250)
+    res = arma_order_select_ic(y, ic=['aic', 'bic'], trend='nc',
+                               method='innovations')
+    # same as the regression numbers of the Kalman filter MLE, except for
+    # the (3, 2) model where the optimizers stop at different points
+    aic_x = np.array([[np.nan, 552.7342255, 484.29687843],
+                      [562.10924262, 485.5197969, 480.32858497],
+                      [507.04581344, 482.91065829, 481.91926034],
+                      [484.03995962, 482.14868032, 483.86378955],
+                      [481.8849479, 483.8377379, 485.83756612]])
+    mask = np.ones(aic_x.shape, bool)
+    mask[0, 0] = mask[3, 2] = False
+    assert_allclose(res.aic.values[mask], aic_x[mask], rtol=1e-7)
+    assert_allclose(res.aic.values[3, 2], aic_x[3, 2], rtol=1e-3)
+    penalty_diff = (np.log(250) - 2) * np.add.outer(np.arange(5),
+                                                    np.arange(3) + 1)
+    assert_allclose((res.bic.values - res.aic.values)[mask],
+                    penalty_diff[mask])
+    assert_equal(res.aic_min_order, (1, 2))
+    assert_equal(res.bic_min_order, (1, 2))
+
+    res_c = arma_order_select_ic(y + 3, max_ar=2, max_ma=1, ic='aic',
+                                 method='innovations')
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        res_mle = arma_order_select_ic(y + 3, max_ar=2, max_ma=1, ic='aic')
+    assert_allclose(res_c.aic.values, res_mle.aic.values, rtol=1e-6)
+
+    res_par = arma_order_select_ic(y + 3, max_ar=2, max_ma=1, ic='aic',
+                                   method='innovations', n_jobs=2)
+    assert_allclose(res_par.aic.values, res_c.aic.values, rtol=1e-12)
+
+    res_full = arma_order_select_ic(y, max_ar=6, max_ma=6, ic='bic',
+                                    trend='nc', method='innovations')
+    res_prune = arma_order_select_ic(y, max_ar=6, max_ma=6, ic='bic',
+                                     trend='nc', method='innovations',
+                                     prune=True)
+    assert_(np.isnan(res_prune.bic.values[6, 6]))
+    mask = np.isfinite(res_prune.bic.values)
+    assert_allclose(res_prune.bic.values[mask], res_full.bic.values[mask])
+    assert_equal(res_prune.bic_min_order, res_full.bic_min_order)
+
+    assert_raises(ValueError, arma_order_select_ic, y, ic='fpe',
+                  method='innovations')
+
+
 def test_arma_order_select_ic_failure():
     # this should trigger an SVD convergence failure, smoke test that it
     # returns, likely platform dependent failure...
@@ -819,3 +874,171 @@ def test_innovations_algo_filter_kalman_filter():
     assert_allclose(u, res.forecasts_error[0])
     assert_allclose(theta[1:, 0], res.filter_results.kalman_gain[0, 0, :-1])
     assert_allclose(llf_obs, res.llf_obs)
+
+
+@pytest.mark.parametrize('regression', ['nc', 'c', 'ct', 'ctt'])
+@pytest.mark.parametrize('autolag', ['AIC', 'BIC', 't-stat', None])
+def test_adfuller_batch(regression, autolag):
+    rs = np.random.RandomState(1234)
+    x = np.cumsum(rs.standard_normal((250, 12)), 0)
+    x[:, ::3] = rs.standard_normal((250, 4))
+    res = adfuller_batch(x, regression=regression, autolag=autolag,
+                         chunksize=5)
+    assert_equal(len(res), 5 if autolag is None else 6)
+    for i in range(x.shape[1]):
+        try:
+            res1 = adfuller(x[:, i], regression=regression, autolag=autolag)
+        except UnboundLocalError:
+            # adfuller fails if no lag is significant with t-stat
+            assert_equal(res[2][i], 0)
+            continue
+        assert_allclose(res[0][i], res1[0], rtol=1e-8)
+        assert_allclose(res[1][i], res1[1], rtol=1e-8)
+        assert_equal(res[2][i], res1[2])
+        assert_equal(res[3][i], res1[3])
+        for key in res1[4]:
+            assert_allclose(res[4][key][i], res1[4][key], rtol=1e-12)
+        if autolag is not None:
+            assert_allclose(res[5][i], res1[5], rtol=1e-8)
+
+
+def test_adfuller_batch_degenerate():
+    rs = np.random.RandomState(1234)
+    x = np.cumsum(rs.standard_normal((100, 3)), 0)
+    x[:, 1] = 1.
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        res = adfuller_batch(x, maxlag=2)
+    assert_(np.isnan(res[0][1]) and np.isnan(res[1][1]))
+    assert_allclose(res[0][[0, 2]], [adfuller(x[:, 0], maxlag=2)[0],
+                                     adfuller(x[:, 2], maxlag=2)[0]])
+    res1 = adfuller_batch(x[:, 0], maxlag=2, autolag=None)
+    assert_allclose(res1[0], adfuller(x[:, 0], maxlag=2, autolag=None)[0])
+    assert_raises(ValueError, adfuller_batch, x, autolag='hqic')
+
+
+@pytest.mark.parametrize('regression', ['c', 'ct'])
+def test_kpss_batch(regression):
+    rs = np.random.RandomState(1234)
+    x = np.cumsum(rs.standard_normal((200, 10)), 0)
+    x[:, ::2] = rs.standard_normal((200, 5))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        res = kpss_batch(x, regression)
+        for i in range(x.shape[1]):
+            res1 = kpss(x[:, i], regression)
+            assert_allclose(res[0][i], res1[0], rtol=1e-10)
+            assert_allclose(res[1][i], res1[1], rtol=1e-10)
+    assert_equal(res[2], res1[2])
+    assert_equal(res[3], res1[3])
+
+
+@pytest.mark.parametrize('trend', ['nc', 'c', 'ct', 'ctt'])
+def test_coint_batch(trend):
+    rs = np.random.RandomState(1234)
+    y1 = np.cumsum(rs.standard_normal((200, 8, 2)), 0)
+    y0 = y1.sum(2) + rs.standard_normal((200, 8))
+    y0[:, ::2] = np.cumsum(rs.standard_normal((200, 4)), 0)
+    y0[:, 1] = y1[:, 1, 0]
+    with pytest.warns(CollinearityWarning):
+        res = coint_batch(y0, y1, trend, chunksize=3)
+    assert_equal(res[0][1], -np.inf)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for i in range(y0.shape[1]):
+            res1 = coint(y0[:, i], y1[:, i], trend)
+            assert_allclose(res[0][i], res1[0], rtol=1e-8)
+            assert_allclose(res[1][i], res1[1], rtol=1e-8)
+    assert_allclose(res[2], res1[2])
+
+
+def test_online_acf(acovf_data):
+    x = acovf_data
+    nlags = 8
+    mod = OnlineACF(nlags)
+    splits = np.cumsum([1, 3, 5, 100, 2, 90])
+    for chunk in np.split(x, splits):
+        mod.update(chunk)
+    assert_equal(mod.nobs, x.shape[0])
+    assert_allclose(mod.mean, x.mean())
+    for unbiased in (False, True):
+        assert_allclose(mod.acovf(unbiased=unbiased),
+                        acovf(x, unbiased=unbiased, fft=False, nlag=nlags),
+                        rtol=1e-10)
+    res = acf(x, nlags=nlags, qstat=True, fft=False)
+    assert_allclose(mod.acf(), res[0], rtol=1e-10)
+    assert_allclose(mod.q_stat(), res[1:], rtol=1e-10)
+    assert_allclose(mod.pacf(), pacf_yw(x, nlags), rtol=1e-8)
+    assert_allclose(mod.pacf('ywmle'), pacf_yw(x, nlags, 'mle'), rtol=1e-8)
+    freq, density = mod.periodogram(nfreq=5)
+    assert_allclose(freq, np.linspace(0, np.pi, 5))
+    assert_(np.all(density > 0))
+
+
+def test_online_acf_window_discount(acovf_data):
+    x = acovf_data
+    nlags = 5
+    window = 60
+    mod = OnlineACF(nlags, window=window)
+    end = 0
+    for chunk in np.split(x, np.cumsum([2, 10, 1, 70, 3, 100])):
+        mod.update(chunk)
+        end += chunk.shape[0]
+        xw = x[max(0, end - window):end]
+        if end > nlags:
+            assert_equal(mod.nobs, xw.shape[0])
+            assert_allclose(mod.acovf(unbiased=True),
+                            acovf(xw, unbiased=True, fft=False, nlag=nlags),
+                            rtol=1e-8)
+
+    discount = 0.98
+    mod = OnlineACF(nlags, discount=discount)
+    for chunk in np.split(x, [7, 100]):
+        mod.update(chunk)
+    nobs = x.shape[0]
+    weights = discount ** np.arange(nobs - 1, -1, -1.)
+    xd = x - weights.dot(x) / weights.sum()
+    expected = [(weights[k:] * xd[k:]).dot(xd[:nobs - k]) / weights.sum()
+                for k in range(nlags + 1)]
+    assert_allclose(mod.nobs, weights.sum())
+    assert_allclose(mod.acovf(), expected, rtol=1e-10)
+
+    assert_raises(ValueError, OnlineACF, 5, window=10, discount=0.9)
+    assert_raises(ValueError, OnlineACF, 5, window=5)
+    assert_raises(ValueError, OnlineACF(5).acovf)
+
+
+@pytest.mark.parametrize('unbiased', [True, False])
+@pytest.mark.parametrize('demean', [True, False])
+def test_ccovf_fft_nlags(acovf_data, unbiased, demean):
+    x = acovf_data
+    y = np.r_[x[5:], x[:5]] + 0.5 * np.arange(x.shape[0]) / x.shape[0]
+    direct = ccovf(x, y, unbiased=unbiased, demean=demean, fft=False)
+    res = ccovf(x, y, unbiased=unbiased, demean=demean)
+    assert_allclose(res, direct, rtol=1e-8, atol=1e-12)
+    res = ccovf(x, y, unbiased=unbiased, demean=demean, nlags=10,
+                blocksize=17)
+    assert_allclose(res, direct[:11], rtol=1e-10)
+    res = ccovf(x, y, unbiased=unbiased, demean=demean, nlags=10, fft=False)
+    assert_allclose(res, direct[:11], rtol=1e-10)
+    assert_raises(ValueError, ccovf, x, y, nlags=x.shape[0])
+
+
+def test_ccf_multi():
+    rs = np.random.RandomState(1234)
+    x = rs.standard_normal((503, 4))
+    x[1:, 1] += 0.5 * x[:-1, 0]
+    nlags = 12
+    res = ccf_multi(x, nlags, blocksize=40)
+    assert_equal(res.shape, (4, 4, nlags + 1))
+    res_cov = ccovf_multi(x, nlags, unbiased=False)
+    for i in range(4):
+        for j in range(4):
+            assert_allclose(res[i, j],
+                            ccf(x[:, i], x[:, j], fft=False)[:nlags + 1],
+                            rtol=1e-10, atol=1e-12)
+            assert_allclose(res_cov[i, j],
+                            ccovf(x[:, i], x[:, j], unbiased=False,
+                                  fft=False, nlags=nlags),
+                            rtol=1e-10, atol=1e-12)
+    assert_allclose(res_cov[:, :, 0], res_cov[:, :, 0].T)
@@ -256,16 +256,22 @@ class IRAnalysis(BaseIRAnalysis):
                  vecm=False):
         BaseIRAnalysis.__init__(self, model, P=P, periods=periods,
                                 order=order, svar=svar, vecm=vecm)
-
-        if vecm:
-            self.cov_a = model.cov_var_repr
-        else:
-            self.cov_a = model._cov_alpha
-        self.cov_sig = model._cov_sigma
+        self.vecm = vecm
 
         # memoize dict for G matrix function
         self._g_memo = {}
 
+    @cache_readonly
+    def cov_a(self):
+        # created on demand, the Kronecker product is large for large VARs
+        if self.vecm:
+            return self.model.cov_var_repr
+        return self.model._cov_alpha
+
+    @cache_readonly
+    def cov_sig(self):
+        return self.model._cov_sigma
+
     def cov(self, orth=False):
         """
         Compute asymptotic standard errors for impulse response coefficients
@@ -662,13 +668,61 @@ class IRAnalysis(BaseIRAnalysis):
             return chain_dot(Finfty, self.cov_a, Finfty.T)
 
     def stderr(self, orth=False):
+        if not orth and self._has_kron_cov:
+            return self._stderr_kron()
         return np.array([tsa.unvec(np.sqrt(np.diag(c)))
                          for c in self.cov(orth=orth)])
 
     def cum_effect_stderr(self, orth=False):
+        if not orth and self._has_kron_cov:
+            return self._stderr_kron(cum=True)
         return np.array([tsa.unvec(np.sqrt(np.diag(c)))
                          for c in self.cum_effect_cov(orth=orth)])
 
+    @property
+    def _has_kron_cov(self):
+        return (not self.vecm and
+                hasattr(self.model, 'cov_params_factors'))
+
+    def _stderr_kron(self, cum=False):
+        """standard errors of the (cumulative) non-orthogonalized irfs
+
+        This uses the Kronecker structure of the coefficient covariance,
+        ``cov_a = kron(gamma, sigma_u)``, and ``G_i = sum_m kron(X_(i-1-m),
+        Phi_m)`` with ``X_q = J (A')^q``. The variance of the response of `b`
+        to an impulse in `a` is then
+
+            sum_(m,n) (X_(i-1-m) gamma X_(i-1-n)')[a, a] *
+                      (Phi_m sigma_u Phi_n')[b, b]
+
+        so that neither cov_a nor the G matrices are needed. For cumulative
+        effects, X_q is replaced by the partial sums of X.
+        """
+        K = self.neqs
+        periods = self.periods
+        zz_inv, sigma_u = self.model.cov_params_factors
+        k_exog = self.model.k_exog
+        gamma = zz_inv[k_exog:, k_exog:]
+
+        xs = np.empty((periods, K, self._A.shape[0]))
+        xs[0] = np.eye(K, self._A.shape[0])
+        for q in range(1, periods):
+            xs[q] = np.dot(xs[q - 1], self._A.T)
+        if cum:
+            xs = xs.cumsum(0)
+
+        # diagonals of all cross terms
+        xgx = np.einsum('qaj,raj->qra', np.dot(xs, gamma), xs)
+        phis = self.irfs[:periods]
+        psp = np.einsum('mbj,nbj->mnb', np.dot(phis, sigma_u), phis)
+
+        var = np.zeros((periods + 1, K, K))
+        for i in range(1, periods + 1):
+            # X index is i - 1 - m for MA index m < i
+            xgx_i = xgx[:i, :i][::-1, ::-1]
+            var[i] = np.einsum('mna,mnb->ba', xgx_i, psp[:i, :i])
+        return np.sqrt(var)
+
     def lr_effect_stderr(self, orth=False):
         cov = self.lr_effect_cov(orth=orth)
         return tsa.unvec(np.sqrt(np.diag(cov)))
@@ -634,6 +634,87 @@ def test_irf_trend():
     assert_allclose(irf_t.stderr()[1:4], irf.stderr()[1:4], rtol=0.03)
 
 
+@pytest.mark.parametrize('trend', ['c', 'ct', 'nc'])
+def test_irf_resim_batch(trend):
+    from statsmodels.tsa.vector_ar.var_model import (_varsim_batch,
+                                                     _irf_resim_batch)
+    data = get_macrodata().view((float, 3), type=np.ndarray)
+    res = sm.tsa.VAR(data).fit(2, trend=trend)
+    nobs, burn = res.nobs, 50
+    seeds = [1, 2, 3]
+    exog_det = res.endog_lagged[:nobs - 2, :res.k_trend]
+    sim = _varsim_batch(res.coefs, res.intercept, res._chol_sigma_u,
+                        nobs + burn, seeds)
+    ma_coll = _irf_resim_batch(res.coefs, res.intercept, res._chol_sigma_u,
+                               seeds, nobs, burn, exog_det, 8, True, True)
+    assert_equal(ma_coll.shape, (3, 9, 3, 3))
+    # compare with explicit estimation of each replication
+    for i in range(3):
+        res_i = sm.tsa.VAR(sim[i, burn:]).fit(2, trend=trend)
+        assert_allclose(ma_coll[i], res_i.orth_ma_rep(8).cumsum(0),
+                        rtol=1e-10, atol=1e-10)
+
+    # replications do not depend on the batching
+    ma1 = res.irf_resim(repl=20, T=5, seed=5)
+    ma2 = res.irf_resim(repl=20, T=5, seed=5, chunksize=7)
+    assert_equal(ma1.shape, (20, 6, 3, 3))
+    assert_allclose(ma2, ma1, rtol=1e-13)
+    ma3 = res.irf_resim(repl=20, T=5, seed=5, n_jobs=2)
+    assert_allclose(ma3, ma1, rtol=1e-13)
+    assert_(np.all(np.abs(np.diff(ma1[:, 1], axis=0)) > 0))
+
+
+def test_fit_regularized():
+    data = get_macrodata().view((float, 3), type=np.ndarray)
+    model = sm.tsa.VAR(data)
+    res_ols = model.fit(2)
+    res = model.fit_regularized(2, tightness=np.inf)
+    assert_allclose(res.params, res_ols.params, rtol=1e-10)
+
+    res = model.fit_regularized(2, tightness=0.1, lag_decay=2,
+                                prior_mean=[1, 0, 0.5])
+    # ridge regression with dummy observations for the prior
+    z, y = res.endog_lagged, res.endog[2:]
+    penalty = res.penalty
+    assert_equal(penalty[0], 0)
+    assert_allclose(penalty[1 + 3:1 + 6] / penalty[1:1 + 3], 16)
+    w = np.sqrt(penalty)
+    z_aug = np.vstack((z, np.diag(w)))
+    y_aug = np.vstack((y, w[:, None] * res.params_prior))
+    params = np.linalg.lstsq(z_aug, y_aug, rcond=-1)[0]
+    assert_allclose(res.params, params, rtol=1e-8)
+    assert_allclose(res.params_prior[1:4], np.diag([1, 0, 0.5]))
+    # coefficients are shrunk toward the prior mean
+    assert_(np.abs(res.coefs[1]).sum() < np.abs(res_ols.coefs[1]).sum())
+
+    zz_inv, sigma_u = res.cov_params_factors
+    assert_allclose(zz_inv, np.linalg.inv(z_aug.T.dot(z_aug)), rtol=1e-8)
+    resid = y - z.dot(res.params)
+    assert_allclose(sigma_u, resid.T.dot(resid) / len(y), rtol=1e-10)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        cov = res.cov_params
+    assert_allclose(res.bse, np.sqrt(np.diag(cov)).reshape(7, 3),
+                    rtol=1e-12)
+
+
+@pytest.mark.parametrize('regularized', [False, True])
+def test_irf_stderr_kron(regularized):
+    data = get_macrodata().view((float, 3), type=np.ndarray)
+    model = sm.tsa.VAR(data)
+    if regularized:
+        res = model.fit_regularized(3, tightness=0.3)
+    else:
+        res = model.fit(3)
+    irf = res.irf(8)
+    stderr = np.array([util.tsa.unvec(np.sqrt(np.diag(c)))
+                       for c in irf.cov()])
+    assert_allclose(irf.stderr(), stderr, rtol=1e-10, atol=1e-14)
+    stderr = np.array([util.tsa.unvec(np.sqrt(np.diag(c)))
+                       for c in irf.cum_effect_cov()])
+    assert_allclose(irf.cum_effect_stderr(), stderr, rtol=1e-10, atol=1e-14)
+
+
 class TestVARExtras(object):
 
     @classmethod
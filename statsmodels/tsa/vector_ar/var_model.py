@@ -21,6 +21,7 @@ from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools.sm_exceptions import OutputWarning
 from statsmodels.tools.tools import chain_dot
 from statsmodels.tools.linalg import logdet_symm
+from statsmodels.tools.parallel import parallel_func
 from statsmodels.tsa.tsatools import vec, unvec, duplication_matrix
 from statsmodels.tsa.vector_ar.hypothesis_test_results import \
     CausalityTestResults, NormalityTestResults, WhitenessTestResults
@@ -393,6 +394,134 @@ def orth_ma_rep(results, maxn=10, P=None):
     return np.array([np.dot(coefs, P) for coefs in ma_mats])
 
 
+def _ma_rep_batch(coefs, maxn=10):
+    r"""MA(\infty) representation for a stack of VAR(p) coefficient arrays
+
+    Parameters
+    ----------
+    coefs : ndarray (nrepl x p x k x k)
+    maxn : int
+        Number of MA matrices to compute
+
+    Returns
+    -------
+    phis : ndarray (nrepl x maxn + 1 x k x k)
+
+    See Also
+    --------
+    ma_rep
+    """
+    nrepl, p, k, k = coefs.shape
+    phis = np.zeros((nrepl, maxn + 1, k, k))
+    phis[:, 0] = np.eye(k)
+    for i in range(1, maxn + 1):
+        for j in range(1, min(i, p) + 1):
+            phis[:, i] += np.matmul(phis[:, i - j], coefs[:, j - 1])
+    return phis
+
+
+def _varsim_batch(coefs, intercept, chol_sigma_u, steps, seeds):
+    """Simulate one VAR(p) process for each seed, vectorized over seeds
+
+    The process is initialized as in `util.varsim`. Each replication uses its
+    own random number stream, so that a replication does not depend on the
+    other seeds that are simulated in the same batch.
+
+    Returns
+    -------
+    endog_simulated : ndarray (nrepl x steps x k)
+    """
+    p, k, k = coefs.shape
+    nrepl = len(seeds)
+    ugen = np.empty((nrepl, steps, k))
+    for i, s in enumerate(seeds):
+        ugen[i] = np.random.RandomState(s).standard_normal((steps, k))
+    ugen = ugen.dot(chol_sigma_u.T)
+
+    result = np.zeros((nrepl, steps, k))
+    if intercept is not None:
+        result += intercept
+    result[:, p:] += ugen[:, p:]
+    coefs_t = coefs.swapaxes(1, 2)
+    for t in range(p, steps):
+        ygen = result[:, t]
+        for j in range(p):
+            ygen += result[:, t - j - 1].dot(coefs_t[j])
+    return result
+
+
+def _var_fit_batch(endog, lags, exog_det):
+    """OLS estimate of VAR(p) for a stack of endog arrays
+
+    The deterministic terms `exog_det` are shared by all replications, so
+    their cross-products are computed only once. The normal equations are
+    solved for all replications in one batched solve after scaling the
+    regressors to unit length.
+
+    Parameters
+    ----------
+    endog : ndarray (nrepl x nobs x k)
+    lags : int
+    exog_det : ndarray (nobs - lags x k_det)
+        trend and exog columns of the design, as in `VAR._estimate_var`
+
+    Returns
+    -------
+    coefs : ndarray (nrepl x p x k x k)
+    sigma_u : ndarray (nrepl x k x k)
+        unbiased estimate of the innovation covariance
+    """
+    nrepl, nobs, k = endog.shape
+    nobs_eff = nobs - lags
+    k_det = exog_det.shape[1]
+    y = endog[:, lags:]
+    ylag = np.concatenate([endog[:, lags - j - 1:nobs - j - 1]
+                           for j in range(lags)], axis=2)
+    ylag_t = ylag.swapaxes(1, 2)
+
+    k_params = k_det + k * lags
+    zz = np.empty((nrepl, k_params, k_params))
+    zz[:, :k_det, :k_det] = exog_det.T.dot(exog_det)
+    dl = np.matmul(exog_det.T, ylag)
+    zz[:, :k_det, k_det:] = dl
+    zz[:, k_det:, :k_det] = dl.swapaxes(1, 2)
+    zz[:, k_det:, k_det:] = np.matmul(ylag_t, ylag)
+    zy = np.concatenate((np.matmul(exog_det.T, y), np.matmul(ylag_t, y)),
+                        axis=1)
+
+    scale = np.sqrt(np.diagonal(zz, axis1=1, axis2=2))
+    scale[scale == 0] = 1
+    zz /= scale[:, :, None] * scale[:, None, :]
+    params = np.linalg.solve(zz, zy / scale[:, :, None])
+    params /= scale[:, :, None]
+
+    resid = y - np.matmul(ylag, params[:, k_det:])
+    if k_det > 0:
+        resid -= np.matmul(exog_det, params[:, :k_det])
+    sigma_u = np.matmul(resid.swapaxes(1, 2), resid) / (nobs_eff - k_params)
+
+    coefs = params[:, k_det:].reshape((nrepl, lags, k, k)).swapaxes(2, 3)
+    return coefs, sigma_u
+
+
+def _irf_resim_batch(coefs, intercept, chol_sigma_u, seeds, nobs, burn,
+                     exog_det, maxn, orth, cum):
+    """simulate, re-estimate and compute the MA representation for a batch
+
+    This is a module level function so that it can be pickled by joblib.
+    """
+    sim = _varsim_batch(coefs, intercept, chol_sigma_u, nobs + burn, seeds)
+    coefs_sim, sigma_u_sim = _var_fit_batch(sim[:, burn:], coefs.shape[0],
+                                            exog_det)
+    ma_coll = _ma_rep_batch(coefs_sim, maxn=maxn)
+    if orth:
+        ma_coll = np.matmul(ma_coll,
+                            np.linalg.cholesky(sigma_u_sim)[:, None])
+    if cum:
+        ma_coll = ma_coll.cumsum(axis=1)
+    return ma_coll
+
+
 def test_normality(results, signif=0.05):
     """
     Test assumption of normal-distributed errors using Jarque-Bera-style
@@ -628,6 +757,10 @@ class VAR(tsbase.TimeSeriesModel):
             if lags is None:
                 lags = 1
 
+        self._prepare_fit(lags, trend)
+        return self._estimate_var(lags, trend=trend)
+
+    def _prepare_fit(self, lags, trend):
         k_trend = util.get_trendorder(trend)
         self.exog_names = util.make_lag_names(self.endog_names, lags, k_trend)
         self.nobs = self.n_totobs - lags
@@ -641,20 +774,117 @@ class VAR(tsbase.TimeSeriesModel):
                                x_names_to_add + \
                                self.data.xnames[k_trend:]
 
-        return self._estimate_var(lags, trend=trend)
+    def fit_regularized(self, maxlags=1, tightness=0.2, lag_decay=1.,
+                        prior_mean=0., trend='c'):
+        """
+        Fit the VAR model with Minnesota-type shrinkage of the lag coefficients
 
-    def _estimate_var(self, lags, offset=0, trend='c'):
+        Parameters
+        ----------
+        maxlags : int
+            Number of lags of the endogenous variables.
+        tightness : float
+            Overall tightness of the prior, the prior standard deviation of
+            the first lag coefficients in units of the residual standard
+            deviations. Smaller values shrink more, `np.inf` corresponds to
+            OLS.
+        lag_decay : float
+            Prior standard deviations of the coefficients of lag `l` are
+            divided by ``l**lag_decay``.
+        prior_mean : float or array_like
+            Prior mean of the own first lag coefficient of each equation. Use
+            1 for random walk and 0 for white noise priors. The prior mean of
+            all other lag coefficients is zero.
+        trend : str {"c", "ct", "ctt", "nc"}
+            Deterministic terms, see `fit`. Deterministic terms and exog are
+            not penalized.
+
+        Returns
+        -------
+        est : VARResultsWrapper
+            The results instance is a `RegularizedVARResults`.
+
+        Notes
+        -----
+        This is the natural conjugate, Normal-inverse-Wishart version of the
+        Minnesota prior as used for large Bayesian VARs in Banbura, Giannone
+        and Reichlin (2010). The prior variance of the coefficient of lag `l`
+        of variable `j` is ``(tightness / l**lag_decay / s_j)**2`` times the
+        innovation variance of the equation, where `s_j` is the residual
+        standard deviation of a univariate AR(maxlags) for variable `j`.
+
+        Because the prior has Kronecker structure, the posterior mean is a
+        ridge regression in which all equations share the same penalized
+        cross-product matrix ``Z'Z + diag(penalty)``. It is factored once
+        and used for all equations, and the Kronecker covariance of the
+        parameters is never formed explicitly, see
+        `VARResults.cov_params_factors`.
+
+        References
+        ----------
+        Banbura, M., Giannone, D. and Reichlin, L. (2010). Large Bayesian
+        vector auto regressions. Journal of Applied Econometrics, 25, 71-92.
         """
-        lags : int
-            Lags of the endogenous variable.
-        offset : int
-            Periods to drop from beginning-- for order selection so it's an
-            apples-to-apples comparison
-        trend : string or None
-            As per above
+        lags = maxlags
+        if trend not in ['c', 'ct', 'ctt', 'nc']:
+            raise ValueError("trend '{}' not supported for VAR".format(trend))
+
+        self._prepare_fit(lags, trend)
+        endog, z, y_sample = self._lagged_design(lags, trend=trend)
+        neqs = self.neqs
+        k_det = z.shape[1] - neqs * lags
+
+        # scale of each variable from univariate autoregressions
+        scale = np.empty(neqs)
+        const = np.ones((len(y_sample), 1))
+        for j in range(neqs):
+            x = np.column_stack((const, z[:, k_det + j::neqs]))
+            resid = y_sample[:, j] - x.dot(np.linalg.lstsq(x, y_sample[:, j],
+                                                           rcond=-1)[0])
+            scale[j] = np.sqrt(resid.dot(resid) / len(resid))
+
+        penalty = np.zeros(z.shape[1])
+        if tightness != np.inf:
+            lag_std = tightness / np.arange(1, lags + 1)**lag_decay
+            penalty[k_det:] = (1. / np.outer(lag_std, 1. / scale).ravel())**2
+
+        params_prior = np.zeros((z.shape[1], neqs))
+        params_prior[k_det:k_det + neqs] = np.diag(
+            np.broadcast_to(prior_mean, (neqs,)))
+
+        zz = np.dot(z.T, z)
+        zz[np.diag_indices_from(zz)] += penalty
+        zy = np.dot(z.T, y_sample) + penalty[:, None] * params_prior
+        # one factorization shared by all equations
+        params = scipy.linalg.cho_solve(scipy.linalg.cho_factor(zz), zy)
+
+        resid = y_sample - np.dot(z, params)
+        sigma_u = np.dot(resid.T, resid) / len(resid)
+
+        varfit = RegularizedVARResults(endog, z, params, sigma_u, lags,
+                                       names=self.endog_names, trend=trend,
+                                       dates=self.data.dates, model=self,
+                                       exog=self.exog, penalty=penalty,
+                                       params_prior=params_prior,
+                                       tightness=tightness,
+                                       lag_decay=lag_decay)
+        return VARResultsWrapper(varfit)
+
+    def _lagged_design(self, lags, offset=0, trend='c'):
+        """
+        Design matrix of deterministic terms, exog and lagged endog
+
+        Returns
+        -------
+        endog : ndarray
+            endog without the first `offset` observations
+        z : ndarray
+            regressors, with trend and exog in the first columns
+        y_sample : ndarray
+            endog observations that correspond to the rows of z
         """
         # have to do this again because select_order doesn't call fit
-        self.k_trend = k_trend = util.get_trendorder(trend)
+        self.k_trend = util.get_trendorder(trend)
 
         if offset < 0:  # pragma: no cover
             raise ValueError('offset must be >= 0')
@@ -688,6 +918,22 @@ class VAR(tsbase.TimeSeriesModel):
                 z[:, i] = (np.sqrt(z[:, i]) + lags)**2
 
         y_sample = endog[lags:]
+        return endog, z, y_sample
+
+    def _estimate_var(self, lags, offset=0, trend='c'):
+        """
+        lags : int
+            Lags of the endogenous variable.
+        offset : int
+            Periods to drop from beginning-- for order selection so it's an
+            apples-to-apples comparison
+        trend : string or None
+            As per above
+        """
+        endog, z, y_sample = self._lagged_design(lags, offset=offset,
+                                                 trend=trend)
+        k_trend = self.k_trend
+        exog = self.exog
         # Lütkepohl p75, about 5x faster than stated formula
         params = np.linalg.lstsq(z, y_sample, rcond=1e-15)[0]
         resid = y_sample - np.dot(z, params)
@@ -1333,8 +1579,27 @@ class VARResults(VARProcess):
                       "starting in version 0.11.0 `VARResults.cov_params` "
                       "will be a method instead of a property.",
                       category=FutureWarning)
-        z = self.ys_lagged
-        return np.kron(scipy.linalg.inv(np.dot(z.T, z)), self.sigma_u)
+        return np.kron(*self.cov_params_factors)
+
+    @cache_readonly
+    def cov_params_factors(self):
+        """Kronecker factors of the covariance of the model coefficients
+
+        Returns
+        -------
+        zz_inv : ndarray (df_model x df_model)
+            Inverse of the cross-product matrix of the regressors
+        sigma_u : ndarray (neqs x neqs)
+            Covariance matrix of the innovations
+
+        Notes
+        -----
+        ``cov_params == np.kron(zz_inv, sigma_u)``. For models with many
+        equations the Kronecker product is very large, standard errors,
+        impulse response standard errors and forecast covariances use the
+        factors directly.
+        """
+        return scipy.linalg.inv(self._zz), self.sigma_u
 
     def cov_ybar(self):
         r"""Asymptotically consistent estimate of covariance of the sample mean
@@ -1368,7 +1633,9 @@ class VARResults(VARProcess):
         Estimated covariance matrix of model coefficients w/o exog
         """
         # drop exog
-        return self.cov_params[self.k_exog*self.neqs:, self.k_exog*self.neqs:]
+        zz_inv, sigma_u = self.cov_params_factors
+        k_exog = self.k_exog
+        return np.kron(zz_inv[k_exog:, k_exog:], sigma_u)
 
     @cache_readonly
     def _cov_sigma(self):
@@ -1390,8 +1657,9 @@ class VARResults(VARProcess):
     def stderr(self):
         """Standard errors of coefficients, reshaped to match in size
         """
-        stderr = np.sqrt(np.diag(self.cov_params))
-        return stderr.reshape((self.df_model, self.neqs), order='C')
+        zz_inv, sigma_u = self.cov_params_factors
+        # diagonal of the Kronecker product in the shape of params
+        return np.sqrt(np.outer(np.diag(zz_inv), np.diag(sigma_u)))
 
     bse = stderr  # statsmodels interface?
 
@@ -1487,7 +1755,8 @@ class VARResults(VARProcess):
 
     # Monte Carlo irf standard errors
     def irf_errband_mc(self, orth=False, repl=1000, T=10,
-                       signif=0.05, seed=None, burn=100, cum=False):
+                       signif=0.05, seed=None, burn=100, cum=False,
+                       n_jobs=1):
         """
         Compute Monte Carlo integrated error bands assuming normally
         distributed for impulse response functions
@@ -1508,6 +1777,8 @@ class VARResults(VARProcess):
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        n_jobs : int
+            number of processes used for the replications, see `irf_resim`
 
         Notes
         -----
@@ -1518,7 +1789,8 @@ class VARResults(VARProcess):
         Tuple of lower and upper arrays of ma_rep monte carlo standard errors
         """
         ma_coll = self.irf_resim(orth=orth, repl=repl, T=T,
-                                 seed=seed, burn=burn, cum=cum)
+                                 seed=seed, burn=burn, cum=cum,
+                                 n_jobs=n_jobs)
 
         ma_sort = np.sort(ma_coll, axis=0)  # sort to get quantiles
         # python 2: round returns float
@@ -1529,7 +1801,7 @@ class VARResults(VARProcess):
         return lower, upper
 
     def irf_resim(self, orth=False, repl=1000, T=10,
-                      seed=None, burn=100, cum=False):
+                  seed=None, burn=100, cum=False, n_jobs=1, chunksize=None):
         """
         Simulates impulse response function, returning an array of simulations.
         Used for Sims-Zha error band calculation.
@@ -1542,53 +1814,79 @@ class VARResults(VARProcess):
             number of Monte Carlo replications to perform
         T: int, default 10
             number of impulse response periods
-        signif: float (0 < signif <1)
-            Significance level for error bars, defaults to 95% CI
         seed: int
-            np.random.seed for replications
+            seed for the random number generator that creates the seeds of
+            the individual replications
         burn: int
             number of initial observations to discard for simulation
         cum: bool, default False
             produce cumulative irf error bands
+        n_jobs : int
+            Number of processes over which batches of replications are
+            distributed using joblib. The default n_jobs=1 computes all
+            batches in the current process, n_jobs=-1 uses all cores.
+        chunksize : None or int
+            Number of replications that are simulated and estimated jointly
+            in one batch. The default limits the size of the lagged design
+            arrays of a batch to about 16 million elements.
 
         Notes
         -----
         Sims, Christoper A., and Tao Zha. 1999. "Error Bands for Impulse Response." Econometrica 67: 1113-1155.
 
+        All replications of a batch are simulated jointly, and the VAR
+        coefficients are re-estimated by OLS from the lagged design of the
+        simulated data with a batched solve of the normal equations, instead
+        of creating a new VAR model and results instance for each
+        replication. Each replication draws its innovations from its own
+        random number stream, which is seeded from `seed`. The simulations
+        are therefore reproducible and do not depend on `n_jobs` or
+        `chunksize`.
+
+        Exogenous variables are included as regressors when re-estimating
+        the VAR, but only the intercept is used when simulating the data.
+
         Returns
         -------
         Array of simulated impulse response functions
-
         """
         neqs = self.neqs
-        # mean = self.mean()
         k_ar = self.k_ar
-        coefs = self.coefs
-        sigma_u = self.sigma_u
-        intercept = self.intercept
-        # df_model = self.df_model
         nobs = self.nobs
+        nobs_eff = nobs - k_ar
 
-        ma_coll = np.zeros((repl, T+1, neqs, neqs))
-
-        def fill_coll(sim):
-            ret = VAR(sim, exog=self.exog).fit(maxlags=k_ar, trend=self.trend)
-            ret = ret.orth_ma_rep(maxn=T) if orth else ret.ma_rep(maxn=T)
-            return ret.cumsum(axis=0) if cum else ret
-
-        for i in range(repl):
-            # discard first hundred to eliminate correct for starting bias
-            sim = util.varsim(coefs, intercept, sigma_u,
-                              seed=seed, steps=nobs+burn)
-            sim = sim[burn:]
-            ma_coll[i, :, :, :] = fill_coll(sim)
+        # deterministic terms of the design for a sample of length nobs
+        exog_det = self.endog_lagged[:nobs_eff, :self.k_trend]
+        if self.exog is not None:
+            exog_det = np.column_stack((exog_det, self.exog[-nobs_eff:]))
+
+        rs = np.random.RandomState(seed)
+        seeds = rs.randint(0, 2**31 - 1, size=repl)
+        if chunksize is None:
+            chunksize = 2**24 // (nobs * neqs * (k_ar + 1) + 1) + 1
+        chunks = [seeds[i:i + chunksize]
+                  for i in range(0, repl, chunksize)]
+
+        args = (self.coefs, self.intercept, self._chol_sigma_u)
+        kwds = dict(nobs=nobs, burn=burn, exog_det=exog_det, maxn=T,
+                    orth=orth, cum=cum)
+        if n_jobs == 1:
+            ma_coll = [_irf_resim_batch(*args, seeds=chunk, **kwds)
+                       for chunk in chunks]
+        else:
+            par, f, n_jobs = parallel_func(_irf_resim_batch, n_jobs,
+                                           verbose=0)
+            if len(chunks) < n_jobs:
+                # split the work so that it can be distributed
+                chunks = np.array_split(seeds, min(repl, n_jobs))
+            ma_coll = par(f(*args, seeds=chunk, **kwds) for chunk in chunks)
 
-        return ma_coll
+        return np.concatenate(ma_coll, axis=0)
 
     def _omega_forc_cov(self, steps):
         # Approximate MSE matrix \Omega(h) as defined in Lut p97
         G = self._zz
-        Ginv = scipy.linalg.inv(G)
+        Ginv = self.cov_params_factors[0]
 
         # memoize powers of B for speedup
         # TODO: see if can memoize better
@@ -2089,6 +2387,62 @@ class VARResults(VARProcess):
         return roots[idx]
 
 
+class RegularizedVARResults(VARResults):
+    """
+    Estimation results of a VAR with Minnesota-type shrinkage
+
+    See `VAR.fit_regularized`. In addition to the attributes of `VARResults`
+
+    Attributes
+    ----------
+    penalty : ndarray
+        Prior precision of each regressor relative to the innovation
+        covariance, zero for deterministic terms and exog.
+    params_prior : ndarray
+        Prior mean of params.
+    tightness : float
+    lag_decay : float
+
+    Notes
+    -----
+    `sigma_u` is the residual covariance without degrees of freedom
+    correction. `cov_params_factors` and the covariances derived from it use
+    the penalized cross-product matrix ``Z'Z + diag(penalty)`` and correspond
+    to the posterior covariance of the coefficients given `sigma_u`.
+    """
+    _model_type = 'VAR'
+
+    def __init__(self, endog, endog_lagged, params, sigma_u, lag_order,
+                 model=None, trend='c', names=None, dates=None, exog=None,
+                 penalty=None, params_prior=None, tightness=None,
+                 lag_decay=None):
+        self.penalty = penalty
+        self.params_prior = params_prior
+        self.tightness = tightness
+        self.lag_decay = lag_decay
+        super(RegularizedVARResults, self).__init__(
+            endog, endog_lagged, params, sigma_u, lag_order, model=model,
+            trend=trend, names=names, dates=dates, exog=exog)
+
+    @cache_readonly
+    def _zz(self):
+        zz = np.dot(self.ys_lagged.T, self.ys_lagged)
+        zz[np.diag_indices_from(zz)] += self.penalty
+        return zz
+
+    @cache_readonly
+    def cov_params_factors(self):
+        zz_inv = scipy.linalg.cho_solve(scipy.linalg.cho_factor(self._zz),
+                                        np.eye(len(self._zz)))
+        return zz_inv, self.sigma_u
+
+    @cache_readonly
+    def sigma_u_mle(self):
+        """Residual covariance, without degrees of freedom correction
+        """
+        return self.sigma_u
+
+
 class VARResultsWrapper(wrap.ResultsWrapper):
     _attrs = {'bse': 'columns_eq', 'cov_params': 'cov',
               'params': 'columns_eq', 'pvalues': 'columns_eq',